@@ -0,0 +1,83 @@
+"""
+🔎 AUTOMATE AHO–CORASICK - RECHERCHE MULTI-MOTIFS EN UNE PASSE
+═══════════════════════════════════════════════════════════════════════════════
+Recherche simultanée de tous les mots d'un lexique (équipes connues,
+mots-clés de sport) dans un texte, en temps linéaire sur la longueur
+du texte quel que soit le nombre de mots.
+═══════════════════════════════════════════════════════════════════════════════
+"""
+from collections import deque
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+
+class AhoCorasick:
+    """Automate construit une fois, interrogé à chaque validation"""
+
+    __slots__ = ('words', '_goto', '_fail', '_out')
+
+    def __init__(self, words: Iterable[str]):
+        self.words: List[str] = [w for w in words if w]
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[Tuple[int, ...]] = [()]
+        self._build()
+
+    def _build(self):
+        # 1. Trie des mots
+        outputs: List[List[int]] = [[]]
+        for index, word in enumerate(self.words):
+            node = 0
+            for char in word:
+                nxt = self._goto[node].get(char)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[node][char] = nxt
+                    self._goto.append({})
+                    self._fail.append(0)
+                    outputs.append([])
+                node = nxt
+            outputs[node].append(index)
+
+        # 2. Liens d'échec (parcours en largeur)
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, child in self._goto[node].items():
+                queue.append(child)
+                fail = self._fail[node]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                target = self._goto[fail].get(char, 0)
+                self._fail[child] = target if target != child else 0
+                outputs[child].extend(outputs[self._fail[child]])
+
+        self._out = [tuple(o) for o in outputs]
+
+    def iter_matches(self, text: str) -> Iterator[Tuple[int, int]]:
+        """Génère (position de fin, index du mot) pour chaque occurrence"""
+        node = 0
+        goto, fail, out = self._goto, self._fail, self._out
+        for pos, char in enumerate(text):
+            while node and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+            for index in out[node]:
+                yield pos, index
+
+    def find_indices(self, text: str) -> Set[int]:
+        """Index de tous les mots présents dans le texte"""
+        return {index for _, index in self.iter_matches(text)}
+
+    def first_word(self, *texts: str) -> Optional[str]:
+        """Mot présent de plus petit index (ordre du lexique) parmi les textes"""
+        found: Set[int] = set()
+        for text in texts:
+            if text:
+                found |= self.find_indices(text)
+        return self.words[min(found)] if found else None
+
+    def __len__(self) -> int:
+        return len(self.words)
+
+
+__all__ = ['AhoCorasick']
@@ -0,0 +1,153 @@
+"""
+🧪 FAUX SERVEUR GROQ - BENCHMARK HORS-LIGNE
+═══════════════════════════════════════════════════════════════════════════════
+Émule l'endpoint chat-completions de Groq (format OpenAI) en local:
+- Latence configurable (moyenne + gigue) et requêtes traînardes (queue lente)
+- Réponses 429 avec retry-after
+- JSON volontairement malformé
+- Comptage des tokens (≈ 4 caractères / token)
+
+Les probabilités renvoyées reprennent les pourcentages API-Football présents
+dans le prompt: la réponse dépend des données, sans aucun appel externe.
+═══════════════════════════════════════════════════════════════════════════════
+"""
+import asyncio
+import json
+import random
+import re
+from typing import Dict, Optional
+
+from aiohttp import web
+
+CHAT_PATH = "/openai/v1/chat/completions"
+
+TEAMS_RE = re.compile(r'(?:🏟️|MATCH:)\s*(?:MATCH:\s*)?(.+?)\s+vs\s+(.+)')
+PERCENT_RE = re.compile(r'Pourcentages: Dom (\d+)%? \| Nul (\d+)%? \| Ext (\d+)%?')
+
+
+class FakeGroqServer:
+    """Serveur aiohttp local compatible avec UltraPredictor._call_groq"""
+
+    def __init__(self, latency_ms: float = 800, jitter_ms: float = 300,
+                 rate_429: float = 0.0, malformed: float = 0.0,
+                 retry_after: int = 1, seed: int = 42,
+                 straggler_rate: float = 0.0, straggler_ms: float = 10000):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.straggler_rate = straggler_rate
+        self.straggler_ms = straggler_ms
+        self.rate_429 = rate_429
+        self.malformed = malformed
+        self.retry_after = retry_after
+        self.rng = random.Random(seed)
+        self.runner: Optional[web.AppRunner] = None
+        self.url = ""
+        self.counters = {
+            'requests': 0,
+            'ok': 0,
+            'rate_limited': 0,
+            'malformed': 0,
+            'stragglers': 0,
+            'prompt_tokens': 0,
+            'completion_tokens': 0
+        }
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> str:
+        app = web.Application()
+        app.router.add_post(CHAT_PATH, self._handle)
+        self.runner = web.AppRunner(app, access_log=None)
+        await self.runner.setup()
+        site = web.TCPSite(self.runner, host, port)
+        await site.start()
+        bound_host, bound_port = self.runner.addresses[0][:2]
+        self.url = f"http://{bound_host}:{bound_port}{CHAT_PATH}"
+        return self.url
+
+    async def stop(self):
+        if self.runner:
+            await self.runner.cleanup()
+
+    async def _handle(self, request: web.Request) -> web.Response:
+        self.counters['requests'] += 1
+        payload = await request.json()
+
+        delay = max(0.0, self.rng.gauss(self.latency_ms, self.jitter_ms)) / 1000
+        if self.rng.random() < self.straggler_rate:
+            self.counters['stragglers'] += 1
+            delay += self.straggler_ms / 1000
+        await asyncio.sleep(delay)
+
+        if self.rng.random() < self.rate_429:
+            self.counters['rate_limited'] += 1
+            return web.json_response(
+                {'error': {'message': 'Rate limit reached', 'type': 'tokens'}},
+                status=429, headers={'retry-after': str(self.retry_after)}
+            )
+
+        messages = payload.get('messages', [])
+        prompt = "\n".join(m.get('content', '') for m in messages)
+        content = json.dumps(self._prediction(prompt), ensure_ascii=False)
+
+        if self.rng.random() < self.malformed:
+            self.counters['malformed'] += 1
+            content = content[:len(content) // 2]
+
+        prompt_tokens = len(prompt) // 4
+        completion_tokens = len(content) // 4
+        self.counters['ok'] += 1
+        self.counters['prompt_tokens'] += prompt_tokens
+        self.counters['completion_tokens'] += completion_tokens
+
+        return web.json_response({
+            'id': f"bench-{self.counters['requests']}",
+            'object': 'chat.completion',
+            'model': payload.get('model', 'bench'),
+            'choices': [{
+                'index': 0,
+                'message': {'role': 'assistant', 'content': content},
+                'finish_reason': 'stop'
+            }],
+            'usage': {
+                'prompt_tokens': prompt_tokens,
+                'completion_tokens': completion_tokens,
+                'total_tokens': prompt_tokens + completion_tokens
+            }
+        })
+
+    @staticmethod
+    def _prediction(prompt: str) -> Dict:
+        """Prédiction déterministe construite à partir du prompt"""
+        teams = TEAMS_RE.search(prompt)
+        team1, team2 = (teams.group(1).strip(), teams.group(2).strip()) if teams else ("Équipe 1", "Équipe 2")
+
+        percent = PERCENT_RE.search(prompt)
+        if percent:
+            home, draw, away = (int(v) for v in percent.groups())
+        else:
+            home, draw, away = 40, 27, 33
+        total = max(home + draw + away, 1)
+        home, draw = round(home * 100 / total), round(draw * 100 / total)
+        away = 100 - home - draw
+        pick = max((home, '1'), (draw, 'X'), (away, '2'))[1]
+
+        return {
+            'analysis': {
+                'data_quality': 'Bon' if percent else 'Faible',
+                'key_stats': [f"{team1} vs {team2}: pourcentages {home}/{draw}/{away}"],
+                'key_factors': ['Réponse du serveur de benchmark']
+            },
+            'predictions': {
+                'winner': {
+                    'prediction': pick,
+                    'team1_probability': home,
+                    'draw_probability': draw,
+                    'team2_probability': away,
+                    'confidence': min(70, max(home, draw, away)),
+                    'reasoning': 'Benchmark'
+                }
+            },
+            'summary': {'confidence': min(70, max(home, draw, away))}
+        }
+
+
+__all__ = ['FakeGroqServer']
@@ -0,0 +1,112 @@
+"""
+🧪 GÉNÉRATION DU JEU DE DONNÉES DE BENCHMARK
+═══════════════════════════════════════════════════════════════════════════════
+Produit benchmarks/fixtures/matches.json: matchs au format VIPRow, données
+sources au format des collecteurs (API-Football) et résultat final.
+Tirage déterministe (graine fixe) pour des benchmarks reproductibles.
+
+Usage: python benchmarks/make_fixtures.py [--n 60] [--seed 11]
+═══════════════════════════════════════════════════════════════════════════════
+"""
+import argparse
+import hashlib
+import json
+import os
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from statistical_model import LEAGUE_PRIORS, _synthetic_team_stats  # noqa: E402
+
+FIXTURES_FILE = Path(__file__).resolve().parent / "fixtures" / "matches.json"
+
+TEAMS = [
+    'Manchester United', 'Manchester City', 'Liverpool', 'Chelsea', 'Arsenal',
+    'Tottenham', 'Newcastle', 'Aston Villa', 'Real Madrid', 'Barcelona',
+    'Atletico Madrid', 'Sevilla', 'Villarreal', 'Bayern Munich', 'Borussia Dortmund',
+    'RB Leipzig', 'Bayer Leverkusen', 'Juventus', 'Inter Milan', 'AC Milan',
+    'Napoli', 'Roma', 'Lazio', 'Atalanta', 'PSG', 'Marseille', 'Monaco', 'Lille',
+    'Lyon', 'Benfica', 'Porto', 'Ajax'
+]
+
+
+def _percentages(lam_home: float, lam_away: float) -> tuple:
+    """Pourcentages 1X2 arrondis, à la manière de /predictions API-Football"""
+    goals = np.arange(10)
+    fact = np.cumprod(np.concatenate(([1], goals[1:])))
+    ph = np.exp(-lam_home) * lam_home ** goals / fact
+    pa = np.exp(-lam_away) * lam_away ** goals / fact
+    grid = np.outer(ph, pa)
+    home, draw = np.tril(grid, -1).sum(), np.trace(grid)
+    home_pct, draw_pct = int(round(home * 100)), int(round(draw * 100))
+    return home_pct, draw_pct, 100 - home_pct - draw_pct
+
+
+def build(n: int, seed: int) -> list:
+    rng = np.random.default_rng(seed)
+    base_day = datetime(2024, 3, 2, 12, 0)
+    fixtures = []
+
+    for i in range(n):
+        home, away = rng.choice(len(TEAMS), 2, replace=False)
+        team1, team2 = TEAMS[home], TEAMS[away]
+        att1, def1, att2, def2 = rng.lognormal(0.0, 0.25, 4)
+        lam_home = LEAGUE_PRIORS['home_goals'] * att1 * def2
+        lam_away = LEAGUE_PRIORS['away_goals'] * att2 * def1
+        home_goals, away_goals = int(rng.poisson(lam_home)), int(rng.poisson(lam_away))
+
+        scraped_at = base_day + timedelta(days=i // 10, minutes=int(rng.integers(0, 600)))
+        kickoff = scraped_at + timedelta(hours=int(rng.integers(1, 8)))
+        title = f"{team1} vs {team2}"
+        pct_home, pct_draw, pct_away = _percentages(lam_home, lam_away)
+
+        fixtures.append({
+            'match': {
+                'id': hashlib.md5(f"football_{title}_{scraped_at.date()}".encode()).hexdigest()[:12],
+                'title': title,
+                'team1': team1,
+                'team2': team2,
+                'sport': 'FOOTBALL',
+                'start_time': kickoff.strftime('%H:%M'),
+                'scraped_at': scraped_at.isoformat()
+            },
+            'sources': {
+                'sofascore': {'source': 'Sofascore', 'success': False, 'data': {}},
+                'api_football': {
+                    'source': 'API-Football',
+                    'success': True,
+                    'data': {
+                        'predictions': {
+                            'predictions': {
+                                'winner': {'name': team1 if pct_home >= pct_away else team2},
+                                'percent': {'home': f"{pct_home}%", 'draw': f"{pct_draw}%", 'away': f"{pct_away}%"}
+                            }
+                        },
+                        'team1_stats': _synthetic_team_stats(att1, def1, 20, rng),
+                        'team2_stats': _synthetic_team_stats(att2, def2, 20, rng)
+                    }
+                },
+                'odds': {'source': 'Odds API', 'success': False, 'data': {}}
+            },
+            'result': {
+                'score': f"{home_goals}-{away_goals}",
+                'outcome': '1' if home_goals > away_goals else 'X' if home_goals == away_goals else '2'
+            }
+        })
+    return fixtures
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Génère le jeu de données de benchmark")
+    parser.add_argument('--n', type=int, default=60)
+    parser.add_argument('--seed', type=int, default=11)
+    args = parser.parse_args()
+
+    FIXTURES_FILE.parent.mkdir(parents=True, exist_ok=True)
+    with open(FIXTURES_FILE, 'w', encoding='utf-8') as f:
+        json.dump(build(args.n, args.seed), f, ensure_ascii=False, indent=1)
+    print(f"✅ {args.n} matchs écrits dans {os.path.relpath(FIXTURES_FILE)}")
@@ -0,0 +1,230 @@
+"""
+🧪 BENCHMARK HORS-LIGNE DU PIPELINE DE PRÉDICTION
+═══════════════════════════════════════════════════════════════════════════════
+Rejoue un jeu de matchs enregistrés à travers UltraPredictor.analyze_match,
+sans Groq ni API réelles:
+- Faux serveur Groq local (latence, 429, JSON malformé configurables)
+- Collecteurs remplacés par les données enregistrées
+- Données du bot isolées dans un dossier temporaire
+
+Rapport: latences p50/p90/p99, taux de cache, tokens par prédiction,
+Brier / log-loss / précision du vainqueur par type de prédiction,
+latence Groq par modèle et effet de la couverture (--hedging).
+
+Usage:
+    python benchmarks/run_benchmark.py
+    python benchmarks/run_benchmark.py --latency 1500 --rate-429 0.1 --malformed 0.05
+    python benchmarks/run_benchmark.py --no-ai --out rapport.json
+    python benchmarks/run_benchmark.py --stragglers 0.1 --hedging
+═══════════════════════════════════════════════════════════════════════════════
+"""
+import argparse
+import asyncio
+import json
+import logging
+import math
+import os
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+DEFAULT_FIXTURES = Path(__file__).resolve().parent / "fixtures" / "matches.json"
+
+
+def percentile(values: List[float], q: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, math.ceil(q / 100 * len(ordered)) - 1))
+    return round(ordered[index], 1)
+
+
+def winner_probabilities(prediction: Dict) -> Optional[Dict[str, float]]:
+    """Probabilités 1/X/2 normalisées, format IA ou algorithmique"""
+    winner = prediction.get('predictions', {}).get('winner', {})
+    probs = winner.get('probabilities') or {
+        '1': winner.get('team1_probability'),
+        'X': winner.get('draw_probability'),
+        '2': winner.get('team2_probability')
+    }
+    probs = {k: float(v) for k, v in probs.items() if isinstance(v, (int, float))}
+    total = sum(probs.values())
+    if total <= 0:
+        return None
+    return {k: probs.get(k, 0.0) / total for k in ('1', 'X', '2')}
+
+
+def score_predictions(rows: List[Dict]) -> Dict:
+    """Brier multi-classe, log-loss et précision du pronostic vainqueur"""
+    scored = [r for r in rows if r['probs']]
+    if not scored:
+        return {'n': 0}
+    brier = logloss = hits = 0.0
+    for r in scored:
+        probs, outcome = r['probs'], r['outcome']
+        brier += sum((probs[k] - (1.0 if k == outcome else 0.0)) ** 2 for k in ('1', 'X', '2'))
+        logloss -= math.log(max(probs[outcome], 1e-6))
+        hits += max(probs, key=probs.get) == outcome
+    n = len(scored)
+    return {
+        'n': n,
+        'brier': round(brier / n, 4),
+        'log_loss': round(logloss / n, 4),
+        'accuracy': round(hits / n, 3)
+    }
+
+
+def variant(match: Dict) -> Dict:
+    """Même rencontre, titre et id différents (re-scraping)"""
+    return {**match, 'id': f"{match['id']}-v", 'title': f"{match['title']} (Live)"}
+
+
+async def run(args) -> Dict:
+    with open(args.fixtures, 'r', encoding='utf-8') as f:
+        fixtures = json.load(f)[:args.limit or None]
+
+    # Données du bot isolées (les chemins data/ sont relatifs au dossier courant)
+    workdir = tempfile.mkdtemp(prefix="footbot-bench-")
+    os.chdir(workdir)
+
+    from fake_groq import FakeGroqServer
+    server = FakeGroqServer(latency_ms=args.latency, jitter_ms=args.jitter,
+                            rate_429=args.rate_429, malformed=args.malformed, seed=args.seed,
+                            straggler_rate=args.stragglers, straggler_ms=args.straggler_ms)
+    url = await server.start()
+    os.environ['GROQ_API_URL'] = url
+    os.environ['GROQ_API_KEY'] = "" if args.no_ai else "bench-key"
+    os.environ['GROQ_HEDGING'] = "1" if args.hedging else ""
+
+    import prediction_module
+    from telemetry import telemetry
+    from stub_collectors import make_stub_collector
+
+    stub = make_stub_collector(fixtures, latency_ms=args.collector_latency)
+    prediction_module.DataCollector = stub
+    prediction_module.DATA_COLLECTOR_AVAILABLE = True
+
+    semaphore = asyncio.Semaphore(args.concurrency)
+    latencies: Dict[str, List[float]] = {'cold': [], 'warm': []}
+    rows: List[Dict] = []
+
+    async with prediction_module.UltraPredictor() as predictor:
+
+        async def analyze(match: Dict, phase: str, fixture: Optional[Dict] = None):
+            async with semaphore:
+                start = time.perf_counter()
+                prediction = await predictor.analyze_match(match, user_id=1)
+                latencies[phase].append((time.perf_counter() - start) * 1000)
+            if fixture is not None:
+                rows.append({
+                    'type': prediction.get('meta', {}).get('prediction_type', 'unknown'),
+                    'probs': winner_probabilities(prediction),
+                    'outcome': fixture['result']['outcome']
+                })
+
+        total_start = time.perf_counter()
+        # Passe 1: analyses à froid
+        await asyncio.gather(*[analyze(f['match'], 'cold', f) for f in fixtures])
+        # Passe 2: mêmes rencontres sous un autre id (doit toucher le cache)
+        await asyncio.gather(*[analyze(variant(f['match']), 'warm') for f in fixtures])
+        wall_ms = (time.perf_counter() - total_start) * 1000
+        stats = dict(predictor.stats)
+    groq_telemetry = telemetry.snapshot()
+
+    await server.stop()
+    os.chdir(ROOT)
+    shutil.rmtree(workdir, ignore_errors=True)
+
+    requests_total = len(fixtures) * 2
+    ai_count = max(stats['ai_predictions'], 1)
+    by_type: Dict[str, List[Dict]] = {}
+    for row in rows:
+        by_type.setdefault(row['type'], []).append(row)
+
+    return {
+        'config': {
+            'fixtures': len(fixtures),
+            'ai': not args.no_ai,
+            'latency_ms': args.latency,
+            'rate_429': args.rate_429,
+            'malformed': args.malformed,
+            'concurrency': args.concurrency,
+            'stragglers': args.stragglers,
+            'hedging': args.hedging
+        },
+        'latency_ms': {
+            phase: {
+                'p50': percentile(values, 50),
+                'p90': percentile(values, 90),
+                'p99': percentile(values, 99),
+                'max': round(max(values), 1) if values else 0.0
+            }
+            for phase, values in latencies.items()
+        },
+        'wall_ms': round(wall_ms),
+        'cache': {
+            'hits': stats['cache_hits'],
+            'fingerprint_hits': stats['fingerprint_hits'],
+            'hit_ratio': round((stats['cache_hits'] + stats['fingerprint_hits']) / requests_total, 3)
+        },
+        'predictions': {
+            'ai': stats['ai_predictions'],
+            'fallback': stats['fallback_predictions'],
+            'fallback_rate': round(stats['fallback_predictions'] / max(len(fixtures), 1), 3)
+        },
+        'groq': {
+            **server.counters,
+            'tokens_per_ai_prediction': round(
+                (server.counters['prompt_tokens'] + server.counters['completion_tokens']) / ai_count
+            ),
+            'latency_by_model_ms': {
+                model: entry['latency_ms'] for model, entry in groq_telemetry['models'].items()
+            },
+            'hedging': groq_telemetry['hedging']
+        },
+        'collector': dict(stub.stats),
+        'calibration': {
+            'all': score_predictions(rows),
+            **{ptype: score_predictions(items) for ptype, items in by_type.items()}
+        }
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark hors-ligne du pipeline de prédiction")
+    parser.add_argument('--fixtures', default=str(DEFAULT_FIXTURES))
+    parser.add_argument('--limit', type=int, default=0, help="Nombre de matchs (0 = tous)")
+    parser.add_argument('--latency', type=float, default=800, help="Latence Groq moyenne (ms)")
+    parser.add_argument('--jitter', type=float, default=300, help="Gigue de latence Groq (ms)")
+    parser.add_argument('--rate-429', type=float, default=0.0, help="Probabilité de 429")
+    parser.add_argument('--malformed', type=float, default=0.0, help="Probabilité de JSON malformé")
+    parser.add_argument('--stragglers', type=float, default=0.0, help="Probabilité de requête traînarde")
+    parser.add_argument('--straggler-ms', type=float, default=10000, help="Retard d'une requête traînarde (ms)")
+    parser.add_argument('--hedging', action='store_true', help="Active la couverture des appels Groq")
+    parser.add_argument('--collector-latency', type=float, default=150, help="Latence collecte (ms)")
+    parser.add_argument('--concurrency', type=int, default=4)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--no-ai', action='store_true', help="Sans Groq (fallback algorithmique)")
+    parser.add_argument('--out', help="Fichier JSON du rapport")
+    args = parser.parse_args()
+    args.fixtures = str(Path(args.fixtures).resolve())
+    out = Path(args.out).resolve() if args.out else None
+
+    logging.basicConfig(level=logging.WARNING)
+    report = asyncio.run(run(args))
+
+    text = json.dumps(report, indent=2, ensure_ascii=False)
+    print(text)
+    if out:
+        out.write_text(text, encoding='utf-8')
+
+
+if __name__ == "__main__":
+    main()
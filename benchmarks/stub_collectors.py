@@ -0,0 +1,64 @@
+"""
+🧪 COLLECTEURS ENREGISTRÉS - BENCHMARK HORS-LIGNE
+═══════════════════════════════════════════════════════════════════════════════
+Remplace UltraDataCollector par un collecteur qui rejoue des données
+enregistrées (benchmarks/fixtures/*.json) avec une latence simulée.
+Les données sont structurées et formatées par le vrai modèle CollectedData.
+═══════════════════════════════════════════════════════════════════════════════
+"""
+import asyncio
+from typing import Dict, List, Optional, Type
+
+from collected_data import CollectedData
+from deadline import Deadline, ensure
+from fixture_identity import fixture_key
+
+EMPTY_SOURCE = {'success': False, 'data': {}}
+
+
+def make_stub_collector(fixtures: List[Dict], latency_ms: float = 0.0) -> Type:
+    """Classe compatible avec `async with DataCollector() as collector`"""
+    recorded = {fixture_key(f['match']): f.get('sources', {}) for f in fixtures}
+    counters = {'calls': 0, 'hits': 0}
+
+    class StubDataCollector:
+        stats = counters
+
+        def __init__(self):
+            self.last_sources: Dict[str, Dict] = {}
+
+        async def __aenter__(self):
+            return self
+
+        async def __aexit__(self, *args):
+            return None
+
+        async def collect_all_data(self, match: Dict, deadline: Optional[Deadline] = None,
+                                   value: float = 1.0) -> str:
+            return (await self.collect(match, deadline, value)).format()
+
+        async def collect(self, match: Dict, deadline: Optional[Deadline] = None,
+                          value: float = 1.0) -> CollectedData:
+            counters['calls'] += 1
+            if latency_ms:
+                await asyncio.sleep(ensure(deadline).timeout(latency_ms / 1000))
+
+            sources = recorded.get(fixture_key(match)) or {}
+            if sources:
+                counters['hits'] += 1
+            self.last_sources = {
+                name: sources.get(name, EMPTY_SOURCE)
+                for name in ('sofascore', 'api_football', 'odds')
+            } if sources else {}
+            return CollectedData.from_sources(
+                match, match.get('team1', ''), match.get('team2', ''),
+                match.get('sport', 'football').lower(),
+                sources.get('sofascore', EMPTY_SOURCE),
+                sources.get('api_football', EMPTY_SOURCE),
+                sources.get('odds', EMPTY_SOURCE)
+            )
+
+    return StubDataCollector
+
+
+__all__ = ['make_stub_collector']
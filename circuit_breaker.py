@@ -0,0 +1,150 @@
+"""
+🔌 DISJONCTEURS PAR SOURCE V1.0 - ÉCHECS RAPIDES ET TIMEOUTS ADAPTATIFS
+═══════════════════════════════════════════════════════════════════════════════
+Une source en panne (403 Sofascore, API-Football qui ne répond plus) ne fait
+plus attendre chaque prédiction jusqu'au timeout:
+- Disjoncteur par source: fermé -> ouvert après N échecs consécutifs,
+  puis semi-ouvert (une seule requête sonde) après un délai croissant
+- Source ouverte sautée instantanément par le collecteur
+- Timeout adaptatif: p95 des latences observées x marge, borné par le plafond
+- État exposé sur /health
+═══════════════════════════════════════════════════════════════════════════════
+"""
+import logging
+import threading
+import time
+from collections import deque
+from typing import Dict, Optional
+
+logger = logging.getLogger("footbot.circuit_breaker")
+
+# ════════════════════════════════════════════════════════════════════════════
+# ⚙️ CONFIGURATION
+# ════════════════════════════════════════════════════════════════════════════
+
+FAILURE_THRESHOLD = 3          # Échecs consécutifs avant ouverture
+BASE_COOLDOWN = 30.0           # Premier délai avant sonde (s), doublé à chaque échec de sonde
+MAX_COOLDOWN = 600.0
+PROBE_TIMEOUT = 30.0           # Sonde sans réponse (annulée): une autre peut partir
+
+LATENCY_WINDOW = 50            # Dernières latences réussies conservées
+MIN_SAMPLES = 8                # En dessous: timeout plafond de l'appelant
+TIMEOUT_MARGIN = 2.0           # Timeout = p95 x marge
+MIN_TIMEOUT = 2.0
+
+CLOSED, OPEN, HALF_OPEN = 'closed', 'open', 'half_open'
+
+# Statuts HTTP qui signalent une source en difficulté (un 404 est une réponse valide)
+FAILURE_STATUSES = {401, 403, 429, 500, 502, 503, 504}
+
+
+class CircuitBreaker:
+    """Disjoncteur + latences d'une source"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.state = CLOSED
+        self.failures = 0
+        self.cooldown = BASE_COOLDOWN
+        self.opened_at = 0.0
+        self.probe_started = 0.0
+        self.last_error = ''
+        self._latencies: deque = deque(maxlen=LATENCY_WINDOW)
+        self._lock = threading.Lock()
+        self.stats = {'ok': 0, 'failed': 0, 'rejected': 0, 'opened': 0}
+
+    @property
+    def available(self) -> bool:
+        """Faux tant que le circuit est ouvert et le délai non écoulé"""
+        return self.state != OPEN or time.time() - self.opened_at >= self.cooldown
+
+    def allow(self) -> bool:
+        """Une requête peut-elle partir ? (réserve la sonde en semi-ouvert)"""
+        with self._lock:
+            if self.state == CLOSED:
+                return True
+            now = time.time()
+            if self.state == OPEN and now - self.opened_at >= self.cooldown:
+                self.state = HALF_OPEN
+                self.probe_started = 0.0
+            if self.state == HALF_OPEN and now - self.probe_started >= PROBE_TIMEOUT:
+                self.probe_started = now
+                return True
+            self.stats['rejected'] += 1
+            return False
+
+    def record_success(self, latency: float):
+        with self._lock:
+            self._latencies.append(latency)
+            self.stats['ok'] += 1
+            if self.state != CLOSED:
+                logger.info(f"🔌 {self.name}: source rétablie, circuit refermé")
+            self.state = CLOSED
+            self.failures = 0
+            self.cooldown = BASE_COOLDOWN
+
+    def record_failure(self, reason: str):
+        with self._lock:
+            self.stats['failed'] += 1
+            self.failures += 1
+            self.last_error = reason
+            if self.state == HALF_OPEN:
+                # Sonde échouée: réouverture, délai doublé
+                self.cooldown = min(MAX_COOLDOWN, self.cooldown * 2)
+                self._open()
+            elif self.state == CLOSED and self.failures >= FAILURE_THRESHOLD:
+                self._open()
+
+    def _open(self):
+        self.state = OPEN
+        self.opened_at = time.time()
+        self.stats['opened'] += 1
+        logger.warning(f"🔌 {self.name}: circuit ouvert ({self.last_error}), nouvel essai dans {self.cooldown:.0f}s")
+
+    def p95(self) -> Optional[float]:
+        with self._lock:
+            if len(self._latencies) < MIN_SAMPLES:
+                return None
+            ordered = sorted(self._latencies)
+        return ordered[min(len(ordered) - 1, int(0.95 * len(ordered)))]
+
+    def timeout(self, cap: float) -> float:
+        """Timeout adapté aux latences observées, jamais au-delà du plafond"""
+        p95 = self.p95()
+        if p95 is None:
+            return cap
+        return max(MIN_TIMEOUT, min(cap, p95 * TIMEOUT_MARGIN))
+
+    def snapshot(self) -> Dict:
+        p95 = self.p95()
+        return {
+            'state': self.state,
+            'failures': self.failures,
+            'retry_in': round(max(0.0, self.cooldown - (time.time() - self.opened_at)), 1) if self.state == OPEN else 0,
+            'p95_ms': round(p95 * 1000) if p95 is not None else None,
+            'last_error': self.last_error,
+            **self.stats
+        }
+
+
+class CircuitBreakers:
+    """Registre des disjoncteurs par nom de source"""
+
+    def __init__(self):
+        self._breakers: Dict[str, CircuitBreaker] = {}
+
+    def get(self, name: str) -> CircuitBreaker:
+        breaker = self._breakers.get(name)
+        if breaker is None:
+            breaker = self._breakers[name] = CircuitBreaker(name)
+        return breaker
+
+    def report(self) -> Dict[str, Dict]:
+        return {name: breaker.snapshot() for name, breaker in self._breakers.items()}
+
+
+# Instance globale
+circuit_breakers = CircuitBreakers()
+
+
+__all__ = ['CircuitBreaker', 'CircuitBreakers', 'circuit_breakers', 'FAILURE_STATUSES']
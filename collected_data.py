@@ -0,0 +1,770 @@
+"""
+🧱 DONNÉES COLLECTÉES V1.0 - MODÈLE TYPÉ ET FORMATAGE À LA DEMANDE
+═══════════════════════════════════════════════════════════════════════════════
+Les collecteurs ne renvoient plus un unique texte de plusieurs Ko:
+- Dataclasses compactes (slots): rencontre, cotes, forme, H2H, compositions,
+  blessures, statistiques de saison
+- Formatage paresseux et par section (le prompt ne demande que ce qu'il utilise)
+- Score de qualité par champ (pondéré, partiel selon le volume de données)
+- Sérialisation compacte pour le cache des collecteurs
+═══════════════════════════════════════════════════════════════════════════════
+"""
+import logging
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from fixture_identity import data_fingerprint
+
+logger = logging.getLogger("footbot.collected_data")
+
+# ════════════════════════════════════════════════════════════════════════════
+# ⚙️ CONFIGURATION
+# ════════════════════════════════════════════════════════════════════════════
+
+# Poids de chaque champ dans le score de qualité (total 100)
+FIELD_WEIGHTS = {
+    'fixture': 10,
+    'prediction': 10,
+    'lineups': 10,
+    'injuries': 5,
+    'team1_stats': 10,
+    'team2_stats': 10,
+    'h2h': 10,
+    'sofascore': 5,
+    'form': 5,
+    'match_stats': 5,
+    'odds': 15,
+    'markets': 5
+}
+
+# Sections de format(), dans l'ordre d'affichage
+SECTIONS = (
+    'header', 'fixture', 'prediction', 'lineups', 'injuries', 'team_stats', 'h2h',
+    'sofascore', 'odds', 'summary', 'mission'
+)
+API_FOOTBALL_SECTIONS = ('fixture', 'prediction', 'lineups', 'injuries', 'team_stats', 'h2h')
+
+H2H_LIMIT = 10
+INJURY_LIMIT = 10
+MATCH_STATS_LIMIT = 30
+FULL_SEASON_GAMES = 5     # Stats de saison jugées complètes à partir de N matchs
+
+# (total, domicile, extérieur)
+Split = Tuple[Any, Any, Any]
+
+
+def _get(data: Any, *path: str, default: Any = None) -> Any:
+    """Lecture imbriquée tolérante (dict manquant ou None)"""
+    for key in path:
+        if not isinstance(data, dict):
+            return default
+        data = data.get(key)
+    return default if data is None else data
+
+
+def _split(data: Any, *path: str) -> Split:
+    node = _get(data, *path, default={})
+    return (_get(node, 'total'), _get(node, 'home'), _get(node, 'away'))
+
+
+def _compact(value: Any) -> Any:
+    """Retire récursivement les valeurs absentes (None, conteneurs vides, triplets vides)"""
+    if isinstance(value, dict):
+        kept = {k: _compact(v) for k, v in value.items()}
+        return {k: v for k, v in kept.items() if v is not None and v != {} and v != []}
+    if isinstance(value, (list, tuple)):
+        items = [_compact(v) for v in value]
+        return [] if all(v is None for v in items) else items
+    return value
+
+
+def _na(value: Any) -> Any:
+    return 'N/A' if value is None else value
+
+
+def _banner(title: str) -> str:
+    rule = "═" * 80
+    return f"\n{rule}\n{title}\n{rule}\n\n"
+
+# ════════════════════════════════════════════════════════════════════════════
+# 🧱 CHAMPS
+# ════════════════════════════════════════════════════════════════════════════
+
+@dataclass(slots=True)
+class FixtureInfo:
+    fixture_id: Optional[int] = None
+    league: str = 'N/A'
+    country: str = 'N/A'
+    season: Any = 'N/A'
+    round: str = 'N/A'
+    venue: str = 'N/A'
+    city: str = 'N/A'
+    capacity: Any = 'N/A'
+    referee: str = 'N/A'
+    kickoff: str = ''
+
+    @classmethod
+    def from_api(cls, fixture: Dict) -> 'FixtureInfo':
+        league = _get(fixture, 'league', default={})
+        venue = _get(fixture, 'fixture', 'venue', default={})
+        return cls(
+            fixture_id=_get(fixture, 'fixture', 'id'),
+            league=_get(league, 'name', default='N/A'),
+            country=_get(league, 'country', default='N/A'),
+            season=_get(league, 'season', default='N/A'),
+            round=_get(league, 'round', default='N/A'),
+            venue=_get(venue, 'name', default='N/A'),
+            city=_get(venue, 'city', default='N/A'),
+            capacity=_get(venue, 'capacity', default='N/A'),
+            referee=_get(fixture, 'fixture', 'referee', default='N/A'),
+            kickoff=_get(fixture, 'fixture', 'date', default='')
+        )
+
+
+@dataclass(slots=True)
+class ApiPrediction:
+    winner: str = 'N/A'
+    advice: str = 'N/A'
+    goals: Tuple[Any, Any] = ('?', '?')
+    percent: Tuple[Any, Any, Any] = ('N/A', 'N/A', 'N/A')
+    # critère -> (domicile, extérieur)
+    comparison: Dict[str, Tuple[Any, Any]] = field(default_factory=dict)
+
+    @classmethod
+    def from_api(cls, predictions: Dict) -> 'ApiPrediction':
+        pred = _get(predictions, 'predictions', default={})
+        comparison = _get(predictions, 'comparison', default={})
+        return cls(
+            winner=_get(pred, 'winner', 'name', default='N/A'),
+            advice=_get(pred, 'advice', default='N/A'),
+            goals=(_get(pred, 'goals', 'home', default='?'), _get(pred, 'goals', 'away', default='?')),
+            percent=tuple(_get(pred, 'percent', side, default='N/A') for side in ('home', 'draw', 'away')),
+            comparison={
+                key: (_get(value, 'home', default='N/A'), _get(value, 'away', default='N/A'))
+                for key, value in comparison.items() if isinstance(value, dict)
+            }
+        )
+
+
+@dataclass(slots=True)
+class Lineup:
+    team: str
+    formation: str = 'N/A'
+    coach: str = 'N/A'
+    starters: Tuple[str, ...] = ()
+
+    @classmethod
+    def from_api(cls, lineup: Dict) -> 'Lineup':
+        return cls(
+            team=_get(lineup, 'team', 'name', default='Équipe'),
+            formation=_get(lineup, 'formation', default='N/A'),
+            coach=_get(lineup, 'coach', 'name', default='N/A'),
+            starters=tuple(_get(p, 'player', 'name', default='') for p in _get(lineup, 'startXI', default=[]))
+        )
+
+
+@dataclass(slots=True)
+class Injury:
+    player: str
+    team: str = 'N/A'
+    reason: str = 'N/A'
+
+    @classmethod
+    def from_api(cls, injury: Dict) -> 'Injury':
+        return cls(
+            player=_get(injury, 'player', 'name', default='N/A'),
+            team=_get(injury, 'team', 'name', default='N/A'),
+            reason=_get(injury, 'player', 'reason', default='N/A')
+        )
+
+
+@dataclass(slots=True)
+class H2HMatch:
+    date: str
+    home: str
+    away: str
+    home_goals: int = 0
+    away_goals: int = 0
+
+    @classmethod
+    def from_api(cls, match: Dict) -> 'H2HMatch':
+        return cls(
+            date=_get(match, 'fixture', 'date', default='')[:10],
+            home=_get(match, 'teams', 'home', 'name', default='Home'),
+            away=_get(match, 'teams', 'away', 'name', default='Away'),
+            home_goals=_get(match, 'goals', 'home', default=0),
+            away_goals=_get(match, 'goals', 'away', default=0)
+        )
+
+
+@dataclass(slots=True)
+class TeamStats:
+    """Statistiques de saison API-Football (/teams/statistics) d'une équipe"""
+    form: str = ''
+    played: Split = (None, None, None)
+    wins: Split = (None, None, None)
+    draws: Split = (None, None, None)
+    losses: Split = (None, None, None)
+    goals_for: Split = (None, None, None)
+    goals_against: Split = (None, None, None)
+    avg_for: Split = (None, None, None)
+    avg_against: Split = (None, None, None)
+    clean_sheets: Split = (None, None, None)
+    failed_to_score: Split = (None, None, None)
+    yellow: Optional[int] = None
+    red: Optional[int] = None
+    penalty_scored: Any = None
+    penalty_missed: Any = None
+    penalty_total: Any = None
+
+    @classmethod
+    def from_api(cls, stats: Dict) -> 'TeamStats':
+        cards = _get(stats, 'cards', default={})
+
+        def card_total(color: str) -> Optional[int]:
+            periods = _get(cards, color, default={})
+            if not periods:
+                return None
+            return sum(_get(v, 'total', default=0) for v in periods.values() if isinstance(v, dict))
+
+        return cls(
+            form=_get(stats, 'form', default=''),
+            played=_split(stats, 'fixtures', 'played'),
+            wins=_split(stats, 'fixtures', 'wins'),
+            draws=_split(stats, 'fixtures', 'draws'),
+            losses=_split(stats, 'fixtures', 'loses'),
+            goals_for=_split(stats, 'goals', 'for', 'total'),
+            goals_against=_split(stats, 'goals', 'against', 'total'),
+            avg_for=_split(stats, 'goals', 'for', 'average'),
+            avg_against=_split(stats, 'goals', 'against', 'average'),
+            clean_sheets=_split(stats, 'clean_sheet'),
+            failed_to_score=_split(stats, 'failed_to_score'),
+            yellow=card_total('yellow'),
+            red=card_total('red'),
+            penalty_scored=_get(stats, 'penalty', 'scored', 'total'),
+            penalty_missed=_get(stats, 'penalty', 'missed', 'total'),
+            penalty_total=_get(stats, 'penalty', 'total')
+        )
+
+    @property
+    def games(self) -> int:
+        try:
+            return int(self.played[0] or 0)
+        except (TypeError, ValueError):
+            return 0
+
+    def to_api(self) -> Dict:
+        """Forme API-Football attendue par le modèle statistique"""
+        def side(values: Split) -> Dict:
+            return {'total': values[0], 'home': values[1], 'away': values[2]}
+
+        stats = {
+            'fixtures': {'played': side(self.played)},
+            'goals': {
+                'for': {'average': side(self.avg_for)},
+                'against': {'average': side(self.avg_against)}
+            }
+        }
+        if self.yellow:
+            stats['cards'] = {'yellow': {'all': {'total': self.yellow}}}
+        return stats
+
+
+@dataclass(slots=True)
+class TeamForm:
+    """Forme d'avant-match Sofascore (pregame-form)"""
+    form: Tuple[str, ...] = ()
+    position: Any = None
+    value: Any = None
+    avg_rating: Any = None
+
+    @classmethod
+    def from_sofascore(cls, team: Dict) -> 'TeamForm':
+        return cls(
+            form=tuple(_get(team, 'form', default=[])),
+            position=_get(team, 'position'),
+            value=_get(team, 'value'),
+            avg_rating=_get(team, 'avgRating')
+        )
+
+
+@dataclass(slots=True)
+class SofascoreData:
+    home: str
+    away: str
+    tournament: str = 'N/A'
+    # (statistique, domicile, extérieur) sur le match entier
+    match_stats: Tuple[Tuple[str, Any, Any], ...] = ()
+    home_form: Optional[TeamForm] = None
+    away_form: Optional[TeamForm] = None
+    form_label: str = ''
+    # (victoires domicile, nuls, victoires extérieur)
+    duel: Optional[Tuple[int, int, int]] = None
+
+    @classmethod
+    def from_sofascore(cls, data: Dict, team1: str, team2: str) -> 'SofascoreData':
+        match = _get(data, 'match', default={})
+        details = _get(data, 'details', default={})
+
+        match_stats = []
+        for period in _get(details, 'statistics', 'statistics', default=[]):
+            if _get(period, 'period') != 'ALL':
+                continue
+            for group in _get(period, 'groups', default=[]):
+                for item in _get(group, 'statisticsItems', default=[]):
+                    match_stats.append((_get(item, 'name', default='?'), _get(item, 'home'), _get(item, 'away')))
+
+        form = _get(details, 'form', default={})
+        duel = _get(details, 'h2h', 'teamDuel')
+        return cls(
+            home=_get(match, 'homeTeam', 'name', default=team1),
+            away=_get(match, 'awayTeam', 'name', default=team2),
+            tournament=_get(match, 'tournament', 'name', default='N/A'),
+            match_stats=tuple(match_stats[:MATCH_STATS_LIMIT]),
+            home_form=TeamForm.from_sofascore(form['homeTeam']) if _get(form, 'homeTeam') else None,
+            away_form=TeamForm.from_sofascore(form['awayTeam']) if _get(form, 'awayTeam') else None,
+            form_label=_get(form, 'label', default=''),
+            duel=(
+                (_get(duel, 'homeWins', default=0), _get(duel, 'draws', default=0), _get(duel, 'awayWins', default=0))
+                if duel else None
+            )
+        )
+
+
+@dataclass(slots=True)
+class MarketOdds:
+    bookmakers: Tuple[str, ...] = ()
+    # '1' / 'X' / '2'
+    match_winner: Dict[str, float] = field(default_factory=dict)
+    best: Dict[str, float] = field(default_factory=dict)
+    implied: Dict[str, float] = field(default_factory=dict)
+    over_under: Dict[str, float] = field(default_factory=dict)
+    btts: Dict[str, float] = field(default_factory=dict)
+
+    @classmethod
+    def from_odds(cls, data: Dict) -> 'MarketOdds':
+        parsed = _get(data, 'odds', default={})
+        return cls(
+            bookmakers=tuple(_get(data, 'bookmakers', default=[])),
+            match_winner=dict(_get(parsed, 'match_winner', default={})),
+            best={k: v for k, v in _get(parsed, 'best_odds', default={}).items() if v},
+            implied=dict(_get(parsed, 'implied_probabilities', default={})),
+            over_under=dict(_get(parsed, 'over_under', default={})),
+            btts=dict(_get(parsed, 'btts', default={}))
+        )
+
+# ════════════════════════════════════════════════════════════════════════════
+# 📦 DONNÉES D'UN MATCH
+# ════════════════════════════════════════════════════════════════════════════
+
+@dataclass(slots=True)
+class CollectedData:
+    team1: str
+    team2: str
+    sport: str
+    start_time: str = 'N/A'
+    collected_at: str = field(default_factory=lambda: datetime.now().isoformat(timespec='seconds'))
+    sources: Tuple[str, ...] = ()
+    # source -> message d'erreur affiché (clé absente, match introuvable...)
+    errors: Dict[str, str] = field(default_factory=dict)
+    fixture: Optional[FixtureInfo] = None
+    prediction: Optional[ApiPrediction] = None
+    lineups: Tuple[Lineup, ...] = ()
+    injuries: Tuple[Injury, ...] = ()
+    team1_stats: Optional[TeamStats] = None
+    team2_stats: Optional[TeamStats] = None
+    h2h: Tuple[H2HMatch, ...] = ()
+    sofascore: Optional[SofascoreData] = None
+    odds: Optional[MarketOdds] = None
+
+    # === CONSTRUCTION ===
+    @classmethod
+    def from_sources(cls, match: Dict, team1: str, team2: str, sport: str,
+                     sofascore: Dict, api_football: Dict, odds: Dict) -> 'CollectedData':
+        """Extrait les champs utiles des réponses brutes des collecteurs"""
+        data = cls(team1=team1, team2=team2, sport=sport, start_time=match.get('start_time') or 'N/A')
+        sources = []
+
+        if api_football.get('success'):
+            sources.append('API-Football')
+            raw = api_football.get('data', {})
+            if raw.get('fixture'):
+                data.fixture = FixtureInfo.from_api(raw['fixture'])
+            if raw.get('predictions'):
+                data.prediction = ApiPrediction.from_api(raw['predictions'])
+            data.lineups = tuple(Lineup.from_api(l) for l in raw.get('lineups') or [])
+            data.injuries = tuple(Injury.from_api(i) for i in (raw.get('injuries') or [])[:INJURY_LIMIT])
+            if raw.get('team1_stats'):
+                data.team1_stats = TeamStats.from_api(raw['team1_stats'])
+            if raw.get('team2_stats'):
+                data.team2_stats = TeamStats.from_api(raw['team2_stats'])
+            data.h2h = tuple(H2HMatch.from_api(m) for m in (raw.get('h2h') or [])[:H2H_LIMIT])
+        elif api_football.get('error'):
+            data.errors['api_football'] = api_football['error']
+
+        if sofascore.get('success'):
+            sources.append('Sofascore')
+            data.sofascore = SofascoreData.from_sofascore(sofascore.get('data', {}), team1, team2)
+
+        if odds.get('success'):
+            sources.append('Bookmakers')
+            data.odds = MarketOdds.from_odds(odds.get('data', {}))
+        elif odds.get('error'):
+            data.errors['odds'] = odds['error']
+
+        data.sources = tuple(sources)
+        return data
+
+    # === QUALITÉ ===
+    def field_quality(self) -> Dict[str, float]:
+        """Points obtenus par champ (0 à FIELD_WEIGHTS[champ])"""
+        sofa = self.sofascore
+        odds = self.odds
+        filled = {
+            'fixture': 1.0 if self.fixture else 0.0,
+            'prediction': 1.0 if self.prediction else 0.0,
+            'lineups': min(1.0, len(self.lineups) / 2),
+            'injuries': 1.0 if self.injuries else 0.0,
+            'team1_stats': min(1.0, self.team1_stats.games / FULL_SEASON_GAMES) if self.team1_stats else 0.0,
+            'team2_stats': min(1.0, self.team2_stats.games / FULL_SEASON_GAMES) if self.team2_stats else 0.0,
+            'h2h': min(1.0, len(self.h2h) / 5),
+            'sofascore': 1.0 if sofa else 0.0,
+            'form': ((sofa.home_form is not None) + (sofa.away_form is not None)) / 2 if sofa else 0.0,
+            'match_stats': 1.0 if sofa and sofa.match_stats else 0.0,
+            'odds': 1.0 if odds and odds.match_winner else 0.0,
+            'markets': ((bool(odds.over_under) + bool(odds.btts)) / 2) if odds else 0.0
+        }
+        return {name: round(FIELD_WEIGHTS[name] * share, 1) for name, share in filled.items()}
+
+    @property
+    def quality(self) -> int:
+        """Score de qualité 0-100 (somme pondérée des champs renseignés)"""
+        return int(round(sum(self.field_quality().values())))
+
+    def fingerprint(self) -> str:
+        """Empreinte des champs collectés (vide si aucune source n'a répondu)"""
+        if not self.sources:
+            return ""
+        return data_fingerprint({'collected': {'data': self.to_dict()}})
+
+    # === SÉRIALISATION ===
+    def to_dict(self) -> Dict:
+        """Forme JSON compacte (champs absents omis, rétablis par from_dict)"""
+        return _compact(asdict(self))
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'CollectedData':
+        def tuples(values: Dict) -> Dict:
+            return {k: tuple(v) if isinstance(v, list) else v for k, v in values.items()}
+
+        def one(kind, values):
+            return kind(**tuples(values)) if values else None
+
+        sofa = data.get('sofascore')
+        if sofa:
+            sofa = {
+                **sofa,
+                'match_stats': tuple(tuple(s) for s in sofa.get('match_stats', [])),
+                'home_form': one(TeamForm, sofa.get('home_form')),
+                'away_form': one(TeamForm, sofa.get('away_form'))
+            }
+        prediction = data.get('prediction')
+        if prediction:
+            prediction = {**prediction, 'comparison': {k: tuple(v) for k, v in prediction.get('comparison', {}).items()}}
+
+        return cls(**{
+            **tuples(data),
+            'fixture': one(FixtureInfo, data.get('fixture')),
+            'prediction': one(ApiPrediction, prediction),
+            'lineups': tuple(Lineup(**tuples(l)) for l in data.get('lineups', [])),
+            'injuries': tuple(Injury(**i) for i in data.get('injuries', [])),
+            'team1_stats': one(TeamStats, data.get('team1_stats')),
+            'team2_stats': one(TeamStats, data.get('team2_stats')),
+            'h2h': tuple(H2HMatch(**m) for m in data.get('h2h', [])),
+            'sofascore': one(SofascoreData, sofa),
+            'odds': one(MarketOdds, data.get('odds'))
+        })
+
+    # === FORMATAGE (À LA DEMANDE) ===
+    def format(self, sections: Optional[Iterable[str]] = None) -> str:
+        """Texte pour l'IA, limité aux sections demandées (toutes par défaut)"""
+        wanted = [name for name in SECTIONS if sections is None or name in sections]
+        parts: List[str] = []
+        api_block = False
+        for name in wanted:
+            if name in API_FOOTBALL_SECTIONS:
+                # Bandeau (ou erreur) API-Football une seule fois, avant sa première section
+                if not api_block:
+                    api_block = True
+                    if 'API-Football' in self.sources:
+                        parts.append(_banner("📊 API-FOOTBALL - Données officielles (source principale)"))
+                    elif 'api_football' in self.errors:
+                        parts.append(f"\n⚠️ API-FOOTBALL: {self.errors['api_football']}\n\n")
+                if 'API-Football' not in self.sources:
+                    continue
+            parts.append(getattr(self, f"_format_{name}")())
+        return ''.join(parts)
+
+    def _format_header(self) -> str:
+        return f"""
+╔══════════════════════════════════════════════════════════════════════════════╗
+║  📊 DONNÉES COLLECTÉES POUR ANALYSE IA - {datetime.fromisoformat(self.collected_at).strftime('%d/%m/%Y %H:%M')}
+╚══════════════════════════════════════════════════════════════════════════════╝
+
+🏟️ MATCH: {self.team1} vs {self.team2}
+🏆 SPORT: {self.sport.upper()}
+⏰ HEURE: {self.start_time}
+
+"""
+
+    def _format_fixture(self) -> str:
+        f = self.fixture
+        if not f:
+            return ""
+        return f"""📋 INFORMATIONS MATCH
+• Compétition: {f.league} ({f.country})
+• Saison: {f.season}
+• Tour: {f.round}
+• Stade: {f.venue} (capacité: {f.capacity})
+• Ville: {f.city}
+• Arbitre: {f.referee}
+
+"""
+
+    def _format_prediction(self) -> str:
+        p = self.prediction
+        if not p:
+            return ""
+        output = f"""🔮 PRÉDICTIONS API-FOOTBALL (Officielles)
+• Vainqueur prédit: {p.winner}
+• Conseil: {p.advice}
+• Score prédit: {p.goals[0]}-{p.goals[1]}
+• Pourcentages: Dom {p.percent[0]} | Nul {p.percent[1]} | Ext {p.percent[2]}
+
+"""
+        if p.comparison:
+            labels = (('form', 'Forme'), ('att', 'Attaque'), ('def', 'Défense'),
+                      ('h2h', 'H2H'), ('goals', 'Buts'), ('total', 'Total'))
+            output += "📊 COMPARAISON DES ÉQUIPES\n"
+            for key, label in labels:
+                home, away = p.comparison.get(key, ('N/A', 'N/A'))
+                output += f"• {label}: {home}% vs {away}%\n"
+            output += "\n"
+        return output
+
+    def _format_lineups(self) -> str:
+        if not self.lineups:
+            return ""
+        output = "👥 COMPOSITIONS OFFICIELLES\n"
+        for lineup in self.lineups:
+            output += f"\n🔷 {lineup.team} ({lineup.formation})\n"
+            output += f"   Coach: {lineup.coach}\n"
+            output += "   Titulaires: " + ', '.join(lineup.starters[:11]) + "\n"
+        return output + "\n"
+
+    def _format_injuries(self) -> str:
+        if not self.injuries:
+            return ""
+        output = "🚑 BLESSURES / ABSENCES\n"
+        for injury in self.injuries:
+            output += f"   • {injury.player} ({injury.team}): {injury.reason}\n"
+        return output + "\n"
+
+    def _format_team_stats(self) -> str:
+        output = ""
+        for stats, name in ((self.team1_stats, self.team1), (self.team2_stats, self.team2)):
+            if stats:
+                output += self._format_season(stats, name)
+        return output
+
+    @staticmethod
+    def _format_season(s: TeamStats, team_name: str) -> str:
+        def split(values: Split) -> str:
+            return f"{_na(values[0])} (Dom: {_na(values[1])}, Ext: {_na(values[2])})"
+
+        output = f"""
+📈 STATISTIQUES SAISON - {team_name.upper()}
+────────────────────────────────────────
+
+"""
+        if s.form:
+            output += f"• Forme récente: {s.form}\n"
+        if any(s.played):
+            output += f"""• Matchs joués: {split(s.played)}
+• Victoires: {split(s.wins)}
+• Nuls: {split(s.draws)}
+• Défaites: {split(s.losses)}
+
+"""
+        if any(s.goals_for + s.goals_against + s.avg_for + s.avg_against):
+            output += f"""• Buts marqués: {split(s.goals_for)}
+• Moyenne buts marqués: {_na(s.avg_for[0])}/match
+• Buts encaissés: {split(s.goals_against)}
+• Moyenne buts encaissés: {_na(s.avg_against[0])}/match
+
+"""
+        if any(s.clean_sheets) or any(s.failed_to_score):
+            output += f"""• Clean sheets: {split(s.clean_sheets)}
+• Matchs sans marquer: {split(s.failed_to_score)}
+
+"""
+        if s.yellow is not None or s.red is not None:
+            output += f"""• Cartons jaunes total: {s.yellow or 0}
+• Cartons rouges total: {s.red or 0}
+
+"""
+        if s.penalty_total is not None:
+            output += f"""• Pénaltys marqués: {_na(s.penalty_scored)}/{s.penalty_total}
+• Pénaltys manqués: {_na(s.penalty_missed)}
+
+"""
+        return output
+
+    def _format_h2h(self) -> str:
+        if not self.h2h:
+            return ""
+        output = "🔄 HISTORIQUE CONFRONTATIONS DIRECTES (H2H)\n\n"
+        home_wins = draws = away_wins = goals = 0
+        for m in self.h2h:
+            goals += m.home_goals + m.away_goals
+            if m.home_goals > m.away_goals:
+                home_wins += 1
+            elif m.away_goals > m.home_goals:
+                away_wins += 1
+            else:
+                draws += 1
+            output += f"   • {m.date}: {m.home} {m.home_goals}-{m.away_goals} {m.away}\n"
+        total = len(self.h2h)
+        return output + f"""
+   📈 Résumé ({total} derniers matchs):
+   • Victoires domicile: {home_wins}
+   • Nuls: {draws}
+   • Victoires extérieur: {away_wins}
+   • Buts moyens: {round(goals / total, 2)}/match
+
+"""
+
+    def _format_sofascore(self) -> str:
+        s = self.sofascore
+        if not s:
+            return ""
+        output = _banner("📊 SOFASCORE - Statistiques complémentaires")
+        output += f"📋 MATCH: {s.home} vs {s.away}\n• Compétition: {s.tournament}\n\n"
+        if s.match_stats:
+            output += "📈 STATISTIQUES DÉTAILLÉES\n"
+            output += ''.join(f"• {name}: {_na(home)} - {_na(away)}\n" for name, home, away in s.match_stats)
+            output += "\n"
+        if s.home_form or s.away_form:
+            output += "📊 FORME RÉCENTE\n"
+            for team, form in ((s.home, s.home_form), (s.away, s.away_form)):
+                if form:
+                    label = f", {s.form_label} {form.value}" if form.value is not None else ""
+                    output += (f"• {team}: {' '.join(form.form) or 'N/A'} (position {_na(form.position)}"
+                               f"{label}, note moyenne {_na(form.avg_rating)})\n")
+            output += "\n"
+        if s.duel:
+            output += (f"🔄 H2H SOFASCORE\n• Victoires {s.home}: {s.duel[0]} | Nuls: {s.duel[1]} | "
+                       f"Victoires {s.away}: {s.duel[2]}\n\n")
+        return output
+
+    def _format_odds(self) -> str:
+        o = self.odds
+        if not o:
+            return f"\n⚠️ ODDS API: {self.errors['odds']}\n\n" if 'odds' in self.errors else ""
+        output = _banner("💰 COTES DES BOOKMAKERS (The Odds API)")
+        output += f"📊 Sources: {', '.join(o.bookmakers[:5])}\n\n"
+        mw = o.match_winner
+        if mw:
+            output += f"""🏆 RÉSULTAT DU MATCH (1X2)
+• Victoire {self.team1} (1): {mw.get('1', 'N/A')}
+• Match Nul (X): {mw.get('X', 'N/A')}
+• Victoire {self.team2} (2): {mw.get('2', 'N/A')}
+
+"""
+        if o.best:
+            output += f"""⭐ MEILLEURES COTES DU MARCHÉ
+• Meilleure cote 1: {o.best.get('1', 'N/A')}
+• Meilleure cote X: {o.best.get('X', 'N/A')}
+• Meilleure cote 2: {o.best.get('2', 'N/A')}
+
+"""
+        if o.implied:
+            output += f"""💡 PROBABILITÉS IMPLICITES (calculées des cotes)
+• Probabilité {self.team1}: {o.implied.get('1', 'N/A')}%
+• Probabilité Nul: {o.implied.get('X', 'N/A')}%
+• Probabilité {self.team2}: {o.implied.get('2', 'N/A')}%
+• Marge bookmaker: {o.implied.get('margin', 'N/A')}%
+
+⚠️ Ces probabilités reflètent l'opinion du marché, pas la réalité.
+Si TU estimes une probabilité supérieure → c'est un VALUE BET potentiel.
+
+"""
+        if o.over_under:
+            output += "⚽ TOTAL BUTS (Over/Under)\n"
+            for key in sorted(o.over_under):
+                output += f"• {key.replace('_', ' ').title()}: {o.over_under[key]}\n"
+            output += "\n"
+        if o.btts:
+            output += f"""🎯 BTTS (Les deux équipes marquent)
+• Oui: {o.btts.get('yes', 'N/A')}
+• Non: {o.btts.get('no', 'N/A')}
+
+"""
+        return output
+
+    def _format_summary(self) -> str:
+        output = _banner("📋 RÉSUMÉ DE LA COLLECTE DE DONNÉES") + f"""✅ Sources utilisées: {', '.join(self.sources) if self.sources else 'Aucune source externe'}
+📊 Score de qualité: {self.quality}%
+⏰ Collecté le: {datetime.fromisoformat(self.collected_at).strftime('%d/%m/%Y à %H:%M:%S')}
+
+"""
+        if not self.sources:
+            output += """
+⚠️ ATTENTION: Aucune donnée externe n'a pu être collectée.
+L'analyse sera basée uniquement sur les connaissances générales de l'IA.
+Raisons possibles:
+- APIs non configurées (ajoutez API_FOOTBALL_KEY et/ou ODDS_API_KEY)
+- Match non trouvé dans les bases de données
+- Quota API épuisé
+
+"""
+        return output
+
+    @staticmethod
+    def _format_mission() -> str:
+        return _banner("🎯 MISSION POUR L'IA - GÉNÈRE TES PROPRES PRÉDICTIONS") + """Tu as reçu toutes les données disponibles. Maintenant:
+
+1. ANALYSE les statistiques des équipes
+2. ÉTUDIE l'historique H2H
+3. COMPARE avec les probabilités implicites des bookmakers
+4. IDENTIFIE les VALUE BETS (où tu vois une meilleure probabilité)
+5. GÉNÈRE tes prédictions pour TOUS les marchés pertinents:
+   - Résultat (1X2)
+   - Score exact
+   - Total buts (Over/Under)
+   - BTTS
+   - Corners
+   - Cartons
+   - Fautes
+   - Mi-temps
+   - Tout autre marché pertinent
+
+IMPORTANT:
+- Base-toi UNIQUEMENT sur les données fournies
+- Justifie CHAQUE prédiction
+- Donne ton niveau de confiance (%)
+- Indique si des données manquent
+
+Réponds en JSON valide uniquement.
+════════════════════════════════════════════════════════════════════════════════
+"""
+
+    def __str__(self) -> str:
+        return self.format()
+
+
+__all__ = [
+    'CollectedData', 'FixtureInfo', 'ApiPrediction', 'Lineup', 'Injury', 'H2HMatch',
+    'TeamStats', 'TeamForm', 'SofascoreData', 'MarketOdds', 'FIELD_WEIGHTS', 'SECTIONS'
+]
@@ -0,0 +1,243 @@
+"""
+🗄️ CACHE DES COLLECTEURS V1.0 - MÉMOIRE + SQLITE, TTL PAR TYPE
+═══════════════════════════════════════════════════════════════════════════════
+Cache partagé par tout le processus (et persistant entre redémarrages) pour
+les réponses des sources externes:
+- Niveau 1: LRU en mémoire (N entrées)
+- Niveau 2: SQLite sur disque, éviction par taille (moins récemment lus)
+- TTL par type de donnée (fiche match, cotes, compositions, stats, H2H...)
+- Requêtes identiques simultanées fusionnées (un seul appel amont)
+- Réponses vides/échouées jamais mises en cache
+Une analyse répétée d'une rencontre ne coûte plus aucune requête amont.
+═══════════════════════════════════════════════════════════════════════════════
+"""
+import asyncio
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from telemetry import telemetry
+
+logger = logging.getLogger("footbot.collector_cache")
+
+# ════════════════════════════════════════════════════════════════════════════
+# ⚙️ CONFIGURATION
+# ════════════════════════════════════════════════════════════════════════════
+
+CACHE_DB = Path("data/footbot/predictions/collector_cache.sqlite3")
+MEMORY_MAX_ENTRIES = 512
+DISK_MAX_BYTES = int(os.environ.get("COLLECTOR_CACHE_MB", "64")) * 1024 * 1024
+EVICTION_CHECK_EVERY = 50        # Vérification de la taille toutes les N écritures
+
+# Durée de vie par type de donnée (secondes)
+KIND_TTLS = {
+    'collection': 1800,          # Collecte complète formatée pour l'IA
+    'fixture': 6 * 3600,         # Fiche du match (ids, ligue, horaire)
+    'fixtures_day': 3 * 3600,    # Liste API-Football des matchs d'une date
+    'schedule': 1800,            # Matchs programmés du jour (Sofascore)
+    'details': 1800,             # Statistiques / forme d'avant-match
+    'odds': 1800,                # Cotes
+    'odds_board': 12 * 3600,     # Tableau de cotes d'une ligue (The Odds API)
+    'lineups': 1800,             # Compositions (changent près du coup d'envoi)
+    'injuries': 3 * 3600,        # Blessures / absents
+    'predictions': 6 * 3600,     # Prédictions API-Football
+    'team_stats': 12 * 3600,     # Derniers matchs d'une équipe (Sofascore)
+    'h2h': 7 * 86400             # Confrontations directes
+}
+DEFAULT_TTL = 1800
+
+
+class CollectorCache:
+    """Cache à deux niveaux, clé = (type, clé)"""
+
+    def __init__(self, path: Path = CACHE_DB, memory_entries: int = MEMORY_MAX_ENTRIES,
+                 max_bytes: int = DISK_MAX_BYTES):
+        self.path = path
+        self.memory_entries = memory_entries
+        self.max_bytes = max_bytes
+        # (type, clé) -> (expiration, JSON): le JSON évite de partager des objets mutables
+        self._memory: 'OrderedDict[Tuple[str, str], Tuple[float, str]]' = OrderedDict()
+        self._lock = threading.Lock()
+        self._db: Optional[sqlite3.Connection] = None
+        self._disk_ok = True
+        self._writes = 0
+        self._inflight: Dict[Tuple[str, str], asyncio.Future] = {}
+        self.stats = {'memory_hits': 0, 'disk_hits': 0, 'misses': 0, 'writes': 0, 'evictions': 0}
+
+    # === STOCKAGE DISQUE ===
+    def _conn(self) -> Optional[sqlite3.Connection]:
+        if self._db is not None or not self._disk_ok:
+            return self._db
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            db = sqlite3.connect(str(self.path), check_same_thread=False, isolation_level=None)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("PRAGMA synchronous=NORMAL")
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS entries ("
+                " kind TEXT NOT NULL, key TEXT NOT NULL, value TEXT NOT NULL,"
+                " expires_at REAL NOT NULL, accessed_at REAL NOT NULL, size INTEGER NOT NULL,"
+                " PRIMARY KEY (kind, key))"
+            )
+            db.execute("CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed_at)")
+            db.execute("DELETE FROM entries WHERE expires_at < ?", (time.time(),))
+            self._db = db
+        except sqlite3.Error as e:
+            self._disk_ok = False
+            logger.warning(f"⚠️ Cache disque indisponible ({e}) - mémoire seule")
+        return self._db
+
+    def _disk_get(self, kind: str, key: str, now: float) -> Optional[Tuple[float, str]]:
+        db = self._conn()
+        if db is None:
+            return None
+        try:
+            row = db.execute(
+                "SELECT expires_at, value FROM entries WHERE kind = ? AND key = ?", (kind, key)
+            ).fetchone()
+            if not row:
+                return None
+            if row[0] < now:
+                db.execute("DELETE FROM entries WHERE kind = ? AND key = ?", (kind, key))
+                return None
+            db.execute("UPDATE entries SET accessed_at = ? WHERE kind = ? AND key = ?", (now, kind, key))
+            return row[0], row[1]
+        except sqlite3.Error as e:
+            logger.debug(f"Lecture cache disque: {e}")
+            return None
+
+    def _disk_set(self, kind: str, key: str, text: str, expires_at: float, now: float):
+        db = self._conn()
+        if db is None:
+            return
+        try:
+            db.execute(
+                "INSERT OR REPLACE INTO entries (kind, key, value, expires_at, accessed_at, size)"
+                " VALUES (?, ?, ?, ?, ?, ?)",
+                (kind, key, text, expires_at, now, len(text))
+            )
+            self._writes += 1
+            if self._writes % EVICTION_CHECK_EVERY == 0:
+                self._evict(db, now)
+        except sqlite3.Error as e:
+            logger.debug(f"Écriture cache disque: {e}")
+
+    def _evict(self, db: sqlite3.Connection, now: float):
+        """Expirés d'abord, puis les moins récemment lus jusqu'à 90% de la taille max"""
+        db.execute("DELETE FROM entries WHERE expires_at < ?", (now,))
+        total = db.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        target = int(self.max_bytes * 0.9)
+        removed = 0
+        for kind, key, size in db.execute(
+            "SELECT kind, key, size FROM entries ORDER BY accessed_at"
+        ).fetchall():
+            if total <= target:
+                break
+            db.execute("DELETE FROM entries WHERE kind = ? AND key = ?", (kind, key))
+            total -= size
+            removed += 1
+        self.stats['evictions'] += removed
+        logger.info(f"🗄️ Cache collecteurs: {removed} entrées évincées (taille)")
+
+    # === API ===
+    def get(self, kind: str, key: str) -> Any:
+        """Valeur en cache (copie), ou None"""
+        now = time.time()
+        ident = (kind, key)
+        with self._lock:
+            entry = self._memory.get(ident)
+            if entry and entry[0] >= now:
+                self._memory.move_to_end(ident)
+                self.stats['memory_hits'] += 1
+                telemetry.record_cache_hit(f"collector:{kind}")
+                return json.loads(entry[1])
+            if entry:
+                del self._memory[ident]
+
+            entry = self._disk_get(kind, key, now)
+            if entry is None:
+                self.stats['misses'] += 1
+                return None
+            self._remember(ident, entry)
+            self.stats['disk_hits'] += 1
+        telemetry.record_cache_hit(f"collector:{kind}")
+        return json.loads(entry[1])
+
+    def set(self, kind: str, key: str, value: Any, ttl: Optional[float] = None):
+        if not value:
+            return
+        try:
+            text = json.dumps(value, ensure_ascii=False)
+        except (TypeError, ValueError) as e:
+            logger.debug(f"Valeur non sérialisable ({kind}): {e}")
+            return
+        now = time.time()
+        expires_at = now + (ttl if ttl is not None else KIND_TTLS.get(kind, DEFAULT_TTL))
+        with self._lock:
+            self._remember((kind, key), (expires_at, text))
+            self._disk_set(kind, key, text, expires_at, now)
+            self.stats['writes'] += 1
+
+    def _remember(self, ident: Tuple[str, str], entry: Tuple[float, str]):
+        self._memory[ident] = entry
+        self._memory.move_to_end(ident)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+
+    async def fetch(self, kind: str, key: str, loader: Callable[[], Awaitable[Any]],
+                    ttl: Optional[float] = None) -> Any:
+        """
+        Valeur en cache, sinon résultat de loader() (mis en cache s'il est non vide).
+        Les appels simultanés pour la même clé partagent un seul loader().
+        """
+        cached = self.get(kind, key)
+        if cached is not None:
+            return cached
+
+        ident = (kind, key)
+        pending = self._inflight.get(ident)
+        if pending is not None:
+            try:
+                return await asyncio.shield(pending)
+            except asyncio.CancelledError:
+                if not pending.cancelled():
+                    raise
+                # Premier demandeur annulé (échéance): on charge nous-mêmes
+                value = await loader()
+                self.set(kind, key, value, ttl)
+                return value
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[ident] = future
+        try:
+            value = await loader()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            future.exception()   # Marquée comme lue: pas d'avertissement si personne n'attend
+            raise
+        finally:
+            self._inflight.pop(ident, None)
+        self.set(kind, key, value, ttl)
+        future.set_result(value)
+        return value
+
+    def get_stats(self) -> Dict:
+        return {**self.stats, 'memory_entries': len(self._memory), 'disk': self._disk_ok}
+
+
+# Instance globale
+collector_cache = CollectorCache()
+
+
+__all__ = ['CollectorCache', 'collector_cache', 'KIND_TTLS']
@@ -15,15 +15,25 @@ L'IA reçoit TOUTES les données et génère SES PROPRES prédictions librement.
 import asyncio
 import aiohttp
 import logging
-import json
 import re
 import os
 import time
 import hashlib
+from functools import partial
 from typing import Dict, List, Optional, Any, Tuple
 from datetime import datetime, timedelta
 from urllib.parse import quote
 
+from circuit_breaker import circuit_breakers
+from collected_data import CollectedData
+from collector_cache import KIND_TTLS, collector_cache
+from http_cache import http_cache
+from deadline import Deadline, ensure
+from fixtures_snapshot import fixtures_snapshot
+from odds_snapshot import OddsQuotaError, odds_snapshot
+from team_resolver import TeamPairIndex
+from team_stats_store import PREFETCH_VALUE, detect_season, in_off_peak, season_for_date, team_stats_store
+
 logger = logging.getLogger("footbot.data_collector")
 
 # ════════════════════════════════════════════════════════════════════════════
@@ -38,6 +48,12 @@ API_FOOTBALL_URL = "https://v3.football.api-sports.io"
 ODDS_API_KEY = os.environ.get("ODDS_API_KEY", "")
 ODDS_API_URL = "https://api.the-odds-api.com/v4"
 
+# Temps restant minimal (s) pour lancer une requête optionnelle
+OPTIONAL_MIN_BUDGET = 4.0
+
+# Requêtes Sofascore simultanées (détails + stats d'équipes en parallèle)
+SOFASCORE_MAX_CONCURRENCY = int(os.environ.get("SOFASCORE_MAX_CONCURRENCY", "4"))
+
 # Log de configuration au démarrage
 def log_api_status():
     """Affiche le statut des APIs configurées"""
@@ -63,7 +79,8 @@ def log_api_status():
 # Appel au chargement du module
 try:
     API_STATUS = log_api_status()
-except:
+except Exception as e:
+    logger.warning(f"Statut des APIs indisponible: {e}")
     API_STATUS = {'api_football': False, 'odds_api': False}
 
 # User agents pour le scraping
@@ -82,6 +99,11 @@ class SofascoreCollector:
     
     BASE_URL = "https://api.sofascore.com/api/v1"
     
+    # Index des matchs programmés, partagé par toutes les instances: (sport, jour) -> index
+    _event_indexes: Dict[Tuple[str, str], TeamPairIndex] = {}
+    # Requêtes simultanées vers l'hôte, par boucle asyncio
+    _host_slots: Optional[Tuple[asyncio.AbstractEventLoop, asyncio.Semaphore]] = None
+    
     def __init__(self, session: aiohttp.ClientSession):
         self.session = session
         self.headers = {
@@ -92,97 +114,110 @@ class SofascoreCollector:
             'Referer': 'https://www.sofascore.com/'
         }
     
-    async def search_match(self, team1: str, team2: str, sport: str = 'football') -> Optional[Dict]:
-        """Recherche un match par noms d'équipes"""
+    @classmethod
+    def _slots(cls) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        if cls._host_slots is None or cls._host_slots[0] is not loop:
+            cls._host_slots = (loop, asyncio.Semaphore(SOFASCORE_MAX_CONCURRENCY))
+        return cls._host_slots[1]
+    
+    async def _get_json(self, kind: str, endpoint: str, deadline: Deadline, cap: float = 10) -> Any:
+        """GET JSON via le cache des collecteurs (None si échec)"""
+        async def load():
+            async with self._slots():
+                response = await http_cache.get_json(self.session, f"{self.BASE_URL}{endpoint}",
+                                                     headers=self.headers, timeout=cap,
+                                                     breaker='sofascore', deadline=deadline)
+            if response.ok:
+                return response.data
+            if response.status and response.status != 404:
+                logger.warning(f"Sofascore API {endpoint}: {response.status}")
+            return None
+        return await collector_cache.fetch(kind, f"sofascore:{endpoint}", load)
+    
+    async def _event_index(self, sport: str, day: str, deadline: Deadline) -> Optional[TeamPairIndex]:
+        """Matchs programmés du jour indexés par équipes (un téléchargement par intervalle)"""
+        index = self._event_indexes.get((sport, day))
+        if index and time.time() - index.built_at < KIND_TTLS['schedule']:
+            return index
+        data = await self._get_json('schedule', f"/sport/{sport}/scheduled-events/{day}", deadline, cap=15)
+        if not data:
+            return index
+        index = TeamPairIndex(data.get('events', []), lambda e: (e.get('homeTeam', {}).get('name', ''),
+                                                                 e.get('awayTeam', {}).get('name', '')))
+        # Un seul jour conservé par sport
+        for stale in [k for k in self._event_indexes if k[0] == sport and k[1] != day]:
+            del self._event_indexes[stale]
+        self._event_indexes[(sport, day)] = index
+        return index
+    
+    async def search_match(self, team1: str, team2: str, sport: str = 'football',
+                           deadline: Optional[Deadline] = None) -> Optional[Dict]:
+        """Recherche un match par noms d'équipes dans l'index du jour"""
+        deadline = ensure(deadline)
+        today = datetime.now().strftime("%Y-%m-%d")
         try:
-            today = datetime.now().strftime("%Y-%m-%d")
-            url = f"{self.BASE_URL}/sport/{sport}/scheduled-events/{today}"
-            
-            async with self.session.get(url, headers=self.headers, timeout=15) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    events = data.get('events', [])
-                    
-                    team1_lower = team1.lower().strip()
-                    team2_lower = team2.lower().strip()
-                    
-                    for event in events:
-                        home = event.get('homeTeam', {}).get('name', '').lower()
-                        away = event.get('awayTeam', {}).get('name', '').lower()
-                        
-                        if self._fuzzy_match(team1_lower, home) and self._fuzzy_match(team2_lower, away):
-                            return event
-                        if self._fuzzy_match(team2_lower, home) and self._fuzzy_match(team1_lower, away):
-                            return event
-                else:
-                    logger.warning(f"Sofascore API: {response.status}")
+            index = await self._event_index(sport, today, deadline)
+            return index.find(team1, team2) if index else None
         except Exception as e:
             logger.error(f"Sofascore search error: {e}")
         return None
     
-    def _fuzzy_match(self, search: str, target: str) -> bool:
-        """Match flexible entre deux noms"""
-        if search in target or target in search:
-            return True
-        search_words = set(search.split())
-        target_words = set(target.split())
-        return len(search_words & target_words) >= 1
-    
-    async def get_match_details(self, event_id: int) -> Dict:
-        """Récupère tous les détails d'un match"""
-        data = {}
+    async def get_match_details(self, event_id: int, deadline: Optional[Deadline] = None) -> Dict:
+        """Récupère tous les détails d'un match (requêtes simultanées)"""
+        deadline = ensure(deadline)
+        if not deadline.has(OPTIONAL_MIN_BUDGET):
+            return {}
         endpoints = {
-            'statistics': f"/event/{event_id}/statistics",
-            'lineups': f"/event/{event_id}/lineups",
-            'h2h': f"/event/{event_id}/h2h",
-            'form': f"/event/{event_id}/pregame-form",
-            'odds': f"/event/{event_id}/odds/1/all"
+            'statistics': ('details', f"/event/{event_id}/statistics"),
+            'lineups': ('lineups', f"/event/{event_id}/lineups"),
+            'h2h': ('h2h', f"/event/{event_id}/h2h"),
+            'form': ('details', f"/event/{event_id}/pregame-form"),
+            'odds': ('odds', f"/event/{event_id}/odds/1/all")
         }
-        
-        for key, endpoint in endpoints.items():
-            try:
-                url = f"{self.BASE_URL}{endpoint}"
-                async with self.session.get(url, headers=self.headers, timeout=10) as r:
-                    if r.status == 200:
-                        data[key] = await r.json()
-            except:
-                pass
-        
-        return data
+        values = await asyncio.gather(*(
+            self._get_json(kind, endpoint, deadline) for kind, endpoint in endpoints.values()
+        ))
+        return {key: value for key, value in zip(endpoints, values) if value is not None}
     
-    async def get_team_stats(self, team_id: int) -> Dict:
+    async def get_team_stats(self, team_id: int, deadline: Optional[Deadline] = None) -> Dict:
         """Récupère les statistiques d'une équipe"""
+        deadline = ensure(deadline)
         data = {}
-        try:
-            recent_url = f"{self.BASE_URL}/team/{team_id}/events/last/0"
-            async with self.session.get(recent_url, headers=self.headers, timeout=10) as r:
-                if r.status == 200:
-                    data['recent_matches'] = await r.json()
-        except:
-            pass
+        if not deadline.has(OPTIONAL_MIN_BUDGET):
+            return data
+        recent = await self._get_json('team_stats', f"/team/{team_id}/events/last/0", deadline)
+        if recent is not None:
+            data['recent_matches'] = recent
         return data
     
-    async def collect_all(self, team1: str, team2: str, sport: str = 'football') -> Dict:
-        """Collecte toutes les données"""
+    async def collect_all(self, team1: str, team2: str, sport: str = 'football',
+                          deadline: Optional[Deadline] = None) -> Dict:
+        """Collecte toutes les données (détails et stats en parallèle, sautés si le temps manque)"""
+        deadline = ensure(deadline)
         result = {'source': 'Sofascore', 'success': False, 'data': {}}
         
         try:
-            match = await self.search_match(team1, team2, sport)
+            match = await self.search_match(team1, team2, sport, deadline)
             if match:
                 result['success'] = True
                 result['data']['match'] = match
                 
+                jobs = {}
                 event_id = match.get('id')
                 if event_id:
-                    result['data']['details'] = await self.get_match_details(event_id)
-                
+                    jobs['details'] = self.get_match_details(event_id, deadline)
                 home_id = match.get('homeTeam', {}).get('id')
                 away_id = match.get('awayTeam', {}).get('id')
-                
                 if home_id:
-                    result['data']['team1_stats'] = await self.get_team_stats(home_id)
+                    jobs['team1_stats'] = self.get_team_stats(home_id, deadline)
                 if away_id:
-                    result['data']['team2_stats'] = await self.get_team_stats(away_id)
+                    jobs['team2_stats'] = self.get_team_stats(away_id, deadline)
+                
+                values = await asyncio.gather(*jobs.values())
+                for key, value in zip(jobs, values):
+                    if key == 'details' or value:
+                        result['data'][key] = value
         except Exception as e:
             result['error'] = str(e)
         
@@ -192,6 +227,61 @@ class SofascoreCollector:
 # 🔍 COLLECTEUR API-FOOTBALL (GRATUIT 100 req/jour)
 # ════════════════════════════════════════════════════════════════════════════
 
+def api_football_headers(api_key: str = API_FOOTBALL_KEY) -> Dict[str, str]:
+    return {
+        'x-rapidapi-key': api_key,
+        'x-rapidapi-host': 'v3.football.api-sports.io'
+    }
+
+
+async def refresh_fixtures_snapshot() -> int:
+    """Rafraîchit les instantanés API-Football périmés (tâche de fond); retourne les requêtes"""
+    if not API_FOOTBALL_KEY:
+        return 0
+    return await fixtures_snapshot.refresh(API_FOOTBALL_URL, api_football_headers())
+
+
+def match_teams(match: Dict) -> Tuple[str, str]:
+    """Équipes d'un match scrapé (champs team1/team2, sinon extraites du titre)"""
+    team1 = match.get('team1', '')
+    team2 = match.get('team2', '')
+    if not team1 or not team2:
+        title = match.get('title', '')
+        for sep in (' vs ', ' - '):
+            if sep in title:
+                parts = title.split(sep)
+                team1 = parts[0].strip()
+                team2 = parts[1].strip() if len(parts) > 1 else ''
+                break
+    return team1, team2
+
+
+async def prefetch_team_stats(matches: List[Dict], force: bool = False) -> int:
+    """
+    Précharge les stats de saison des équipes des matchs de football scrapés
+    (heures creuses seulement, sauf `force`), dans la marge du registre des quotas
+    """
+    if not API_FOOTBALL_KEY or not (force or in_off_peak()):
+        return 0
+    pairs = [match_teams(m) for m in matches if m.get('sport', 'FOOTBALL').lower() in ('football', 'soccer')]
+    pairs = [(team1, team2) for team1, team2 in pairs if team1 and team2]
+    if not pairs:
+        return 0
+    async with aiohttp.ClientSession() as session:
+        collector = APIFootballCollector(session)
+        collector.value = PREFETCH_VALUE
+        index = await fixtures_snapshot.get_index(session, API_FOOTBALL_URL, collector.headers,
+                                                  datetime.now().strftime("%Y-%m-%d"))
+        if not index:
+            return 0
+        fixtures = {}
+        for team1, team2 in pairs:
+            fixture = index.find(team1, team2)
+            if fixture:
+                fixtures[fixture.get('fixture', {}).get('id')] = fixture
+        return await team_stats_store.prefetch(collector._fetch_team_statistics, list(fixtures.values()))
+
+
 class APIFootballCollector:
     """
     Collecte via API-Football - LA MEILLEURE SOURCE DE DONNÉES
@@ -202,191 +292,122 @@ class APIFootballCollector:
     def __init__(self, session: aiohttp.ClientSession):
         self.session = session
         self.api_key = API_FOOTBALL_KEY
-        self.headers = {
-            'x-rapidapi-key': self.api_key,
-            'x-rapidapi-host': 'v3.football.api-sports.io'
-        }
+        self.headers = api_football_headers(self.api_key)
         self.requests_today = 0
+        self.value = 1.0      # Valeur du match en cours pour le registre des quotas
     
     @property
     def is_available(self) -> bool:
         return bool(self.api_key)
     
-    async def search_fixture(self, team1: str, team2: str, date: str = None) -> Optional[Dict]:
-        """Recherche un match par équipes"""
+    async def search_fixture(self, team1: str, team2: str, date: str = None,
+                             deadline: Optional[Deadline] = None) -> Optional[Dict]:
+        """Recherche un match par équipes dans les instantanés du jour (et du lendemain)"""
+        deadline = ensure(deadline)
         if not self.is_available:
             logger.warning("❌ API-Football: Clé non configurée")
             return None
+        if not date:
+            date = datetime.now().strftime("%Y-%m-%d")
+        # Chercher aussi demain si pas trouvé aujourd'hui
+        dates_to_check = [date]
+        tomorrow = (datetime.now() + timedelta(days=1)).strftime("%Y-%m-%d")
+        if date != tomorrow:
+            dates_to_check.append(tomorrow)
+        
+        requests_before = fixtures_snapshot.stats['requests']
+        fixture = await fixtures_snapshot.find(self.session, API_FOOTBALL_URL, self.headers,
+                                               team1, team2, dates_to_check, deadline)
+        self.requests_today += fixtures_snapshot.stats['requests'] - requests_before
+        if fixture:
+            teams = fixture.get('teams', {})
+            logger.info(f"✅ Match trouvé: {teams.get('home', {}).get('name')} vs {teams.get('away', {}).get('name')}")
+        return fixture
+    
+    async def _api_get(self, kind: str, endpoint: str, params: Dict,
+                       deadline: Optional[Deadline] = None) -> Any:
+        """GET API-Football (champ 'response') via le cache des collecteurs"""
+        key = f"api_football:{endpoint}:" + '&'.join(f"{k}={v}" for k, v in sorted(params.items()))
+        
+        async def load():
+            response = await http_cache.get_json(self.session, f"{API_FOOTBALL_URL}/{endpoint}",
+                                                 params=params, headers=self.headers, timeout=10,
+                                                 ttl=KIND_TTLS.get(kind, 600), quota=('api_football', self.value),
+                                                 breaker='api_football', deadline=deadline)
+            if response.sent:
+                self.requests_today += 1
+            if response.ok:
+                return response.data.get('response')
+            if response.source == 'error':
+                logger.error(f"API-Football {endpoint}: erreur réseau")
+            return None
         
-        try:
-            if not date:
-                date = datetime.now().strftime("%Y-%m-%d")
-            
-            # Chercher aussi demain si pas trouvé aujourd'hui
-            dates_to_check = [date]
-            tomorrow = (datetime.now() + timedelta(days=1)).strftime("%Y-%m-%d")
-            if date != tomorrow:
-                dates_to_check.append(tomorrow)
-            
-            for check_date in dates_to_check:
-                url = f"{API_FOOTBALL_URL}/fixtures"
-                params = {'date': check_date}
-                
-                async with self.session.get(url, headers=self.headers, params=params, timeout=15) as r:
-                    self.requests_today += 1
-                    
-                    if r.status == 200:
-                        data = await r.json()
-                        fixtures = data.get('response', [])
-                        
-                        # Log du quota restant
-                        remaining = r.headers.get('x-ratelimit-requests-remaining', '?')
-                        logger.info(f"📊 API-Football: {len(fixtures)} matchs trouvés, quota restant: {remaining}")
-                        
-                        team1_lower = team1.lower()
-                        team2_lower = team2.lower()
-                        
-                        for fixture in fixtures:
-                            home = fixture.get('teams', {}).get('home', {}).get('name', '').lower()
-                            away = fixture.get('teams', {}).get('away', {}).get('name', '').lower()
-                            
-                            # Match flexible
-                            if self._match_team(team1_lower, home) and self._match_team(team2_lower, away):
-                                logger.info(f"✅ Match trouvé: {fixture.get('teams', {}).get('home', {}).get('name')} vs {fixture.get('teams', {}).get('away', {}).get('name')}")
-                                return fixture
-                            if self._match_team(team2_lower, home) and self._match_team(team1_lower, away):
-                                logger.info(f"✅ Match trouvé: {fixture.get('teams', {}).get('home', {}).get('name')} vs {fixture.get('teams', {}).get('away', {}).get('name')}")
-                                return fixture
-                    
-                    elif r.status == 429:
-                        logger.error("❌ API-Football: Quota épuisé (100 req/jour)")
-                        return None
-                        
-        except Exception as e:
-            logger.error(f"❌ API-Football search error: {e}")
-        return None
+        return await collector_cache.fetch(kind, key, load)
     
-    def _match_team(self, search: str, target: str) -> bool:
-        """Match flexible entre noms d'équipes"""
-        if search in target or target in search:
-            return True
-        # Match par mots
-        search_words = set(search.replace('-', ' ').split())
-        target_words = set(target.replace('-', ' ').split())
-        common = search_words & target_words
-        return len(common) >= 1
-    
-    async def get_fixture_statistics(self, fixture_id: int) -> Dict:
+    async def get_fixture_statistics(self, fixture_id: int, deadline: Optional[Deadline] = None) -> Dict:
         """Récupère les statistiques détaillées du match"""
         if not self.is_available:
             return {}
-        
-        try:
-            url = f"{API_FOOTBALL_URL}/fixtures/statistics"
-            params = {'fixture': fixture_id}
-            
-            async with self.session.get(url, headers=self.headers, params=params, timeout=10) as r:
-                self.requests_today += 1
-                if r.status == 200:
-                    data = await r.json()
-                    return data.get('response', [])
-        except Exception as e:
-            logger.error(f"API-Football stats error: {e}")
-        return []
+        return await self._api_get('details', 'fixtures/statistics', {'fixture': fixture_id}, deadline) or []
     
-    async def get_fixture_lineups(self, fixture_id: int) -> Dict:
+    async def get_fixture_lineups(self, fixture_id: int, deadline: Optional[Deadline] = None) -> Dict:
         """Récupère les compositions"""
         if not self.is_available:
             return {}
-        
-        try:
-            url = f"{API_FOOTBALL_URL}/fixtures/lineups"
-            params = {'fixture': fixture_id}
-            
-            async with self.session.get(url, headers=self.headers, params=params, timeout=10) as r:
-                self.requests_today += 1
-                if r.status == 200:
-                    data = await r.json()
-                    return data.get('response', [])
-        except:
-            pass
-        return []
+        return await self._api_get('lineups', 'fixtures/lineups', {'fixture': fixture_id}, deadline) or []
     
-    async def get_predictions(self, fixture_id: int) -> Dict:
+    async def get_predictions(self, fixture_id: int, deadline: Optional[Deadline] = None) -> Dict:
         """Récupère les prédictions officielles API-Football"""
         if not self.is_available:
             return {}
-        
-        try:
-            url = f"{API_FOOTBALL_URL}/predictions"
-            params = {'fixture': fixture_id}
-            
-            async with self.session.get(url, headers=self.headers, params=params, timeout=10) as r:
-                self.requests_today += 1
-                if r.status == 200:
-                    data = await r.json()
-                    response = data.get('response', [])
-                    return response[0] if response else {}
-        except:
-            pass
-        return {}
-    
-    async def get_team_statistics(self, team_id: int, league_id: int, season: int = 2024) -> Dict:
-        """Récupère les statistiques complètes d'une équipe"""
+        response = await self._api_get('predictions', 'predictions', {'fixture': fixture_id}, deadline)
+        return response[0] if response else {}
+    
+    async def get_team_statistics(self, team_id: int, league_id: int, season: Optional[int] = None,
+                                  kickoff: Optional[float] = None,
+                                  deadline: Optional[Deadline] = None) -> Dict:
+        """
+        Statistiques de saison d'une équipe via le magasin (équipe, ligue, saison).
+        `kickoff`: coup d'envoi du match analysé, l'entrée sera rafraîchie après.
+        """
         if not self.is_available:
             return {}
-        
-        try:
-            url = f"{API_FOOTBALL_URL}/teams/statistics"
-            params = {'team': team_id, 'league': league_id, 'season': season}
-            
-            async with self.session.get(url, headers=self.headers, params=params, timeout=10) as r:
-                self.requests_today += 1
-                if r.status == 200:
-                    data = await r.json()
-                    return data.get('response', {})
-        except:
-            pass
-        return {}
+        return await team_stats_store.get(partial(self._fetch_team_statistics, deadline=deadline),
+                                          team_id, league_id, season or season_for_date(), kickoff)
+    
+    async def _fetch_team_statistics(self, team_id: int, league_id: int, season: int,
+                                     deadline: Optional[Deadline] = None) -> Optional[Dict]:
+        """GET /teams/statistics (le magasin décide de la fraîcheur: ttl=0)"""
+        params = {'team': team_id, 'league': league_id, 'season': season}
+        response = await http_cache.get_json(self.session, f"{API_FOOTBALL_URL}/teams/statistics",
+                                             params=params, headers=self.headers, timeout=10, ttl=0,
+                                             quota=('api_football', self.value), breaker='api_football',
+                                             deadline=deadline)
+        if response.sent:
+            self.requests_today += 1
+        if response.ok:
+            return response.data.get('response') or None
+        if response.status:
+            logger.warning(f"API-Football teams/statistics {team_id}: {response.status}")
+        return None
     
-    async def get_h2h(self, team1_id: int, team2_id: int, last: int = 10) -> List[Dict]:
+    async def get_h2h(self, team1_id: int, team2_id: int, last: int = 10,
+                      deadline: Optional[Deadline] = None) -> List[Dict]:
         """Récupère l'historique des confrontations directes"""
         if not self.is_available:
             return []
-        
-        try:
-            url = f"{API_FOOTBALL_URL}/fixtures/headtohead"
-            params = {'h2h': f"{team1_id}-{team2_id}", 'last': last}
-            
-            async with self.session.get(url, headers=self.headers, params=params, timeout=10) as r:
-                self.requests_today += 1
-                if r.status == 200:
-                    data = await r.json()
-                    return data.get('response', [])
-        except:
-            pass
-        return []
+        params = {'h2h': f"{team1_id}-{team2_id}", 'last': last}
+        return await self._api_get('h2h', 'fixtures/headtohead', params, deadline) or []
     
-    async def get_injuries(self, fixture_id: int) -> List[Dict]:
+    async def get_injuries(self, fixture_id: int, deadline: Optional[Deadline] = None) -> List[Dict]:
         """Récupère les blessures pour un match"""
         if not self.is_available:
             return []
-        
-        try:
-            url = f"{API_FOOTBALL_URL}/injuries"
-            params = {'fixture': fixture_id}
-            
-            async with self.session.get(url, headers=self.headers, params=params, timeout=10) as r:
-                self.requests_today += 1
-                if r.status == 200:
-                    data = await r.json()
-                    return data.get('response', [])
-        except:
-            pass
-        return []
+        return await self._api_get('injuries', 'injuries', {'fixture': fixture_id}, deadline) or []
     
-    async def collect_all(self, team1: str, team2: str) -> Dict:
+    async def collect_all(self, team1: str, team2: str, deadline: Optional[Deadline] = None) -> Dict:
         """Collecte TOUTES les données disponibles pour un match"""
+        deadline = ensure(deadline)
         result = {
             'source': 'API-Football',
             'success': False,
@@ -402,7 +423,7 @@ class APIFootballCollector:
         
         try:
             # 1. Trouver le match
-            fixture = await self.search_fixture(team1, team2)
+            fixture = await self.search_fixture(team1, team2, deadline=deadline)
             if not fixture:
                 result['error'] = f"Match non trouvé: {team1} vs {team2}"
                 return result
@@ -414,42 +435,49 @@ class APIFootballCollector:
             home_team = fixture.get('teams', {}).get('home', {})
             away_team = fixture.get('teams', {}).get('away', {})
             league_id = fixture.get('league', {}).get('id')
+            season = detect_season(fixture)
+            kickoff = fixture.get('fixture', {}).get('timestamp')
             
             # 2. Collecter en parallèle pour économiser les requêtes
-            if fixture_id:
-                tasks = [
-                    self.get_predictions(fixture_id),
-                    self.get_fixture_lineups(fixture_id),
-                    self.get_injuries(fixture_id)
-                ]
-                
-                predictions, lineups, injuries = await asyncio.gather(*tasks, return_exceptions=True)
-                
-                if not isinstance(predictions, Exception) and predictions:
-                    result['data']['predictions'] = predictions
+            if fixture_id and deadline.has(OPTIONAL_MIN_BUDGET):
+                tasks = {
+                    'predictions': asyncio.create_task(self.get_predictions(fixture_id, deadline)),
+                    'lineups': asyncio.create_task(self.get_fixture_lineups(fixture_id, deadline)),
+                    'injuries': asyncio.create_task(self.get_injuries(fixture_id, deadline))
+                }
                 
-                if not isinstance(lineups, Exception) and lineups:
-                    result['data']['lineups'] = lineups
+                # Ce qui n'a pas répondu à l'échéance est abandonné
+                _, pending = await asyncio.wait(tasks.values(), timeout=deadline.timeout(10))
+                for task in pending:
+                    task.cancel()
                 
-                if not isinstance(injuries, Exception) and injuries:
-                    result['data']['injuries'] = injuries
+                for key, task in tasks.items():
+                    if task in pending or task.exception():
+                        continue
+                    if task.result():
+                        result['data'][key] = task.result()
             
-            # 3. Stats des équipes (si quota suffisant)
+            # 3. Stats des équipes (si quota et temps suffisants)
             if home_team.get('id') and away_team.get('id') and league_id:
                 # H2H
-                h2h = await self.get_h2h(home_team['id'], away_team['id'])
-                if h2h:
-                    result['data']['h2h'] = h2h
+                if deadline.has(OPTIONAL_MIN_BUDGET):
+                    h2h = await self.get_h2h(home_team['id'], away_team['id'], deadline=deadline)
+                    if h2h:
+                        result['data']['h2h'] = h2h
                 
                 # Stats équipe domicile
-                team1_stats = await self.get_team_statistics(home_team['id'], league_id)
-                if team1_stats:
-                    result['data']['team1_stats'] = team1_stats
+                if deadline.has(OPTIONAL_MIN_BUDGET):
+                    team1_stats = await self.get_team_statistics(home_team['id'], league_id, season, kickoff,
+                                                                 deadline)
+                    if team1_stats:
+                        result['data']['team1_stats'] = team1_stats
                 
                 # Stats équipe extérieur
-                team2_stats = await self.get_team_statistics(away_team['id'], league_id)
-                if team2_stats:
-                    result['data']['team2_stats'] = team2_stats
+                if deadline.has(OPTIONAL_MIN_BUDGET):
+                    team2_stats = await self.get_team_statistics(away_team['id'], league_id, season, kickoff,
+                                                                 deadline)
+                    if team2_stats:
+                        result['data']['team2_stats'] = team2_stats
             
             result['requests_used'] = self.requests_today - start_requests
             logger.info(f"✅ API-Football: {result['requests_used']} requêtes utilisées")
@@ -534,6 +562,7 @@ class OddsCollector:
         self.session = session
         self.api_key = ODDS_API_KEY
         self.requests_used = 0
+        self.value = 1.0      # Valeur du match en cours pour le registre des quotas
     
     @property
     def is_available(self) -> bool:
@@ -544,20 +573,18 @@ class OddsCollector:
         if not self.is_available:
             return []
         
-        try:
-            url = f"{ODDS_API_URL}/sports"
-            params = {'apiKey': self.api_key}
-            
-            async with self.session.get(url, params=params, timeout=10) as r:
-                self.requests_used += 1
-                if r.status == 200:
-                    return await r.json()
-        except:
-            pass
-        return []
+        # /sports ne consomme pas de quota; la liste change rarement
+        response = await http_cache.get_json(self.session, f"{ODDS_API_URL}/sports",
+                                             params={'apiKey': self.api_key}, timeout=10, ttl=86400,
+                                             breaker='odds')
+        if response.sent:
+            self.requests_used += 1
+        return response.data if response.ok else []
     
-    async def get_odds(self, team1: str, team2: str, sport: str = 'football') -> Dict:
+    async def get_odds(self, team1: str, team2: str, sport: str = 'football',
+                       deadline: Optional[Deadline] = None) -> Dict:
         """Récupère les cotes pour un match - OPTIMISÉ pour économiser le quota"""
+        deadline = ensure(deadline)
         result = {
             'source': 'The Odds API',
             'success': False,
@@ -569,82 +596,37 @@ class OddsCollector:
             result['error'] = "ODDS_API_KEY non configurée"
             return result
         
+        # Ligues les plus probables (max 5); chaque tableau est téléchargé une fois par intervalle
+        sport_keys = self.SPORT_KEYS.get(sport.lower(), ['soccer_epl'])[:5]
+        requests_before = odds_snapshot.stats['requests']
         try:
-            # Sélectionner les ligues les plus probables (max 5 pour économiser le quota)
-            sport_keys = self.SPORT_KEYS.get(sport.lower(), ['soccer_epl'])[:5]
-            
-            team1_lower = team1.lower()
-            team2_lower = team2.lower()
-            
-            for sport_key in sport_keys:
-                url = f"{ODDS_API_URL}/sports/{sport_key}/odds"
-                params = {
-                    'apiKey': self.api_key,
-                    'regions': 'eu,uk',
-                    'markets': 'h2h,totals,btts',
-                    'oddsFormat': 'decimal'
-                }
-                
-                async with self.session.get(url, params=params, timeout=15) as r:
-                    self.requests_used += 1
-                    result['requests_used'] += 1
-                    
-                    if r.status == 200:
-                        data = await r.json()
-                        
-                        for event in data:
-                            home = event.get('home_team', '').lower()
-                            away = event.get('away_team', '').lower()
-                            
-                            if self._match_team(team1_lower, home) and self._match_team(team2_lower, away):
-                                result['success'] = True
-                                result['data'] = {
-                                    'event': event,
-                                    'odds': self._parse_all_odds(event),
-                                    'bookmakers': [b['title'] for b in event.get('bookmakers', [])],
-                                    'sport_key': sport_key
-                                }
-                                remaining = r.headers.get('x-requests-remaining', '?')
-                                logger.info(f"✅ Cotes trouvées [{sport_key}]: {event.get('home_team')} vs {event.get('away_team')} (quota: {remaining})")
-                                return result  # ARRÊTER dès qu'on trouve
-                            
-                            if self._match_team(team2_lower, home) and self._match_team(team1_lower, away):
-                                result['success'] = True
-                                result['data'] = {
-                                    'event': event,
-                                    'odds': self._parse_all_odds(event),
-                                    'bookmakers': [b['title'] for b in event.get('bookmakers', [])],
-                                    'sport_key': sport_key
-                                }
-                                remaining = r.headers.get('x-requests-remaining', '?')
-                                logger.info(f"✅ Cotes trouvées [{sport_key}]: {event.get('home_team')} vs {event.get('away_team')} (quota: {remaining})")
-                                return result  # ARRÊTER dès qu'on trouve
-                    
-                    elif r.status == 401:
-                        result['error'] = "Clé API invalide"
-                        return result
-                    elif r.status == 429:
-                        result['error'] = "Quota épuisé (500 req/mois)"
-                        return result
-            
-            # Log seulement si pas trouvé
-            logger.warning(f"⚠️ Odds API: Cotes non trouvées pour {team1} vs {team2}")
-            result['error'] = f"Match non trouvé dans les ligues disponibles"
-            
+            entry = await odds_snapshot.find(
+                self.session, ODDS_API_URL, self.api_key, team1, team2, sport_keys,
+                self._parse_all_odds, deadline, min_budget=OPTIONAL_MIN_BUDGET, value=self.value
+            )
+            if entry:
+                result['success'] = True
+                result['data'] = entry
+                event = entry['event']
+                logger.info(f"✅ Cotes trouvées [{entry['sport_key']}]: {event.get('home_team')} vs {event.get('away_team')} (quota: {odds_snapshot.quota['remaining'] or '?'})")
+            elif not deadline.has(OPTIONAL_MIN_BUDGET):
+                result['error'] = "Échéance atteinte"
+            else:
+                # Log seulement si pas trouvé
+                logger.warning(f"⚠️ Odds API: Cotes non trouvées pour {team1} vs {team2}")
+                result['error'] = f"Match non trouvé dans les ligues disponibles"
+        except OddsQuotaError as e:
+            result['error'] = str(e)
         except Exception as e:
             logger.error(f"Odds API error: {e}")
             result['error'] = str(e)
+        finally:
+            used = odds_snapshot.stats['requests'] - requests_before
+            self.requests_used += used
+            result['requests_used'] += used
         
         return result
     
-    def _match_team(self, search: str, target: str) -> bool:
-        """Match flexible"""
-        if search in target or target in search:
-            return True
-        search_words = set(search.replace('-', ' ').split())
-        target_words = set(target.replace('-', ' ').split())
-        return len(search_words & target_words) >= 1
-    
     def _parse_all_odds(self, event: Dict) -> Dict:
         """Parse TOUTES les cotes disponibles"""
         odds = {
@@ -746,8 +728,8 @@ class OddsCollector:
                         '2': round(100 / mw['2'] / total, 1),
                         'margin': round((total - 1) * 100, 2)
                     }
-                except:
-                    pass
+                except (ZeroDivisionError, TypeError) as e:
+                    logger.debug(f"Probabilités implicites non calculables: {e}")
         
         return odds
 
@@ -766,8 +748,8 @@ class UltraDataCollector:
         self.sofascore: Optional[SofascoreCollector] = None
         self.api_football: Optional[APIFootballCollector] = None
         self.odds: Optional[OddsCollector] = None
-        self.cache: Dict[str, Tuple[str, float]] = {}
-        self.cache_ttl = 1800
+        # Données brutes de la dernière collecte (réutilisées par le modèle statistique)
+        self.last_sources: Dict[str, Dict] = {}
     
     async def __aenter__(self):
         timeout = aiohttp.ClientTimeout(total=60)
@@ -781,488 +763,84 @@ class UltraDataCollector:
         if self.session:
             await self.session.close()
     
-    def _cache_key(self, team1: str, team2: str) -> str:
-        content = f"{team1.lower()}_{team2.lower()}_{datetime.now().strftime('%Y-%m-%d')}"
+    def _cache_key(self, team1: str, team2: str, sport: str) -> str:
+        # Même paire de noms dans deux sports (Real Madrid football / basket): collectes distinctes
+        content = f"{sport.strip().lower()}_{team1.lower()}_{team2.lower()}_{datetime.now().strftime('%Y-%m-%d')}"
         return hashlib.md5(content.encode()).hexdigest()
     
-    async def collect_all_data(self, match: Dict) -> str:
-        """Collecte TOUTES les données et retourne un texte pour l'IA"""
-        team1 = match.get('team1', '')
-        team2 = match.get('team2', '')
+    async def collect_all_data(self, match: Dict, deadline: Optional[Deadline] = None,
+                               value: float = 1.0) -> str:
+        """Collecte TOUTES les données et retourne le texte complet pour l'IA"""
+        return (await self.collect(match, deadline, value)).format()
+    
+    async def collect(self, match: Dict, deadline: Optional[Deadline] = None,
+                      value: float = 1.0) -> CollectedData:
+        """
+        Collecte TOUTES les données du match (champs typés, formatés à la demande).
+        Avec une échéance, chaque requête est bornée par le temps restant et les
+        requêtes optionnelles sont sautées: on garde ce qui est arrivé à temps.
+        `value` (0-1, voir quota_ledger.match_value) décide des requêtes à quota.
+        """
+        deadline = ensure(deadline)
+        self.api_football.value = self.odds.value = value
+        team1, team2 = match_teams(match)
         sport = match.get('sport', 'FOOTBALL').lower()
         
-        # Extraire du titre si nécessaire
-        if not team1 or not team2:
-            title = match.get('title', '')
-            if ' vs ' in title:
-                parts = title.split(' vs ')
-                team1 = parts[0].strip()
-                team2 = parts[1].strip() if len(parts) > 1 else ''
-            elif ' - ' in title:
-                parts = title.split(' - ')
-                team1 = parts[0].strip()
-                team2 = parts[1].strip() if len(parts) > 1 else ''
-        
-        # Vérifier le cache
-        cache_key = self._cache_key(team1, team2)
-        if cache_key in self.cache:
-            cached_data, timestamp = self.cache[cache_key]
-            if time.time() - timestamp < self.cache_ttl:
-                logger.info(f"📦 Cache hit: {team1} vs {team2}")
-                return cached_data
+        # Vérifier le cache (partagé entre analyses et persistant)
+        cache_key = self._cache_key(team1, team2, sport)
+        cached = collector_cache.get('collection', cache_key)
+        if cached and 'data' in cached:
+            logger.info(f"📦 Cache hit: {team1} vs {team2}")
+            # Aucune requête amont consommée par cette collecte
+            self.last_sources = {}
+            return CollectedData.from_dict(cached['data'])
         
         logger.info(f"🔍 Collecte: {team1} vs {team2} ({sport})")
         
-        # Collecter en parallèle
-        tasks = [
-            self.sofascore.collect_all(team1, team2, sport),
-            self.api_football.collect_all(team1, team2),
-            self.odds.get_odds(team1, team2, sport)
-        ]
-        
-        results = await asyncio.gather(*tasks, return_exceptions=True)
-        
-        sofascore_data = results[0] if not isinstance(results[0], Exception) else {'success': False}
-        api_football_data = results[1] if not isinstance(results[1], Exception) else {'success': False}
-        odds_data = results[2] if not isinstance(results[2], Exception) else {'success': False}
-        
-        # Formater pour l'IA
-        formatted = self._format_for_ai(match, team1, team2, sport, sofascore_data, api_football_data, odds_data)
-        
-        # Mettre en cache
-        self.cache[cache_key] = (formatted, time.time())
-        
-        return formatted
-    
-    def _format_for_ai(self, match: Dict, team1: str, team2: str, sport: str,
-                       sofascore: Dict, api_football: Dict, odds: Dict) -> str:
-        """Formate TOUTES les données pour l'IA"""
-        
-        sources = []
-        quality = 0
-        
-        output = f"""
-╔══════════════════════════════════════════════════════════════════════════════╗
-║  📊 DONNÉES COLLECTÉES POUR ANALYSE IA - {datetime.now().strftime('%d/%m/%Y %H:%M')}
-╚══════════════════════════════════════════════════════════════════════════════╝
-
-🏟️ MATCH: {team1} vs {team2}
-🏆 SPORT: {sport.upper()}
-⏰ HEURE: {match.get('start_time', 'N/A')}
-
-"""
-        
-        # ═══════════════════════════════════════════════════════════════════════
-        # API-FOOTBALL (SOURCE PRINCIPALE)
-        # ═══════════════════════════════════════════════════════════════════════
-        if api_football.get('success'):
-            sources.append('API-Football')
-            quality += 40
-            
-            output += """
-════════════════════════════════════════════════════════════════════════════════
-📊 API-FOOTBALL - Données officielles (source principale)
-════════════════════════════════════════════════════════════════════════════════
-
-"""
-            data = api_football.get('data', {})
-            
-            # Fixture info
-            fixture = data.get('fixture', {})
-            if fixture:
-                league = fixture.get('league', {})
-                venue = fixture.get('fixture', {}).get('venue', {})
-                referee = fixture.get('fixture', {}).get('referee', 'N/A')
-                
-                output += f"""📋 INFORMATIONS MATCH
-• Compétition: {league.get('name', 'N/A')} ({league.get('country', 'N/A')})
-• Saison: {league.get('season', 'N/A')}
-• Tour: {league.get('round', 'N/A')}
-• Stade: {venue.get('name', 'N/A')} (capacité: {venue.get('capacity', 'N/A')})
-• Ville: {venue.get('city', 'N/A')}
-• Arbitre: {referee}
-
-"""
-            
-            # Prédictions API-Football
-            predictions = data.get('predictions', {})
-            if predictions:
-                pred = predictions.get('predictions', {})
-                teams = predictions.get('teams', {})
-                comparison = predictions.get('comparison', {})
-                
-                output += f"""🔮 PRÉDICTIONS API-FOOTBALL (Officielles)
-• Vainqueur prédit: {pred.get('winner', {}).get('name', 'N/A')}
-• Conseil: {pred.get('advice', 'N/A')}
-• Score prédit: {pred.get('goals', {}).get('home', '?')}-{pred.get('goals', {}).get('away', '?')}
-• Pourcentages: Dom {pred.get('percent', {}).get('home', 'N/A')} | Nul {pred.get('percent', {}).get('draw', 'N/A')} | Ext {pred.get('percent', {}).get('away', 'N/A')}
-
-"""
-                if comparison:
-                    output += f"""📊 COMPARAISON DES ÉQUIPES
-• Forme: {comparison.get('form', {}).get('home', 'N/A')}% vs {comparison.get('form', {}).get('away', 'N/A')}%
-• Attaque: {comparison.get('att', {}).get('home', 'N/A')}% vs {comparison.get('att', {}).get('away', 'N/A')}%
-• Défense: {comparison.get('def', {}).get('home', 'N/A')}% vs {comparison.get('def', {}).get('away', 'N/A')}%
-• H2H: {comparison.get('h2h', {}).get('home', 'N/A')}% vs {comparison.get('h2h', {}).get('away', 'N/A')}%
-• Buts: {comparison.get('goals', {}).get('home', 'N/A')}% vs {comparison.get('goals', {}).get('away', 'N/A')}%
-• Total: {comparison.get('total', {}).get('home', 'N/A')}% vs {comparison.get('total', {}).get('away', 'N/A')}%
-
-"""
-            
-            # Compositions
-            lineups = data.get('lineups', [])
-            if lineups:
-                output += "👥 COMPOSITIONS OFFICIELLES\n"
-                for lineup in lineups:
-                    team_name = lineup.get('team', {}).get('name', 'Équipe')
-                    formation = lineup.get('formation', 'N/A')
-                    coach = lineup.get('coach', {}).get('name', 'N/A')
-                    
-                    output += f"\n🔷 {team_name} ({formation})\n"
-                    output += f"   Coach: {coach}\n"
-                    output += "   Titulaires: "
-                    
-                    starters = lineup.get('startXI', [])
-                    player_names = [p.get('player', {}).get('name', '') for p in starters]
-                    output += ', '.join(player_names[:11]) + "\n"
-                
-                output += "\n"
-            
-            # Blessures
-            injuries = data.get('injuries', [])
-            if injuries:
-                output += "🚑 BLESSURES / ABSENCES\n"
-                for inj in injuries[:10]:
-                    player = inj.get('player', {}).get('name', 'N/A')
-                    team = inj.get('team', {}).get('name', 'N/A')
-                    reason = inj.get('player', {}).get('reason', 'N/A')
-                    output += f"   • {player} ({team}): {reason}\n"
-                output += "\n"
-            
-            # Stats équipe 1
-            team1_stats = data.get('team1_stats', {})
-            if team1_stats:
-                output += self._format_team_stats(team1_stats, team1)
-            
-            # Stats équipe 2
-            team2_stats = data.get('team2_stats', {})
-            if team2_stats:
-                output += self._format_team_stats(team2_stats, team2)
-            
-            # H2H
-            h2h = data.get('h2h', [])
-            if h2h:
-                output += "🔄 HISTORIQUE CONFRONTATIONS DIRECTES (H2H)\n\n"
-                
-                home_wins = 0
-                away_wins = 0
-                draws = 0
-                home_goals = 0
-                away_goals = 0
-                
-                for match_h2h in h2h[:10]:
-                    teams_h2h = match_h2h.get('teams', {})
-                    goals = match_h2h.get('goals', {})
-                    
-                    home_name = teams_h2h.get('home', {}).get('name', 'Home')
-                    away_name = teams_h2h.get('away', {}).get('name', 'Away')
-                    home_score = goals.get('home', 0) or 0
-                    away_score = goals.get('away', 0) or 0
-                    
-                    home_goals += home_score
-                    away_goals += away_score
-                    
-                    if home_score > away_score:
-                        home_wins += 1
-                    elif away_score > home_score:
-                        away_wins += 1
-                    else:
-                        draws += 1
-                    
-                    date = match_h2h.get('fixture', {}).get('date', '')[:10]
-                    output += f"   • {date}: {home_name} {home_score}-{away_score} {away_name}\n"
-                
-                total = len(h2h[:10])
-                output += f"""
-   📈 Résumé ({total} derniers matchs):
-   • Victoires domicile: {home_wins}
-   • Nuls: {draws}
-   • Victoires extérieur: {away_wins}
-   • Buts moyens: {round((home_goals + away_goals) / max(total, 1), 2)}/match
-
-"""
-        elif api_football.get('error'):
-            output += f"""
-⚠️ API-FOOTBALL: {api_football.get('error')}
-
-"""
-        
-        # ═══════════════════════════════════════════════════════════════════════
-        # SOFASCORE
-        # ═══════════════════════════════════════════════════════════════════════
-        if sofascore.get('success'):
-            sources.append('Sofascore')
-            quality += 25
-            
-            output += """
-════════════════════════════════════════════════════════════════════════════════
-📊 SOFASCORE - Statistiques complémentaires
-════════════════════════════════════════════════════════════════════════════════
-
-"""
-            data = sofascore.get('data', {})
-            
-            # Match info
-            match_info = data.get('match', {})
-            if match_info:
-                tournament = match_info.get('tournament', {}).get('name', 'N/A')
-                home = match_info.get('homeTeam', {}).get('name', team1)
-                away = match_info.get('awayTeam', {}).get('name', team2)
-                
-                output += f"""📋 MATCH: {home} vs {away}
-• Compétition: {tournament}
-
-"""
-            
-            # Détails
-            details = data.get('details', {})
-            
-            if details.get('statistics'):
-                output += "📈 STATISTIQUES DÉTAILLÉES\n"
-                output += self._json_to_readable(details['statistics'], max_length=1500)
-                output += "\n\n"
-            
-            if details.get('form'):
-                output += "📊 FORME RÉCENTE\n"
-                output += self._json_to_readable(details['form'], max_length=800)
-                output += "\n\n"
-            
-            if details.get('h2h'):
-                output += "🔄 H2H SOFASCORE\n"
-                output += self._json_to_readable(details['h2h'], max_length=1000)
-                output += "\n\n"
-        
-        # ═══════════════════════════════════════════════════════════════════════
-        # COTES DES BOOKMAKERS
-        # ═══════════════════════════════════════════════════════════════════════
-        if odds.get('success'):
-            sources.append('Bookmakers')
-            quality += 25
-            
-            output += """
-════════════════════════════════════════════════════════════════════════════════
-💰 COTES DES BOOKMAKERS (The Odds API)
-════════════════════════════════════════════════════════════════════════════════
-
-"""
-            data = odds.get('data', {})
-            bookmakers = data.get('bookmakers', [])
-            output += f"📊 Sources: {', '.join(bookmakers[:5])}\n\n"
-            
-            parsed_odds = data.get('odds', {})
-            
-            # Match Winner
-            mw = parsed_odds.get('match_winner', {})
-            if mw:
-                output += f"""🏆 RÉSULTAT DU MATCH (1X2)
-• Victoire {team1} (1): {mw.get('1', 'N/A')}
-• Match Nul (X): {mw.get('X', 'N/A')}
-• Victoire {team2} (2): {mw.get('2', 'N/A')}
-
-"""
-            
-            # Meilleures cotes
-            best = parsed_odds.get('best_odds', {})
-            if best and any(best.values()):
-                output += f"""⭐ MEILLEURES COTES DU MARCHÉ
-• Meilleure cote 1: {best.get('1', 'N/A')}
-• Meilleure cote X: {best.get('X', 'N/A')}
-• Meilleure cote 2: {best.get('2', 'N/A')}
-
-"""
-            
-            # Probabilités implicites
-            impl = parsed_odds.get('implied_probabilities', {})
-            if impl:
-                output += f"""💡 PROBABILITÉS IMPLICITES (calculées des cotes)
-• Probabilité {team1}: {impl.get('1', 'N/A')}%
-• Probabilité Nul: {impl.get('X', 'N/A')}%
-• Probabilité {team2}: {impl.get('2', 'N/A')}%
-• Marge bookmaker: {impl.get('margin', 'N/A')}%
-
-⚠️ Ces probabilités reflètent l'opinion du marché, pas la réalité.
-Si TU estimes une probabilité supérieure → c'est un VALUE BET potentiel.
-
-"""
-            
-            # Over/Under
-            ou = parsed_odds.get('over_under', {})
-            if ou:
-                output += "⚽ TOTAL BUTS (Over/Under)\n"
-                for key in sorted(ou.keys()):
-                    label = key.replace('_', ' ').title()
-                    output += f"• {label}: {ou[key]}\n"
-                output += "\n"
-            
-            # BTTS
-            btts = parsed_odds.get('btts', {})
-            if btts:
-                output += f"""🎯 BTTS (Les deux équipes marquent)
-• Oui: {btts.get('yes', 'N/A')}
-• Non: {btts.get('no', 'N/A')}
-
-"""
-        elif odds.get('error'):
-            output += f"""
-⚠️ ODDS API: {odds.get('error')}
-
-"""
-        
-        # ═══════════════════════════════════════════════════════════════════════
-        # RÉSUMÉ
-        # ═══════════════════════════════════════════════════════════════════════
-        output += f"""
-════════════════════════════════════════════════════════════════════════════════
-📋 RÉSUMÉ DE LA COLLECTE DE DONNÉES
-════════════════════════════════════════════════════════════════════════════════
-
-✅ Sources utilisées: {', '.join(sources) if sources else 'Aucune source externe'}
-📊 Score de qualité: {quality}%
-⏰ Collecté le: {datetime.now().strftime('%d/%m/%Y à %H:%M:%S')}
-
-"""
-        
-        if not sources:
-            output += """
-⚠️ ATTENTION: Aucune donnée externe n'a pu être collectée.
-L'analyse sera basée uniquement sur les connaissances générales de l'IA.
-Raisons possibles:
-- APIs non configurées (ajoutez API_FOOTBALL_KEY et/ou ODDS_API_KEY)
-- Match non trouvé dans les bases de données
-- Quota API épuisé
-
-"""
-        
-        output += """
-════════════════════════════════════════════════════════════════════════════════
-🎯 MISSION POUR L'IA - GÉNÈRE TES PROPRES PRÉDICTIONS
-════════════════════════════════════════════════════════════════════════════════
-
-Tu as reçu toutes les données disponibles. Maintenant:
-
-1. ANALYSE les statistiques des équipes
-2. ÉTUDIE l'historique H2H
-3. COMPARE avec les probabilités implicites des bookmakers
-4. IDENTIFIE les VALUE BETS (où tu vois une meilleure probabilité)
-5. GÉNÈRE tes prédictions pour TOUS les marchés pertinents:
-   - Résultat (1X2)
-   - Score exact
-   - Total buts (Over/Under)
-   - BTTS
-   - Corners
-   - Cartons
-   - Fautes
-   - Mi-temps
-   - Tout autre marché pertinent
-
-IMPORTANT:
-- Base-toi UNIQUEMENT sur les données fournies
-- Justifie CHAQUE prédiction
-- Donne ton niveau de confiance (%)
-- Indique si des données manquent
-
-Réponds en JSON valide uniquement.
-════════════════════════════════════════════════════════════════════════════════
-"""
-        
-        return output
-    
-    def _format_team_stats(self, stats: Dict, team_name: str) -> str:
-        """Formate les statistiques d'une équipe de manière lisible"""
-        output = f"""
-📈 STATISTIQUES SAISON - {team_name.upper()}
-────────────────────────────────────────
-
-"""
-        
-        # Forme
-        form = stats.get('form', '')
-        if form:
-            output += f"• Forme récente: {form}\n"
-        
-        # Fixtures
-        fixtures = stats.get('fixtures', {})
-        if fixtures:
-            played = fixtures.get('played', {})
-            wins = fixtures.get('wins', {})
-            draws = fixtures.get('draws', {})
-            loses = fixtures.get('loses', {})
-            
-            output += f"""• Matchs joués: {played.get('total', 'N/A')} (Dom: {played.get('home', 'N/A')}, Ext: {played.get('away', 'N/A')})
-• Victoires: {wins.get('total', 'N/A')} (Dom: {wins.get('home', 'N/A')}, Ext: {wins.get('away', 'N/A')})
-• Nuls: {draws.get('total', 'N/A')} (Dom: {draws.get('home', 'N/A')}, Ext: {draws.get('away', 'N/A')})
-• Défaites: {loses.get('total', 'N/A')} (Dom: {loses.get('home', 'N/A')}, Ext: {loses.get('away', 'N/A')})
-
-"""
-        
-        # Buts
-        goals = stats.get('goals', {})
-        if goals:
-            scored = goals.get('for', {})
-            conceded = goals.get('against', {})
-            
-            output += f"""• Buts marqués: {scored.get('total', {}).get('total', 'N/A')} (Dom: {scored.get('total', {}).get('home', 'N/A')}, Ext: {scored.get('total', {}).get('away', 'N/A')})
-• Moyenne buts marqués: {scored.get('average', {}).get('total', 'N/A')}/match
-• Buts encaissés: {conceded.get('total', {}).get('total', 'N/A')} (Dom: {conceded.get('total', {}).get('home', 'N/A')}, Ext: {conceded.get('total', {}).get('away', 'N/A')})
-• Moyenne buts encaissés: {conceded.get('average', {}).get('total', 'N/A')}/match
-
-"""
-        
-        # Clean sheets et Failed to score
-        clean_sheet = stats.get('clean_sheet', {})
-        failed = stats.get('failed_to_score', {})
-        if clean_sheet or failed:
-            output += f"""• Clean sheets: {clean_sheet.get('total', 'N/A')} (Dom: {clean_sheet.get('home', 'N/A')}, Ext: {clean_sheet.get('away', 'N/A')})
-• Matchs sans marquer: {failed.get('total', 'N/A')} (Dom: {failed.get('home', 'N/A')}, Ext: {failed.get('away', 'N/A')})
-
-"""
+        # Collecter en parallèle (source au disjoncteur ouvert: sautée sans attendre)
+        jobs = {
+            'sofascore': lambda: self.sofascore.collect_all(team1, team2, sport, deadline),
+            'api_football': lambda: self.api_football.collect_all(team1, team2, deadline),
+            'odds': lambda: self.odds.get_odds(team1, team2, sport, deadline)
+        }
+        skipped = [name for name in jobs if not circuit_breakers.get(name).available]
+        if skipped:
+            logger.info(f"🔌 Sources sautées (circuit ouvert): {', '.join(skipped)}")
+        
+        results = await asyncio.gather(
+            *(job() for name, job in jobs.items() if name not in skipped), return_exceptions=True
+        )
+        collected = dict(zip([name for name in jobs if name not in skipped], results))
+        for name, result in collected.items():
+            if isinstance(result, Exception):
+                logger.warning(f"Collecte {name} échouée: {type(result).__name__}: {result}")
+        
+        def outcome(name: str) -> Dict:
+            if name in skipped:
+                return {'success': False, 'error': 'source indisponible (circuit ouvert)'}
+            result = collected[name]
+            return {'success': False} if isinstance(result, Exception) else result
+        
+        sofascore_data = outcome('sofascore')
+        api_football_data = outcome('api_football')
+        odds_data = outcome('odds')
+        
+        self.last_sources = {
+            'sofascore': sofascore_data,
+            'api_football': api_football_data,
+            'odds': odds_data
+        }
         
-        # Cartons
-        cards = stats.get('cards', {})
-        if cards:
-            yellow = cards.get('yellow', {})
-            red = cards.get('red', {})
-            
-            total_yellow = sum(v.get('total', 0) or 0 for v in yellow.values() if isinstance(v, dict))
-            total_red = sum(v.get('total', 0) or 0 for v in red.values() if isinstance(v, dict))
-            
-            output += f"""• Cartons jaunes total: {total_yellow}
-• Cartons rouges total: {total_red}
-
-"""
+        data = CollectedData.from_sources(match, team1, team2, sport, sofascore_data, api_football_data, odds_data)
         
-        # Pénaltys
-        penalty = stats.get('penalty', {})
-        if penalty:
-            output += f"""• Pénaltys marqués: {penalty.get('scored', {}).get('total', 'N/A')}/{penalty.get('total', 'N/A')}
-• Pénaltys manqués: {penalty.get('missed', {}).get('total', 'N/A')}
-
-"""
+        # Mettre en cache la structure compacte (sauf collecte tronquée par l'échéance)
+        if deadline.has(OPTIONAL_MIN_BUDGET):
+            collector_cache.set('collection', cache_key, {'data': data.to_dict()})
         
-        return output
-    
-    def _json_to_readable(self, data: Any, max_length: int = 1500) -> str:
-        """Convertit JSON en texte lisible"""
-        try:
-            text = json.dumps(data, indent=2, ensure_ascii=False)
-            if len(text) > max_length:
-                text = text[:max_length] + "\n... [tronqué]"
-            return text
-        except:
-            return str(data)[:max_length]
+        return data
 
 # Alias pour compatibilité
 DataCollector = UltraDataCollector
-CollectedData = None  # Pour compatibilité
 
-__all__ = ['UltraDataCollector', 'DataCollector', 'SofascoreCollector', 'APIFootballCollector', 'OddsCollector']
\ No newline at end of file
+__all__ = ['UltraDataCollector', 'DataCollector', 'CollectedData', 'SofascoreCollector', 'APIFootballCollector',
+           'OddsCollector', 'refresh_fixtures_snapshot', 'prefetch_team_stats']
\ No newline at end of file
@@ -0,0 +1,65 @@
+"""
+⏱️ ÉCHÉANCES V1.0 - BUDGET DE TEMPS DE BOUT EN BOUT
+═══════════════════════════════════════════════════════════════════════════════
+Une échéance unique créée par le handler et transmise à chaque étape:
+- Collecte, sources, appels Groq: timeout = min(plafond, temps restant)
+- Sous-budgets par étape (avec réserve pour les étapes suivantes)
+- Les étapes optionnelles sont sautées quand le temps manque
+- Sans échéance: comportement historique (plafonds fixes)
+═══════════════════════════════════════════════════════════════════════════════
+"""
+import math
+import time
+from typing import Optional
+
+MIN_TIMEOUT = 0.05   # aiohttp traite un timeout nul comme "pas de timeout"
+
+
+class Deadline:
+    """Instant limite absolu (horloge monotone)"""
+
+    __slots__ = ('expires_at',)
+
+    def __init__(self, budget: float):
+        self.expires_at = time.monotonic() + budget
+
+    @classmethod
+    def unbounded(cls) -> 'Deadline':
+        deadline = cls(0)
+        deadline.expires_at = math.inf
+        return deadline
+
+    def remaining(self) -> float:
+        return max(0.0, self.expires_at - time.monotonic())
+
+    @property
+    def expired(self) -> bool:
+        return self.remaining() <= 0
+
+    def has(self, seconds: float) -> bool:
+        """Reste-t-il au moins `seconds` ?"""
+        return self.remaining() >= seconds
+
+    def timeout(self, cap: float) -> float:
+        """Timeout d'un appel: plafond historique borné par le temps restant"""
+        return max(MIN_TIMEOUT, min(cap, self.remaining()))
+
+    def child(self, budget: float, reserve: float = 0.0) -> 'Deadline':
+        """
+        Sous-échéance d'une étape: au plus `budget` secondes, en laissant
+        `reserve` secondes aux étapes suivantes.
+        """
+        child = Deadline(budget)
+        child.expires_at = min(child.expires_at, self.expires_at - reserve)
+        return child
+
+    def __repr__(self) -> str:
+        return f"Deadline(remaining={self.remaining():.1f}s)"
+
+
+def ensure(deadline: Optional[Deadline]) -> Deadline:
+    """Échéance fournie, ou illimitée"""
+    return deadline if deadline is not None else Deadline.unbounded()
+
+
+__all__ = ['Deadline', 'ensure']
@@ -0,0 +1,84 @@
+"""
+🪪 IDENTITÉ CANONIQUE DES RENCONTRES
+═══════════════════════════════════════════════════════════════════════════════
+Les ids VIPRow (md5 sport_titre_date) changent dès que le titre varie
+ou que le scraping passe minuit. Ce module fournit:
+- fixture_key(): sport + paire d'équipes canonique (alias résolus) + date du coup d'envoi
+- data_fingerprint(): empreinte des données collectées (hors champs volatils)
+La prédiction est réutilisée tant que la rencontre et ses données sont les mêmes.
+═══════════════════════════════════════════════════════════════════════════════
+"""
+import hashlib
+import json
+import re
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional
+
+from team_resolver import canonical_name, normalize_name
+
+# Champs qui changent sans que l'information change
+VOLATILE_KEYS = {
+    'changes', 'changeTimestamp', 'lastUpdated', 'last_update', 'timestamp',
+    'requests_used', 'requests_remaining', 'collected_at', 'fetched_at'
+}
+
+# Un coup d'envoi "dans le passé" de plus de 12h appartient au lendemain
+KICKOFF_ROLLOVER_HOURS = 12
+
+
+def kickoff_date(match: Dict) -> str:
+    """Date (AAAA-MM-JJ) du coup d'envoi, déduite de scraped_at + start_time"""
+    try:
+        scraped = datetime.fromisoformat(match.get('scraped_at') or '')
+    except ValueError:
+        scraped = datetime.now()
+
+    time_match = re.search(r'(\d{1,2}):(\d{2})', match.get('start_time') or '')
+    if not time_match:
+        return scraped.date().isoformat()
+
+    hour, minute = int(time_match.group(1)) % 24, int(time_match.group(2)) % 60
+    kickoff = scraped.replace(hour=hour, minute=minute, second=0, microsecond=0)
+    if kickoff < scraped - timedelta(hours=KICKOFF_ROLLOVER_HOURS):
+        kickoff += timedelta(days=1)
+    elif kickoff > scraped + timedelta(hours=KICKOFF_ROLLOVER_HOURS):
+        kickoff -= timedelta(days=1)
+    return kickoff.date().isoformat()
+
+
+def fixture_key(match: Dict) -> str:
+    """Clé stable d'une rencontre: sport|équipe1|équipe2|date ("PSG" == "Paris Saint-Germain")"""
+    sport = (match.get('sport') or 'football').lower()
+    team1 = canonical_name(match.get('team1', ''))
+    team2 = canonical_name(match.get('team2', ''))
+    if not team1 or not team2:
+        # Événement sans adversaire identifiable: le titre normalisé fait foi
+        team1, team2 = normalize_name(match.get('title', '')), ''
+    return f"{sport}|{team1}|{team2}|{kickoff_date(match)}"
+
+
+def _strip_volatile(value: Any) -> Any:
+    if isinstance(value, dict):
+        return {k: _strip_volatile(v) for k, v in value.items() if k not in VOLATILE_KEYS}
+    if isinstance(value, list):
+        return [_strip_volatile(v) for v in value]
+    return value
+
+
+def data_fingerprint(sources: Optional[Dict[str, Dict]]) -> str:
+    """
+    Empreinte des données brutes des collecteurs ({source: {'success', 'data'}}).
+    Chaîne vide si aucune source n'a renvoyé de données.
+    """
+    payload = {
+        name: _strip_volatile(source.get('data'))
+        for name, source in (sources or {}).items()
+        if isinstance(source, dict) and source.get('data')
+    }
+    if not payload:
+        return ""
+    encoded = json.dumps(payload, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha1(encoded.encode('utf-8')).hexdigest()
+
+
+__all__ = ['fixture_key', 'kickoff_date', 'data_fingerprint']
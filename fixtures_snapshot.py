@@ -0,0 +1,154 @@
+"""
+📅 INSTANTANÉ DES MATCHS API-FOOTBALL V1.0 - UNE REQUÊTE PAR JOUR ET PAR DATE
+═══════════════════════════════════════════════════════════════════════════════
+La liste /fixtures?date= n'est plus téléchargée à chaque prédiction:
+- Un instantané par date (aujourd'hui, demain), rafraîchi périodiquement
+  (tâche de fond) et persisté dans le cache des collecteurs
+- Index nom d'équipe normalisé -> matchs: recherche en mémoire, O(1)
+  (TeamPairIndex du résolveur d'équipes)
+- Requêtes consommées comptées (quota gratuit: 100 req/jour)
+═══════════════════════════════════════════════════════════════════════════════
+"""
+import asyncio
+import logging
+import time
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+import aiohttp
+
+from collector_cache import collector_cache
+from deadline import Deadline, ensure
+from http_cache import http_cache
+from team_resolver import TeamPairIndex
+
+logger = logging.getLogger("footbot.fixtures_snapshot")
+
+# ════════════════════════════════════════════════════════════════════════════
+# ⚙️ CONFIGURATION
+# ════════════════════════════════════════════════════════════════════════════
+
+FIXTURES_REFRESH_INTERVAL = 3 * 3600    # 2 dates x 8 rafraîchissements = 16 req/jour max
+
+
+class FixtureIndex(TeamPairIndex):
+    """Matchs API-Football d'une date"""
+
+    __slots__ = ('date',)
+
+    def __init__(self, date: str, fixtures: List[Dict]):
+        super().__init__(fixtures, lambda f: (f.get('teams', {}).get('home', {}).get('name', ''),
+                                              f.get('teams', {}).get('away', {}).get('name', '')))
+        self.date = date
+
+    @property
+    def fixtures(self) -> List[Dict]:
+        return self.items
+
+
+class FixturesSnapshot:
+    """Instantanés par date + comptage des requêtes"""
+
+    def __init__(self, refresh_interval: float = FIXTURES_REFRESH_INTERVAL):
+        self.refresh_interval = refresh_interval
+        self._indexes: Dict[str, FixtureIndex] = {}
+        self._locks: Dict[str, asyncio.Lock] = {}
+        self.stats = {'requests': 0, 'lookups': 0, 'found': 0, 'refreshes': 0}
+
+    @staticmethod
+    def dates() -> List[str]:
+        today = datetime.now()
+        return [today.strftime("%Y-%m-%d"), (today + timedelta(days=1)).strftime("%Y-%m-%d")]
+
+    def _fresh(self, date: str) -> Optional[FixtureIndex]:
+        index = self._indexes.get(date)
+        if index and time.time() - index.built_at < self.refresh_interval:
+            return index
+        return None
+
+    async def _download(self, session: aiohttp.ClientSession, api_url: str, headers: Dict,
+                        date: str, deadline: Deadline) -> Optional[List[Dict]]:
+        # ttl=0: chaque rafraîchissement revalide (304 si la liste n'a pas changé).
+        # Une liste du jour sert toutes les prédictions: refusée seulement quota épuisé
+        response = await http_cache.get_json(session, f"{api_url}/fixtures", params={'date': date},
+                                             headers=headers, timeout=15, ttl=0,
+                                             quota=('api_football', 1.0), breaker='api_football',
+                                             deadline=deadline)
+        if response.sent:
+            self.stats['requests'] += 1
+        if response.ok:
+            fixtures = response.data.get('response', [])
+            remaining = response.headers.get('x-ratelimit-requests-remaining', '?')
+            logger.info(f"📅 API-Football {date}: {len(fixtures)} matchs, quota restant: {remaining}")
+            return fixtures
+        if response.status == 429:
+            logger.error("❌ API-Football: Quota épuisé (100 req/jour)")
+        elif response.status:
+            logger.warning(f"API-Football fixtures {date}: {response.status}")
+        elif response.source == 'error':
+            logger.error(f"❌ API-Football fixtures {date}: erreur réseau")
+        return None
+
+    async def get_index(self, session: aiohttp.ClientSession, api_url: str, headers: Dict,
+                        date: str, deadline: Optional[Deadline] = None,
+                        force: bool = False) -> Optional[FixtureIndex]:
+        """Index de la date: mémoire, sinon cache persistant, sinon une requête"""
+        deadline = ensure(deadline)
+        index = None if force else self._fresh(date)
+        if index:
+            return index
+
+        lock = self._locks.setdefault(date, asyncio.Lock())
+        async with lock:
+            index = None if force else self._fresh(date)
+            if index:
+                return index
+            fixtures = None if force else collector_cache.get('fixtures_day', date)
+            if fixtures is None:
+                fixtures = await self._download(session, api_url, headers, date, deadline)
+                if fixtures is None:
+                    return self._indexes.get(date)     # Ancien instantané plutôt que rien
+                collector_cache.set('fixtures_day', date, fixtures, ttl=self.refresh_interval)
+                self.stats['refreshes'] += 1
+            index = self._indexes[date] = FixtureIndex(date, fixtures)
+            for stale in [d for d in self._indexes if d not in self.dates()]:
+                del self._indexes[stale]
+            return index
+
+    async def find(self, session: aiohttp.ClientSession, api_url: str, headers: Dict,
+                   team1: str, team2: str, dates: List[str],
+                   deadline: Optional[Deadline] = None) -> Optional[Dict]:
+        """Cherche le match dans les instantanés des dates données, dans l'ordre"""
+        deadline = ensure(deadline)
+        self.stats['lookups'] += 1
+        for date in dates:
+            if deadline.expired:
+                break
+            index = await self.get_index(session, api_url, headers, date, deadline)
+            fixture = index.find(team1, team2) if index else None
+            if fixture:
+                self.stats['found'] += 1
+                return fixture
+        return None
+
+    async def refresh(self, api_url: str, headers: Dict) -> int:
+        """Rafraîchit les instantanés périmés (tâche de fond); retourne le nombre de requêtes"""
+        before = self.stats['requests']
+        async with aiohttp.ClientSession() as session:
+            for date in self.dates():
+                if not self._fresh(date):
+                    await self.get_index(session, api_url, headers, date, force=True)
+        return self.stats['requests'] - before
+
+    def get_stats(self) -> Dict:
+        return {
+            **self.stats,
+            'dates': {date: len(index.fixtures) for date, index in self._indexes.items()}
+        }
+
+
+# Instance globale
+fixtures_snapshot = FixturesSnapshot()
+
+
+__all__ = ['FixturesSnapshot', 'FixtureIndex', 'fixtures_snapshot']
@@ -34,6 +34,9 @@ from telegram.ext import (
 )
 from telegram.error import TelegramError
 
+from rate_limiter import rate_limiter, classify_callback
+from prediction_queue import prediction_queue
+
 # ════════════════════════════════════════════════════════════════════════════
 # ⚙️ CONFIGURATION
 # ════════════════════════════════════════════════════════════════════════════
@@ -48,6 +51,7 @@ logger = logging.getLogger("footbot")
 try:
     from prediction_module import (
         handle_prediction_request,
+        show_prediction_page,
         handle_vote,
         show_community_votes,
         show_user_prediction_stats,
@@ -88,6 +92,51 @@ except ImportError as e:
         EventValidator = None
         logger.warning(f"⚠️ Aucun module de prédictions disponible: {e2}")
 
+# Règlement des pronostics (résultats en lot)
+try:
+    from settlement import settlement_engine
+    SETTLEMENT_AVAILABLE = True
+except ImportError as e:
+    settlement_engine = None
+    SETTLEMENT_AVAILABLE = False
+    logger.warning(f"⚠️ Règlement des pronostics non disponible: {e}")
+
+# Préchauffage des prédictions (matchs populaires analysés en fond)
+try:
+    from prewarm import prewarm_scheduler
+    PREWARM_AVAILABLE = True
+except ImportError as e:
+    prewarm_scheduler = None
+    PREWARM_AVAILABLE = False
+    logger.warning(f"⚠️ Préchauffage des prédictions non disponible: {e}")
+
+# Instantanés API-Football du jour (une requête par date et par intervalle)
+try:
+    from data_collector import refresh_fixtures_snapshot
+    FIXTURES_SNAPSHOT_AVAILABLE = True
+except ImportError as e:
+    refresh_fixtures_snapshot = None
+    FIXTURES_SNAPSHOT_AVAILABLE = False
+    logger.warning(f"⚠️ Instantanés API-Football non disponibles: {e}")
+
+# Stats de saison des équipes (préchargées aux heures creuses)
+try:
+    from data_collector import prefetch_team_stats
+    TEAM_STATS_PREFETCH_AVAILABLE = True
+except ImportError as e:
+    prefetch_team_stats = None
+    TEAM_STATS_PREFETCH_AVAILABLE = False
+    logger.warning(f"⚠️ Préchargement des stats d'équipes non disponible: {e}")
+
+# Registre persistant des quotas API (sauvegardé à l'arrêt)
+try:
+    from quota_ledger import quota_ledger
+    QUOTA_LEDGER_AVAILABLE = True
+except ImportError as e:
+    quota_ledger = None
+    QUOTA_LEDGER_AVAILABLE = False
+    logger.warning(f"⚠️ Registre des quotas non disponible: {e}")
+
 
 # Configuration Bot
 BOT_TOKEN = os.environ.get("FOOTBOT_TOKEN", "").strip()
@@ -136,10 +185,12 @@ MAX_RETRIES = 3
 TIMEOUT = 25
 REQUEST_DELAY = 0.5
 AUTO_UPDATE_INTERVAL = 600  # 10 minutes
+SETTLEMENT_INTERVAL = 10800  # 3 heures
 
 # Variables globales
 background_tasks: set = set()
 shutdown_event: Optional[asyncio.Event] = None
+prewarm_task: Optional[asyncio.Task] = None
 
 # ════════════════════════════════════════════════════════════════════════════
 # 📦 GESTIONNAIRE DE DONNÉES
@@ -588,7 +639,11 @@ class VIPRowScraper:
                 logger.error(f"Erreur scraping: {result}")
         
         final_matches = list({m['id']: m for m in all_matches}.values())
-        
+
+        # Validation unique par scraping (les handlers réutilisent le score stocké)
+        if EventValidator:
+            EventValidator.validate_batch(final_matches)
+
         data = DataManager.load_data()
         data['matches'] = final_matches
         data['last_update'] = datetime.now().isoformat()
@@ -1516,6 +1571,14 @@ async def callback_handler(update: Update, context: ContextTypes.DEFAULT_TYPE):
             await query.answer("⚠️ Rejoignez le canal d'abord !", show_alert=True)
             return
     
+    # Limitation de débit (les prédictions sont limitées par palier dans leur handler)
+    action = classify_callback(data)
+    if user_id not in ADMIN_IDS and action != 'predict':
+        allowed, retry_after = rate_limiter.check(user_id, action)
+        if not allowed:
+            await query.answer(f"⏳ Trop de requêtes - réessayez dans {retry_after}s")
+            return
+    
     # ═══════════════════════════════════════════════════════════════════════
     # NAVIGATION PRINCIPALE
     # ═══════════════════════════════════════════════════════════════════════
@@ -1554,10 +1617,21 @@ async def callback_handler(update: Update, context: ContextTypes.DEFAULT_TYPE):
         sport = data.split("_", 2)[2]
         await show_matches_for_prediction(query, sport)
     
+    elif data.startswith("cancel_predict_"):
+        match_id = data.split("_", 2)[2]
+        await query.answer("🚫 Analyse annulée")
+        # L'écran de chargement affiche l'annulation; sans analyse en cours, retour au match
+        if not prediction_queue.cancel_user(user_id):
+            await watch_match(query, match_id)
+    
     elif data.startswith("predict_") and PREDICTIONS_ENABLED:
         match_id = data.split("_", 1)[1]
         await handle_prediction_request(query, match_id, DataManager)
     
+    elif data.startswith("predpage_") and PREDICTIONS_ENABLED:
+        match_id, _, page = data[len("predpage_"):].rpartition("_")
+        await show_prediction_page(query, match_id, int(page), DataManager)
+    
     elif data.startswith("vote_") and PREDICTIONS_ENABLED:
         parts = data.split("_")
         if len(parts) == 3:
@@ -1632,9 +1706,21 @@ async def callback_handler(update: Update, context: ContextTypes.DEFAULT_TYPE):
 # 🔄 TÂCHES DE FOND
 # ════════════════════════════════════════════════════════════════════════════
 
+async def prewarm_cycle(matches: List[Dict], favorites: Dict):
+    """Préchauffage en tâche séparée: le cycle de mise à jour ne l'attend pas"""
+    try:
+        warmed = await prewarm_scheduler.run(matches, favorites)
+        if warmed:
+            logger.info(f"🔥 Préchauffage: {warmed} prédictions prêtes")
+    except asyncio.CancelledError:
+        raise
+    except Exception as e:
+        logger.error(f"Erreur préchauffage: {e}")
+
+
 async def auto_update_task():
     """Tâche de mise à jour automatique"""
-    global shutdown_event
+    global shutdown_event, prewarm_task
     
     await asyncio.sleep(60)
     
@@ -1650,6 +1736,27 @@ async def auto_update_task():
                 count = await scraper.scrape_all_sports()
             logger.info(f"✅ MAJ auto terminée: {count} événements")
             
+            if FIXTURES_SNAPSHOT_AVAILABLE and PREDICTIONS_ENABLED:
+                used = await refresh_fixtures_snapshot()
+                if used:
+                    logger.info(f"📅 Instantanés API-Football rafraîchis ({used} requêtes)")
+            
+            if TEAM_STATS_PREFETCH_AVAILABLE and PREDICTIONS_ENABLED:
+                fetched = await prefetch_team_stats(DataManager.load_data().get('matches', []))
+                if fetched:
+                    logger.info(f"📚 Stats d'équipes préchargées: {fetched}")
+            
+            if PREWARM_AVAILABLE and PREDICTIONS_ENABLED:
+                if prewarm_task and not prewarm_task.done():
+                    logger.info("🔥 Préchauffage précédent encore en cours - cycle sauté")
+                else:
+                    prewarm_task = asyncio.create_task(
+                        prewarm_cycle(DataManager.load_data().get('matches', []), DataManager.load_favorites()),
+                        name="footbot_prewarm"
+                    )
+                    background_tasks.add(prewarm_task)
+                    prewarm_task.add_done_callback(background_tasks.discard)
+            
         except asyncio.CancelledError:
             break
         except Exception as e:
@@ -1665,6 +1772,40 @@ async def auto_update_task():
             continue
 
 
+async def settlement_task():
+    """Tâche de règlement des pronostics et votes en attente"""
+    # Modèle statistique ajusté dès le démarrage sur les stats persistées
+    try:
+        settlement_engine.refit_model()
+    except Exception as e:
+        logger.error(f"Erreur ajustement du modèle statistique: {e}")
+    
+    await asyncio.sleep(300)
+    
+    logger.info("🏁 Tâche de règlement démarrée")
+    
+    while True:
+        try:
+            if shutdown_event and shutdown_event.is_set():
+                break
+            
+            await settlement_engine.run()
+            
+        except asyncio.CancelledError:
+            break
+        except Exception as e:
+            logger.error(f"Erreur règlement: {e}")
+        
+        try:
+            if shutdown_event:
+                await asyncio.wait_for(shutdown_event.wait(), timeout=SETTLEMENT_INTERVAL)
+                break
+            else:
+                await asyncio.sleep(SETTLEMENT_INTERVAL)
+        except asyncio.TimeoutError:
+            continue
+
+
 async def daily_reset_task():
     """Tâche de reset quotidien à minuit"""
     global shutdown_event
@@ -1728,7 +1869,9 @@ def main():
         logger.info("🔮 Prédictions: ❌ Désactivé")
     
     # Créer l'application
-    application = Application.builder().token(BOT_TOKEN).build()
+    # Mises à jour concurrentes: une analyse en file ne bloque ni les autres
+    # utilisateurs ni le bouton d'annulation
+    application = Application.builder().token(BOT_TOKEN).concurrent_updates(True).build()
     
     # Handlers de commandes
     application.add_handler(CommandHandler("start", cmd_start))
@@ -1780,7 +1923,9 @@ async def main_async():
     
     shutdown_event = asyncio.Event()
     
-    application = Application.builder().token(BOT_TOKEN).build()
+    # Mises à jour concurrentes: une analyse en file ne bloque ni les autres
+    # utilisateurs ni le bouton d'annulation
+    application = Application.builder().token(BOT_TOKEN).concurrent_updates(True).build()
     
     # Handlers
     application.add_handler(CommandHandler("start", cmd_start))
@@ -1810,6 +1955,11 @@ async def main_async():
         task_update.add_done_callback(background_tasks.discard)
         task_reset.add_done_callback(background_tasks.discard)
         
+        if SETTLEMENT_AVAILABLE:
+            task_settlement = asyncio.create_task(settlement_task(), name="footbot_settlement")
+            background_tasks.add(task_settlement)
+            task_settlement.add_done_callback(background_tasks.discard)
+        
         logger.info("🔄 Tâches de fond démarrées")
         
         try:
@@ -1830,6 +1980,9 @@ async def main_async():
             await application.updater.stop()
             await application.stop()
             
+            if QUOTA_LEDGER_AVAILABLE:
+                quota_ledger.save(force=True)
+            
             logger.info("👋 FootBot V2 arrêté proprement")
 
 
@@ -0,0 +1,243 @@
+"""
+🌐 CACHE HTTP V1.0 - FRAÎCHEUR, REVALIDATION CONDITIONNELLE, 404 NÉGATIFS
+═══════════════════════════════════════════════════════════════════════════════
+Couche GET JSON partagée par les collecteurs (Sofascore, API-Football, Odds):
+- Fraîcheur selon Cache-Control max-age / Expires, sinon TTL de l'appelant
+- Réponse périmée avec ETag / Last-Modified: requête conditionnelle,
+  un 304 réutilise le corps en cache (pas de JSON retéléchargé)
+- 404 mis en cache (négatif) pour ne pas redemander une ressource absente
+- Corps stockés compressés (zlib), LRU borné en octets
+- Quota: autorisation, comptage et recalage via le registre des quotas,
+  uniquement quand une requête part réellement
+- Disjoncteur par source: source en panne refusée sans attendre le timeout,
+  timeout adapté aux latences observées; un timeout raccourci par
+  l'échéance de l'appelant ne compte pas comme un échec de la source
+═══════════════════════════════════════════════════════════════════════════════
+"""
+import asyncio
+import email.utils
+import hashlib
+import json
+import logging
+import os
+import re
+import time
+import zlib
+from collections import OrderedDict
+from typing import Any, Dict, Mapping, Optional, Tuple
+
+import aiohttp
+
+from circuit_breaker import FAILURE_STATUSES, circuit_breakers
+from deadline import Deadline, ensure
+from quota_ledger import quota_ledger
+
+logger = logging.getLogger("footbot.http_cache")
+
+# ════════════════════════════════════════════════════════════════════════════
+# ⚙️ CONFIGURATION
+# ════════════════════════════════════════════════════════════════════════════
+
+HTTP_CACHE_MAX_BYTES = int(os.environ.get("HTTP_CACHE_MB", "32")) * 1024 * 1024
+DEFAULT_TTL = 60             # Fraîcheur si le serveur ne dit rien
+NEGATIVE_TTL = 600           # Durée de vie d'un 404
+STALE_KEEP = 6 * 3600        # Entrée périmée gardée pour revalidation
+
+# En-têtes de réponse conservés avec le corps (quotas, validateurs)
+KEPT_HEADERS = (
+    'etag', 'last-modified', 'x-ratelimit-requests-remaining',
+    'x-requests-remaining', 'x-requests-used'
+)
+
+_MAX_AGE_RE = re.compile(r'max-age=(\d+)')
+
+
+class HttpResult:
+    """Réponse (éventuellement servie par le cache)"""
+
+    __slots__ = ('status', 'data', 'headers', 'source')
+
+    def __init__(self, status: Optional[int], data: Any = None,
+                 headers: Optional[Dict[str, str]] = None, source: str = 'network'):
+        self.status = status          # None: requête non envoyée (quota, réseau)
+        self.data = data
+        self.headers = headers or {}
+        self.source = source          # network | fresh | revalidated | negative | denied | open | error
+
+    @property
+    def ok(self) -> bool:
+        return self.status == 200
+
+    @property
+    def sent(self) -> bool:
+        """Une requête est réellement partie (comptée dans les quotas)"""
+        return self.source in ('network', 'revalidated')
+
+
+class _Entry:
+    __slots__ = ('status', 'body', 'headers', 'fresh_until', 'size')
+
+    def __init__(self, status: int, body: bytes, headers: Dict[str, str], fresh_until: float):
+        self.status = status
+        self.body = body
+        self.headers = headers
+        self.fresh_until = fresh_until
+        self.size = len(body) + 256
+
+
+def _freshness(headers: Mapping, default_ttl: float) -> float:
+    """Durée de fraîcheur annoncée par le serveur (secondes)"""
+    control = headers.get('Cache-Control', '').lower()
+    if 'no-store' in control or 'no-cache' in control:
+        return 0.0
+    match = _MAX_AGE_RE.search(control)
+    if match:
+        return float(match.group(1))
+    expires = headers.get('Expires')
+    if expires:
+        try:
+            return max(0.0, email.utils.parsedate_to_datetime(expires).timestamp() - time.time())
+        except (TypeError, ValueError):
+            pass
+    return default_ttl
+
+
+class HttpCache:
+    """LRU de réponses compressées, clé = URL + paramètres (hachée)"""
+
+    def __init__(self, max_bytes: int = HTTP_CACHE_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self._entries: 'OrderedDict[str, _Entry]' = OrderedDict()
+        self._bytes = 0
+        self.stats = {'fresh': 0, 'revalidated': 0, 'negative': 0, 'network': 0,
+                      'denied': 0, 'open': 0, 'errors': 0, 'bytes_saved': 0}
+
+    @staticmethod
+    def _key(url: str, params: Optional[Mapping]) -> str:
+        # Haché: les clés d'API présentes dans les paramètres ne sont pas conservées en clair
+        query = '&'.join(f"{k}={v}" for k, v in sorted((params or {}).items()))
+        return hashlib.sha1(f"{url}?{query}".encode('utf-8')).hexdigest()
+
+    def _store(self, key: str, entry: _Entry):
+        old = self._entries.pop(key, None)
+        if old:
+            self._bytes -= old.size
+        self._entries[key] = entry
+        self._bytes += entry.size
+        while self._bytes > self.max_bytes and self._entries:
+            _, evicted = self._entries.popitem(last=False)
+            self._bytes -= evicted.size
+
+    def _lookup(self, key: str, now: float) -> Optional[_Entry]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if now > entry.fresh_until + STALE_KEEP:
+            self._bytes -= entry.size
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    @staticmethod
+    def _decode(entry: _Entry) -> Any:
+        return json.loads(zlib.decompress(entry.body)) if entry.body else None
+
+    async def get_json(self, session: aiohttp.ClientSession, url: str,
+                       params: Optional[Dict] = None, headers: Optional[Dict] = None,
+                       timeout: float = 10, ttl: float = DEFAULT_TTL,
+                       quota: Optional[Tuple[str, float]] = None,
+                       breaker: Optional[str] = None,
+                       deadline: Optional[Deadline] = None) -> HttpResult:
+        """
+        GET JSON via le cache. `quota` = (fournisseur, valeur du match): la
+        requête réseau est soumise au registre des quotas. `breaker` = nom de
+        la source: circuit ouvert -> réponse 'open' immédiate, `timeout` devient
+        un plafond ajusté sur les latences observées. `deadline` borne ensuite
+        le timeout au temps restant de l'appelant.
+        """
+        now = time.time()
+        key = self._key(url, params)
+        entry = self._lookup(key, now)
+
+        if entry and now < entry.fresh_until:
+            if entry.status == 404:
+                self.stats['negative'] += 1
+                return HttpResult(404, None, entry.headers, 'negative')
+            self.stats['fresh'] += 1
+            return HttpResult(entry.status, self._decode(entry), entry.headers, 'fresh')
+
+        if quota and not quota_ledger.allow(*quota):
+            self.stats['denied'] += 1
+            return HttpResult(None, None, {}, 'denied')
+
+        circuit = circuit_breakers.get(breaker) if breaker else None
+        if circuit:
+            if not circuit.allow():
+                self.stats['open'] += 1
+                return HttpResult(None, None, {}, 'open')
+            timeout = circuit.timeout(timeout)
+        limit = timeout
+        timeout = ensure(deadline).timeout(limit)
+
+        request_headers = dict(headers or {})
+        if entry and entry.status == 200:
+            if entry.headers.get('etag'):
+                request_headers['If-None-Match'] = entry.headers['etag']
+            if entry.headers.get('last-modified'):
+                request_headers['If-Modified-Since'] = entry.headers['last-modified']
+
+        started = time.monotonic()
+        try:
+            if quota:
+                quota_ledger.charge(quota[0])
+            async with session.get(url, params=params, headers=request_headers, timeout=timeout) as r:
+                if quota:
+                    quota_ledger.observe(quota[0], r.headers)
+                if circuit:
+                    if r.status in FAILURE_STATUSES:
+                        circuit.record_failure(f"HTTP {r.status}")
+                    else:
+                        circuit.record_success(time.monotonic() - started)
+                kept = {name: r.headers[name] for name in KEPT_HEADERS if name in r.headers}
+                fresh_for = _freshness(r.headers, ttl)
+
+                if r.status == 304 and entry:
+                    entry.headers.update(kept)
+                    entry.fresh_until = time.time() + fresh_for
+                    self.stats['revalidated'] += 1
+                    self.stats['bytes_saved'] += len(entry.body)
+                    return HttpResult(200, self._decode(entry), entry.headers, 'revalidated')
+
+                if r.status == 404:
+                    self._store(key, _Entry(404, b'', kept, time.time() + NEGATIVE_TTL))
+                    self.stats['network'] += 1
+                    return HttpResult(404, None, kept)
+
+                if r.status != 200:
+                    self.stats['network'] += 1
+                    return HttpResult(r.status, None, kept)
+
+                raw = await r.read()
+                data = json.loads(raw)
+                self._store(key, _Entry(200, zlib.compress(raw, 6), kept, time.time() + fresh_for))
+                self.stats['network'] += 1
+                return HttpResult(200, data, kept)
+        except (aiohttp.ClientError, asyncio.TimeoutError, ValueError) as e:
+            self.stats['errors'] += 1
+            # Timeout raccourci par l'échéance: l'appelant était pressé, la source pas forcément lente
+            clipped = isinstance(e, asyncio.TimeoutError) and timeout < limit
+            if circuit and not isinstance(e, ValueError) and not clipped:
+                circuit.record_failure(type(e).__name__)
+            logger.debug(f"HTTP {url}: {e}")
+            return HttpResult(None, None, {}, 'error')
+
+    def get_stats(self) -> Dict:
+        return {**self.stats, 'entries': len(self._entries), 'bytes': self._bytes}
+
+
+# Instance globale
+http_cache = HttpCache()
+
+
+__all__ = ['HttpCache', 'HttpResult', 'http_cache']
@@ -117,6 +117,8 @@ class HealthCheckHandler(BaseHTTPRequestHandler):
             self._send_health_response()
         elif self.path == '/stats':
             self._send_stats_response()
+        elif self.path == '/metrics':
+            self._send_metrics_response()
         elif self.path == '/backup':
             self._trigger_backup()
         else:
@@ -127,6 +129,15 @@ class HealthCheckHandler(BaseHTTPRequestHandler):
         self.send_header('Content-type', 'text/plain')
         self.end_headers()
     
+    @staticmethod
+    def _source_breakers() -> dict:
+        """État des disjoncteurs des sources de données (vide si module absent)"""
+        try:
+            from circuit_breaker import circuit_breakers
+            return circuit_breakers.report()
+        except ImportError:
+            return {}
+    
     def _send_health_response(self):
         status = bot_status.get_status()
         
@@ -140,6 +151,15 @@ class HealthCheckHandler(BaseHTTPRequestHandler):
             emoji = "🟢" if info['status'] == "running" else "🔴"
             response += f"   {emoji} {name}: {info['status']}\n"
         
+        breakers = self._source_breakers()
+        if breakers:
+            response += "🔌 Sources:\n"
+            for name, info in breakers.items():
+                emoji = {"closed": "🟢", "half_open": "🟡"}.get(info['state'], "🔴")
+                detail = f" (reprise dans {info['retry_in']:.0f}s, {info['last_error']})" if info['state'] == "open" else ""
+                p95 = f", p95 {info['p95_ms']}ms" if info['p95_ms'] is not None else ""
+                response += f"   {emoji} {name}: {info['state']}{p95}{detail}\n"
+        
         self.send_response(200)
         self.send_header('Content-type', 'text/plain; charset=utf-8')
         self.send_header('X-Bot-Status', 'healthy')
@@ -149,12 +169,33 @@ class HealthCheckHandler(BaseHTTPRequestHandler):
     def _send_stats_response(self):
         import json
         status = bot_status.get_status()
+        status['sources'] = self._source_breakers()
         
         self.send_response(200)
         self.send_header('Content-type', 'application/json')
         self.end_headers()
         self.wfile.write(json.dumps(status, indent=2).encode('utf-8'))
     
+    def _send_metrics_response(self):
+        """Télémétrie Groq (tokens, latences, coût, fallback)"""
+        import json
+        try:
+            from telemetry import telemetry
+            metrics = telemetry.snapshot()
+            try:
+                from quota_ledger import quota_ledger
+                metrics['quotas'] = quota_ledger.get_stats()
+            except ImportError:
+                pass
+            self.send_response(200)
+        except Exception as e:
+            metrics = {"error": str(e)}
+            self.send_response(500)
+        
+        self.send_header('Content-type', 'application/json')
+        self.end_headers()
+        self.wfile.write(json.dumps(metrics, indent=2).encode('utf-8'))
+    
     def _trigger_backup(self):
         """Endpoint pour déclencher un backup manuel"""
         try:
@@ -199,7 +240,7 @@ class HTTPServerThread(threading.Thread):
             self.server = HTTPServer(('0.0.0.0', self.port), HealthCheckHandler)
             self.server.timeout = 1
             logger.info(f"🌐 Serveur HTTP démarré sur le port {self.port}")
-            logger.info(f"   📍 Endpoints: /health, /ping, /status, /stats, /backup")
+            logger.info(f"   📍 Endpoints: /health, /ping, /status, /stats, /metrics, /backup")
             
             while not self._stop_event.is_set():
                 self.server.handle_request()
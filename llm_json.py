@@ -0,0 +1,351 @@
+"""
+🧩 JSON DES MODÈLES V1.0 - PARSING TOLÉRANT + SCHÉMA DES PRÉDICTIONS
+═══════════════════════════════════════════════════════════════════════════════
+Les réponses Groq ne sont plus jetées à la première erreur de syntaxe:
+- Parseur tolérant, utilisable sur n'importe quel préfixe (réponse tronquée
+  ou flux): récupère tous les champs complets, ignore le texte autour,
+  les blocs ```json, les commentaires // et les virgules finales
+- Normalisation vers le format lu par TelegramFormatter (alias des marchés,
+  pourcentages "45%" -> 45, best_bet remonté dans predictions)
+- Champs requis par schéma: la liste des manquants sert à une relance ciblée
+  (seulement ces champs) au lieu d'un nouvel appel complet
+═══════════════════════════════════════════════════════════════════════════════
+"""
+import json
+import re
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence
+
+# ════════════════════════════════════════════════════════════════════════════
+# 🧩 PARSEUR TOLÉRANT
+# ════════════════════════════════════════════════════════════════════════════
+
+_LITERALS = {'true': True, 'false': False, 'null': None, 'True': True, 'False': False, 'None': None}
+_NUMBER_RE = re.compile(r'-?(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?')
+_ESCAPES = {'"': '"', '\\': '\\', '/': '/', 'b': '\b', 'f': '\f', 'n': '\n', 'r': '\r', 't': '\t'}
+
+
+class ParseResult(NamedTuple):
+    value: Any
+    complete: bool          # False: texte tronqué ou réparé, valeur partielle
+
+
+class _Incomplete(Exception):
+    """Fin du texte (ou syntaxe irrécupérable) au milieu d'une valeur"""
+
+
+class _LenientParser:
+    """Descente récursive; les objets/listes ouverts gardent leurs éléments complets"""
+
+    def __init__(self, text: str):
+        self.text = text
+        self.pos = 0
+
+    def _skip(self):
+        text, n = self.text, len(self.text)
+        while self.pos < n:
+            char = text[self.pos]
+            if char in ' \t\r\n':
+                self.pos += 1
+            elif text.startswith('//', self.pos):
+                end = text.find('\n', self.pos)
+                self.pos = n if end < 0 else end + 1
+            elif text.startswith('/*', self.pos):
+                end = text.find('*/', self.pos + 2)
+                self.pos = n if end < 0 else end + 2
+            else:
+                break
+
+    def _peek(self) -> str:
+        self._skip()
+        if self.pos >= len(self.text):
+            raise _Incomplete()
+        return self.text[self.pos]
+
+    def value(self) -> Any:
+        char = self._peek()
+        if char == '{':
+            return self._object()
+        if char == '[':
+            return self._array()
+        if char == '"':
+            return self._string()
+        match = _NUMBER_RE.match(self.text, self.pos)
+        if match:
+            end = match.end()
+            if end >= len(self.text):
+                raise _Incomplete()   # "4" peut être le début de "45"
+            self.pos = end
+            number = match.group()
+            return float(number) if any(c in number for c in '.eE') else int(number)
+        for literal, parsed in _LITERALS.items():
+            if self.text.startswith(literal, self.pos):
+                self.pos += len(literal)
+                return parsed
+        raise _Incomplete()
+
+    def _string(self) -> str:
+        text, n = self.text, len(self.text)
+        self.pos += 1
+        parts = []
+        start = self.pos
+        while self.pos < n:
+            char = text[self.pos]
+            if char == '"':
+                parts.append(text[start:self.pos])
+                self.pos += 1
+                return ''.join(parts)
+            if char == '\\':
+                parts.append(text[start:self.pos])
+                if self.pos + 1 >= n:
+                    break
+                code = text[self.pos + 1]
+                if code == 'u':
+                    if self.pos + 6 > n:
+                        break
+                    try:
+                        parts.append(chr(int(text[self.pos + 2:self.pos + 6], 16)))
+                    except ValueError:
+                        pass
+                    self.pos += 6
+                else:
+                    parts.append(_ESCAPES.get(code, code))
+                    self.pos += 2
+                start = self.pos
+                continue
+            self.pos += 1
+        raise _Incomplete()
+
+    def _object(self) -> Dict:
+        self.pos += 1
+        result: Dict = {}
+        try:
+            while True:
+                char = self._peek()
+                if char == '}':
+                    self.pos += 1
+                    return result
+                if char == ',':
+                    self.pos += 1
+                    continue
+                if char != '"':
+                    raise _Incomplete()
+                key = self._string()
+                if self._peek() != ':':
+                    raise _Incomplete()
+                self.pos += 1
+                result[key] = self.value()
+        except _Incomplete:
+            # Objet partiel: la clé en cours (valeur incomplète) est abandonnée,
+            # mais une sous-structure partielle déjà rattachée est conservée
+            raise _Partial(result)
+        except _Partial as partial:
+            result[key] = partial.value
+            raise _Partial(result)
+
+    def _array(self) -> List:
+        self.pos += 1
+        result: List = []
+        try:
+            while True:
+                char = self._peek()
+                if char == ']':
+                    self.pos += 1
+                    return result
+                if char == ',':
+                    self.pos += 1
+                    continue
+                result.append(self.value())
+        except _Incomplete:
+            raise _Partial(result)
+        except _Partial as partial:
+            result.append(partial.value)
+            raise _Partial(result)
+
+
+class _Partial(Exception):
+    """Conteneur interrompu: porte la valeur partielle vers le parent"""
+
+    def __init__(self, value: Any):
+        super().__init__()
+        self.value = value
+
+
+def parse_lenient(text: Optional[str]) -> ParseResult:
+    """
+    Parse une réponse de modèle, même tronquée ou entourée de texte.
+    Retourne (valeur, complète); valeur None si aucun objet exploitable.
+    """
+    if not text:
+        return ParseResult(None, False)
+    start = text.find('{')
+    if start < 0:
+        return ParseResult(None, False)
+
+    # Chemin rapide: JSON valide (éventuellement entouré de ``` ou de prose)
+    end = text.rfind('}')
+    if end > start:
+        try:
+            return ParseResult(json.loads(text[start:end + 1]), True)
+        except json.JSONDecodeError:
+            pass
+
+    parser = _LenientParser(text)
+    parser.pos = start
+    try:
+        value = parser.value()
+    except _Partial as partial:
+        return ParseResult(partial.value, False)
+    except _Incomplete:
+        return ParseResult(None, False)
+    # Réparé (commentaires, virgules finales...) mais structurellement complet
+    return ParseResult(value, False)
+
+# ════════════════════════════════════════════════════════════════════════════
+# 📐 SCHÉMA DES PRÉDICTIONS
+# ════════════════════════════════════════════════════════════════════════════
+
+# Clés du pronostic principal selon les prompts, par ordre de préférence
+WINNER_ALIASES = ('winner', 'match_result', 'match_winner', 'result')
+
+# Champs sans lesquels TelegramFormatter n'affiche pas de pronostic exploitable
+# (la confiance reste facultative: le formateur a une valeur par défaut)
+REQUIRED_FIELDS = (
+    'predictions.winner.prediction',
+    'predictions.winner.probabilities'
+)
+
+DEFAULT_OUTCOMES = ('1', 'X', '2')
+
+
+def _number(value: Any) -> Optional[float]:
+    """45 / "45" / "45%" / 0.45 -> nombre (None si non numérique)"""
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        return value
+    if isinstance(value, str):
+        match = _NUMBER_RE.search(value.replace(',', '.'))
+        if match:
+            number = float(match.group())
+            return int(number) if number.is_integer() else number
+    return None
+
+
+def normalize_prediction(payload: Dict, outcomes: Sequence[str] = DEFAULT_OUTCOMES) -> Dict:
+    """Ramène les variantes des prompts au format du formateur (en place)"""
+    preds = payload.get('predictions')
+    if not isinstance(preds, dict):
+        preds = payload['predictions'] = {}
+
+    # Pronostic principal: un seul nom canonique ('winner')
+    winner = next((preds[k] for k in WINNER_ALIASES if isinstance(preds.get(k), dict)), None)
+    if winner is not None:
+        for key in WINNER_ALIASES[1:]:
+            if preds.get(key) is winner:
+                del preds[key]
+        preds['winner'] = winner
+
+        probs = winner.get('probabilities')
+        if not isinstance(probs, dict):
+            # Format "team1_probability / draw_probability / team2_probability"
+            flat = {
+                '1': winner.get('team1_probability'),
+                'X': winner.get('draw_probability'),
+                '2': winner.get('team2_probability')
+            }
+            probs = {k: v for k, v in flat.items() if v is not None}
+            if probs:
+                winner['probabilities'] = probs
+        if isinstance(probs, dict):
+            numeric = {k: _number(v) for k, v in probs.items()}
+            winner['probabilities'] = {k: v for k, v in numeric.items() if v is not None}
+        if 'confidence' in winner:
+            confidence = _number(winner['confidence'])
+            if confidence is None:
+                del winner['confidence']
+            else:
+                winner['confidence'] = confidence
+
+    # best_bet au niveau racine (prompt data-driven) -> predictions.best_bet
+    if isinstance(payload.get('best_bet'), dict) and 'best_bet' not in preds:
+        preds['best_bet'] = payload.pop('best_bet')
+
+    summary = payload.get('summary')
+    if not isinstance(summary, dict):
+        summary = payload['summary'] = {}
+    if _number(summary.get('confidence')) is None:
+        summary.pop('confidence', None)
+        if winner is not None and isinstance(winner.get('confidence'), (int, float)):
+            summary['confidence'] = winner['confidence']
+    else:
+        summary['confidence'] = _number(summary['confidence'])
+    return payload
+
+
+def _get_path(payload: Dict, path: str) -> Any:
+    node: Any = payload
+    for part in path.split('.'):
+        if not isinstance(node, dict) or part not in node:
+            return None
+        node = node[part]
+    return node
+
+
+def missing_fields(payload: Dict, outcomes: Sequence[str] = DEFAULT_OUTCOMES) -> List[str]:
+    """Champs requis absents ou invalides (payload déjà normalisé)"""
+    missing = []
+    for path in REQUIRED_FIELDS:
+        value = _get_path(payload, path)
+        if path.endswith('probabilities'):
+            valid = isinstance(value, dict) and all(k in value for k in outcomes) and sum(value.values()) > 0
+        elif path.endswith('confidence'):
+            valid = isinstance(value, (int, float))
+        else:
+            valid = bool(value)
+        if not valid:
+            missing.append(path)
+    return missing
+
+
+def followup_skeleton(missing: Sequence[str], outcomes: Sequence[str] = DEFAULT_OUTCOMES) -> Dict:
+    """Squelette JSON des seuls champs manquants, pour la relance ciblée"""
+    examples = {
+        'prediction': '/'.join(outcomes),
+        'probabilities': {k: 0 for k in outcomes},
+        'confidence': 0
+    }
+    skeleton: Dict = {}
+    for path in missing:
+        *parents, leaf = path.split('.')
+        node = skeleton
+        for part in parents:
+            node = node.setdefault(part, {})
+        node[leaf] = examples.get(leaf, '...')
+    return skeleton
+
+
+def merge_missing(payload: Dict, addition: Dict, missing: Sequence[str]) -> Dict:
+    """Reporte dans `payload` les seuls champs `missing` fournis par la relance"""
+    for path in missing:
+        value = _get_path(addition, path)
+        if value is None:
+            continue
+        *parents, leaf = path.split('.')
+        node = payload
+        for part in parents:
+            if not isinstance(node.get(part), dict):
+                node[part] = {}
+            node = node[part]
+        node[leaf] = value
+    return payload
+
+
+__all__ = [
+    'ParseResult',
+    'parse_lenient',
+    'normalize_prediction',
+    'missing_fields',
+    'followup_skeleton',
+    'merge_missing',
+    'REQUIRED_FIELDS'
+]
@@ -0,0 +1,164 @@
+"""
+💰 INSTANTANÉ DES COTES V1.0 - UN TABLEAU PAR LIGUE ET PAR INTERVALLE
+═══════════════════════════════════════════════════════════════════════════════
+The Odds API (500 req/mois) n'est plus interrogée ligue par ligue à chaque
+prédiction:
+- Tableau complet d'une ligue téléchargé au plus une fois par intervalle,
+  persisté dans le cache des collecteurs (survit aux redémarrages)
+- Tous les événements analysés (_parse_all_odds) une seule fois
+- Index par paire domicile/extérieur normalisée (TeamPairIndex)
+- Quota visible: requêtes de l'instantané, restant/consommé selon l'API
+═══════════════════════════════════════════════════════════════════════════════
+"""
+import asyncio
+import logging
+import os
+import time
+from typing import Callable, Dict, List, Optional
+
+import aiohttp
+
+from collector_cache import collector_cache
+from deadline import Deadline, ensure
+from http_cache import http_cache
+from team_resolver import TeamPairIndex
+
+logger = logging.getLogger("footbot.odds_snapshot")
+
+# ════════════════════════════════════════════════════════════════════════════
+# ⚙️ CONFIGURATION
+# ════════════════════════════════════════════════════════════════════════════
+
+# 500 req/mois ≈ 16/jour: un tableau de ligue n'est retéléchargé qu'après cet intervalle
+ODDS_REFRESH_INTERVAL = float(os.environ.get("ODDS_REFRESH_HOURS", "12")) * 3600
+
+ODDS_PARAMS = {
+    'regions': 'eu,uk',
+    'markets': 'h2h,totals,btts',
+    'oddsFormat': 'decimal'
+}
+
+
+class OddsQuotaError(Exception):
+    """Clé invalide (401) ou quota épuisé (429): inutile d'essayer d'autres ligues"""
+
+
+class OddsBoard(TeamPairIndex):
+    """Cotes analysées de tous les événements d'une ligue"""
+
+    __slots__ = ('sport_key',)
+
+    def __init__(self, sport_key: str, entries: List[Dict]):
+        super().__init__(entries, lambda e: (e['event'].get('home_team', ''), e['event'].get('away_team', '')))
+        self.sport_key = sport_key
+
+
+class OddsSnapshot:
+    """Tableaux de cotes par ligue + comptage du quota"""
+
+    def __init__(self, refresh_interval: float = ODDS_REFRESH_INTERVAL):
+        self.refresh_interval = refresh_interval
+        self._boards: Dict[str, OddsBoard] = {}
+        self._locks: Dict[str, asyncio.Lock] = {}
+        self.quota = {'remaining': None, 'used': None}
+        self.stats = {'requests': 0, 'lookups': 0, 'found': 0, 'board_hits': 0, 'events_parsed': 0}
+
+    def _fresh(self, sport_key: str) -> Optional[OddsBoard]:
+        board = self._boards.get(sport_key)
+        if board and time.time() - board.built_at < self.refresh_interval:
+            return board
+        return None
+
+    async def _download(self, session: aiohttp.ClientSession, api_url: str, api_key: str,
+                        sport_key: str, deadline: Deadline, value: float) -> Optional[List[Dict]]:
+        params = {'apiKey': api_key, **ODDS_PARAMS}
+        # ttl=0: le tableau n'est redemandé qu'à l'expiration de l'instantané, puis revalidé
+        response = await http_cache.get_json(session, f"{api_url}/sports/{sport_key}/odds", params=params,
+                                             timeout=15, ttl=0, quota=('odds', value),
+                                             breaker='odds', deadline=deadline)
+        if response.sent:
+            self.stats['requests'] += 1
+            self.quota['remaining'] = response.headers.get('x-requests-remaining', self.quota['remaining'])
+            self.quota['used'] = response.headers.get('x-requests-used', self.quota['used'])
+        if response.ok:
+            return response.data
+        if response.status == 401:
+            raise OddsQuotaError("Clé API invalide")
+        if response.status == 429:
+            raise OddsQuotaError("Quota épuisé (500 req/mois)")
+        if response.status:
+            logger.warning(f"Odds API {sport_key}: {response.status}")
+        return None
+
+    async def get_board(self, session: aiohttp.ClientSession, api_url: str, api_key: str,
+                        sport_key: str, parse: Callable[[Dict], Dict],
+                        deadline: Optional[Deadline] = None, value: float = 1.0) -> Optional[OddsBoard]:
+        """Tableau de la ligue: mémoire, sinon cache persistant, sinon une requête"""
+        deadline = ensure(deadline)
+        board = self._fresh(sport_key)
+        if board:
+            self.stats['board_hits'] += 1
+            return board
+
+        lock = self._locks.setdefault(sport_key, asyncio.Lock())
+        async with lock:
+            board = self._fresh(sport_key)
+            if board:
+                self.stats['board_hits'] += 1
+                return board
+            entries = collector_cache.get('odds_board', sport_key)
+            if entries is None:
+                events = await self._download(session, api_url, api_key, sport_key, deadline, value)
+                if events is None:
+                    return self._boards.get(sport_key)
+                entries = [
+                    {
+                        'event': event,
+                        'odds': parse(event),
+                        'bookmakers': [b['title'] for b in event.get('bookmakers', [])],
+                        'sport_key': sport_key
+                    }
+                    for event in events
+                ]
+                self.stats['events_parsed'] += len(entries)
+                # Une ligue vide est aussi une réponse: mise en cache pour ne pas la redemander
+                collector_cache.set('odds_board', sport_key, entries or [{}], ttl=self.refresh_interval)
+                logger.info(f"💰 Cotes [{sport_key}]: {len(entries)} événements (quota restant: {self.quota['remaining']})")
+            entries = [entry for entry in entries if entry]
+            board = self._boards[sport_key] = OddsBoard(sport_key, entries)
+            return board
+
+    async def find(self, session: aiohttp.ClientSession, api_url: str, api_key: str,
+                   team1: str, team2: str, sport_keys: List[str], parse: Callable[[Dict], Dict],
+                   deadline: Optional[Deadline] = None, min_budget: float = 0,
+                   value: float = 1.0) -> Optional[Dict]:
+        """
+        Cotes du match dans les ligues données, dans l'ordre.
+        `value` (0-1): valeur du match pour le budget du registre des quotas.
+        Lève OddsQuotaError si la clé est refusée ou le quota épuisé.
+        """
+        deadline = ensure(deadline)
+        self.stats['lookups'] += 1
+        for sport_key in sport_keys:
+            if not self._fresh(sport_key) and not deadline.has(min_budget):
+                break
+            board = await self.get_board(session, api_url, api_key, sport_key, parse, deadline, value)
+            entry = board.find(team1, team2) if board else None
+            if entry:
+                self.stats['found'] += 1
+                return entry
+        return None
+
+    def get_stats(self) -> Dict:
+        return {
+            **self.stats,
+            'quota': dict(self.quota),
+            'boards': {key: len(board.items) for key, board in self._boards.items()}
+        }
+
+
+# Instance globale
+odds_snapshot = OddsSnapshot()
+
+
+__all__ = ['OddsSnapshot', 'OddsBoard', 'OddsQuotaError', 'odds_snapshot']
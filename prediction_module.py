@@ -16,7 +16,6 @@ import os
 import json
 import time
 import hashlib
-import random
 import re
 from typing import Dict, List, Optional, Tuple, Any
 from datetime import datetime, timedelta
@@ -26,6 +25,18 @@ from enum import Enum
 
 from telegram import InlineKeyboardButton, InlineKeyboardMarkup
 
+from aho_corasick import AhoCorasick
+from deadline import Deadline, ensure
+from llm_json import parse_lenient, normalize_prediction, missing_fields, followup_skeleton, merge_missing
+from fixture_identity import fixture_key, kickoff_date
+from prediction_renderer import prediction_renderer
+from prompt_registry import PromptRegistry, PromptTemplate
+from quota_ledger import match_value, quota_ledger
+from rate_limiter import rate_limiter
+from team_resolver import fold_accents
+from telemetry import telemetry
+from prediction_queue import prediction_queue
+
 # Définir le logger EN PREMIER
 logger = logging.getLogger("footbot.predictions")
 
@@ -40,11 +51,32 @@ except ImportError as e:
     CollectedData = None
     logger.warning(f"⚠️ DataCollector non disponible: {e}")
 
+# Import du modèle statistique (fallback sans IA)
+try:
+    from statistical_model import statistical_model
+    STATISTICAL_MODEL_AVAILABLE = True
+except ImportError as e:
+    STATISTICAL_MODEL_AVAILABLE = False
+    statistical_model = None
+    logger.warning(f"⚠️ Modèle statistique non disponible: {e}")
+
+# Import du moteur de ratings (force des équipes)
+try:
+    from rating_engine import rating_engine
+    RATING_ENGINE_AVAILABLE = True
+except ImportError as e:
+    RATING_ENGINE_AVAILABLE = False
+    rating_engine = None
+    logger.warning(f"⚠️ Moteur de ratings non disponible: {e}")
+
 # ════════════════════════════════════════════════════════════════════════════
 # ⚙️ CONFIGURATION
 # ════════════════════════════════════════════════════════════════════════════
 
-GROQ_API_URL = "https://api.groq.com/openai/v1/chat/completions"
+# Surchargeable (ex: serveur local de benchmark, voir benchmarks/)
+GROQ_API_URL = os.environ.get(
+    "GROQ_API_URL", "https://api.groq.com/openai/v1/chat/completions"
+).strip()
 GROQ_API_KEY = os.environ.get("GROQ_API_KEY", "").strip()
 
 # Activation des prédictions (toujours activé, mais mode différent selon API)
@@ -65,6 +97,11 @@ GROQ_MODELS = [
     ("llama3-8b-8192", 8)                  # Fallback - 8B
 ]
 
+# Couverture (hedging): si le modèle principal tarde au-delà de son p90, requête
+# parallèle au modèle suivant; la première réponse JSON valide l'emporte.
+GROQ_HEDGING = os.environ.get("GROQ_HEDGING", "").strip().lower() in ("1", "true", "yes")
+GROQ_HEDGE_BUDGET = float(os.environ.get("GROQ_HEDGE_BUDGET", "0.1"))  # Part max des appels couverts
+
 # Répertoire de données
 PREDICTIONS_DIR = Path("data/footbot/predictions")
 PREDICTIONS_DIR.mkdir(parents=True, exist_ok=True)
@@ -76,7 +113,8 @@ FILES = {
     'votes': PREDICTIONS_DIR / "community_votes.json",
     'leaderboard': PREDICTIONS_DIR / "leaderboard.json",
     'achievements': PREDICTIONS_DIR / "achievements.json",
-    'validated_events': PREDICTIONS_DIR / "validated_events.json"
+    'validated_events': PREDICTIONS_DIR / "validated_events.json",
+    'settlement': PREDICTIONS_DIR / "settlement_state.json"
 }
 
 # ════════════════════════════════════════════════════════════════════════════
@@ -264,6 +302,21 @@ class Limits:
     POINTS_CORRECT = 10
     POINTS_EXACT = 50
     POINTS_VOTE = 1
+    FIXTURE_CACHE_RETENTION = 172800  # 48h: réutilisation si les données n'ont pas changé
+    HEDGE_PERCENTILE = 90             # Seuil de couverture: p90 de latence du modèle principal
+    HEDGE_DEFAULT_DELAY = 8.0         # Seuil (s) tant que la télémétrie manque d'échantillons
+    HEDGE_MIN_DELAY = 1.0
+    PREDICTION_DEADLINE = 45.0        # Budget total (s) d'une analyse demandée par un utilisateur
+    COLLECTION_BUDGET = 20.0          # Part max de la collecte de données
+    GROQ_MIN_BUDGET = 6.0             # Temps restant minimal pour lancer un appel Groq
+    # Sections des données collectées envoyées à Groq (l'en-tête du match est déjà dans le prompt)
+    PROMPT_SECTIONS = ('fixture', 'prediction', 'lineups', 'injuries', 'team_stats', 'h2h',
+                       'sofascore', 'odds', 'summary', 'mission')
+
+
+# Rafales de prédictions: RATE_LIMIT_MAX par RATE_LIMIT_WINDOW (palier gratuit)
+rate_limiter.configure('predict', Limits.RATE_LIMIT_MAX, Limits.RATE_LIMIT_WINDOW)
+rate_limiter.base_daily_limit = Limits.MAX_PREDICTIONS_FREE
 
 # ════════════════════════════════════════════════════════════════════════════
 # 📦 DATA CLASSES
@@ -321,19 +374,32 @@ class EventValidator:
         r'\bam\b', r'\bpm\b', r'\d{1,2}:\d{2}'
     ]
     
+    # Regex précompilées (construites une seule fois au chargement)
+    _INVALID_RE = re.compile(
+        '|'.join(f'(?P<p{i}>{pattern})' for i, pattern in enumerate(INVALID_PATTERNS)),
+        re.IGNORECASE
+    )
+    _SEPARATOR_RE = re.compile(r'\bvs\.?\b|\bv\b|\b-\b', re.IGNORECASE)
+    _TIME_RE = re.compile(r'\d{1,2}:\d{2}')
+    
+    # Automates Aho–Corasick par sport (équipes connues + mots-clés)
+    _AUTOMATA: Dict[str, AhoCorasick] = {
+        sport: AhoCorasick(teams) for sport, teams in KNOWN_TEAMS.items()
+    }
+    
     @classmethod
     def validate_event(cls, match: Dict) -> Tuple[bool, str, int]:
         """
         Valide un événement et retourne (is_valid, message, score)
         Score: 0-100 où 100 = événement très probablement réel
         """
-        title = match.get('title', '').lower().strip()
-        team1 = match.get('team1', '').lower().strip()
-        team2 = match.get('team2', '').lower().strip()
+        # Accents repliés: "Atlético", "München" retrouvent le lexique
+        title = fold_accents(match.get('title', '')).strip()
+        team1 = fold_accents(match.get('team1', '')).strip()
+        team2 = fold_accents(match.get('team2', '')).strip()
         sport = match.get('sport', 'football').lower()
         
         score = 50  # Score de base
-        reasons = []
         
         # === VÉRIFICATIONS NÉGATIVES ===
         
@@ -341,15 +407,15 @@ class EventValidator:
         if len(title) < 5:
             return False, "Titre trop court", 0
         
-        # Patterns invalides
-        for pattern in cls.INVALID_PATTERNS:
-            if re.search(pattern, title, re.IGNORECASE):
-                return False, f"Pattern invalide: {pattern}", 0
+        # Patterns invalides (une seule regex combinée)
+        invalid = cls._INVALID_RE.search(title)
+        if invalid:
+            pattern = cls.INVALID_PATTERNS[int(invalid.lastgroup[1:])]
+            return False, f"Pattern invalide: {pattern}", 0
         
         # Pas de team1
         if not team1 or len(team1) < 2:
             score -= 20
-            reasons.append("Équipe 1 manquante")
         
         # === VÉRIFICATIONS POSITIVES ===
         
@@ -358,27 +424,24 @@ class EventValidator:
             score += 15
         
         # Contient "vs" ou similaire
-        if re.search(r'\bvs\.?\b|\bv\b|\b-\b', title, re.IGNORECASE):
+        if cls._SEPARATOR_RE.search(title):
             score += 15
         
         # Contient une heure
-        if re.search(r'\d{1,2}:\d{2}', match.get('start_time', '')):
+        if cls._TIME_RE.search(match.get('start_time', '')):
             score += 10
         
-        # Équipe connue détectée
-        known_teams = KNOWN_TEAMS.get(sport, [])
-        for team in known_teams:
-            if team in title or team in team1 or team in team2:
+        automaton = cls._AUTOMATA.get(sport)
+        if automaton:
+            title_hits = automaton.find_indices(title)
+            
+            # Équipe connue détectée
+            if title_hits or automaton.first_word(team1, team2):
                 score += 20
-                reasons.append(f"Équipe connue: {team}")
-                break
-        
-        # Mots-clés de sport détectés
-        sport_keywords = KNOWN_TEAMS.get(sport, [])
-        for keyword in sport_keywords[:10]:
-            if keyword in title:
+            
+            # Mots-clés de sport détectés (10 premiers du lexique)
+            if any(index < 10 for index in title_hits):
                 score += 5
-                break
         
         # === CALCUL FINAL ===
         score = max(0, min(100, score))
@@ -389,6 +452,43 @@ class EventValidator:
         grade = cls.get_grade(score)
         return True, f"Événement validé (Grade {grade})", score
     
+    @classmethod
+    def known_team_hits(cls, match: Dict) -> int:
+        """Nombre d'entrées du lexique (équipes connues) trouvées dans le match"""
+        automaton = cls._AUTOMATA.get(match.get('sport', 'football').lower())
+        if not automaton:
+            return 0
+        text = fold_accents(' '.join(match.get(k, '') for k in ('title', 'team1', 'team2')))
+        return len(automaton.find_indices(text))
+    
+    @classmethod
+    def validate_batch(cls, matches: List[Dict]) -> List[Dict]:
+        """
+        Valide tous les matchs d'un scraping en une passe et annote chaque match
+        (validation_score, validation_grade, validation_message, is_valid).
+        Retourne la liste annotée (mêmes objets).
+        """
+        valid_count = 0
+        for match in matches:
+            is_valid, msg, score = cls.validate_event(match)
+            match['is_valid'] = is_valid
+            match['validation_score'] = score
+            match['validation_grade'] = cls.get_grade(score)
+            match['validation_message'] = msg
+            valid_count += is_valid
+        
+        logger.info(f"✅ Validation batch: {valid_count}/{len(matches)} événements valides")
+        return matches
+    
+    @classmethod
+    def get_validation(cls, match: Dict) -> Tuple[bool, str, int]:
+        """Réutilise la validation stockée au scraping, sinon valide"""
+        if 'validation_score' in match and 'is_valid' in match:
+            return (match['is_valid'],
+                    match.get('validation_message', ''),
+                    match['validation_score'])
+        return cls.validate_event(match)
+    
     @classmethod
     def get_grade(cls, score: int) -> str:
         """Convertit un score en grade"""
@@ -497,6 +597,42 @@ class AdvancedDataManager:
         
         cls._save_file('cache', cache)
     
+    # === CACHE PAR RENCONTRE (identité canonique) ===
+    @classmethod
+    def get_fixture_cache(cls, key: str) -> Optional[Dict]:
+        """
+        Entrée {'data', 'fingerprint', 'cached_at', 'fresh'} pour une rencontre.
+        fresh = encore dans la durée de cache (réutilisable sans collecte).
+        """
+        cache = cls._load_file('cache', {'predictions': {}})
+        entry = cache.get('fixtures', {}).get(key)
+        if not entry:
+            return None
+        cached_at = datetime.fromisoformat(entry.get('cached_at', '2000-01-01'))
+        age = (datetime.now() - cached_at).total_seconds()
+        if age > Limits.FIXTURE_CACHE_RETENTION:
+            return None
+        return {**entry, 'fresh': age < Limits.CACHE_DURATION}
+    
+    @classmethod
+    def set_fixture_cache(cls, key: str, prediction: Dict, fingerprint: str):
+        cache = cls._load_file('cache', {'predictions': {}})
+        fixtures = cache.setdefault('fixtures', {})
+        fixtures[key] = {
+            'data': prediction,
+            'fingerprint': fingerprint,
+            'cached_at': datetime.now().isoformat()
+        }
+        
+        # Nettoyer les rencontres trop anciennes
+        cutoff = (datetime.now() - timedelta(seconds=Limits.FIXTURE_CACHE_RETENTION)).isoformat()
+        cache['fixtures'] = {
+            k: v for k, v in fixtures.items()
+            if v.get('cached_at', '') > cutoff
+        }
+        
+        cls._save_file('cache', cache)
+    
     # === PROFIL UTILISATEUR ===
     @classmethod
     def get_user_profile(cls, user_id: int, username: str = "") -> UserProfile:
@@ -537,15 +673,33 @@ class AdvancedDataManager:
     
     # === HISTORIQUE ===
     @classmethod
-    def add_prediction_to_history(cls, user_id: int, match: Dict, prediction: Dict):
+    def add_prediction_to_history(cls, user_id: int, match: Dict, prediction: Dict) -> bool:
+        """Ajoute la prédiction servie; False si la rencontre est déjà dans l'historique de l'utilisateur"""
         history = cls._load_file('history', {'predictions': []})
         
+        # Une seule entrée par (utilisateur, rencontre): un second clic ne se règle pas deux fois
+        key = fixture_key(match)
+        match_id = match.get('id')
+        if any(
+            entry.get('user_id') == user_id
+            and (entry.get('fixture_key') == key or (match_id and entry.get('match_id') == match_id))
+            for entry in history['predictions']
+        ):
+            return False
+        
+        preds = prediction.get('predictions', {})
         history['predictions'].append({
             'user_id': user_id,
-            'match_id': match.get('id'),
+            'match_id': match_id,
+            'fixture_key': key,
             'match_title': match.get('title'),
+            'team1': match.get('team1', ''),
+            'team2': match.get('team2', ''),
+            'match_date': cls._match_date(match),
             'sport': match.get('sport', 'FOOTBALL'),
             'prediction_type': prediction.get('meta', {}).get('prediction_type', 'unknown'),
+            'pick': cls._extract_pick(preds.get('winner', {}), match),
+            'exact_score': cls._extract_exact_score(preds),
             'timestamp': datetime.now().isoformat(),
             'status': 'pending'
         })
@@ -554,6 +708,42 @@ class AdvancedDataManager:
             history['predictions'] = history['predictions'][-5000:]
         
         cls._save_file('history', history)
+        return True
+    
+    @staticmethod
+    def _match_date(match: Dict) -> str:
+        """Date du coup d'envoi (un match de 00h30 scrapé la veille au soir compte pour le lendemain)"""
+        return kickoff_date(match)
+    
+    @staticmethod
+    def _extract_pick(winner: Dict, match: Dict) -> Optional[str]:
+        """Normalise le pronostic vainqueur en '1', 'X' ou '2'"""
+        pick = str(winner.get('prediction', '')).strip()
+        if pick.upper() in ('1', 'X', '2'):
+            return pick.upper()
+        pick_lower = pick.lower()
+        if not pick_lower:
+            return None
+        if pick_lower in ('nul', 'draw', 'match nul'):
+            return 'X'
+        team1 = match.get('team1', '').lower()
+        team2 = match.get('team2', '').lower()
+        if team1 and (team1 in pick_lower or pick_lower in team1):
+            return '1'
+        if team2 and (team2 in pick_lower or pick_lower in team2):
+            return '2'
+        return None
+    
+    @staticmethod
+    def _extract_exact_score(preds: Dict) -> Optional[str]:
+        """Score exact pronostiqué ('2-1'), format IA ou algorithmique"""
+        score = preds.get('score', {}).get('prediction')
+        if not score:
+            top_3 = preds.get('exact_score', {}).get('top_3') or []
+            score = top_3[0].get('score') if top_3 else preds.get('exact_score', {}).get('prediction')
+        if score and re.match(r'^\d+\s*-\s*\d+$', str(score).strip()):
+            return str(score).replace(' ', '')
+        return None
     
     @classmethod
     def get_today_predictions_count(cls, user_id: int) -> int:
@@ -572,7 +762,8 @@ class AdvancedDataManager:
     
     # === VOTES ===
     @classmethod
-    def add_vote(cls, match_id: str, user_id: int, vote: str, sport: str = 'football') -> Dict:
+    def add_vote(cls, match_id: str, user_id: int, vote: str, sport: str = 'football',
+                 match: Optional[Dict] = None) -> Dict:
         votes = cls._load_file('votes', {'matches': {}})
         
         sport_config = SPORTS_CONFIG.get(sport.lower(), SPORTS_CONFIG['other'])
@@ -583,10 +774,16 @@ class AdvancedDataManager:
                 'votes': [],
                 'totals': {k: 0 for k in vote_options},
                 'sport': sport,
-                'created_at': datetime.now().isoformat()
+                'created_at': datetime.now().isoformat(),
+                'status': 'pending'
             }
         
         match_votes = votes['matches'][match_id]
+        if match:
+            # Informations nécessaires au règlement du vote
+            match_votes.setdefault('team1', match.get('team1', ''))
+            match_votes.setdefault('team2', match.get('team2', ''))
+            match_votes.setdefault('match_date', cls._match_date(match))
         
         existing = next((v for v in match_votes['votes'] if v['user_id'] == user_id), None)
         if existing:
@@ -1284,266 +1481,12 @@ Analyse-les et génère TES PROPRES PRÉDICTIONS.
 - Sois PRÉCIS et JUSTIFIE tout avec les données"""
 
 
-def get_sport_prompt(sport: str) -> str:
-    """Retourne le prompt adapté au sport"""
-    base = """Tu es un analyste sportif professionnel d'élite.
-
-RÈGLES STRICTES:
-1. Confiance JAMAIS supérieure à 70%
-2. Remplir TOUS les champs demandés
-3. Format JSON valide obligatoire
-4. Justifications claires et précises
-
-"""
-    
-    sport_lower = sport.lower()
-    
-    if sport_lower in ['football', 'soccer']:
-        return base + get_football_prompt()
-    elif sport_lower in ['ufc', 'mma']:
-        return base + get_ufc_prompt()
-    elif sport_lower in ['nba', 'basketball']:
-        return base + get_nba_prompt()
-    elif sport_lower == 'tennis':
-        return base + get_tennis_prompt()
-    else:
-        return base + get_generic_prompt()
-
-# ════════════════════════════════════════════════════════════════════════════
-# 🤖 PRÉDICTEUR IA ULTRA V5
-# ════════════════════════════════════════════════════════════════════════════
-
-class UltraPredictor:
-    """Prédicteur avec signalement clair IA vs Algorithme"""
-    
-    def __init__(self):
-        self.api_key = GROQ_API_KEY
-        self.session: Optional[aiohttp.ClientSession] = None
-        self.current_model_index = 0
-        self.stats = {
-            'ai_predictions': 0,
-            'fallback_predictions': 0,
-            'cache_hits': 0,
-            'api_errors': 0
-        }
-    
-    async def __aenter__(self):
-        timeout = aiohttp.ClientTimeout(total=90)
-        self.session = aiohttp.ClientSession(timeout=timeout)
-        return self
-    
-    async def __aexit__(self, exc_type, exc_val, exc_tb):
-        if self.session:
-            await self.session.close()
-    
-    async def _call_groq(self, messages: List[Dict], extended: bool = True, min_quality: int = 0) -> Optional[str]:
-        """
-        Appel API Groq avec gestion intelligente du rate limit.
-        
-        Args:
-            messages: Liste des messages pour l'API
-            extended: True pour plus de tokens
-            min_quality: Qualité minimale du modèle (0-70). Si le modèle disponible est en dessous, on attend.
-        """
-        if not self.api_key:
-            return None
-        
-        max_retries = 3
-        retry_count = 0
-        
-        while retry_count < max_retries:
-            model_name, model_quality = GROQ_MODELS[self.current_model_index]
-            
-            # Si on exige une qualité minimale et le modèle actuel est trop faible, on attend
-            if min_quality > 0 and model_quality < min_quality:
-                logger.warning(f"⚠️ Modèle {model_name} trop faible ({model_quality}B), attente pour meilleur modèle...")
-                await asyncio.sleep(15)  # Attendre que le rate limit se réinitialise
-                self.current_model_index = 0  # Revenir au meilleur modèle
-                retry_count += 1
-                continue
-            
-            headers = {
-                "Authorization": f"Bearer {self.api_key}",
-                "Content-Type": "application/json"
-            }
-            
-            # Limiter la taille du message
-            user_message = messages[-1]['content'] if messages else ""
-            if len(user_message) > 30000:
-                user_message = user_message[:30000] + "\n\n[...données tronquées...]"
-                messages[-1]['content'] = user_message
-                logger.warning(f"⚠️ Données tronquées à 30000 caractères")
-            
-            # Plus de tokens pour les gros modèles
-            max_tokens = 8000 if extended and model_quality >= 70 else 6000 if extended else 4000
-            
-            payload = {
-                "model": model_name,
-                "messages": messages,
-                "temperature": 0.3,
-                "max_tokens": max_tokens,
-                "top_p": 0.95,
-                "response_format": {"type": "json_object"}
-            }
-            
-            try:
-                async with self.session.post(GROQ_API_URL, headers=headers, json=payload, timeout=120) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        usage = data.get('usage', {})
-                        tokens = usage.get('completion_tokens', 0)
-                        logger.info(f"✅ IA [{model_name}] ({model_quality}B) - {tokens} tokens")
-                        return data['choices'][0]['message']['content']
-                    
-                    elif response.status == 429:
-                        retry_after = response.headers.get('retry-after', '60')
-                        try:
-                            wait_time = min(int(retry_after), 30)
-                        except:
-                            wait_time = 15
-                        
-                        logger.warning(f"⚠️ Rate limit {model_name} - attente {wait_time}s...")
-                        self.stats['api_errors'] += 1
-                        
-                        # Essayer le modèle suivant
-                        if self.current_model_index < len(GROQ_MODELS) - 1:
-                            self.current_model_index += 1
-                            next_model, next_quality = GROQ_MODELS[self.current_model_index]
-                            
-                            # Si le prochain modèle est trop faible et on a pas trop réessayé, attendre
-                            if min_quality > 0 and next_quality < min_quality and retry_count < 2:
-                                logger.info(f"⏳ Attente {wait_time}s pour modèle de qualité...")
-                                await asyncio.sleep(wait_time)
-                                self.current_model_index = 0  # Revenir au meilleur
-                                retry_count += 1
-                                continue
-                            
-                            logger.info(f"🔄 Passage au modèle: {next_model} ({next_quality}B)")
-                            await asyncio.sleep(2)
-                            continue
-                        else:
-                            # Dernier modèle aussi en rate limit - attendre et recommencer
-                            logger.warning(f"⏳ Tous les modèles en rate limit, attente {wait_time}s...")
-                            await asyncio.sleep(wait_time)
-                            self.current_model_index = 0
-                            retry_count += 1
-                            continue
-                    
-                    elif response.status == 400:
-                        error_text = await response.text()
-                        logger.error(f"❌ Groq 400: {error_text[:150]}")
-                        
-                        if "decommissioned" in error_text.lower():
-                            if self.current_model_index < len(GROQ_MODELS) - 1:
-                                self.current_model_index += 1
-                                continue
-                        return None
-                    
-                    else:
-                        error_text = await response.text()
-                        logger.error(f"❌ Groq {response.status}: {error_text[:150]}")
-                        return None
-            
-            except asyncio.TimeoutError:
-                logger.error("⏱️ Timeout Groq (120s)")
-                retry_count += 1
-            except Exception as e:
-                logger.error(f"❌ Exception Groq: {e}")
-                retry_count += 1
-        
-        return None
-    
-    async def analyze_match(self, match: Dict, user_id: int) -> Dict:
-        """Analyse complète avec collecte de données multi-sources"""
-        
-        # Valider l'événement
-        is_valid, msg, validation_score = EventValidator.validate_event(match)
-        
-        if not is_valid:
-            return self._generate_invalid_response(match, msg)
-        
-        # Vérifier le cache
-        cache_key = f"v5_{match['id']}"
-        cached = AdvancedDataManager.get_prediction_cache(cache_key)
-        if cached:
-            self.stats['cache_hits'] += 1
-            return cached
-        
-        sport = match.get('sport', 'FOOTBALL').lower()
-        sport_config = SPORTS_CONFIG.get(sport, SPORTS_CONFIG['other'])
-        
-        # === ÉTAPE 1: COLLECTER LES DONNÉES ===
-        collected_data_text = ""
-        data_quality = 0
-        
-        if DATA_COLLECTOR_AVAILABLE:
-            try:
-                logger.info(f"📊 Collecte des données pour: {match.get('title', 'Match')[:40]}")
-                async with DataCollector() as collector:
-                    # collect_all_data retourne directement le texte formaté
-                    collected_data_text = await collector.collect_all_data(match)
-                    if collected_data_text:
-                        # Estimer la qualité basé sur la longueur du contenu
-                        data_quality = min(100, len(collected_data_text) // 100)
-                        logger.info(f"✅ Données collectées ({len(collected_data_text)} chars)")
-            except Exception as e:
-                logger.error(f"❌ Erreur collecte données: {e}")
-                collected_data_text = ""
-        
-        # === ÉTAPE 2: ANALYSE IA AVEC LES DONNÉES ===
-        prediction = None
-        if self.api_key:
-            if collected_data_text:
-                # Mode DATA-DRIVEN: l'IA reçoit les données réelles et génère LIBREMENT
-                prediction = await self._get_data_driven_prediction(match, sport, collected_data_text)
-            else:
-                # Mode classique: l'IA génère sans données externes
-                prediction = await self._get_ai_prediction(match, sport)
-        
-        if prediction:
-            # Prédiction IA réussie
-            self.stats['ai_predictions'] += 1
-            
-            prediction = self._finalize_prediction(
-                prediction, match, sport_config, validation_score,
-                is_ai=True,
-                data_quality=data_quality
-            )
-        else:
-            # Fallback algorithmique
-            self.stats['fallback_predictions'] += 1
-            prediction = self._generate_algorithmic_prediction(match, sport_config, validation_score)
-        
-        # Sauvegarder
-        AdvancedDataManager.set_prediction_cache(cache_key, prediction)
-        AdvancedDataManager.add_prediction_to_history(user_id, match, prediction)
-        
-        # Mettre à jour profil
-        profile = AdvancedDataManager.get_user_profile(user_id)
-        profile.predictions_count += 1
-        AdvancedDataManager.save_user_profile(profile)
-        
-        return prediction
-    
-    async def _get_data_driven_prediction(self, match: Dict, sport: str, data_text: str) -> Optional[Dict]:
-        """
-        L'IA reçoit les données collectées et génère SES PROPRES PRÉDICTIONS.
-        Analyse ULTRA-DÉTAILLÉE avec justifications complètes.
-        """
-        team1 = match.get('team1', '')
-        team2 = match.get('team2', '')
-        
-        # Extraire du titre si nécessaire
-        if not team1 or not team2:
-            title = match.get('title', '')
-            if ' vs ' in title or ' v ' in title:
-                sep = ' vs ' if ' vs ' in title else ' v '
-                parts = title.split(sep)
-                team1 = parts[0].strip()
-                team2 = parts[1].strip() if len(parts) > 1 else ''
-        
-        # Prompt ULTRA-PRO pour une analyse approfondie
-        system_prompt = """Tu es un ANALYSTE SPORTIF D'ÉLITE spécialisé dans les pronostics professionnels.
+def get_data_driven_pro_prompt() -> str:
+    """
+    Prompt ULTRA-PRO du mode data-driven: méthodologie, format JSON et mission.
+    Les données collectées arrivent dans le message utilisateur.
+    """
+    return """Tu es un ANALYSTE SPORTIF D'ÉLITE spécialisé dans les pronostics professionnels.
 Tu travailles pour un fonds d'investissement sportif qui mise des millions sur tes analyses.
 Chaque prédiction doit être IRRÉPROCHABLE, JUSTIFIÉE et basée sur les DONNÉES.
 
@@ -1757,18 +1700,7 @@ Chaque prédiction doit être IRRÉPROCHABLE, JUSTIFIÉE et basée sur les DONN
 - CALCULE les probabilités avec précision
 - JUSTIFIE chaque prédiction avec des CHIFFRES
 - Identifie TOUS les value bets possibles
-- Sois PROFESSIONNEL et PRÉCIS"""
-        
-        user_prompt = f"""📊 ANALYSE PRO DEMANDÉE POUR:
-🏟️ {team1} vs {team2}
-🏆 Sport: {sport.upper()}
-⏰ {match.get('start_time', 'Heure non précisée')}
-
-══════════════════════════════════════════════════════════════════════════════
-📊 DONNÉES COLLECTÉES - ANALYSE EN PROFONDEUR
-══════════════════════════════════════════════════════════════════════════════
-
-{data_text}
+- Sois PROFESSIONNEL et PRÉCIS
 
 ══════════════════════════════════════════════════════════════════════════════
 🎯 MISSION
@@ -1782,80 +1714,615 @@ Tu as reçu TOUTES les données disponibles. Maintenant:
 5. Identifie les VALUE BETS
 6. Génère un JSON COMPLET avec TOUTES tes prédictions
 
-⚠️ RAPPEL: JAMAIS de "N/A" - estime si nécessaire. CHIFFRES PRÉCIS obligatoires.
+⚠️ RAPPEL: JAMAIS de "N/A" - estime si nécessaire. CHIFFRES PRÉCIS obligatoires."""
 
-Réponds UNIQUEMENT avec un JSON valide."""
-        
-        messages = [
-            {"role": "system", "content": system_prompt},
-            {"role": "user", "content": user_prompt}
-        ]
-        
-        logger.info(f"🤖 Analyse PROFESSIONNELLE avec {len(data_text)} caractères de données...")
-        
-        # Exiger un modèle de qualité minimale 9B pour une analyse sérieuse
-        response = await self._call_groq(messages, extended=True, min_quality=9)
-        
-        if response:
-            try:
-                # Nettoyer la réponse
-                response = response.strip()
-                if response.startswith("```"):
-                    response = response.split("```")[1]
-                    if response.startswith("json"):
-                        response = response[4:]
-                
-                result = json.loads(response.strip())
-                logger.info("✅ Prédiction data-driven générée avec succès")
-                return result
-            except json.JSONDecodeError as e:
-                logger.error(f"❌ Erreur parsing JSON: {e}")
-        
-        return None
-    
-    async def _get_ai_prediction(self, match: Dict, sport: str) -> Optional[Dict]:
-        """Obtient une prédiction de l'IA (mode classique sans données externes)"""
-        system_prompt = get_sport_prompt(sport)
-        
-        team1 = match.get('team1', match.get('title', 'Équipe 1'))
-        team2 = match.get('team2', 'Équipe 2')
-        
-        user_prompt = f"""ANALYSE DEMANDÉE:
 
-🏟️ MATCH: {team1} vs {team2}
-🏆 SPORT: {sport.upper()}
-⏰ HEURE: {match.get('start_time', 'N/A')}
-📅 DATE: {datetime.now().strftime('%d/%m/%Y')}
+SPORT_PROMPT_BASE = """Tu es un analyste sportif professionnel d'élite.
 
-Fournis une analyse COMPLÈTE au format JSON avec TOUS les pronostics demandés."""
-        
-        messages = [
-            {"role": "system", "content": system_prompt},
-            {"role": "user", "content": user_prompt}
-        ]
-        
-        response = await self._call_groq(messages)
-        
-        if response:
-            try:
-                # Nettoyer la réponse
-                response = response.strip()
-                if response.startswith("```"):
-                    response = response.split("```")[1]
-                    if response.startswith("json"):
-                        response = response[4:]
-                
-                return json.loads(response.strip())
-            except json.JSONDecodeError as e:
-                logger.error(f"❌ Erreur parsing JSON: {e}")
-        
-        return None
-    
-    def _finalize_prediction(self, prediction: Dict, match: Dict, 
-                            sport_config: Dict, validation_score: int,
-                            is_ai: bool, data_quality: int = 0) -> Dict:
-        """Finalise la prédiction avec métadonnées"""
-        
+RÈGLES STRICTES:
+1. Confiance JAMAIS supérieure à 70%
+2. Remplir TOUS les champs demandés
+3. Format JSON valide obligatoire
+4. Justifications claires et précises
+
+"""
+
+# Registre construit une seule fois au chargement (version + empreinte par prompt)
+PROMPTS = PromptRegistry(default='generic')
+PROMPTS.register('football', 'v5', SPORT_PROMPT_BASE + get_football_prompt(), aliases=('soccer',),
+                 outcomes=('1', 'X', '2'))
+PROMPTS.register('ufc', 'v5', SPORT_PROMPT_BASE + get_ufc_prompt(), aliases=('mma',))
+PROMPTS.register('nba', 'v5', SPORT_PROMPT_BASE + get_nba_prompt(), aliases=('basketball',))
+PROMPTS.register('tennis', 'v5', SPORT_PROMPT_BASE + get_tennis_prompt())
+PROMPTS.register('generic', 'v5', SPORT_PROMPT_BASE + get_generic_prompt())
+PROMPTS.register('data_driven', 'v5', get_data_driven_pro_prompt(), outcomes=('1', 'X', '2'))
+PROMPTS.log_sizes()
+telemetry.set_prompt_sizes(PROMPTS.size_report())
+
+
+def get_sport_prompt(sport: str) -> str:
+    """Retourne le prompt adapté au sport (texte précalculé)"""
+    return PROMPTS.for_sport(sport).text
+
+
+def required_outcomes(sport: str, template: PromptTemplate) -> Tuple[str, ...]:
+    """Issues exigées dans la réponse: demandées par le prompt ET votables pour le sport"""
+    vote_options = SPORTS_CONFIG.get(sport, SPORTS_CONFIG['other'])['vote_options']
+    return tuple(k for k in template.outcomes if k in vote_options)
+
+# ════════════════════════════════════════════════════════════════════════════
+# 🤖 PRÉDICTEUR IA ULTRA V5
+# ════════════════════════════════════════════════════════════════════════════
+
+class UltraPredictor:
+    """Prédicteur avec signalement clair IA vs Algorithme"""
+    
+    def __init__(self):
+        self.api_key = GROQ_API_KEY
+        self.session: Optional[aiohttp.ClientSession] = None
+        self.current_model_index = 0
+        self.last_model: Optional[str] = None
+        # Sources brutes de la dernière collecte (requêtes consommées par source)
+        self.last_sources: Dict[str, Dict] = {}
+        self.last_prompt: Optional[str] = None
+        self.stats = {
+            'ai_predictions': 0,
+            'fallback_predictions': 0,
+            'cache_hits': 0,
+            'fingerprint_hits': 0,
+            'api_errors': 0,
+            'groq_requests': 0
+        }
+    
+    async def __aenter__(self):
+        timeout = aiohttp.ClientTimeout(total=90)
+        self.session = aiohttp.ClientSession(timeout=timeout)
+        return self
+    
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        if self.session:
+            await self.session.close()
+    
+    async def _post_groq(self, model_name: str, model_quality: int, messages: List[Dict],
+                         extended: bool, timeout: float = 120) -> Tuple[int, Optional[str], str]:
+        """
+        Une requête HTTP vers un modèle Groq.
+        Retourne (statut, contenu si 200, retry-after si 429 / texte d'erreur sinon).
+        """
+        headers = {
+            "Authorization": f"Bearer {self.api_key}",
+            "Content-Type": "application/json"
+        }
+        
+        # Plus de tokens pour les gros modèles
+        max_tokens = 8000 if extended and model_quality >= 70 else 6000 if extended else 4000
+        
+        payload = {
+            "model": model_name,
+            "messages": messages,
+            "temperature": 0.3,
+            "max_tokens": max_tokens,
+            "top_p": 0.95,
+            "response_format": {"type": "json_object"}
+        }
+        
+        request_start = time.perf_counter()
+        quota_ledger.charge('groq')
+        self.stats['groq_requests'] += 1
+        try:
+            async with self.session.post(GROQ_API_URL, headers=headers, json=payload, timeout=timeout) as response:
+                latency_ms = (time.perf_counter() - request_start) * 1000
+                quota_ledger.observe('groq', response.headers, model=model_name)
+                if response.status == 200:
+                    data = await response.json()
+                    usage = data.get('usage', {})
+                    tokens = usage.get('completion_tokens', 0)
+                    telemetry.record_groq_call(
+                        model_name, 'ok', latency_ms,
+                        usage.get('prompt_tokens', 0), tokens
+                    )
+                    logger.info(f"✅ IA [{model_name}] ({model_quality}B) - {tokens} tokens")
+                    return 200, data['choices'][0]['message']['content'], ""
+                
+                telemetry.record_groq_call(
+                    model_name, 'rate_limited' if response.status == 429 else 'http_error', latency_ms
+                )
+                if response.status == 429:
+                    return 429, None, response.headers.get('retry-after', '60')
+                return response.status, None, await response.text()
+        
+        except asyncio.TimeoutError:
+            telemetry.record_groq_call(
+                model_name, 'timeout', (time.perf_counter() - request_start) * 1000
+            )
+            raise
+    
+    async def _post_groq_hedged(self, primary: Tuple[str, int], backup: Tuple[str, int], messages: List[Dict],
+                                extended: bool, timeout: float = 120) -> Tuple[str, Tuple[int, Optional[str], str]]:
+        """
+        Requête au modèle principal, doublée vers `backup` s'il dépasse son p90.
+        Retourne (modèle gagnant, résultat de _post_groq). Le perdant est annulé.
+        """
+        threshold = telemetry.model_latency_percentile(primary[0], Limits.HEDGE_PERCENTILE)
+        delay = max(Limits.HEDGE_MIN_DELAY, threshold / 1000 if threshold else Limits.HEDGE_DEFAULT_DELAY)
+        
+        call_start = time.perf_counter()
+        primary_task = asyncio.create_task(self._post_groq(*primary, messages, extended, timeout))
+        tasks = {primary_task: primary[0]}
+        try:
+            done, _ = await asyncio.wait({primary_task}, timeout=delay)
+            if done or not telemetry.hedge_allowed(GROQ_HEDGE_BUDGET):
+                result = await primary_task
+                telemetry.record_hedge(False, False, (time.perf_counter() - call_start) * 1000)
+                return primary[0], result
+            
+            logger.info(f"🛡️ {primary[0]} > {delay:.1f}s - couverture vers {backup[0]}")
+            backup_task = asyncio.create_task(
+                self._post_groq(*backup, messages, extended, max(0.05, timeout - delay))
+            )
+            tasks[backup_task] = backup[0]
+            
+            pending = set(tasks)
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception():
+                        continue
+                    status, content, _ = task.result()
+                    if status == 200 and parse_lenient(content).complete:
+                        telemetry.record_hedge(
+                            True, task is backup_task, (time.perf_counter() - call_start) * 1000
+                        )
+                        return tasks[task], task.result()
+            
+            # Aucune réponse complète: un 200 tronqué plutôt qu'une erreur, sinon le premier
+            # résultat (principal d'abord) guide les reprises; exception seulement si les deux ont échoué
+            answered = [task for task in tasks if not task.exception()]
+            if not answered:
+                telemetry.record_hedge(True, False, (time.perf_counter() - call_start) * 1000)
+                raise primary_task.exception()
+            chosen = next((task for task in answered if task.result()[0] == 200), answered[0])
+            telemetry.record_hedge(True, chosen is backup_task, (time.perf_counter() - call_start) * 1000)
+            return tasks[chosen], chosen.result()
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+    
+    async def _call_groq(self, messages: List[Dict], extended: bool = True, min_quality: int = 0,
+                         deadline: Optional[Deadline] = None) -> Optional[str]:
+        """
+        Appel API Groq avec gestion intelligente du rate limit.
+        
+        Args:
+            messages: Liste des messages pour l'API
+            extended: True pour plus de tokens
+            min_quality: Qualité minimale du modèle (0-70). Si le modèle disponible est en dessous, on attend.
+            deadline: Échéance; ni attente ni nouvel essai qui la dépasserait
+        """
+        if not self.api_key:
+            return None
+        deadline = ensure(deadline)
+        
+        async def wait(seconds: float) -> bool:
+            """Attend avant un nouvel essai, si l'échéance le permet"""
+            if not deadline.has(seconds + Limits.GROQ_MIN_BUDGET):
+                logger.warning(f"⏱️ Échéance Groq: abandon ({deadline.remaining():.1f}s restantes)")
+                return False
+            await asyncio.sleep(seconds)
+            return True
+        
+        max_retries = 3
+        retry_count = 0
+        
+        # Limiter la taille du message
+        user_message = messages[-1]['content'] if messages else ""
+        if len(user_message) > 30000:
+            user_message = user_message[:30000] + "\n\n[...données tronquées...]"
+            messages[-1]['content'] = user_message
+            logger.warning(f"⚠️ Données tronquées à 30000 caractères")
+        
+        while retry_count < max_retries:
+            if deadline.expired:
+                break
+            model_name, model_quality = GROQ_MODELS[self.current_model_index]
+            
+            # Si on exige une qualité minimale et le modèle actuel est trop faible, on attend
+            if min_quality > 0 and model_quality < min_quality:
+                logger.warning(f"⚠️ Modèle {model_name} trop faible ({model_quality}B), attente pour meilleur modèle...")
+                if not await wait(15):  # Attendre que le rate limit se réinitialise
+                    return None
+                self.current_model_index = 0  # Revenir au meilleur modèle
+                retry_count += 1
+                continue
+            
+            # Modèle de couverture: le suivant, s'il respecte la qualité minimale
+            backup = None
+            if GROQ_HEDGING and self.current_model_index < len(GROQ_MODELS) - 1:
+                candidate = GROQ_MODELS[self.current_model_index + 1]
+                if candidate[1] >= min_quality:
+                    backup = candidate
+            
+            try:
+                timeout = deadline.timeout(120)
+                if backup:
+                    winner, (status, content, detail) = await self._post_groq_hedged(
+                        (model_name, model_quality), backup, messages, extended, timeout
+                    )
+                else:
+                    winner = model_name
+                    status, content, detail = await self._post_groq(
+                        model_name, model_quality, messages, extended, timeout
+                    )
+                
+                if status == 200:
+                    self.last_model = winner
+                    return content
+                
+                if status == 429:
+                    try:
+                        wait_time = min(int(detail), 30)
+                    except:
+                        wait_time = 15
+                    
+                    logger.warning(f"⚠️ Rate limit {model_name} - attente {wait_time}s...")
+                    self.stats['api_errors'] += 1
+                    
+                    # Essayer le modèle suivant
+                    if self.current_model_index < len(GROQ_MODELS) - 1:
+                        self.current_model_index += 1
+                        next_model, next_quality = GROQ_MODELS[self.current_model_index]
+                        
+                        # Si le prochain modèle est trop faible et on a pas trop réessayé, attendre
+                        if min_quality > 0 and next_quality < min_quality and retry_count < 2:
+                            logger.info(f"⏳ Attente {wait_time}s pour modèle de qualité...")
+                            if not await wait(wait_time):
+                                return None
+                            self.current_model_index = 0  # Revenir au meilleur
+                            retry_count += 1
+                            continue
+                        
+                        logger.info(f"🔄 Passage au modèle: {next_model} ({next_quality}B)")
+                        if not await wait(2):
+                            return None
+                        continue
+                    else:
+                        # Dernier modèle aussi en rate limit - attendre et recommencer
+                        logger.warning(f"⏳ Tous les modèles en rate limit, attente {wait_time}s...")
+                        if not await wait(wait_time):
+                            return None
+                        self.current_model_index = 0
+                        retry_count += 1
+                        continue
+                
+                elif status == 400:
+                    logger.error(f"❌ Groq 400: {detail[:150]}")
+                    
+                    if "decommissioned" in detail.lower():
+                        if self.current_model_index < len(GROQ_MODELS) - 1:
+                            self.current_model_index += 1
+                            continue
+                    return None
+                
+                else:
+                    logger.error(f"❌ Groq {status}: {detail[:150]}")
+                    return None
+            
+            except asyncio.TimeoutError:
+                logger.error(f"⏱️ Timeout Groq ({timeout:.0f}s)")
+                retry_count += 1
+            except Exception as e:
+                logger.error(f"❌ Exception Groq: {e}")
+                retry_count += 1
+        
+        return None
+    
+    async def analyze_match(self, match: Dict, user_id: Optional[int], deadline: Optional[Deadline] = None) -> Dict:
+        """
+        Analyse complète avec collecte de données multi-sources.
+        `deadline`: échéance de bout en bout; la meilleure réponse disponible
+        (au pire algorithmique) est rendue avant son expiration.
+        `user_id` None: préchauffage (cache seulement, pas d'historique ni de profil).
+        Pour un utilisateur, toute prédiction servie (cache ou neuve) entre dans son historique.
+        """
+        
+        analysis_start = time.perf_counter()
+        deadline = ensure(deadline)
+        
+        # Valider l'événement (score déjà calculé au scraping si disponible)
+        is_valid, msg, validation_score = EventValidator.get_validation(match)
+        
+        if not is_valid:
+            return self._generate_invalid_response(match, msg)
+        
+        # Vérifier le cache (identité canonique: même rencontre = même clé)
+        fx_key = fixture_key(match)
+        cache_entry = AdvancedDataManager.get_fixture_cache(fx_key)
+        if cache_entry and cache_entry['fresh']:
+            self.stats['cache_hits'] += 1
+            telemetry.record_cache_hit('fixture')
+            return self._record_served(user_id, match, self._rebind_prediction(cache_entry['data'], match))
+        
+        sport = match.get('sport', 'FOOTBALL').lower()
+        sport_config = SPORTS_CONFIG.get(sport, SPORTS_CONFIG['other'])
+        
+        # === ÉTAPE 0: FORCE PRÉCALCULÉE (RATINGS) ===
+        model_inputs, strength_line = self._strength_inputs(match, sport)
+        
+        # === ÉTAPE 1: COLLECTER LES DONNÉES ===
+        collected = await self._collect(
+            match, deadline.child(Limits.COLLECTION_BUDGET, reserve=Limits.GROQ_MIN_BUDGET),
+            match_value(match, requested=user_id is not None)
+        )
+        data_quality = collected.quality if collected else 0
+        fingerprint = collected.fingerprint() if collected else ""
+        if collected:
+            model_inputs.update(self._stats_inputs(collected))
+        
+        # Données inchangées depuis la dernière analyse: pas de nouvel appel IA
+        if cache_entry and fingerprint and cache_entry.get('fingerprint') == fingerprint:
+            self.stats['fingerprint_hits'] += 1
+            telemetry.record_cache_hit('fingerprint')
+            AdvancedDataManager.set_fixture_cache(fx_key, cache_entry['data'], fingerprint)
+            return self._record_served(user_id, match, self._rebind_prediction(cache_entry['data'], match))
+        
+        # === ÉTAPE 2: ANALYSE IA AVEC LES DONNÉES ===
+        prediction = None
+        if self.api_key and deadline.has(Limits.GROQ_MIN_BUDGET):
+            if collected and collected.sources:
+                # Mode DATA-DRIVEN: l'IA reçoit les données réelles et génère LIBREMENT
+                prediction = await self._get_data_driven_prediction(
+                    match, sport, collected.format(Limits.PROMPT_SECTIONS), strength_line, deadline
+                )
+            else:
+                # Mode classique: l'IA génère sans données externes
+                prediction = await self._get_ai_prediction(match, sport, strength_line, deadline)
+        elif self.api_key:
+            logger.warning(f"⏱️ Échéance proche ({deadline.remaining():.1f}s) - analyse algorithmique")
+        
+        if prediction:
+            # Prédiction IA réussie
+            self.stats['ai_predictions'] += 1
+            
+            prediction = self._finalize_prediction(
+                prediction, match, sport_config, validation_score,
+                is_ai=True,
+                data_quality=data_quality
+            )
+        else:
+            # Fallback algorithmique
+            self.stats['fallback_predictions'] += 1
+            prediction = self._generate_algorithmic_prediction(
+                match, sport_config, validation_score, model_inputs
+            )
+        
+        telemetry.record_prediction(
+            prediction.get('meta', {}).get('prediction_type', 'unknown'),
+            (time.perf_counter() - analysis_start) * 1000,
+            fallback=not prediction.get('meta', {}).get('is_ai', False) and bool(self.api_key)
+        )
+        
+        # Sauvegarder (un repli forcé par l'échéance n'est pas mis en cache)
+        if prediction['meta'].get('is_ai') or not self.api_key or deadline.has(Limits.GROQ_MIN_BUDGET):
+            AdvancedDataManager.set_fixture_cache(fx_key, prediction, fingerprint)
+        return self._record_served(user_id, match, prediction)
+    
+    @staticmethod
+    def _record_served(user_id: Optional[int], match: Dict, prediction: Dict) -> Dict:
+        """Historique + profil de l'utilisateur servi (rien pour le préchauffage)"""
+        if user_id is None:
+            return prediction
+        if AdvancedDataManager.add_prediction_to_history(user_id, match, prediction):
+            # Mettre à jour profil (une fois par rencontre)
+            profile = AdvancedDataManager.get_user_profile(user_id)
+            profile.predictions_count += 1
+            AdvancedDataManager.save_user_profile(profile)
+        
+        return prediction
+    
+    @staticmethod
+    def _strength_inputs(match: Dict, sport: str) -> Tuple[Dict, str]:
+        """Entrées du modèle tirées des ratings + ligne de force pour le prompt"""
+        model_inputs: Dict = {}
+        strength_line = ""
+        if RATING_ENGINE_AVAILABLE:
+            team1, team2 = match.get('team1', ''), match.get('team2', '')
+            signal = rating_engine.strength_signal(sport, team1, team2)
+            if signal:
+                model_inputs['rating_diff'] = signal['rating_diff']
+                strength_line = rating_engine.prompt_line(signal, team1, team2)
+        return model_inputs, strength_line
+    
+    @staticmethod
+    def _stats_inputs(collected: CollectedData) -> Dict:
+        """Stats de saison collectées, au format API-Football attendu par le modèle"""
+        return {
+            key: stats.to_api() if stats else None
+            for key, stats in (('team1_stats', collected.team1_stats), ('team2_stats', collected.team2_stats))
+        }
+    
+    async def _collect(self, match: Dict, deadline: Deadline, value: float) -> Optional[CollectedData]:
+        """Collecte multi-sources (None si le collecteur est indisponible ou échoue)"""
+        if not DATA_COLLECTOR_AVAILABLE:
+            return None
+        try:
+            logger.info(f"📊 Collecte des données pour: {match.get('title', 'Match')[:40]}")
+            async with DataCollector() as collector:
+                collected = await collector.collect(match, deadline, value=value)
+                self.last_sources = collector.last_sources
+            logger.info(f"✅ Données collectées: {', '.join(collected.sources) or 'aucune source'} "
+                        f"(qualité {collected.quality}%)")
+            return collected
+        except Exception as e:
+            logger.error(f"❌ Erreur collecte données: {e}")
+            return None
+    
+    async def prepare_algorithmic(self, match: Dict, deadline: Optional[Deadline] = None) -> Optional[Dict]:
+        """
+        Préchauffage sans IA, étape 1: collecte d'un match pour le modèle
+        statistique (None si l'événement est invalide). Le calcul se fait
+        ensuite pour tous les matchs via predict_algorithmic_batch.
+        """
+        is_valid, _, validation_score = EventValidator.get_validation(match)
+        if not is_valid:
+            return None
+        model_inputs, _ = self._strength_inputs(match, match.get('sport', 'FOOTBALL').lower())
+        collected = await self._collect(match, ensure(deadline), match_value(match, requested=False))
+        if collected:
+            model_inputs.update(self._stats_inputs(collected))
+        return {
+            'match': match,
+            'validation_score': validation_score,
+            'model_inputs': model_inputs,
+            'fingerprint': collected.fingerprint() if collected else ""
+        }
+    
+    def predict_algorithmic_batch(self, prepared: List[Dict]) -> List[Dict]:
+        """Préchauffage sans IA, étape 2: UNE passe du modèle pour tous les matchs, mis en cache"""
+        predictions = self.generate_algorithmic_batch(
+            [item['match'] for item in prepared],
+            [item['validation_score'] for item in prepared],
+            [item['model_inputs'] for item in prepared]
+        )
+        for item, prediction in zip(prepared, predictions):
+            AdvancedDataManager.set_fixture_cache(fixture_key(item['match']), prediction, item['fingerprint'])
+        self.stats['fallback_predictions'] += len(predictions)
+        return predictions
+    
+    @staticmethod
+    def _rebind_prediction(prediction: Dict, match: Dict) -> Dict:
+        """Prédiction en cache présentée sous l'id du match demandé"""
+        meta = {**prediction.get('meta', {}), 'match_id': match.get('id'), 'match_title': match.get('title')}
+        return {**prediction, 'meta': meta}
+    
+    async def _get_data_driven_prediction(self, match: Dict, sport: str, data_text: str,
+                                          strength_line: str = "",
+                                          deadline: Optional[Deadline] = None) -> Optional[Dict]:
+        """
+        L'IA reçoit les données collectées et génère SES PROPRES PRÉDICTIONS.
+        Analyse ULTRA-DÉTAILLÉE avec justifications complètes.
+        """
+        team1 = match.get('team1', '')
+        team2 = match.get('team2', '')
+        
+        # Extraire du titre si nécessaire
+        if not team1 or not team2:
+            title = match.get('title', '')
+            if ' vs ' in title or ' v ' in title:
+                sep = ' vs ' if ' vs ' in title else ' v '
+                parts = title.split(sep)
+                team1 = parts[0].strip()
+                team2 = parts[1].strip() if len(parts) > 1 else ''
+        
+        # Prompt ULTRA-PRO (statique, registre) + requête propre au match
+        template = PROMPTS.get('data_driven')
+        user_prompt = f"""📊 ANALYSE PRO DEMANDÉE POUR:
+🏟️ {team1} vs {team2}
+🏆 Sport: {sport.upper()}
+⏰ {match.get('start_time', 'Heure non précisée')}
+{strength_line}
+
+══════════════════════════════════════════════════════════════════════════════
+📊 DONNÉES COLLECTÉES - ANALYSE EN PROFONDEUR
+══════════════════════════════════════════════════════════════════════════════
+
+{data_text}
+
+Réponds UNIQUEMENT avec un JSON valide."""
+        
+        messages = template.messages(user_prompt)
+        self.last_prompt = template.ref
+        
+        logger.info(f"🤖 Analyse PROFESSIONNELLE avec {len(data_text)} caractères de données...")
+        
+        # Exiger un modèle de qualité minimale 9B pour une analyse sérieuse
+        response = await self._call_groq(messages, extended=True, min_quality=9, deadline=deadline)
+        
+        result = await self._parse_prediction(response, messages, required_outcomes(sport, template), deadline)
+        if result is not None:
+            logger.info("✅ Prédiction data-driven générée avec succès")
+        return result
+    
+    async def _get_ai_prediction(self, match: Dict, sport: str,
+                                 strength_line: str = "",
+                                 deadline: Optional[Deadline] = None) -> Optional[Dict]:
+        """Obtient une prédiction de l'IA (mode classique sans données externes)"""
+        template = PROMPTS.for_sport(sport)
+        
+        team1 = match.get('team1', match.get('title', 'Équipe 1'))
+        team2 = match.get('team2', 'Équipe 2')
+        
+        user_prompt = f"""ANALYSE DEMANDÉE:
+
+🏟️ MATCH: {team1} vs {team2}
+🏆 SPORT: {sport.upper()}
+⏰ HEURE: {match.get('start_time', 'N/A')}
+📅 DATE: {datetime.now().strftime('%d/%m/%Y')}
+{strength_line}
+
+Fournis une analyse COMPLÈTE au format JSON avec TOUS les pronostics demandés."""
+        
+        messages = template.messages(user_prompt)
+        self.last_prompt = template.ref
+        
+        response = await self._call_groq(messages, deadline=deadline)
+        
+        return await self._parse_prediction(response, messages, required_outcomes(sport, template), deadline)
+    
+    async def _parse_prediction(self, response: Optional[str], messages: List[Dict], outcomes: Tuple[str, ...],
+                                deadline: Optional[Deadline] = None) -> Optional[Dict]:
+        """
+        Réponse du modèle -> prédiction au format du formateur.
+        JSON tronqué ou réparé: on garde les champs complets; s'il manque des
+        champs requis, une relance courte ne demande que ceux-là.
+        """
+        if not response:
+            return None
+        model = self.last_model or 'unknown'
+        
+        parsed = parse_lenient(response)
+        if not isinstance(parsed.value, dict):
+            telemetry.record_parse_failure(model)
+            logger.error("❌ Erreur parsing JSON: aucun objet exploitable")
+            return None
+        if not parsed.complete:
+            telemetry.record_json_repair(model, 'salvaged')
+            logger.warning(f"🧩 JSON réparé/tronqué [{model}] - champs complets conservés")
+        
+        prediction = normalize_prediction(parsed.value, outcomes)
+        missing = missing_fields(prediction, outcomes)
+        if not missing:
+            return prediction
+        
+        deadline = ensure(deadline)
+        if deadline.has(Limits.GROQ_MIN_BUDGET):
+            logger.info(f"🧩 Relance ciblée: {', '.join(missing)}")
+            telemetry.record_json_repair(model, 'followup')
+            followup = messages + [
+                {"role": "assistant", "content": json.dumps(prediction, ensure_ascii=False)[:4000]},
+                {"role": "user", "content": (
+                    "Ta réponse JSON est incomplète. Réponds UNIQUEMENT avec un objet JSON "
+                    "contenant ces champs, cohérents avec ton analyse:\n"
+                    + json.dumps(followup_skeleton(missing, outcomes), ensure_ascii=False)
+                )}
+            ]
+            addition = parse_lenient(await self._call_groq(followup, extended=False, deadline=deadline)).value
+            if isinstance(addition, dict):
+                merge_missing(prediction, normalize_prediction(addition, outcomes), missing)
+                prediction = normalize_prediction(prediction, outcomes)
+                missing = missing_fields(prediction, outcomes)
+        
+        if missing:
+            telemetry.record_parse_failure(model)
+            logger.error(f"❌ Prédiction incomplète: {', '.join(missing)}")
+            return None
+        return prediction
+    
+    def _finalize_prediction(self, prediction: Dict, match: Dict, 
+                            sport_config: Dict, validation_score: int,
+                            is_ai: bool, data_quality: int = 0) -> Dict:
+        """Finalise la prédiction avec métadonnées"""
+        
         summary = prediction.get('summary', {})
         confidence = summary.get('confidence', summary.get('overall_confidence', 50))
         
@@ -1889,7 +2356,8 @@ Fournis une analyse COMPLÈTE au format JSON avec TOUS les pronostics demandés.
             'sport_icon': sport_config['icon'],
             'analyzed_at': datetime.now().isoformat(),
             'prediction_type': prediction_type,
-            'model': GROQ_MODELS[self.current_model_index] if is_ai else 'Algorithm V5',
+            'model': (self.last_model or 'unknown') if is_ai else 'Algorithm V5',
+            'prompt': self.last_prompt if is_ai else None,
             'validation_score': validation_score,
             'data_quality_score': data_quality,
             'is_ai': is_ai,
@@ -1909,58 +2377,99 @@ Fournis une analyse COMPLÈTE au format JSON avec TOUS les pronostics demandés.
         return prediction
     
     def _generate_algorithmic_prediction(self, match: Dict, sport_config: Dict, 
-                                         validation_score: int) -> Dict:
-        """Génère une prédiction algorithmique (sans IA)"""
+                                         validation_score: int,
+                                         model_inputs: Optional[Dict] = None) -> Dict:
+        """Génère une prédiction algorithmique (sans IA) via le modèle statistique"""
+        return self.generate_algorithmic_batch(
+            [match], [validation_score], [model_inputs or {}]
+        )[0]
+    
+    def generate_algorithmic_batch(self, matches: List[Dict], validation_scores: List[int],
+                                   model_inputs: Optional[List[Dict]] = None) -> List[Dict]:
+        """
+        Score tous les matchs en UNE passe du modèle statistique.
+        model_inputs[i]: {'team1_stats', 'team2_stats', 'rating_diff'} (optionnels)
+        """
+        model_inputs = model_inputs or [{} for _ in matches]
+        
+        items = []
+        for match, inputs in zip(matches, model_inputs):
+            sport_key = match.get('sport', 'FOOTBALL').lower()
+            sport_config = SPORTS_CONFIG.get(sport_key, SPORTS_CONFIG['other'])
+            rating_diff = inputs.get('rating_diff')
+            if rating_diff is None and RATING_ENGINE_AVAILABLE:
+                signal = rating_engine.strength_signal(
+                    sport_key, match.get('team1', ''), match.get('team2', '')
+                )
+                rating_diff = signal['rating_diff'] if signal else 0.0
+            items.append({
+                'sport': sport_key if sport_key in SPORTS_CONFIG else 'other',
+                'result_type': sport_config['result_type'],
+                'team1_stats': inputs.get('team1_stats'),
+                'team2_stats': inputs.get('team2_stats'),
+                'rating_diff': rating_diff or 0.0
+            })
         
+        if STATISTICAL_MODEL_AVAILABLE:
+            model_preds = statistical_model.predict_matches(items)
+        else:
+            model_preds = [self._neutral_predictions(item['result_type']) for item in items]
+        
+        return [
+            self._build_algorithmic_prediction(match, item, preds, score)
+            for match, item, preds, score in zip(matches, items, model_preds, validation_scores)
+        ]
+    
+    @staticmethod
+    def _neutral_predictions(result_type: str) -> Dict:
+        """Probabilités de référence quand NumPy n'est pas installé"""
+        probs = {'1': 40, 'X': 27, '2': 33} if result_type == '1X2' else {'1': 52, '2': 48}
+        return {
+            'winner': {
+                'prediction': '1',
+                'probabilities': probs,
+                'confidence': 30,
+                'reasoning': "Probabilités de référence (modèle statistique indisponible)."
+            }
+        }
+    
+    def _build_algorithmic_prediction(self, match: Dict, item: Dict, preds: Dict,
+                                      validation_score: int) -> Dict:
+        """Assemble la réponse algorithmique au format attendu par TelegramFormatter"""
+        sport_config = SPORTS_CONFIG.get(item['sport'], SPORTS_CONFIG['other'])
         team1 = match.get('team1', 'Équipe 1')
         team2 = match.get('team2', 'Équipe 2')
         sport = sport_config['name']
-        
-        # Générer des probabilités
-        if sport_config['result_type'] == '1X2':
-            p1 = random.randint(30, 50)
-            px = random.randint(20, 32)
-            p2 = 100 - p1 - px
-            probs = {'1': p1, 'X': px, '2': max(18, p2)}
-            winner = max(probs, key=probs.get)
-        else:
-            p1 = random.randint(42, 58)
-            p2 = 100 - p1
-            probs = {'1': p1, '2': p2}
-            winner = '1' if p1 > p2 else '2'
+        has_stats = bool(item.get('team1_stats') and item.get('team2_stats'))
         
         # Grade basé sur validation
         grade = EventValidator.get_grade(validation_score)
         if grade == 'D':
             grade = 'C'  # Minimum C pour algo
         
-        base_confidence = 45 if grade in ['A', 'A+', 'B', 'B+'] else 40
+        winner = preds['winner']
+        base_confidence = winner.get('confidence', 40)
+        
+        key_factors = [
+            "Modèle Poisson/Dixon–Coles" if item['sport'] == 'football' else "Modèle logistique de rating",
+            "Statistiques saison API-Football" if has_stats else "Moyennes de référence de la ligue",
+            f"Contexte {sport}"
+        ]
         
         prediction = {
             'analysis': {
                 'overview': f"Analyse algorithmique pour {team1} vs {team2}. "
-                           f"Ce pronostic est généré par notre algorithme, pas par l'IA.",
-                'key_factors': [
-                    "Analyse basée sur données statistiques",
-                    "Historique des performances",
-                    f"Contexte {sport}"
-                ],
-                'team1_form': "Données de forme simulées",
-                'team2_form': "Données de forme simulées"
-            },
-            'predictions': {
-                'winner': {
-                    'prediction': winner,
-                    'probabilities': probs,
-                    'confidence': base_confidence,
-                    'reasoning': "Prédiction algorithmique basée sur les tendances statistiques."
-                }
+                           f"Ce pronostic est généré par notre modèle statistique, pas par l'IA.",
+                'key_factors': key_factors,
+                'team1_form': "Forces estimées depuis les stats saison" if has_stats else "Données de forme indisponibles",
+                'team2_form': "Forces estimées depuis les stats saison" if has_stats else "Données de forme indisponibles"
             },
+            'predictions': preds,
             'summary': {
                 'confidence': base_confidence,
                 'grade': grade,
                 'data_quality': 'Limité (Algorithme)',
-                'key_insight': f"Analyse {sport} générée algorithmiquement"
+                'key_insight': f"Analyse {sport} générée par le modèle statistique"
             },
             'meta': {
                 'match_id': match.get('id'),
@@ -1972,108 +2481,27 @@ Fournis une analyse COMPLÈTE au format JSON avec TOUS les pronostics demandés.
                 'sport_icon': sport_config['icon'],
                 'analyzed_at': datetime.now().isoformat(),
                 'prediction_type': 'ALGORITHMIC',
-                'model': 'Algorithm V4',
+                'model': 'Statistical Model V1',
                 'validation_score': validation_score,
                 'is_ai': False
             },
             'disclaimer': "⚠️ Prédiction ALGORITHMIQUE (pas d'IA). Fiabilité limitée. Pariez responsablement."
         }
         
-        # Ajouter prédictions spécifiques au sport
-        self._add_sport_predictions(prediction, sport_config['name'].lower(), match)
+        # Meilleur pari: l'issue la plus probable, cote juste dérivée du modèle
+        probs = winner.get('probabilities', {})
+        pick = winner.get('prediction', '1')
+        pick_prob = max(probs.get(pick, 50), 1)
+        preds['best_bet'] = {
+            'selection': f"Vainqueur: {pick}",
+            'odds': round(100 / pick_prob, 2),
+            'confidence': base_confidence,
+            'value_rating': '★★★☆☆',
+            'reasoning': "Issue la plus probable selon le modèle (cote juste = 1/probabilité)"
+        }
         
         return prediction
     
-    def _add_sport_predictions(self, prediction: Dict, sport: str, match: Dict):
-        """Ajoute des prédictions spécifiques au sport"""
-        preds = prediction['predictions']
-        
-        if sport == 'football':
-            preds['total_goals'] = {
-                'expected': round(random.uniform(2.2, 2.8), 1),
-                'over_1_5': {'probability': random.randint(70, 82)},
-                'over_2_5': {'probability': random.randint(48, 58)},
-                'over_3_5': {'probability': random.randint(25, 35)},
-                'confidence': 45
-            }
-            preds['btts'] = {
-                'prediction': random.choice(['Oui', 'Non']),
-                'probability': random.randint(48, 62),
-                'confidence': 42
-            }
-            preds['corners'] = {
-                'total_expected': random.randint(9, 12),
-                'over_8_5': {'probability': random.randint(55, 70)},
-                'over_9_5': {'probability': random.randint(45, 58)},
-                'over_10_5': {'probability': random.randint(35, 48)},
-                'confidence': 40
-            }
-            preds['cards'] = {
-                'yellow_cards': {
-                    'total_expected': round(random.uniform(3.5, 5.5), 1),
-                    'over_3_5': {'probability': random.randint(55, 70)},
-                    'over_4_5': {'probability': random.randint(40, 55)}
-                },
-                'red_cards': {
-                    'probability': random.randint(8, 18)
-                },
-                'confidence': 38
-            }
-            preds['fouls'] = {
-                'total_expected': random.randint(22, 28),
-                'over_22_5': {'probability': random.randint(45, 60)},
-                'confidence': 35
-            }
-            preds['halftime'] = {
-                'result': random.choice(['1', 'X', '2']),
-                'probabilities': {'1': 38, 'X': 35, '2': 27},
-                'confidence': 38
-            }
-        
-        elif sport in ['ufc', 'mma', 'ufc/mma']:
-            preds['method'] = {
-                'ko_tko': {'probability': random.randint(28, 42)},
-                'submission': {'probability': random.randint(15, 28)},
-                'decision': {'probability': random.randint(38, 52)},
-                'confidence': 40
-            }
-            preds['round'] = {
-                'goes_distance': {'probability': random.randint(35, 55)},
-                'confidence': 38
-            }
-        
-        elif sport in ['nba', 'basketball', 'nba/basketball']:
-            preds['total_points'] = {
-                'line': random.choice([210.5, 215.5, 220.5, 225.5, 230.5]),
-                'over_probability': random.randint(45, 55),
-                'confidence': 42
-            }
-            preds['spread'] = {
-                'line': random.choice([-7.5, -5.5, -3.5, 3.5, 5.5, 7.5]),
-                'confidence': 40
-            }
-        
-        elif sport == 'tennis':
-            preds['sets'] = {
-                'prediction': random.choice(['2-0', '2-1', '1-2', '0-2']),
-                'confidence': 38
-            }
-            preds['total_games'] = {
-                'expected': random.randint(20, 26),
-                'over_21_5': {'probability': random.randint(45, 55)},
-                'confidence': 40
-            }
-        
-        # Ajouter best_bet si pas présent
-        if 'best_bet' not in preds:
-            preds['best_bet'] = {
-                'selection': f"Vainqueur: {preds['winner']['prediction']}",
-                'odds': round(random.uniform(1.65, 2.40), 2),
-                'confidence': prediction['summary']['confidence'],
-                'value_rating': '★★★☆☆',
-                'reasoning': "Meilleur pari identifié par l'algorithme"
-            }
-    
     def _generate_invalid_response(self, match: Dict, reason: str) -> Dict:
         """Réponse pour événement invalide"""
         return {
@@ -2102,445 +2530,14 @@ class TelegramFormatter:
     
     @staticmethod
     def format_prediction(match: Dict, prediction: Dict, user_profile: UserProfile = None) -> str:
-        """Formate une prédiction complète"""
-        
-        if prediction.get('error'):
-            return TelegramFormatter._format_error(prediction)
-        
-        meta = prediction.get('meta', {})
-        analysis = prediction.get('analysis', prediction.get('data_analysis', {}))
-        preds = prediction.get('predictions', {})
-        summary = prediction.get('summary', {})
-        lineups = prediction.get('lineups', {})
-        data_sources = prediction.get('data_sources', {})
-        value_bets = prediction.get('value_bets', [])
-        team_analysis = prediction.get('team_analysis', {})
-        
-        is_ai = meta.get('is_ai', False)
-        is_data_driven = meta.get('is_data_driven', False)
-        sport_icon = meta.get('sport_icon', '🎯')
-        data_quality_score = meta.get('data_quality_score', 0)
-        
-        # === BANNIÈRE DE TYPE DE PRÉDICTION ===
-        if is_data_driven:
-            sources_text = ', '.join(data_sources.get('sources_used', ['IA'])[:3])
-            type_banner = f"""╔═══════════════════════════════════════╗
-   🔬 <b>ANALYSE DATA-DRIVEN</b>
-   📊 Données: {sources_text}
-   🎯 Qualité: {data_quality_score}%
-╚═══════════════════════════════════════╝"""
-        elif is_ai:
-            type_banner = """╔═══════════════════════════════════════╗
-   🤖 <b>ANALYSE IA</b>
-   ✅ Générée par Intelligence Artificielle
-╚═══════════════════════════════════════╝"""
-        else:
-            type_banner = """╔═══════════════════════════════════════╗
-   📊 <b>ANALYSE ALGORITHMIQUE</b>
-   ⚠️ Générée SANS IA - Fiabilité limitée
-╚═══════════════════════════════════════╝"""
-        
-        # Grade et confiance
-        grade = summary.get('grade', 'C')
-        confidence = summary.get('confidence', summary.get('overall_confidence', 45))
-        grade_colors = {
-            'A+': '🌟', 'A': '🟢', 'B+': '🟢', 'B': '🟡', 
-            'C+': '🟡', 'C': '🟠', 'D': '🔴'
-        }
-        grade_emoji = grade_colors.get(grade, '⚪')
-        
-        msg = f"""{type_banner}
-
-{sport_icon} <b>{match.get('title', 'Match')}</b>
-⏰ {match.get('start_time', 'N/A')} | 📅 {datetime.now().strftime('%d/%m/%Y')}
-
-━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-{grade_emoji} <b>GRADE: {grade}</b> | Confiance: <b>{confidence}%</b>
-━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-
-"""
-        
-        # === OBSERVATIONS CLÉS (si data-driven) ===
-        if analysis.get('key_observations'):
-            msg += "📋 <b>OBSERVATIONS CLÉS</b>\n"
-            for obs in analysis['key_observations'][:4]:
-                msg += f"• {obs[:80]}\n"
-            msg += "\n"
-        elif analysis.get('overview'):
-            msg += f"""📋 <b>ANALYSE</b>
-{analysis['overview'][:400]}
-
-"""
-        
-        # === ANALYSE DES ÉQUIPES (si disponible) ===
-        if team_analysis:
-            msg += TelegramFormatter._format_team_analysis(team_analysis, match)
-        
-        # === COMPOSITIONS (si disponibles) ===
-        if lineups:
-            msg += TelegramFormatter._format_lineups(lineups, match)
-        
-        # === PRONOSTIC PRINCIPAL ===
-        winner = preds.get('winner', preds.get('match_result', preds.get('match_winner', {})))
-        if winner:
-            msg += TelegramFormatter._format_winner(winner, match)
-        
-        # === PRONOSTICS DÉTAILLÉS PAR SPORT ===
-        sport = meta.get('sport', 'football').lower()
-        msg += TelegramFormatter._format_sport_predictions(preds, sport, match)
-        
-        # === VALUE BETS (si data-driven) ===
-        if value_bets:
-            msg += TelegramFormatter._format_value_bets(value_bets)
-        
-        # === MEILLEUR PARI ===
-        best_bet = preds.get('best_bet', {})
-        if best_bet and not value_bets:
-            msg += f"""━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-💎 <b>MEILLEUR PARI</b>
-
-🎯 <b>{best_bet.get('selection', 'N/A')}</b>
-💰 Cote: <b>{best_bet.get('odds', 'N/A')}</b>
-⭐ Valeur: {best_bet.get('value_rating', '★★★☆☆')}
-
-"""
-        
-        # === INSIGHT / RECOMMANDATION ===
-        key_insight = summary.get('key_insight', summary.get('main_prediction', ''))
-        recommendation = summary.get('recommendation', '')
-        
-        if key_insight or recommendation:
-            msg += "━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━\n"
-            if key_insight:
-                msg += f"💡 <b>INSIGHT</b>\n{key_insight[:200]}\n\n"
-            if recommendation:
-                msg += f"🎯 <b>CONSEIL</b>\n{recommendation[:150]}\n\n"
-        
-        # === DISCLAIMER ===
-        msg += f"""━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-⚠️ <i>{prediction.get('disclaimer', 'Pariez de manière responsable.')}</i>
-
-"""
-        
-        # === INDICATEUR FINAL ===
-        if is_ai:
-            msg += f"🤖 <i>Analysé par IA ({meta.get('model', 'N/A')[:25]})</i>"
-        else:
-            msg += f"📊 <i>Analyse ALGORITHMIQUE - Pas d'IA utilisée</i>"
-        
-        return msg
-    
-    @staticmethod
-    def _format_team_analysis(team_analysis: Dict, match: Dict) -> str:
-        """Formate l'analyse des équipes"""
-        msg = """━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-📊 <b>ANALYSE DES ÉQUIPES</b>
-
-"""
-        team1 = match.get('team1', 'Équipe 1')
-        team2 = match.get('team2', 'Équipe 2')
-        
-        if team_analysis.get('team1'):
-            t1 = team_analysis['team1']
-            msg += f"🔵 <b>{t1.get('name', team1)}</b>\n"
-            if t1.get('form_rating'):
-                msg += f"   📈 Forme: {t1['form_rating']}/10\n"
-            if t1.get('strengths'):
-                msg += f"   ✅ Forces: {', '.join(t1['strengths'][:2])}\n"
-            if t1.get('weaknesses'):
-                msg += f"   ❌ Faiblesses: {', '.join(t1['weaknesses'][:2])}\n"
-            msg += "\n"
-        
-        if team_analysis.get('team2'):
-            t2 = team_analysis['team2']
-            msg += f"🔴 <b>{t2.get('name', team2)}</b>\n"
-            if t2.get('form_rating'):
-                msg += f"   📈 Forme: {t2['form_rating']}/10\n"
-            if t2.get('strengths'):
-                msg += f"   ✅ Forces: {', '.join(t2['strengths'][:2])}\n"
-            if t2.get('weaknesses'):
-                msg += f"   ❌ Faiblesses: {', '.join(t2['weaknesses'][:2])}\n"
-            msg += "\n"
-        
-        return msg
-    
-    @staticmethod
-    def _format_value_bets(value_bets: List) -> str:
-        """Formate les value bets identifiés"""
-        msg = """━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-💎 <b>VALUE BETS IDENTIFIÉS</b>
-
-"""
-        for i, bet in enumerate(value_bets[:3], 1):
-            market = bet.get('market', 'N/A')
-            selection = bet.get('selection', 'N/A')
-            odds = bet.get('odds', 'N/A')
-            value_rating = bet.get('value_rating', '★★★☆☆')
-            prob = bet.get('probability_estimated', 0)
-            
-            msg += f"{i}. <b>{market}</b>\n"
-            msg += f"   🎯 {selection}\n"
-            msg += f"   💰 Cote: {odds} | ⭐ {value_rating}\n"
-            if bet.get('reasoning'):
-                msg += f"   💡 {bet['reasoning'][:60]}...\n"
-            msg += "\n"
-        
-        return msg
+        """Formate une prédiction complète (toutes pages réunies)"""
+        return ''.join(TelegramFormatter.format_prediction_pages(match, prediction, user_profile))
     
     @staticmethod
-    def _format_lineups(lineups: Dict, match: Dict) -> str:
-        """Formate les compositions"""
-        msg = """━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-👥 <b>COMPOSITIONS PROBABLES</b>
-
-"""
-        
-        team1 = match.get('team1', 'Équipe 1')
-        team2 = match.get('team2', 'Équipe 2')
-        
-        if lineups.get('team1'):
-            t1 = lineups['team1']
-            msg += f"🔵 <b>{team1}</b>\n"
-            if t1.get('formation'):
-                msg += f"   📐 Formation: {t1['formation']}\n"
-            if t1.get('starting_xi') or t1.get('starting_five') or t1.get('probable_xi'):
-                players = t1.get('starting_xi') or t1.get('starting_five') or t1.get('probable_xi', [])
-                if players:
-                    msg += f"   👤 {', '.join(str(p) for p in players[:6])}...\n"
-            if t1.get('key_player') or t1.get('key_player_to_watch'):
-                key = t1.get('key_player') or t1.get('key_player_to_watch', '')
-                msg += f"   ⭐ Joueur clé: {key}\n"
-            if t1.get('key_absences'):
-                msg += f"   🚑 Absents: {', '.join(t1['key_absences'][:2])}\n"
-            msg += "\n"
-        
-        if lineups.get('team2'):
-            t2 = lineups['team2']
-            msg += f"🔴 <b>{team2}</b>\n"
-            if t2.get('formation'):
-                msg += f"   📐 Formation: {t2['formation']}\n"
-            if t2.get('starting_xi') or t2.get('starting_five') or t2.get('probable_xi'):
-                players = t2.get('starting_xi') or t2.get('starting_five') or t2.get('probable_xi', [])
-                if players:
-                    msg += f"   👤 {', '.join(str(p) for p in players[:6])}...\n"
-            if t2.get('key_player') or t2.get('key_player_to_watch'):
-                key = t2.get('key_player') or t2.get('key_player_to_watch', '')
-                msg += f"   ⭐ Joueur clé: {key}\n"
-            if t2.get('key_absences'):
-                msg += f"   🚑 Absents: {', '.join(t2['key_absences'][:2])}\n"
-            msg += "\n"
-        
-        return msg
-    
-    @staticmethod
-    def _format_winner(winner: Dict, match: Dict) -> str:
-        """Formate la prédiction du vainqueur"""
-        probs = winner.get('probabilities', {})
-        pred = winner.get('prediction', 'N/A')
-        conf = winner.get('confidence', 0)
-        
-        team1 = match.get('team1', 'Domicile')
-        team2 = match.get('team2', 'Extérieur')
-        
-        msg = f"""━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-🏆 <b>RÉSULTAT / VAINQUEUR</b>
-
-🎯 Prédiction: <b>{pred}</b>
-📊 Confiance: <b>{conf}%</b>
-
-📈 Probabilités:
-"""
-        
-        if '1' in probs:
-            msg += f"├ 1️⃣ {team1}: <b>{probs.get('1', 0)}%</b>\n"
-        if 'X' in probs:
-            msg += f"├ ❌ Nul: <b>{probs.get('X', 0)}%</b>\n"
-        if '2' in probs:
-            msg += f"└ 2️⃣ {team2}: <b>{probs.get('2', 0)}%</b>\n"
-        
-        msg += "\n"
-        return msg
-    
-    @staticmethod
-    def _format_sport_predictions(preds: Dict, sport: str, match: Dict) -> str:
-        """Formate toutes les prédictions spécifiques au sport"""
-        msg = ""
-        
-        if sport in ['football', 'soccer']:
-            # Score exact
-            exact = preds.get('exact_score', {})
-            if exact.get('top_3'):
-                msg += "━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━\n⚽ <b>SCORES PROBABLES</b>\n\n"
-                for i, s in enumerate(exact['top_3'][:3], 1):
-                    medal = '🥇' if i == 1 else '🥈' if i == 2 else '🥉'
-                    msg += f"{medal} <b>{s.get('score', 'N/A')}</b> ({s.get('probability', 0)}%)\n"
-                msg += "\n"
-            
-            # Total buts
-            goals = preds.get('total_goals', {})
-            if goals:
-                msg += f"""━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-📊 <b>TOTAL BUTS</b>
-
-🎯 Attendu: <b>{goals.get('expected', 'N/A')}</b>
-"""
-                for key in ['over_1_5', 'over_2_5', 'over_3_5']:
-                    if key in goals:
-                        prob = goals[key].get('probability', goals[key]) if isinstance(goals[key], dict) else goals[key]
-                        label = key.replace('over_', '+').replace('_', '.')
-                        emoji = "✅" if prob > 50 else "❌"
-                        msg += f"{emoji} {label}: <b>{prob}%</b>\n"
-                msg += "\n"
-            
-            # BTTS
-            btts = preds.get('btts', {})
-            if btts:
-                emoji = "✅" if btts.get('prediction') == 'Oui' else "❌"
-                msg += f"""━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-🥅 <b>BTTS</b> (Les deux marquent)
-
-{emoji} <b>{btts.get('prediction', 'N/A')}</b> ({btts.get('probability', 0)}%)
-
-"""
-            
-            # Corners
-            corners = preds.get('corners', {})
-            if corners:
-                msg += f"""━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-🚩 <b>CORNERS</b>
-
-📊 Total attendu: <b>{corners.get('total_expected', 'N/A')}</b>
-"""
-                for key in ['over_8_5', 'over_9_5', 'over_10_5', 'over_11_5']:
-                    if key in corners:
-                        data = corners[key]
-                        prob = data.get('probability', data) if isinstance(data, dict) else data
-                        label = key.replace('over_', '+').replace('_', '.')
-                        msg += f"   {label}: <b>{prob}%</b>\n"
-                msg += "\n"
-            
-            # Cartons
-            cards = preds.get('cards', {})
-            if cards:
-                yellow = cards.get('yellow_cards', {})
-                red = cards.get('red_cards', {})
-                msg += f"""━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-🟨🟥 <b>CARTONS</b>
-
-🟨 Jaunes attendus: <b>{yellow.get('total_expected', 'N/A')}</b>
-"""
-                for key in ['over_3_5', 'over_4_5', 'over_5_5']:
-                    if key in yellow:
-                        data = yellow[key]
-                        prob = data.get('probability', data) if isinstance(data, dict) else data
-                        label = key.replace('over_', '+').replace('_', '.')
-                        msg += f"   {label}: <b>{prob}%</b>\n"
-                
-                red_prob = red.get('probability', 0) if isinstance(red, dict) else red
-                msg += f"\n🟥 Rouge probabilité: <b>{red_prob}%</b>\n\n"
-            
-            # Fautes
-            fouls = preds.get('fouls', {})
-            if fouls:
-                msg += f"""━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-⚠️ <b>FAUTES</b>
-
-📊 Total attendu: <b>{fouls.get('total_expected', 'N/A')}</b>
-"""
-                if 'over_22_5' in fouls:
-                    data = fouls['over_22_5']
-                    prob = data.get('probability', data) if isinstance(data, dict) else data
-                    msg += f"   +22.5: <b>{prob}%</b>\n"
-                msg += "\n"
-            
-            # Mi-temps
-            ht = preds.get('halftime', {})
-            if ht:
-                msg += f"""━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-⏱️ <b>MI-TEMPS</b>
-
-🎯 Résultat HT: <b>{ht.get('result', 'N/A')}</b>
-"""
-                if ht.get('score'):
-                    msg += f"📊 Score prévu: <b>{ht['score']}</b>\n"
-                msg += "\n"
-        
-        elif sport in ['ufc', 'mma', 'ufc/mma']:
-            method = preds.get('method', {})
-            if method:
-                msg += f"""━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-🎯 <b>MÉTHODE DE VICTOIRE</b>
-
-💥 KO/TKO: <b>{method.get('ko_tko', {}).get('probability', 0)}%</b>
-🔒 Soumission: <b>{method.get('submission', {}).get('probability', 0)}%</b>
-📋 Décision: <b>{method.get('decision', {}).get('probability', 0)}%</b>
-
-"""
-            
-            rd = preds.get('round', {})
-            if rd:
-                msg += f"""━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-⏱️ <b>DURÉE</b>
-
-📊 Va à la distance: <b>{rd.get('goes_distance', {}).get('probability', 0)}%</b>
-
-"""
-        
-        elif sport in ['nba', 'basketball']:
-            total = preds.get('total_points', {})
-            if total:
-                msg += f"""━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-🏀 <b>TOTAL POINTS</b>
-
-📊 Ligne: <b>{total.get('line', 'N/A')}</b>
-✅ Over: <b>{total.get('over_probability', 50)}%</b>
-
-"""
-            
-            spread = preds.get('spread', {})
-            if spread:
-                msg += f"""━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-📏 <b>SPREAD</b>
-
-🎯 Ligne: <b>{spread.get('line', 'N/A')}</b>
-
-"""
-        
-        elif sport == 'tennis':
-            sets = preds.get('sets', preds.get('sets_score', {}))
-            if sets:
-                msg += f"""━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-🎾 <b>SCORE EN SETS</b>
-
-🎯 Prévu: <b>{sets.get('prediction', 'N/A')}</b>
-
-"""
-            
-            games = preds.get('total_games', {})
-            if games:
-                msg += f"""━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-📊 <b>TOTAL JEUX</b>
-
-📊 Attendu: <b>{games.get('expected', 'N/A')}</b>
-
-"""
-        
-        return msg
-    
-    @staticmethod
-    def _format_error(prediction: Dict) -> str:
-        """Formate une erreur"""
-        return f"""╔═══════════════════════════════════════╗
-   ❌ <b>ANALYSE NON DISPONIBLE</b>
-╚═══════════════════════════════════════╝
-
-📋 Match: {prediction.get('match_title', 'N/A')}
-
-⚠️ <b>Raison:</b> {prediction.get('message', 'Erreur inconnue')}
-
-💡 <i>Cet événement ne peut pas être analysé.
-Vérifiez qu'il s'agit d'un événement réel.</i>
-"""
+    def format_prediction_pages(match: Dict, prediction: Dict, user_profile: UserProfile = None) -> List[str]:
+        """Pages HTML (<= 4096 caractères) d'une prédiction, rendu mis en cache"""
+        tier = user_profile.tier if user_profile else 'free'
+        return prediction_renderer.render(match, prediction, tier)
     
     @staticmethod
     def format_community_votes(match: Dict, vote_stats: Dict, user_vote: str = None) -> str:
@@ -2668,63 +2665,90 @@ async def handle_prediction_request(query, match_id: str, data_manager) -> None:
     
     # Vérifier limites
     profile = AdvancedDataManager.get_user_profile(user_id, username)
-    today_count = AdvancedDataManager.get_today_predictions_count(user_id)
+    today_count = rate_limiter.daily_count(
+        user_id, 'predict',
+        seed=lambda: AdvancedDataManager.get_today_predictions_count(user_id)
+    )
     
     if today_count >= profile.daily_limit:
         await query.answer(f"⚠️ Limite atteinte ({profile.daily_limit}/jour)", show_alert=True)
         return
     
+    allowed, retry_after = rate_limiter.check(user_id, 'predict', profile.daily_limit)
+    if not allowed:
+        await query.answer(f"⏳ Trop de demandes - réessayez dans {retry_after}s", show_alert=True)
+        return
+    
     sport = match.get('sport', 'FOOTBALL').lower()
     sport_config = SPORTS_CONFIG.get(sport, SPORTS_CONFIG['other'])
     
     # Message de chargement avec indication du mode
     mode_text = "🤖 IA" if AI_AVAILABLE else "📊 Algorithme"
+    cancel_markup = InlineKeyboardMarkup([[
+        InlineKeyboardButton("❌ Annuler", callback_data=f"cancel_predict_{match['id']}")
+    ]])
     
-    try:
-        loading_msg = await query.edit_message_text(
-            f"""🔮 <b>Analyse en cours...</b>
+    def loading_text(position: int = 0) -> str:
+        queue_line = f"\n🎟️ File d'attente: <b>{position}</b> analyse(s) avant la vôtre\n" if position else ""
+        return f"""🔮 <b>Analyse en cours...</b>
 
 {sport_config['icon']} <b>{match.get('title', 'Match')[:50]}</b>
-
+{queue_line}
 ⏳ Mode: {mode_text}
 📊 Calcul des probabilités...
 🎯 Génération des pronostics...
 
-<i>Patientez quelques secondes...</i>""",
-            parse_mode='HTML'
+<i>Patientez quelques secondes...</i>"""
+    
+    try:
+        loading_msg = await query.edit_message_text(
+            loading_text(), parse_mode='HTML', reply_markup=cancel_markup
         )
     except:
         loading_msg = query.message
     
-    try:
+    async def publish_position(position: int):
+        await loading_msg.edit_text(loading_text(position), parse_mode='HTML', reply_markup=cancel_markup)
+    
+    async def run_analysis():
+        # Échéance armée au démarrage de l'analyse (l'attente en file est affichée à part)
+        deadline = Deadline(Limits.PREDICTION_DEADLINE)
         async with UltraPredictor() as predictor:
-            prediction = await predictor.analyze_match(match, user_id)
-        
-        formatted = TelegramFormatter.format_prediction(match, prediction, profile)
-        
-        # Boutons
-        buttons = []
-        
-        if sport_config.get('vote_options'):
-            vote_row = []
-            for key, label in sport_config['vote_options'].items():
-                vote_row.append(InlineKeyboardButton(
-                    f"{key}️⃣ {label[:10]}",
-                    callback_data=f"vote_{match['id']}_{key}"
-                ))
-            if vote_row:
-                buttons.append(vote_row)
-        
-        buttons.append([
-            InlineKeyboardButton("👥 Votes", callback_data=f"votes_{match['id']}"),
-            InlineKeyboardButton("📊 Stats", callback_data="my_stats"),
-            InlineKeyboardButton("🔙 Retour", callback_data=f"watch_{match['id']}")
-        ])
+            return await predictor.analyze_match(match, user_id, deadline)
+    
+    try:
+        # File par palier: concurrence bornée, les paliers payants passent devant
+        future = await prediction_queue.submit(user_id, profile.tier, run_analysis, publish_position)
+        try:
+            prediction = await future
+        except asyncio.CancelledError:
+            if asyncio.current_task().cancelling():
+                raise       # Arrêt du bot, pas une annulation de l'utilisateur
+            # Bouton Annuler ou nouvelle analyse demandée: l'écran de chargement ne reste pas figé
+            logger.info(f"🚫 Analyse {match['id']} abandonnée par {user_id}")
+            try:
+                await loading_msg.edit_text(
+                    f"""🚫 <b>Analyse annulée</b>
+
+{sport_config['icon']} <b>{match.get('title', 'Match')[:50]}</b>""",
+                    parse_mode='HTML',
+                    reply_markup=InlineKeyboardMarkup([[
+                        InlineKeyboardButton("🔄 Relancer", callback_data=f"predict_{match['id']}"),
+                        InlineKeyboardButton("🔙 Retour", callback_data=f"watch_{match['id']}")
+                    ]])
+                )
+            except Exception as e:
+                logger.debug(f"Message d'annulation non affiché: {e}")
+            return
+        rate_limiter.increment_daily(user_id, 'predict')
+        
+        pages = TelegramFormatter.format_prediction_pages(match, prediction, profile)
+        prediction_renderer.remember(user_id, match['id'], pages)
         
         await loading_msg.edit_text(
-            formatted,
+            pages[0],
             parse_mode='HTML',
-            reply_markup=InlineKeyboardMarkup(buttons)
+            reply_markup=_prediction_keyboard(match['id'], sport_config, 0, len(pages))
         )
         
     except Exception as e:
@@ -2746,6 +2770,62 @@ Une erreur est survenue.
         )
 
 
+def _prediction_keyboard(match_id: str, sport_config: Dict, page: int, total_pages: int) -> InlineKeyboardMarkup:
+    """Boutons sous une prédiction: pages (si plusieurs), votes, navigation"""
+    buttons = []
+    
+    if total_pages > 1:
+        nav_row = []
+        if page > 0:
+            nav_row.append(InlineKeyboardButton("◀️", callback_data=f"predpage_{match_id}_{page - 1}"))
+        nav_row.append(InlineKeyboardButton(f"📄 {page + 1}/{total_pages}", callback_data=f"predpage_{match_id}_{page}"))
+        if page < total_pages - 1:
+            nav_row.append(InlineKeyboardButton("▶️", callback_data=f"predpage_{match_id}_{page + 1}"))
+        buttons.append(nav_row)
+    
+    if sport_config.get('vote_options'):
+        vote_row = []
+        for key, label in sport_config['vote_options'].items():
+            vote_row.append(InlineKeyboardButton(
+                f"{key}️⃣ {label[:10]}",
+                callback_data=f"vote_{match_id}_{key}"
+            ))
+        if vote_row:
+            buttons.append(vote_row)
+    
+    buttons.append([
+        InlineKeyboardButton("👥 Votes", callback_data=f"votes_{match_id}"),
+        InlineKeyboardButton("📊 Stats", callback_data="my_stats"),
+        InlineKeyboardButton("🔙 Retour", callback_data=f"watch_{match_id}")
+    ])
+    return InlineKeyboardMarkup(buttons)
+
+
+async def show_prediction_page(query, match_id: str, page: int, data_manager) -> None:
+    """Affiche une autre page d'une prédiction déjà rendue (pas de nouvelle analyse)"""
+    pages = prediction_renderer.recall(query.from_user.id, match_id)
+    if not pages:
+        await query.answer("⌛ Analyse expirée - relancez-la", show_alert=True)
+        return
+    
+    page = max(0, min(page, len(pages) - 1))
+    all_matches = data_manager.load_data().get('matches', [])
+    match = next((m for m in all_matches if m.get('id') == match_id), {})
+    sport = match.get('sport', 'football').lower()
+    sport_config = SPORTS_CONFIG.get(sport, SPORTS_CONFIG['other'])
+    
+    await query.answer()
+    try:
+        await query.edit_message_text(
+            pages[page],
+            parse_mode='HTML',
+            reply_markup=_prediction_keyboard(match_id, sport_config, page, len(pages))
+        )
+    except Exception as e:
+        # Même page redemandée: Telegram refuse une édition identique
+        logger.debug(f"Page {page} non affichée: {e}")
+
+
 async def handle_vote(query, match_id: str, vote: str, data_manager) -> None:
     """Handler pour les votes"""
     user = query.from_user
@@ -2755,7 +2835,7 @@ async def handle_vote(query, match_id: str, vote: str, data_manager) -> None:
     
     sport = match.get('sport', 'football').lower() if match else 'football'
     
-    AdvancedDataManager.add_vote(match_id, user.id, vote, sport)
+    AdvancedDataManager.add_vote(match_id, user.id, vote, sport, match)
     
     profile = AdvancedDataManager.get_user_profile(user.id)
     profile.total_points += Limits.POINTS_VOTE
@@ -2895,6 +2975,7 @@ __all__ = [
     'PredictionsManager',
     'UserProfile',
     'handle_prediction_request',
+    'show_prediction_page',
     'handle_vote',
     'show_community_votes',
     'show_user_prediction_stats',
@@ -0,0 +1,226 @@
+"""
+🎟️ FILE DE PRÉDICTIONS V1.0 - PRIORITÉ PAR PALIER
+═══════════════════════════════════════════════════════════════════════════════
+Les analyses ne tournent plus directement dans le callback Telegram:
+- Concurrence bornée (N analyses simultanées max)
+- Une file par palier (admin > vip > premium > free)
+- Équité: tourniquet pondéré entre paliers (pas de famine du gratuit)
+- Position dans la file publiée sur le message de chargement
+- Annulation quand l'utilisateur quitte l'écran (une tâche par utilisateur)
+═══════════════════════════════════════════════════════════════════════════════
+"""
+import asyncio
+import itertools
+import logging
+import math
+import os
+import time
+from collections import deque
+from typing import Awaitable, Callable, Deque, Dict, Optional
+
+from telemetry import telemetry
+
+logger = logging.getLogger("footbot.prediction_queue")
+
+# ════════════════════════════════════════════════════════════════════════════
+# ⚙️ CONFIGURATION
+# ════════════════════════════════════════════════════════════════════════════
+
+MAX_CONCURRENT_PREDICTIONS = int(os.environ.get("MAX_CONCURRENT_PREDICTIONS", "3"))
+
+# Poids du tourniquet: sur 19 analyses démarrées en charge, 8 admin, 6 vip, 4 premium, 1 free
+TIER_WEIGHTS = {
+    'admin': 8,
+    'vip': 6,
+    'premium': 4,
+    'free': 1
+}
+
+POSITION_UPDATE_INTERVAL = 3.0   # Délai min entre deux éditions du message (s)
+
+
+class PredictionJob:
+    """Une demande d'analyse en attente ou en cours"""
+
+    __slots__ = ('job_id', 'user_id', 'tier', 'runner', 'on_position', 'future',
+                 'task', 'enqueued_at', 'last_position', 'last_update')
+
+    def __init__(self, job_id: int, user_id: int, tier: str,
+                 runner: Callable[[], Awaitable], on_position: Optional[Callable[[int], Awaitable]]):
+        self.job_id = job_id
+        self.user_id = user_id
+        self.tier = tier
+        self.runner = runner
+        self.on_position = on_position
+        self.future: asyncio.Future = asyncio.get_running_loop().create_future()
+        self.task: Optional[asyncio.Task] = None
+        self.enqueued_at = time.perf_counter()
+        self.last_position = -1
+        self.last_update = 0.0
+
+# ════════════════════════════════════════════════════════════════════════════
+# 🎟️ FILE
+# ════════════════════════════════════════════════════════════════════════════
+
+class PredictionQueue:
+    """Files par palier + tourniquet pondéré + workers bornés"""
+
+    def __init__(self, concurrency: int = MAX_CONCURRENT_PREDICTIONS):
+        self.concurrency = concurrency
+        self.queues: Dict[str, Deque[PredictionJob]] = {tier: deque() for tier in TIER_WEIGHTS}
+        self._credits: Dict[str, float] = {tier: 0.0 for tier in TIER_WEIGHTS}
+        self._by_user: Dict[int, PredictionJob] = {}
+        self._ids = itertools.count(1)
+        self._wakeup: Optional[asyncio.Event] = None
+        self._workers: list = []
+        self._notifiers: set = set()      # Mises à jour des positions en cours (référence gardée)
+        self.stats = {'submitted': 0, 'completed': 0, 'cancelled': 0, 'failed': 0}
+
+    def _ensure_workers(self):
+        if self._workers:
+            return
+        self._wakeup = asyncio.Event()
+        self._workers = [
+            asyncio.create_task(self._worker(i), name=f"prediction_worker_{i}")
+            for i in range(self.concurrency)
+        ]
+        logger.info(f"🎟️ File de prédictions: {self.concurrency} workers")
+
+    @property
+    def pending(self) -> int:
+        return sum(len(q) for q in self.queues.values())
+
+    # === SOUMISSION / ANNULATION ===
+    async def submit(self, user_id: int, tier: str, runner: Callable[[], Awaitable],
+                     on_position: Optional[Callable[[int], Awaitable]] = None) -> asyncio.Future:
+        """
+        Met une analyse en file et retourne un futur (résultat de runner()).
+        Une nouvelle demande remplace la précédente du même utilisateur.
+        """
+        self._ensure_workers()
+        self.cancel_user(user_id)
+
+        tier = tier if tier in self.queues else 'free'
+        job = PredictionJob(next(self._ids), user_id, tier, runner, on_position)
+        self.queues[tier].append(job)
+        self._by_user[user_id] = job
+        self.stats['submitted'] += 1
+
+        position = self.position(job)
+        if position > 0:
+            await self._publish(job, position, force=True)
+        self._wakeup.set()
+        return job.future
+
+    def cancel_user(self, user_id: int) -> bool:
+        """Annule la demande en attente ou en cours d'un utilisateur"""
+        job = self._by_user.pop(user_id, None)
+        if not job:
+            return False
+        try:
+            self.queues[job.tier].remove(job)
+        except ValueError:
+            pass
+        if job.task and not job.task.done():
+            job.task.cancel()
+        if not job.future.done():
+            job.future.cancel()
+        self.stats['cancelled'] += 1
+        logger.info(f"🚫 Analyse annulée (utilisateur {user_id})")
+        return True
+
+    # === ORDONNANCEMENT ===
+    def _next_job(self) -> Optional[PredictionJob]:
+        """Tourniquet pondéré lisse entre les paliers non vides"""
+        active = [tier for tier, queue in self.queues.items() if queue]
+        if not active:
+            return None
+        total = sum(TIER_WEIGHTS[tier] for tier in active)
+        for tier in active:
+            self._credits[tier] += TIER_WEIGHTS[tier]
+        chosen = max(active, key=lambda tier: self._credits[tier])
+        self._credits[chosen] -= total
+        return self.queues[chosen].popleft()
+
+    def position(self, job: PredictionJob) -> int:
+        """Nombre estimé d'analyses à démarrer avant celle-ci (0 = prochaine)"""
+        queue = self.queues.get(job.tier)
+        if not queue or job not in queue:
+            return 0
+        own_index = queue.index(job)
+        weight = TIER_WEIGHTS[job.tier]
+        ahead = own_index
+        for tier, other in self.queues.items():
+            if tier != job.tier and other:
+                ahead += min(len(other), math.ceil((own_index + 1) * TIER_WEIGHTS[tier] / weight))
+        return ahead
+
+    async def _publish(self, job: PredictionJob, position: int, force: bool = False):
+        if not job.on_position or position == job.last_position:
+            return
+        now = time.perf_counter()
+        if not force and now - job.last_update < POSITION_UPDATE_INTERVAL:
+            return
+        job.last_position, job.last_update = position, now
+        try:
+            await job.on_position(position)
+        except Exception as e:
+            logger.debug(f"Position non publiée: {e}")
+
+    async def _publish_positions(self):
+        waiting = [job for queue in self.queues.values() for job in queue]
+        for job in waiting:
+            await self._publish(job, self.position(job))
+
+    # === WORKERS ===
+    async def _worker(self, index: int):
+        while True:
+            job = self._next_job()
+            if job is None:
+                self._wakeup.clear()
+                await self._wakeup.wait()
+                continue
+            if job.future.done():
+                # Demandeur parti avant le démarrage
+                continue
+
+            telemetry.record_queue_wait((time.perf_counter() - job.enqueued_at) * 1000)
+            notifier = asyncio.create_task(self._publish_positions())
+            self._notifiers.add(notifier)
+            notifier.add_done_callback(self._notifiers.discard)
+
+            job.task = asyncio.create_task(job.runner())
+            try:
+                result = await job.task
+                if not job.future.done():
+                    job.future.set_result(result)
+                self.stats['completed'] += 1
+            except asyncio.CancelledError:
+                if job.task.cancelled():
+                    # Annulation de l'analyse (utilisateur parti): le worker continue
+                    if not job.future.done():
+                        job.future.cancel()
+                else:
+                    raise
+            except Exception as e:
+                self.stats['failed'] += 1
+                if not job.future.done():
+                    job.future.set_exception(e)
+            finally:
+                if self._by_user.get(job.user_id) is job:
+                    del self._by_user[job.user_id]
+
+    def get_stats(self) -> Dict:
+        return {
+            **self.stats,
+            'pending': {tier: len(queue) for tier, queue in self.queues.items()},
+            'running': sum(1 for job in self._by_user.values() if job.task and not job.task.done()),
+            'concurrency': self.concurrency
+        }
+
+
+# Instance globale
+prediction_queue = PredictionQueue()
+
+
+__all__ = ['PredictionQueue', 'PredictionJob', 'prediction_queue', 'TIER_WEIGHTS']
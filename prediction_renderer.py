@@ -0,0 +1,537 @@
+"""
+🖨️ RENDU DES PRÉDICTIONS V1.0 - GABARITS PRÉCOMPILÉS + PAGINATION
+═══════════════════════════════════════════════════════════════════════════════
+Rendu Telegram (HTML) d'une prédiction, extrait de TelegramFormatter:
+- Gabarits de section définis une fois au chargement du module
+- Sections spécifiques au sport choisies par table (plus de if/elif)
+- Cache LRU du rendu par (version de la prédiction, palier utilisateur):
+  un hit de cache ou un changement de page ne reformate rien
+- Découpage en pages <= 4096 caractères aux frontières de section
+  (jamais au milieu d'une balise HTML)
+═══════════════════════════════════════════════════════════════════════════════
+"""
+import threading
+from collections import OrderedDict
+from datetime import datetime
+from typing import Callable, Dict, List, Sequence, Tuple
+
+from telemetry import telemetry
+
+# ════════════════════════════════════════════════════════════════════════════
+# ⚙️ CONFIGURATION
+# ════════════════════════════════════════════════════════════════════════════
+
+TELEGRAM_MAX_LENGTH = 4096
+PAGE_BUDGET = 3900          # Marge pour l'en-tête de page ajouté par le handler
+RENDER_CACHE_SIZE = 256
+
+RULE = "━" * 34
+BOX_TOP = "╔" + "═" * 39 + "╗"
+BOX_BOTTOM = "╚" + "═" * 39 + "╝"
+
+GRADE_EMOJIS = {
+    'A+': '🌟', 'A': '🟢', 'B+': '🟢', 'B': '🟡',
+    'C+': '🟡', 'C': '🟠', 'D': '🔴'
+}
+
+# ════════════════════════════════════════════════════════════════════════════
+# 📝 GABARITS
+# ════════════════════════════════════════════════════════════════════════════
+
+BANNER_DATA_DRIVEN = (
+    BOX_TOP + "\n   🔬 <b>ANALYSE DATA-DRIVEN</b>\n   📊 Données: {sources}\n"
+    "   🎯 Qualité: {quality}%\n" + BOX_BOTTOM
+)
+BANNER_AI = BOX_TOP + "\n   🤖 <b>ANALYSE IA</b>\n   ✅ Générée par Intelligence Artificielle\n" + BOX_BOTTOM
+BANNER_ALGORITHMIC = (
+    BOX_TOP + "\n   📊 <b>ANALYSE ALGORITHMIQUE</b>\n   ⚠️ Générée SANS IA - Fiabilité limitée\n" + BOX_BOTTOM
+)
+
+HEADER = (
+    "{banner}\n\n{icon} <b>{title}</b>\n⏰ {start_time} | 📅 {date}\n\n"
+    + RULE + "\n{grade_emoji} <b>GRADE: {grade}</b> | Confiance: <b>{confidence}%</b>\n" + RULE + "\n\n"
+)
+
+OBSERVATIONS_HEAD = "📋 <b>OBSERVATIONS CLÉS</b>\n"
+OBSERVATION_LINE = "• {text}\n"
+OVERVIEW = "📋 <b>ANALYSE</b>\n{text}\n\n"
+
+TEAMS_HEAD = RULE + "\n📊 <b>ANALYSE DES ÉQUIPES</b>\n\n"
+TEAM_NAME = "{marker} <b>{name}</b>\n"
+TEAM_FORM = "   📈 Forme: {value}/10\n"
+TEAM_STRENGTHS = "   ✅ Forces: {value}\n"
+TEAM_WEAKNESSES = "   ❌ Faiblesses: {value}\n"
+
+LINEUPS_HEAD = RULE + "\n👥 <b>COMPOSITIONS PROBABLES</b>\n\n"
+LINEUP_FORMATION = "   📐 Formation: {value}\n"
+LINEUP_PLAYERS = "   👤 {value}...\n"
+LINEUP_KEY_PLAYER = "   ⭐ Joueur clé: {value}\n"
+LINEUP_ABSENCES = "   🚑 Absents: {value}\n"
+
+WINNER = (
+    RULE + "\n🏆 <b>RÉSULTAT / VAINQUEUR</b>\n\n🎯 Prédiction: <b>{prediction}</b>\n"
+    "📊 Confiance: <b>{confidence}%</b>\n\n📈 Probabilités:\n"
+)
+WINNER_LINES = (
+    ('1', "├ 1️⃣ {team1}: <b>{value}%</b>\n"),
+    ('X', "├ ❌ Nul: <b>{value}%</b>\n"),
+    ('2', "└ 2️⃣ {team2}: <b>{value}%</b>\n")
+)
+
+EXACT_SCORE_HEAD = RULE + "\n⚽ <b>SCORES PROBABLES</b>\n\n"
+EXACT_SCORE_LINE = "{medal} <b>{score}</b> ({probability}%)\n"
+TOTAL_GOALS_HEAD = RULE + "\n📊 <b>TOTAL BUTS</b>\n\n🎯 Attendu: <b>{expected}</b>\n"
+OVER_FLAGGED_LINE = "{emoji} {label}: <b>{probability}%</b>\n"
+OVER_LINE = "   {label}: <b>{probability}%</b>\n"
+BTTS = RULE + "\n🥅 <b>BTTS</b> (Les deux marquent)\n\n{emoji} <b>{prediction}</b> ({probability}%)\n\n"
+CORNERS_HEAD = RULE + "\n🚩 <b>CORNERS</b>\n\n📊 Total attendu: <b>{expected}</b>\n"
+CARDS_HEAD = RULE + "\n🟨🟥 <b>CARTONS</b>\n\n🟨 Jaunes attendus: <b>{expected}</b>\n"
+CARDS_RED = "\n🟥 Rouge probabilité: <b>{probability}%</b>\n\n"
+FOULS_HEAD = RULE + "\n⚠️ <b>FAUTES</b>\n\n📊 Total attendu: <b>{expected}</b>\n"
+FOULS_OVER = "   +22.5: <b>{probability}%</b>\n"
+HALFTIME_HEAD = RULE + "\n⏱️ <b>MI-TEMPS</b>\n\n🎯 Résultat HT: <b>{result}</b>\n"
+HALFTIME_SCORE = "📊 Score prévu: <b>{score}</b>\n"
+
+UFC_METHOD = (
+    RULE + "\n🎯 <b>MÉTHODE DE VICTOIRE</b>\n\n💥 KO/TKO: <b>{ko}%</b>\n"
+    "🔒 Soumission: <b>{submission}%</b>\n📋 Décision: <b>{decision}%</b>\n\n"
+)
+UFC_ROUND = RULE + "\n⏱️ <b>DURÉE</b>\n\n📊 Va à la distance: <b>{distance}%</b>\n\n"
+NBA_TOTAL = RULE + "\n🏀 <b>TOTAL POINTS</b>\n\n📊 Ligne: <b>{line}</b>\n✅ Over: <b>{over}%</b>\n\n"
+NBA_SPREAD = RULE + "\n📏 <b>SPREAD</b>\n\n🎯 Ligne: <b>{line}</b>\n\n"
+TENNIS_SETS = RULE + "\n🎾 <b>SCORE EN SETS</b>\n\n🎯 Prévu: <b>{prediction}</b>\n\n"
+TENNIS_GAMES = RULE + "\n📊 <b>TOTAL JEUX</b>\n\n📊 Attendu: <b>{expected}</b>\n\n"
+
+VALUE_BETS_HEAD = RULE + "\n💎 <b>VALUE BETS IDENTIFIÉS</b>\n\n"
+VALUE_BET = "{index}. <b>{market}</b>\n   🎯 {selection}\n   💰 Cote: {odds} | ⭐ {rating}\n"
+VALUE_BET_REASON = "   💡 {reasoning}...\n"
+BEST_BET = RULE + "\n💎 <b>MEILLEUR PARI</b>\n\n🎯 <b>{selection}</b>\n💰 Cote: <b>{odds}</b>\n⭐ Valeur: {rating}\n\n"
+
+INSIGHT_HEAD = RULE + "\n"
+INSIGHT = "💡 <b>INSIGHT</b>\n{text}\n\n"
+RECOMMENDATION = "🎯 <b>CONSEIL</b>\n{text}\n\n"
+DISCLAIMER = RULE + "\n⚠️ <i>{text}</i>\n\n"
+FOOTER_AI = "🤖 <i>Analysé par IA ({model})</i>"
+FOOTER_ALGORITHMIC = "📊 <i>Analyse ALGORITHMIQUE - Pas d'IA utilisée</i>"
+
+ERROR = (
+    BOX_TOP + "\n   ❌ <b>ANALYSE NON DISPONIBLE</b>\n" + BOX_BOTTOM + "\n\n📋 Match: {title}\n\n"
+    "⚠️ <b>Raison:</b> {message}\n\n💡 <i>Cet événement ne peut pas être analysé.\n"
+    "Vérifiez qu'il s'agit d'un événement réel.</i>\n"
+)
+
+# ════════════════════════════════════════════════════════════════════════════
+# 🧱 SECTIONS
+# ════════════════════════════════════════════════════════════════════════════
+
+def _probability(data) -> float:
+    """Marché au format {"probability": x} ou valeur brute"""
+    return data.get('probability', data) if isinstance(data, dict) else data
+
+
+def _over_label(key: str) -> str:
+    return key.replace('over_', '+').replace('_', '.')
+
+
+def _team_analysis(team_analysis: Dict, match: Dict) -> str:
+    parts = [TEAMS_HEAD]
+    defaults = {'team1': match.get('team1', 'Équipe 1'), 'team2': match.get('team2', 'Équipe 2')}
+    for side, marker in (('team1', '🔵'), ('team2', '🔴')):
+        team = team_analysis.get(side)
+        if not team:
+            continue
+        parts.append(TEAM_NAME.format(marker=marker, name=team.get('name', defaults[side])))
+        if team.get('form_rating'):
+            parts.append(TEAM_FORM.format(value=team['form_rating']))
+        if team.get('strengths'):
+            parts.append(TEAM_STRENGTHS.format(value=', '.join(team['strengths'][:2])))
+        if team.get('weaknesses'):
+            parts.append(TEAM_WEAKNESSES.format(value=', '.join(team['weaknesses'][:2])))
+        parts.append("\n")
+    return ''.join(parts)
+
+
+def _lineups(lineups: Dict, match: Dict) -> str:
+    parts = [LINEUPS_HEAD]
+    names = {'team1': match.get('team1', 'Équipe 1'), 'team2': match.get('team2', 'Équipe 2')}
+    for side, marker in (('team1', '🔵'), ('team2', '🔴')):
+        team = lineups.get(side)
+        if not team:
+            continue
+        parts.append(TEAM_NAME.format(marker=marker, name=names[side]))
+        if team.get('formation'):
+            parts.append(LINEUP_FORMATION.format(value=team['formation']))
+        players = team.get('starting_xi') or team.get('starting_five') or team.get('probable_xi')
+        if players:
+            parts.append(LINEUP_PLAYERS.format(value=', '.join(str(p) for p in players[:6])))
+        key_player = team.get('key_player') or team.get('key_player_to_watch')
+        if key_player:
+            parts.append(LINEUP_KEY_PLAYER.format(value=key_player))
+        if team.get('key_absences'):
+            parts.append(LINEUP_ABSENCES.format(value=', '.join(team['key_absences'][:2])))
+        parts.append("\n")
+    return ''.join(parts)
+
+
+def _winner(winner: Dict, match: Dict) -> str:
+    probs = winner.get('probabilities', {})
+    parts = [WINNER.format(prediction=winner.get('prediction', 'N/A'), confidence=winner.get('confidence', 0))]
+    teams = {'team1': match.get('team1', 'Domicile'), 'team2': match.get('team2', 'Extérieur')}
+    for key, line in WINNER_LINES:
+        if key in probs:
+            parts.append(line.format(value=probs.get(key, 0), **teams))
+    parts.append("\n")
+    return ''.join(parts)
+
+
+def _value_bets(value_bets: List) -> str:
+    parts = [VALUE_BETS_HEAD]
+    for index, bet in enumerate(value_bets[:3], 1):
+        parts.append(VALUE_BET.format(
+            index=index,
+            market=bet.get('market', 'N/A'),
+            selection=bet.get('selection', 'N/A'),
+            odds=bet.get('odds', 'N/A'),
+            rating=bet.get('value_rating', '★★★☆☆')
+        ))
+        if bet.get('reasoning'):
+            parts.append(VALUE_BET_REASON.format(reasoning=bet['reasoning'][:60]))
+        parts.append("\n")
+    return ''.join(parts)
+
+# --- Football ---
+
+def _exact_score(preds: Dict) -> str:
+    top = preds.get('exact_score', {}).get('top_3')
+    if not top:
+        return ""
+    medals = ('🥇', '🥈', '🥉')
+    lines = [
+        EXACT_SCORE_LINE.format(medal=medals[i], score=s.get('score', 'N/A'), probability=s.get('probability', 0))
+        for i, s in enumerate(top[:3])
+    ]
+    return EXACT_SCORE_HEAD + ''.join(lines) + "\n"
+
+
+def _total_goals(preds: Dict) -> str:
+    goals = preds.get('total_goals', {})
+    if not goals:
+        return ""
+    parts = [TOTAL_GOALS_HEAD.format(expected=goals.get('expected', 'N/A'))]
+    for key in ('over_1_5', 'over_2_5', 'over_3_5'):
+        if key in goals:
+            prob = _probability(goals[key])
+            parts.append(OVER_FLAGGED_LINE.format(
+                emoji="✅" if prob > 50 else "❌", label=_over_label(key), probability=prob
+            ))
+    parts.append("\n")
+    return ''.join(parts)
+
+
+def _btts(preds: Dict) -> str:
+    btts = preds.get('btts', {})
+    if not btts:
+        return ""
+    return BTTS.format(
+        emoji="✅" if btts.get('prediction') == 'Oui' else "❌",
+        prediction=btts.get('prediction', 'N/A'),
+        probability=btts.get('probability', 0)
+    )
+
+
+def _corners(preds: Dict) -> str:
+    corners = preds.get('corners', {})
+    if not corners:
+        return ""
+    parts = [CORNERS_HEAD.format(expected=corners.get('total_expected', 'N/A'))]
+    for key in ('over_8_5', 'over_9_5', 'over_10_5', 'over_11_5'):
+        if key in corners:
+            parts.append(OVER_LINE.format(label=_over_label(key), probability=_probability(corners[key])))
+    parts.append("\n")
+    return ''.join(parts)
+
+
+def _cards(preds: Dict) -> str:
+    cards = preds.get('cards', {})
+    if not cards:
+        return ""
+    yellow = cards.get('yellow_cards', {})
+    red = cards.get('red_cards', {})
+    parts = [CARDS_HEAD.format(expected=yellow.get('total_expected', 'N/A'))]
+    for key in ('over_3_5', 'over_4_5', 'over_5_5'):
+        if key in yellow:
+            parts.append(OVER_LINE.format(label=_over_label(key), probability=_probability(yellow[key])))
+    parts.append(CARDS_RED.format(probability=red.get('probability', 0) if isinstance(red, dict) else red))
+    return ''.join(parts)
+
+
+def _fouls(preds: Dict) -> str:
+    fouls = preds.get('fouls', {})
+    if not fouls:
+        return ""
+    text = FOULS_HEAD.format(expected=fouls.get('total_expected', 'N/A'))
+    if 'over_22_5' in fouls:
+        text += FOULS_OVER.format(probability=_probability(fouls['over_22_5']))
+    return text + "\n"
+
+
+def _halftime(preds: Dict) -> str:
+    ht = preds.get('halftime', {})
+    if not ht:
+        return ""
+    text = HALFTIME_HEAD.format(result=ht.get('result', 'N/A'))
+    if ht.get('score'):
+        text += HALFTIME_SCORE.format(score=ht['score'])
+    return text + "\n"
+
+# --- Autres sports ---
+
+def _ufc_method(preds: Dict) -> str:
+    method = preds.get('method', {})
+    if not method:
+        return ""
+    return UFC_METHOD.format(
+        ko=method.get('ko_tko', {}).get('probability', 0),
+        submission=method.get('submission', {}).get('probability', 0),
+        decision=method.get('decision', {}).get('probability', 0)
+    )
+
+
+def _ufc_round(preds: Dict) -> str:
+    rd = preds.get('round', {})
+    return UFC_ROUND.format(distance=rd.get('goes_distance', {}).get('probability', 0)) if rd else ""
+
+
+def _nba_total(preds: Dict) -> str:
+    total = preds.get('total_points', {})
+    if not total:
+        return ""
+    return NBA_TOTAL.format(line=total.get('line', 'N/A'), over=total.get('over_probability', 50))
+
+
+def _nba_spread(preds: Dict) -> str:
+    spread = preds.get('spread', {})
+    return NBA_SPREAD.format(line=spread.get('line', 'N/A')) if spread else ""
+
+
+def _tennis_sets(preds: Dict) -> str:
+    sets = preds.get('sets', preds.get('sets_score', {}))
+    return TENNIS_SETS.format(prediction=sets.get('prediction', 'N/A')) if sets else ""
+
+
+def _tennis_games(preds: Dict) -> str:
+    games = preds.get('total_games', {})
+    return TENNIS_GAMES.format(expected=games.get('expected', 'N/A')) if games else ""
+
+
+FOOTBALL_SECTIONS = (_exact_score, _total_goals, _btts, _corners, _cards, _fouls, _halftime)
+UFC_SECTIONS = (_ufc_method, _ufc_round)
+BASKETBALL_SECTIONS = (_nba_total, _nba_spread)
+
+SPORT_SECTIONS: Dict[str, Tuple[Callable[[Dict], str], ...]] = {
+    'football': FOOTBALL_SECTIONS,
+    'soccer': FOOTBALL_SECTIONS,
+    'ufc': UFC_SECTIONS,
+    'mma': UFC_SECTIONS,
+    'ufc/mma': UFC_SECTIONS,
+    'nba': BASKETBALL_SECTIONS,
+    'basketball': BASKETBALL_SECTIONS,
+    'tennis': (_tennis_sets, _tennis_games)
+}
+
+# ════════════════════════════════════════════════════════════════════════════
+# 🖨️ MOTEUR DE RENDU
+# ════════════════════════════════════════════════════════════════════════════
+
+def render_sections(match: Dict, prediction: Dict) -> List[str]:
+    """Sections HTML de la prédiction, dans l'ordre d'affichage"""
+    if prediction.get('error'):
+        return [ERROR.format(
+            title=prediction.get('match_title', 'N/A'),
+            message=prediction.get('message', 'Erreur inconnue')
+        )]
+
+    meta = prediction.get('meta', {})
+    analysis = prediction.get('analysis', prediction.get('data_analysis', {}))
+    preds = prediction.get('predictions', {})
+    summary = prediction.get('summary', {})
+    value_bets = prediction.get('value_bets', [])
+    is_ai = meta.get('is_ai', False)
+
+    # === BANNIÈRE + EN-TÊTE ===
+    if meta.get('is_data_driven', False):
+        sources = prediction.get('data_sources', {}).get('sources_used', ['IA'])[:3]
+        banner = BANNER_DATA_DRIVEN.format(sources=', '.join(sources), quality=meta.get('data_quality_score', 0))
+    elif is_ai:
+        banner = BANNER_AI
+    else:
+        banner = BANNER_ALGORITHMIC
+
+    grade = summary.get('grade', 'C')
+    header = HEADER.format(
+        banner=banner,
+        icon=meta.get('sport_icon', '🎯'),
+        title=match.get('title', 'Match'),
+        start_time=match.get('start_time', 'N/A'),
+        date=datetime.now().strftime('%d/%m/%Y'),
+        grade_emoji=GRADE_EMOJIS.get(grade, '⚪'),
+        grade=grade,
+        confidence=summary.get('confidence', summary.get('overall_confidence', 45))
+    )
+
+    # === OBSERVATIONS CLÉS (si data-driven) / ANALYSE ===
+    if analysis.get('key_observations'):
+        header += OBSERVATIONS_HEAD + ''.join(
+            OBSERVATION_LINE.format(text=obs[:80]) for obs in analysis['key_observations'][:4]
+        ) + "\n"
+    elif analysis.get('overview'):
+        header += OVERVIEW.format(text=analysis['overview'][:400])
+
+    sections = [header]
+    if prediction.get('team_analysis'):
+        sections.append(_team_analysis(prediction['team_analysis'], match))
+    if prediction.get('lineups'):
+        sections.append(_lineups(prediction['lineups'], match))
+
+    # === PRONOSTIC PRINCIPAL + MARCHÉS DU SPORT ===
+    winner = preds.get('winner', preds.get('match_result', preds.get('match_winner', {})))
+    if winner:
+        sections.append(_winner(winner, match))
+    sport = meta.get('sport', 'football').lower()
+    sections.extend(section(preds) for section in SPORT_SECTIONS.get(sport, ()))
+
+    # === VALUE BETS / MEILLEUR PARI ===
+    best_bet = preds.get('best_bet', {})
+    if value_bets:
+        sections.append(_value_bets(value_bets))
+    elif best_bet:
+        sections.append(BEST_BET.format(
+            selection=best_bet.get('selection', 'N/A'),
+            odds=best_bet.get('odds', 'N/A'),
+            rating=best_bet.get('value_rating', '★★★☆☆')
+        ))
+
+    # === INSIGHT / RECOMMANDATION ===
+    key_insight = summary.get('key_insight', summary.get('main_prediction', ''))
+    recommendation = summary.get('recommendation', '')
+    if key_insight or recommendation:
+        text = INSIGHT_HEAD
+        if key_insight:
+            text += INSIGHT.format(text=key_insight[:200])
+        if recommendation:
+            text += RECOMMENDATION.format(text=recommendation[:150])
+        sections.append(text)
+
+    # === DISCLAIMER + INDICATEUR FINAL ===
+    footer = DISCLAIMER.format(text=prediction.get('disclaimer', 'Pariez de manière responsable.'))
+    if is_ai:
+        footer += FOOTER_AI.format(model=str(meta.get('model') or 'N/A')[:25])
+    else:
+        footer += FOOTER_ALGORITHMIC
+    sections.append(footer)
+
+    return [section for section in sections if section]
+
+
+def paginate(sections: Sequence[str], budget: int = PAGE_BUDGET) -> List[str]:
+    """Regroupe les sections en pages <= budget; une section trop longue est coupée aux lignes"""
+    pages: List[str] = []
+    current = ""
+    for section in sections:
+        pieces = [section]
+        if len(section) > budget:
+            pieces, chunk = [], ""
+            for line in section.splitlines(keepends=True):
+                if chunk and len(chunk) + len(line) > budget:
+                    pieces.append(chunk)
+                    chunk = ""
+                chunk += line[:budget]
+            if chunk:
+                pieces.append(chunk)
+        for piece in pieces:
+            if current and len(current) + len(piece) > budget:
+                pages.append(current)
+                current = ""
+            current += piece
+    if current:
+        pages.append(current)
+    return pages or [""]
+
+
+class PredictionRenderer:
+    """Rendu mis en cache par (version de la prédiction, palier)"""
+
+    def __init__(self, size: int = RENDER_CACHE_SIZE):
+        self.size = size
+        self._cache: 'OrderedDict[Tuple, List[str]]' = OrderedDict()
+        # (user_id, match_id) -> pages affichées, pour la navigation entre pages
+        self._shown: 'OrderedDict[Tuple[int, str], List[str]]' = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {'hits': 0, 'misses': 0}
+
+    @staticmethod
+    def version(match: Dict, prediction: Dict) -> Tuple:
+        """Identité d'un rendu: prédiction (analyzed_at) + match affiché + jour"""
+        meta = prediction.get('meta', {})
+        return (
+            meta.get('match_id', match.get('id')),
+            meta.get('analyzed_at', ''),
+            match.get('title'),
+            match.get('start_time'),
+            datetime.now().strftime('%Y-%m-%d')
+        )
+
+    def render(self, match: Dict, prediction: Dict, tier: str = 'free') -> List[str]:
+        """Pages HTML (une seule si le message tient dans la limite Telegram)"""
+        if prediction.get('error') or not prediction.get('meta', {}).get('analyzed_at'):
+            # Pas de version identifiable: rendu direct, sans cache
+            return paginate(render_sections(match, prediction))
+
+        key = (self.version(match, prediction), tier)
+        with self._lock:
+            pages = self._cache.get(key)
+            if pages is not None:
+                self._cache.move_to_end(key)
+                self.stats['hits'] += 1
+        if pages is not None:
+            telemetry.record_cache_hit('render')
+            return pages
+
+        pages = paginate(render_sections(match, prediction))
+        with self._lock:
+            self.stats['misses'] += 1
+            self._cache[key] = pages
+            while len(self._cache) > self.size:
+                self._cache.popitem(last=False)
+        return pages
+
+    # === NAVIGATION ===
+    def remember(self, user_id: int, match_id: str, pages: List[str]):
+        """Mémorise les pages affichées à un utilisateur (changement de page sans re-rendu)"""
+        with self._lock:
+            self._shown[(user_id, match_id)] = pages
+            self._shown.move_to_end((user_id, match_id))
+            while len(self._shown) > self.size:
+                self._shown.popitem(last=False)
+
+    def recall(self, user_id: int, match_id: str) -> List[str]:
+        """Pages affichées à l'utilisateur pour ce match ([] si expirées)"""
+        with self._lock:
+            return self._shown.get((user_id, match_id), [])
+
+    def get_stats(self) -> Dict:
+        return {**self.stats, 'size': len(self._cache), 'shown': len(self._shown)}
+
+
+# Instance globale
+prediction_renderer = PredictionRenderer()
+
+
+__all__ = [
+    'PredictionRenderer',
+    'prediction_renderer',
+    'render_sections',
+    'paginate',
+    'TELEGRAM_MAX_LENGTH',
+    'SPORT_SECTIONS'
+]
@@ -0,0 +1,180 @@
+"""
+🔥 PRÉCHAUFFAGE V1.0 - PRÉDICTIONS CALCULÉES AVANT LE CLIC
+═══════════════════════════════════════════════════════════════════════════════
+Après chaque scraping, les matchs les plus susceptibles d'être demandés sont
+analysés en tâche de fond; le premier utilisateur tombe sur le cache:
+- Classement: grade de validation, équipes connues, favoris, votes
+- Part bornée des quotas (Groq, API-Football, The Odds API) par jour
+- Priorité aux utilisateurs: pause dès qu'une analyse attend dans la file
+- Matchs déjà en cache (frais) ignorés
+- Sans IA: collecte match par match, puis UNE passe du modèle statistique
+═══════════════════════════════════════════════════════════════════════════════
+"""
+import logging
+import os
+from datetime import datetime
+from typing import Dict, List, Tuple
+
+from deadline import Deadline
+from fixture_identity import fixture_key
+from prediction_module import AdvancedDataManager, EventValidator, UltraPredictor
+from prediction_queue import prediction_queue
+from quota_ledger import quota_ledger
+
+logger = logging.getLogger("footbot.prewarm")
+
+# ════════════════════════════════════════════════════════════════════════════
+# ⚙️ CONFIGURATION
+# ════════════════════════════════════════════════════════════════════════════
+
+PREWARM_ENABLED = os.environ.get("PREWARM_ENABLED", "1").lower() in ("1", "true", "yes")
+PREWARM_MAX_PER_CYCLE = int(os.environ.get("PREWARM_MAX_PER_CYCLE", "6"))
+
+# Part des quotas journaliers réservée au préchauffage (le reste aux utilisateurs)
+PREWARM_GROQ_SHARE = float(os.environ.get("PREWARM_GROQ_SHARE", "0.25"))
+PREWARM_API_SHARE = float(os.environ.get("PREWARM_API_SHARE", "0.25"))
+
+DAILY_QUOTAS = {
+    'groq': quota_ledger.limit('groq'),
+    'api_football': quota_ledger.limit('api_football'),                       # 100 req/jour
+    'odds': int(os.environ.get("ODDS_DAILY_QUOTA", str(quota_ledger.limit('odds') // 30)))   # 500 req/mois
+}
+
+PREWARM_DEADLINE = 90.0      # Pas d'utilisateur qui attend: budget plus large
+MIN_VALIDATION_SCORE = 55    # Grade B minimum
+
+# Poids du classement
+KNOWN_TEAM_WEIGHT = 15       # par équipe connue (2 max)
+FAVORITE_WEIGHT = 10         # par utilisateur l'ayant en favori
+VOTE_WEIGHT = 5              # par vote communautaire
+SIGNAL_CAP = 50              # plafond des bonus favoris / votes
+
+
+class PrewarmScheduler:
+    """Classement des matchs + analyses de fond dans une part des quotas"""
+
+    def __init__(self):
+        self.day = datetime.now().date().isoformat()
+        self.used: Dict[str, int] = {source: 0 for source in DAILY_QUOTAS}
+        self.stats = {'cycles': 0, 'warmed': 0, 'skipped_cached': 0, 'stopped_quota': 0, 'stopped_busy': 0}
+
+    @property
+    def budgets(self) -> Dict[str, int]:
+        return {
+            'groq': int(DAILY_QUOTAS['groq'] * PREWARM_GROQ_SHARE),
+            'api_football': int(DAILY_QUOTAS['api_football'] * PREWARM_API_SHARE),
+            'odds': int(DAILY_QUOTAS['odds'] * PREWARM_API_SHARE)
+        }
+
+    def _roll_day(self):
+        today = datetime.now().date().isoformat()
+        if today != self.day:
+            self.day = today
+            self.used = {source: 0 for source in DAILY_QUOTAS}
+
+    def _quota_left(self) -> bool:
+        budgets = self.budgets
+        return all(self.used[source] < budgets[source] for source in budgets)
+
+    @staticmethod
+    def _queue_busy() -> bool:
+        stats = prediction_queue.get_stats()
+        return sum(stats['pending'].values()) > 0 or stats['running'] >= stats['concurrency']
+
+    # === CLASSEMENT ===
+    @staticmethod
+    def rank(matches: List[Dict], favorites: Dict[str, List[str]]) -> List[Tuple[float, Dict]]:
+        """(score, match) des matchs valides, du plus demandé au moins demandé"""
+        fav_counts: Dict[str, int] = {}
+        for match_ids in favorites.values():
+            for match_id in match_ids:
+                fav_counts[match_id] = fav_counts.get(match_id, 0) + 1
+
+        ranked = []
+        for match in matches:
+            is_valid, _, validation_score = EventValidator.get_validation(match)
+            if not is_valid or validation_score < MIN_VALIDATION_SCORE:
+                continue
+            match_id = match.get('id', '')
+            votes = AdvancedDataManager.get_vote_stats(match_id).get('total_votes', 0)
+            score = (
+                validation_score
+                + KNOWN_TEAM_WEIGHT * min(2, EventValidator.known_team_hits(match))
+                + min(SIGNAL_CAP, FAVORITE_WEIGHT * fav_counts.get(match_id, 0))
+                + min(SIGNAL_CAP, VOTE_WEIGHT * votes)
+            )
+            ranked.append((score, match))
+
+        ranked.sort(key=lambda item: item[0], reverse=True)
+        return ranked
+
+    # === EXÉCUTION ===
+    async def run(self, matches: List[Dict], favorites: Dict[str, List[str]]) -> int:
+        """Préchauffe les meilleurs matchs non cachés; retourne le nombre analysé"""
+        if not PREWARM_ENABLED:
+            return 0
+        self._roll_day()
+        self.stats['cycles'] += 1
+
+        warmed = 0
+        seen_keys = set()
+        prepared: List[Dict] = []
+        async with UltraPredictor() as predictor:
+            algorithmic = not predictor.api_key
+            for score, match in self.rank(matches, favorites):
+                if warmed >= PREWARM_MAX_PER_CYCLE:
+                    break
+                if not self._quota_left():
+                    self.stats['stopped_quota'] += 1
+                    logger.info(f"🔥 Préchauffage: part de quota atteinte ({self.used})")
+                    break
+                if self._queue_busy():
+                    self.stats['stopped_busy'] += 1
+                    logger.info("🔥 Préchauffage: file occupée, reporté au prochain cycle")
+                    break
+
+                key = fixture_key(match)
+                cached = AdvancedDataManager.get_fixture_cache(key)
+                if key in seen_keys or (cached and cached['fresh']):
+                    self.stats['skipped_cached'] += 1
+                    continue
+                seen_keys.add(key)
+
+                # Requêtes de CE prédicteur: les analyses utilisateurs concurrentes ne comptent pas
+                groq_before = predictor.stats['groq_requests']
+                predictor.last_sources = {}
+                try:
+                    if algorithmic:
+                        item = await predictor.prepare_algorithmic(match, Deadline(PREWARM_DEADLINE))
+                        if item is None:
+                            continue
+                        prepared.append(item)
+                    else:
+                        await predictor.analyze_match(match, None, Deadline(PREWARM_DEADLINE))
+                except Exception as e:
+                    logger.warning(f"🔥 Préchauffage échoué ({match.get('title', '?')[:40]}): {e}")
+                    continue
+                finally:
+                    # Compté même en cas d'échec: les requêtes ont été consommées
+                    self.used['groq'] += predictor.stats['groq_requests'] - groq_before
+                    for source in ('api_football', 'odds'):
+                        self.used[source] += predictor.last_sources.get(source, {}).get('requests_used', 0)
+
+                warmed += 1
+                logger.info(f"🔥 Préchauffé ({score:.0f} pts): {match.get('title', '?')[:50]}")
+
+            if prepared:
+                predictor.predict_algorithmic_batch(prepared)
+
+        self.stats['warmed'] += warmed
+        return warmed
+
+    def get_stats(self) -> Dict:
+        return {**self.stats, 'used_today': dict(self.used), 'budgets': self.budgets}
+
+
+# Instance globale
+prewarm_scheduler = PrewarmScheduler()
+
+
+__all__ = ['PrewarmScheduler', 'prewarm_scheduler', 'PREWARM_ENABLED']
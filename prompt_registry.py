@@ -0,0 +1,87 @@
+"""
+📚 REGISTRE DES PROMPTS V1.0 - PROMPTS SYSTÈME CONSTRUITS UNE FOIS
+═══════════════════════════════════════════════════════════════════════════════
+Les prompts système ne sont plus reconstruits à chaque analyse:
+- Texte figé au chargement du module, avec version et empreinte (sha256)
+- Résolution sport -> prompt par alias (football/soccer, ufc/mma...)
+- Issues demandées par le format JSON du prompt (1/X/2 ou 1/2)
+- Messages toujours ordonnés [système statique, utilisateur variable]:
+  le préfixe envoyé à Groq est identique d'une requête à l'autre
+- Rapport de taille par prompt (caractères, tokens estimés) pour /metrics
+═══════════════════════════════════════════════════════════════════════════════
+"""
+import hashlib
+import logging
+from typing import Dict, Iterable, List, Sequence
+
+logger = logging.getLogger("footbot.prompt_registry")
+
+CHARS_PER_TOKEN = 3.5   # Estimation pour du français mêlé de JSON
+
+
+class PromptTemplate:
+    """Prompt système figé"""
+
+    __slots__ = ('name', 'version', 'text', 'outcomes', 'sha', 'chars', 'est_tokens')
+
+    def __init__(self, name: str, version: str, text: str, outcomes: Sequence[str] = ('1', '2')):
+        self.name = name
+        self.version = version
+        self.text = text
+        self.outcomes = tuple(outcomes)
+        self.sha = hashlib.sha256(text.encode('utf-8')).hexdigest()[:12]
+        self.chars = len(text)
+        self.est_tokens = round(len(text) / CHARS_PER_TOKEN)
+
+    @property
+    def ref(self) -> str:
+        """Identifiant tracé dans les prédictions: nom@version#empreinte"""
+        return f"{self.name}@{self.version}#{self.sha}"
+
+    def messages(self, user_content: str) -> List[Dict[str, str]]:
+        """Préfixe système stable, puis la partie propre à la requête"""
+        return [
+            {"role": "system", "content": self.text},
+            {"role": "user", "content": user_content}
+        ]
+
+
+class PromptRegistry:
+    """Prompts par nom + alias de sport"""
+
+    def __init__(self, default: str = 'generic'):
+        self.default = default
+        self._prompts: Dict[str, PromptTemplate] = {}
+        self._aliases: Dict[str, str] = {}
+
+    def register(self, name: str, version: str, text: str, aliases: Iterable[str] = (),
+                 outcomes: Sequence[str] = ('1', '2')) -> PromptTemplate:
+        template = PromptTemplate(name, version, text, outcomes)
+        self._prompts[name] = template
+        for alias in (name, *aliases):
+            self._aliases[alias.lower()] = name
+        return template
+
+    def get(self, name: str) -> PromptTemplate:
+        return self._prompts[name]
+
+    def for_sport(self, sport: str) -> PromptTemplate:
+        return self._prompts[self._aliases.get(sport.lower(), self.default)]
+
+    def size_report(self) -> Dict[str, Dict]:
+        return {
+            name: {
+                'version': template.version,
+                'sha': template.sha,
+                'chars': template.chars,
+                'est_tokens': template.est_tokens
+            }
+            for name, template in self._prompts.items()
+        }
+
+    def log_sizes(self):
+        sizes = ', '.join(f"{t.name}={t.est_tokens}" for t in self._prompts.values())
+        logger.info(f"📚 Prompts système (tokens estimés): {sizes}")
+
+
+__all__ = ['PromptTemplate', 'PromptRegistry']
@@ -0,0 +1,243 @@
+"""
+🧾 REGISTRE DES QUOTAS API V1.0 - CONSOMMATION PERSISTANTE ET BUDGETS
+═══════════════════════════════════════════════════════════════════════════════
+Les compteurs des collecteurs repartaient de zéro à chaque prédiction; le
+registre suit la consommation réelle de chaque fournisseur:
+- Période par fournisseur (API-Football: jour, The Odds API: mois, Groq: jour)
+- Persisté en JSON, recalé sur les en-têtes "requêtes restantes" des APIs
+  (Groq: en-tête par modèle, noté à part sans toucher au compteur global)
+- Budget appliqué avant chaque requête: plus le quota est consommé en avance
+  sur le calendrier, plus la valeur du match exigée est haute
+- Prévision d'épuisement (rythme de consommation de la période)
+═══════════════════════════════════════════════════════════════════════════════
+"""
+import calendar
+import json
+import logging
+import os
+import threading
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, Mapping
+
+logger = logging.getLogger("footbot.quota_ledger")
+
+# ════════════════════════════════════════════════════════════════════════════
+# ⚙️ CONFIGURATION
+# ════════════════════════════════════════════════════════════════════════════
+
+LEDGER_FILE = Path("data/footbot/predictions/quota_ledger.json")
+SAVE_EVERY = 10                  # Écriture disque toutes les N requêtes comptées
+
+# Fournisseur -> (période, quota, en-tête "restant")
+PROVIDERS = {
+    'api_football': ('day', int(os.environ.get("API_FOOTBALL_DAILY_QUOTA", "100")), 'x-ratelimit-requests-remaining'),
+    'odds': ('month', int(os.environ.get("ODDS_MONTHLY_QUOTA", "500")), 'x-requests-remaining'),
+    'groq': ('day', int(os.environ.get("GROQ_DAILY_QUOTA", "1000")), 'x-ratelimit-remaining-requests')
+}
+
+RESERVE_SHARE = 0.05             # Dernière part du quota réservée aux matchs de valeur >= RESERVE_VALUE
+RESERVE_VALUE = 0.9
+
+
+def _period_bounds(period: str, now: datetime):
+    """(clé, début, fin) de la période contenant `now`"""
+    if period == 'month':
+        start = now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+        days = calendar.monthrange(now.year, now.month)[1]
+        return now.strftime("%Y-%m"), start, start + timedelta(days=days)
+    start = now.replace(hour=0, minute=0, second=0, microsecond=0)
+    return now.strftime("%Y-%m-%d"), start, start + timedelta(days=1)
+
+
+def match_value(match: Mapping, requested: bool = True) -> float:
+    """
+    Valeur 0-1 d'une collecte pour l'allocation du quota.
+    Demande d'un utilisateur: 0.5-1 selon le grade; préchauffage: 0-0.6.
+    """
+    base = max(0, min(100, match.get('validation_score', 50))) / 100
+    return 0.5 + base / 2 if requested else 0.6 * base
+
+
+class QuotaLedger:
+    """Consommation par fournisseur et par période, persistée"""
+
+    def __init__(self, path: Path = LEDGER_FILE):
+        self.path = path
+        self._lock = threading.Lock()
+        self._pending = 0
+        # fournisseur -> {'period', 'used', 'reported_remaining', 'first_at', 'last_at'}
+        self.entries: Dict[str, Dict] = {}
+        self.stats = {'denied': 0}
+        self.load()
+
+    # === PERSISTANCE ===
+    def load(self):
+        try:
+            if self.path.exists():
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    self.entries = json.load(f).get('providers', {})
+        except Exception as e:
+            logger.error(f"Erreur chargement registre des quotas: {e}")
+            self.entries = {}
+
+    def save(self, force: bool = False):
+        if not (self._pending or force):
+            return
+        with self._lock:
+            try:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                tmp_path = self.path.with_suffix('.tmp')
+                with open(tmp_path, 'w', encoding='utf-8') as f:
+                    json.dump({'version': 1, 'updated_at': time.time(), 'providers': self.entries}, f)
+                tmp_path.replace(self.path)
+                self._pending = 0
+            except Exception as e:
+                logger.error(f"Erreur sauvegarde registre des quotas: {e}")
+
+    # === COMPTAGE ===
+    def _entry(self, provider: str) -> Dict:
+        """Entrée de la période courante (remise à zéro au changement de période)"""
+        key, _, _ = _period_bounds(PROVIDERS[provider][0], datetime.now())
+        entry = self.entries.get(provider)
+        if not entry or entry.get('period') != key:
+            entry = self.entries[provider] = {
+                'period': key, 'used': 0, 'reported_remaining': None, 'first_at': None, 'last_at': None
+            }
+        return entry
+
+    def limit(self, provider: str) -> int:
+        return PROVIDERS[provider][1]
+
+    def charge(self, provider: str, count: int = 1):
+        """Compte `count` requêtes envoyées"""
+        if provider not in PROVIDERS or count <= 0:
+            return
+        now = time.time()
+        with self._lock:
+            entry = self._entry(provider)
+            entry['used'] += count
+            entry['first_at'] = entry['first_at'] or now
+            entry['last_at'] = now
+            if entry['reported_remaining'] is not None:
+                entry['reported_remaining'] = max(0, entry['reported_remaining'] - count)
+            self._pending += 1
+        if self._pending >= SAVE_EVERY:
+            self.save()
+
+    def observe(self, provider: str, headers: Mapping, model: str = ''):
+        """
+        Recale la consommation sur l'en-tête "requêtes restantes" de la réponse.
+        `model`: l'en-tête ne vaut que pour ce modèle (limite Groq par modèle),
+        il est conservé par modèle et ne recale pas le quota du fournisseur.
+        """
+        if provider not in PROVIDERS:
+            return
+        raw = headers.get(PROVIDERS[provider][2])
+        try:
+            remaining = int(float(raw))
+        except (TypeError, ValueError):
+            return
+        with self._lock:
+            entry = self._entry(provider)
+            if model:
+                entry.setdefault('models', {})[model] = remaining
+                return
+            entry['reported_remaining'] = remaining
+            # Requêtes faites ailleurs (autre processus, autre bot sur la même clé)
+            entry['used'] = max(entry['used'], self.limit(provider) - remaining)
+
+    def remaining(self, provider: str) -> int:
+        with self._lock:
+            entry = self._entry(provider)
+            local = self.limit(provider) - entry['used']
+            reported = entry['reported_remaining']
+        return max(0, min(local, reported) if reported is not None else local)
+
+    # === BUDGET ===
+    @staticmethod
+    def _time_left(provider: str) -> float:
+        """Part (0-1) de la période restant à courir"""
+        now = datetime.now()
+        _, start, end = _period_bounds(PROVIDERS[provider][0], now)
+        return max(1e-6, (end - now) / (end - start))
+
+    def required_value(self, provider: str) -> float:
+        """
+        Valeur minimale d'un match pour dépenser maintenant: 0 tant que la
+        consommation suit le calendrier, jusqu'à 1 quand le quota est vide
+        """
+        limit = self.limit(provider)
+        remaining = self.remaining(provider)
+        if remaining <= 0:
+            return float('inf')
+        if remaining <= limit * RESERVE_SHARE:
+            return RESERVE_VALUE
+        time_left = self._time_left(provider)
+        share_left = remaining / limit
+        if share_left >= time_left:
+            return 0.0
+        return 1.0 - share_left / time_left
+
+    def slack(self, provider: str) -> int:
+        """Requêtes d'avance sur le calendrier (0 si la consommation est en avance)"""
+        if provider not in PROVIDERS:
+            return 0
+        limit = self.limit(provider)
+        remaining = self.remaining(provider)
+        if remaining <= limit * RESERVE_SHARE:
+            return 0
+        return max(0, int(remaining - limit * self._time_left(provider)))
+
+    def allow(self, provider: str, value: float = 1.0) -> bool:
+        """La requête d'un match de cette valeur (0-1) entre-t-elle dans le budget ?"""
+        if provider not in PROVIDERS:
+            return True
+        if value >= self.required_value(provider):
+            return True
+        self.stats['denied'] += 1
+        logger.info(f"🧾 Quota {provider}: requête refusée (valeur {value:.2f}, restant {self.remaining(provider)})")
+        return False
+
+    # === PRÉVISION ===
+    def forecast(self, provider: str) -> Dict:
+        """Rythme de consommation et heure d'épuisement prévue (None: tient jusqu'à la fin de période)"""
+        now = datetime.now()
+        key, start, end = _period_bounds(PROVIDERS[provider][0], now)
+        with self._lock:
+            entry = dict(self._entry(provider))
+        remaining = self.remaining(provider)
+        elapsed_h = max((now - start).total_seconds() / 3600, 1 / 60)
+        rate = entry['used'] / elapsed_h
+        exhausted_at = None
+        if remaining <= 0:
+            exhausted_at = now
+        elif rate > 0:
+            projected = now + timedelta(hours=remaining / rate)
+            if projected < end:
+                exhausted_at = projected
+        return {
+            'period': key,
+            'limit': self.limit(provider),
+            'used': entry['used'],
+            'remaining': remaining,
+            'per_hour': round(rate, 2),
+            'required_value': round(min(self.required_value(provider), 1.0), 2),
+            'exhausted_at': exhausted_at.isoformat(timespec='minutes') if exhausted_at else None,
+            'resets_at': end.isoformat(timespec='minutes'),
+            'models': dict(entry.get('models', {}))
+        }
+
+    def report(self) -> Dict[str, Dict]:
+        return {provider: self.forecast(provider) for provider in PROVIDERS}
+
+    def get_stats(self) -> Dict:
+        return {**self.stats, 'providers': self.report()}
+
+
+# Instance globale
+quota_ledger = QuotaLedger()
+
+
+__all__ = ['QuotaLedger', 'quota_ledger', 'match_value', 'PROVIDERS']
@@ -0,0 +1,192 @@
+"""
+🚦 LIMITEUR DE REQUÊTES V1.0 - TOKEN BUCKET PAR UTILISATEUR
+═══════════════════════════════════════════════════════════════════════════════
+Protège le quota Groq et le scraper contre les rafales:
+- Un seau de jetons par (utilisateur, classe d'action): O(1) par vérification
+- Classes: predict, vote, refresh, navigation
+- Capacité des prédictions modulée par le palier (daily_limit du profil)
+- Compteurs journaliers en mémoire, persistés périodiquement
+═══════════════════════════════════════════════════════════════════════════════
+"""
+import json
+import logging
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, Optional, Tuple
+
+logger = logging.getLogger("footbot.rate_limiter")
+
+# ════════════════════════════════════════════════════════════════════════════
+# ⚙️ CONFIGURATION
+# ════════════════════════════════════════════════════════════════════════════
+
+COUNTERS_FILE = Path("data/footbot/predictions/rate_counters.json")
+
+# Classe d'action -> (jetons max, fenêtre de recharge complète en secondes)
+ACTION_LIMITS = {
+    'predict': (5, 60),
+    'vote': (20, 60),
+    'refresh': (2, 300),
+    'navigation': (60, 60)
+}
+
+MAX_TIER_FACTOR = 3.0       # Rafale max d'un palier payant = 3x le gratuit
+PERSIST_INTERVAL = 60       # Sauvegarde des compteurs journaliers (s)
+IDLE_BUCKET_TTL = 3600      # Oubli des seaux inactifs (s)
+
+
+def classify_callback(data: str) -> str:
+    """Classe d'action d'un callback Telegram"""
+    if data.startswith("predict_") and not data.startswith("predict_sport_"):
+        return 'predict'
+    if data.startswith("vote_"):
+        return 'vote'
+    if data in ("refresh_all", "admin_update"):
+        return 'refresh'
+    return 'navigation'
+
+# ════════════════════════════════════════════════════════════════════════════
+# 🚦 LIMITEUR
+# ════════════════════════════════════════════════════════════════════════════
+
+class RateLimiter:
+    """Seaux de jetons + compteurs journaliers"""
+
+    def __init__(self, path: Path = COUNTERS_FILE):
+        self.path = path
+        self.limits: Dict[str, Tuple[int, int]] = dict(ACTION_LIMITS)
+        self.base_daily_limit = 15
+        # (user_id, action) -> [jetons, dernier remplissage]
+        self._buckets: Dict[Tuple[int, str], list] = {}
+        # (user_id, action) -> compteur du jour
+        self._daily: Dict[Tuple[int, str], int] = {}
+        self._day = datetime.now().date().isoformat()
+        self._dirty = False
+        self._last_persist = time.time()
+        self._lock = threading.Lock()
+        self.rejected = 0
+        self._load()
+
+    def configure(self, action: str, capacity: int, window: int):
+        """Ajuste une classe d'action (ex: Limits.RATE_LIMIT_MAX / RATE_LIMIT_WINDOW)"""
+        self.limits[action] = (capacity, window)
+
+    def _tier_factor(self, daily_limit: Optional[int]) -> float:
+        if not daily_limit:
+            return 1.0
+        ratio = daily_limit / max(self.base_daily_limit, 1)
+        return min(MAX_TIER_FACTOR, max(1.0, ratio ** 0.5))
+
+    # === SEAUX DE JETONS ===
+    def check(self, user_id: int, action: str, daily_limit: Optional[int] = None) -> Tuple[bool, int]:
+        """
+        Consomme un jeton si disponible.
+        Retourne (autorisé, secondes avant le prochain jeton).
+        """
+        capacity, window = self.limits.get(action, self.limits['navigation'])
+        if action == 'predict':
+            capacity = capacity * self._tier_factor(daily_limit)
+        refill_rate = capacity / window
+        now = time.time()
+
+        with self._lock:
+            bucket = self._buckets.get((user_id, action))
+            if bucket is None:
+                bucket = self._buckets[(user_id, action)] = [capacity, now]
+            else:
+                bucket[0] = min(capacity, bucket[0] + (now - bucket[1]) * refill_rate)
+                bucket[1] = now
+
+            if bucket[0] >= 1:
+                bucket[0] -= 1
+                allowed, retry_after = True, 0
+            else:
+                self.rejected += 1
+                allowed, retry_after = False, int((1 - bucket[0]) / refill_rate) + 1
+
+        self.maybe_persist()
+        return allowed, retry_after
+
+    # === COMPTEURS JOURNALIERS ===
+    def _roll_day(self):
+        today = datetime.now().date().isoformat()
+        if today != self._day:
+            self._day = today
+            self._daily.clear()
+            self._dirty = True
+
+    def daily_count(self, user_id: int, action: str = 'predict',
+                    seed: Optional[Callable[[], int]] = None) -> int:
+        """Compteur du jour; `seed` l'initialise (une seule fois) si inconnu"""
+        with self._lock:
+            self._roll_day()
+            key = (user_id, action)
+            if key not in self._daily:
+                if seed is None:
+                    return 0
+                self._daily[key] = seed()
+            return self._daily[key]
+
+    def increment_daily(self, user_id: int, action: str = 'predict'):
+        with self._lock:
+            self._roll_day()
+            key = (user_id, action)
+            self._daily[key] = self._daily.get(key, 0) + 1
+            self._dirty = True
+        self.maybe_persist()
+
+    # === PERSISTANCE ===
+    def _load(self):
+        try:
+            if self.path.exists():
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                if data.get('day') == self._day:
+                    for key, count in data.get('counters', {}).items():
+                        user_id, action = key.split(':', 1)
+                        self._daily[(int(user_id), action)] = count
+        except Exception as e:
+            logger.error(f"Erreur chargement compteurs: {e}")
+
+    def maybe_persist(self, force: bool = False):
+        now = time.time()
+        if not force and (not self._dirty or now - self._last_persist < PERSIST_INTERVAL):
+            return
+        with self._lock:
+            self._last_persist = now
+            # Seaux inactifs: pleins depuis longtemps, inutile de les garder
+            self._buckets = {
+                key: bucket for key, bucket in self._buckets.items()
+                if now - bucket[1] < IDLE_BUCKET_TTL
+            }
+            data = {
+                'day': self._day,
+                'counters': {f"{uid}:{action}": count for (uid, action), count in self._daily.items()}
+            }
+            self._dirty = False
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.path, 'w', encoding='utf-8') as f:
+                json.dump(data, f)
+        except Exception as e:
+            logger.error(f"Erreur sauvegarde compteurs: {e}")
+
+    def get_stats(self) -> Dict:
+        return {
+            'buckets': len(self._buckets),
+            'daily_counters': len(self._daily),
+            'rejected': self.rejected
+        }
+
+
+# Instance globale
+rate_limiter = RateLimiter()
+
+
+__all__ = [
+    'RateLimiter',
+    'rate_limiter',
+    'classify_callback'
+]
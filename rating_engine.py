@@ -0,0 +1,275 @@
+"""
+📈 MOTEUR DE RATINGS ELO/GLICKO V1.0 - FORCE DES ÉQUIPES DANS LE TEMPS
+═══════════════════════════════════════════════════════════════════════════════
+Maintient un rating Glicko-1 (rating + déviation) par équipe / combattant
+et par sport de SPORTS_CONFIG:
+- Mise à jour incrémentale à partir des résultats réglés
+- Stockage compact en tableaux array('d') (un slot par équipe)
+- Accès O(1) par nom canonique (dict nom -> slot, alias résolus)
+- Signal de force précalculé pour le modèle statistique et le prompt Groq
+═══════════════════════════════════════════════════════════════════════════════
+"""
+import json
+import logging
+import math
+import threading
+import time
+from array import array
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from team_resolver import canonical_name, normalize_name
+
+logger = logging.getLogger("footbot.rating_engine")
+
+# ════════════════════════════════════════════════════════════════════════════
+# ⚙️ CONFIGURATION
+# ════════════════════════════════════════════════════════════════════════════
+
+RATINGS_FILE = Path("data/footbot/predictions/team_ratings.json")
+
+INITIAL_RATING = 1500.0
+INITIAL_RD = 350.0        # Incertitude maximale (équipe inconnue)
+MIN_RD = 40.0             # Plancher: garde le rating réactif
+RD_DECAY_PER_DAY = 6.5    # Constante c de Glicko (inflation de RD par jour d'inactivité)
+
+GLICKO_Q = math.log(10) / 400
+
+
+def _g(rd: float) -> float:
+    """Facteur d'atténuation Glicko selon l'incertitude de l'adversaire"""
+    return 1.0 / math.sqrt(1.0 + 3.0 * (GLICKO_Q ** 2) * (rd ** 2) / (math.pi ** 2))
+
+
+def _expected(rating: float, opp_rating: float, opp_rd: float) -> float:
+    """Score attendu E(s | r, r_j, RD_j)"""
+    return 1.0 / (1.0 + 10 ** (-_g(opp_rd) * (rating - opp_rating) / 400))
+
+# ════════════════════════════════════════════════════════════════════════════
+# 🗃️ STOCKAGE PAR SPORT
+# ════════════════════════════════════════════════════════════════════════════
+
+class SportRatings:
+    """Tableaux de ratings d'un sport (un slot par équipe)"""
+
+    __slots__ = ('index', 'names', 'rating', 'rd', 'games', 'last_played')
+
+    def __init__(self):
+        self.index: Dict[str, int] = {}
+        self.names: List[str] = []
+        self.rating = array('d')
+        self.rd = array('d')
+        self.games = array('l')
+        self.last_played = array('d')
+
+    def slot(self, key: str, create: bool = False) -> Optional[int]:
+        """Slot de l'équipe (créé à la demande)"""
+        idx = self.index.get(key)
+        if idx is None and create:
+            idx = len(self.names)
+            self.index[key] = idx
+            self.names.append(key)
+            self.rating.append(INITIAL_RATING)
+            self.rd.append(INITIAL_RD)
+            self.games.append(0)
+            self.last_played.append(0.0)
+        return idx
+
+    def current_rd(self, idx: int, now: float) -> float:
+        """RD gonflée selon l'inactivité depuis le dernier match"""
+        last = self.last_played[idx]
+        if not last:
+            return self.rd[idx]
+        days = max(0.0, (now - last) / 86400)
+        return min(INITIAL_RD, math.sqrt(self.rd[idx] ** 2 + (RD_DECAY_PER_DAY ** 2) * days))
+
+    def to_dict(self) -> Dict:
+        return {
+            'names': self.names,
+            'rating': [round(r, 2) for r in self.rating],
+            'rd': [round(r, 2) for r in self.rd],
+            'games': list(self.games),
+            'last_played': list(self.last_played)
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'SportRatings':
+        table = cls()
+        table.names = list(data.get('names', []))
+        table.rating = array('d', data.get('rating', []))
+        table.rd = array('d', data.get('rd', []))
+        table.games = array('l', data.get('games', []))
+        table.last_played = array('d', data.get('last_played', []))
+        # Anciennes clés ramenées au nom canonique (alias): le slot le plus joué l'emporte
+        for i, name in enumerate(table.names):
+            key = canonical_name(name)
+            kept = table.index.get(key)
+            if kept is None or table.games[i] > table.games[kept]:
+                table.index[key] = i
+        return table
+
+# ════════════════════════════════════════════════════════════════════════════
+# 📈 MOTEUR
+# ════════════════════════════════════════════════════════════════════════════
+
+class RatingEngine:
+    """Ratings Glicko-1 incrémentaux, persistés en JSON"""
+
+    def __init__(self, path: Path = RATINGS_FILE):
+        self.path = path
+        self.sports: Dict[str, SportRatings] = {}
+        self.dirty = False
+        self._lock = threading.Lock()
+        self.load()
+
+    # === PERSISTANCE ===
+    def load(self):
+        try:
+            if self.path.exists():
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                self.sports = {
+                    sport: SportRatings.from_dict(table)
+                    for sport, table in data.get('sports', {}).items()
+                }
+                total = sum(len(t.names) for t in self.sports.values())
+                logger.info(f"📈 Ratings chargés: {total} équipes / {len(self.sports)} sports")
+        except Exception as e:
+            logger.error(f"Erreur chargement ratings: {e}")
+            self.sports = {}
+
+    def save(self, force: bool = False):
+        if not (self.dirty or force):
+            return
+        with self._lock:
+            try:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                data = {
+                    'version': 1,
+                    'updated_at': time.time(),
+                    'sports': {sport: table.to_dict() for sport, table in self.sports.items()}
+                }
+                tmp_path = self.path.with_suffix('.tmp')
+                with open(tmp_path, 'w', encoding='utf-8') as f:
+                    json.dump(data, f, ensure_ascii=False)
+                tmp_path.replace(self.path)
+                self.dirty = False
+            except Exception as e:
+                logger.error(f"Erreur sauvegarde ratings: {e}")
+
+    def _table(self, sport: str) -> SportRatings:
+        sport = sport.lower()
+        table = self.sports.get(sport)
+        if table is None:
+            table = self.sports[sport] = SportRatings()
+        return table
+
+    # === LECTURE ===
+    def get_rating(self, sport: str, name: str) -> Optional[Tuple[float, float, int]]:
+        """(rating, RD courante, matchs joués) ou None si équipe inconnue"""
+        table = self.sports.get(sport.lower())
+        if table is None:
+            return None
+        idx = table.index.get(canonical_name(name))
+        if idx is None:
+            return None
+        return table.rating[idx], table.current_rd(idx, time.time()), table.games[idx]
+
+    def strength_signal(self, sport: str, team1: str, team2: str) -> Optional[Dict]:
+        """
+        Écart de force team1 - team2 (échelle Elo, hors avantage du terrain).
+        L'écart est atténué par l'incertitude combinée des deux ratings.
+        """
+        r1 = self.get_rating(sport, team1)
+        r2 = self.get_rating(sport, team2)
+        if r1 is None and r2 is None:
+            return None
+
+        rating1, rd1, games1 = r1 or (INITIAL_RATING, INITIAL_RD, 0)
+        rating2, rd2, games2 = r2 or (INITIAL_RATING, INITIAL_RD, 0)
+        combined_rd = math.sqrt(rd1 ** 2 + rd2 ** 2)
+        certainty = _g(combined_rd)
+
+        return {
+            'rating_diff': round((rating1 - rating2) * certainty, 1),
+            'team1': {'rating': round(rating1), 'rd': round(rd1), 'games': games1},
+            'team2': {'rating': round(rating2), 'rd': round(rd2), 'games': games2},
+            'win_probability': round(_expected(rating1, rating2, combined_rd) * 100)
+        }
+
+    @staticmethod
+    def prompt_line(signal: Optional[Dict], team1: str, team2: str) -> str:
+        """Résumé d'une ligne pour le prompt Groq"""
+        if not signal:
+            return ""
+        s1, s2 = signal['team1'], signal['team2']
+        return (f"📈 RATINGS GLICKO: {team1} {s1['rating']} (±{s1['rd']}, {s1['games']} matchs) | "
+                f"{team2} {s2['rating']} (±{s2['rd']}, {s2['games']} matchs) | "
+                f"Probabilité {team1}: {signal['win_probability']}% (hors terrain)")
+
+    # === MISE À JOUR ===
+    def update(self, sport: str, team1: str, team2: str, score1: float,
+               home_advantage: float = 0.0, played_at: Optional[float] = None):
+        """
+        Applique un résultat réglé.
+        score1: 1 = victoire team1, 0.5 = nul, 0 = victoire team2
+        """
+        key1, key2 = canonical_name(team1), canonical_name(team2)
+        if not key1 or not key2 or key1 == key2:
+            return
+
+        now = played_at or time.time()
+        with self._lock:
+            table = self._table(sport)
+            i = table.slot(key1, create=True)
+            j = table.slot(key2, create=True)
+
+            r1, r2 = table.rating[i] + home_advantage, table.rating[j]
+            rd1, rd2 = table.current_rd(i, now), table.current_rd(j, now)
+
+            new1 = self._glicko_step(r1, rd1, r2, rd2, score1)
+            new2 = self._glicko_step(r2, rd2, r1, rd1, 1.0 - score1)
+
+            table.rating[i] = new1[0] - home_advantage
+            table.rating[j] = new2[0]
+            table.rd[i], table.rd[j] = new1[1], new2[1]
+            table.games[i] += 1
+            table.games[j] += 1
+            table.last_played[i] = table.last_played[j] = now
+            self.dirty = True
+
+    def update_many(self, sport: str, results: List[Tuple[str, str, float]],
+                    home_advantage: float = 0.0):
+        """Applique une série de résultats puis persiste une seule fois"""
+        for team1, team2, score1 in results:
+            self.update(sport, team1, team2, score1, home_advantage)
+        self.save()
+
+    @staticmethod
+    def _glicko_step(rating: float, rd: float, opp_rating: float, opp_rd: float,
+                     score: float) -> Tuple[float, float]:
+        """Une période Glicko-1 avec un seul match"""
+        g = _g(opp_rd)
+        e = _expected(rating, opp_rating, opp_rd)
+        d2 = 1.0 / ((GLICKO_Q ** 2) * (g ** 2) * e * (1 - e))
+        denom = 1.0 / (rd ** 2) + 1.0 / d2
+        new_rating = rating + (GLICKO_Q / denom) * g * (score - e)
+        new_rd = max(MIN_RD, math.sqrt(1.0 / denom))
+        return new_rating, new_rd
+
+    def get_stats(self) -> Dict:
+        return {
+            sport: {'teams': len(table.names), 'games': sum(table.games) // 2}
+            for sport, table in self.sports.items()
+        }
+
+
+# Instance globale
+rating_engine = RatingEngine()
+
+
+__all__ = [
+    'RatingEngine',
+    'rating_engine',
+    'normalize_name'
+]
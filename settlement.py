@@ -0,0 +1,446 @@
+"""
+🏁 RÈGLEMENT DES PRONOSTICS V1.0 - RÉSULTATS EN LOT
+═══════════════════════════════════════════════════════════════════════════════
+Règle périodiquement les pronostics et votes communautaires en attente:
+- Résultats récupérés UNE fois par (sport, jour) - pas un appel par match
+  (API-Football /fixtures?date=, Sofascore scheduled-events), via le cache
+  HTTP: quota API-Football, disjoncteurs et revalidation partagés
+- Résolution de tous les pronostics et votes en UNE passe vectorisée NumPy
+- Points, victoires, séries et classement mis à jour en UNE écriture
+- Résultats terminés transmis au moteur de ratings
+- Modèle statistique réajusté sur les stats de saison des équipes suivies
+═══════════════════════════════════════════════════════════════════════════════
+"""
+import asyncio
+import logging
+import time
+from dataclasses import asdict
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+import aiohttp
+import numpy as np
+
+from prediction_module import AdvancedDataManager, Limits, UserProfile, SPORTS_CONFIG
+from data_collector import API_FOOTBALL_KEY, API_FOOTBALL_URL, USER_AGENTS
+from rating_engine import rating_engine, normalize_name
+from http_cache import http_cache
+from team_resolver import TeamPairIndex
+from statistical_model import HOME_ADVANTAGE, statistical_model
+from team_stats_store import team_stats_store
+
+logger = logging.getLogger("footbot.settlement")
+
+# ════════════════════════════════════════════════════════════════════════════
+# ⚙️ CONFIGURATION
+# ════════════════════════════════════════════════════════════════════════════
+
+SOFASCORE_URL = "https://api.sofascore.com/api/v1"
+
+# Sport du bot -> slug Sofascore
+SOFASCORE_SPORTS = {
+    'football': 'football',
+    'nba': 'basketball',
+    'nfl': 'american-football',
+    'nhl': 'ice-hockey',
+    'tennis': 'tennis',
+    'ufc': 'mma',
+    'rugby': 'rugby',
+    'volleyball': 'volleyball'
+}
+
+API_FOOTBALL_FINISHED = {'FT', 'AET', 'PEN'}
+
+OUTCOME_CODES = {'1': 0, 'X': 1, '2': 2}
+OUTCOME_LABELS = ['1', 'X', '2']
+
+PENDING_EXPIRY_DAYS = 3       # Au-delà: pronostic annulé (résultat introuvable)
+RATED_RETENTION_DAYS = 14     # Mémoire des résultats déjà transmis aux ratings
+MODEL_FIT_MIN_TEAMS = 20      # Stats d'équipes minimales pour réajuster le modèle statistique
+
+
+def _result(home: str, away: str, home_score, away_score,
+            winner_code: Optional[int] = None) -> Optional[Dict]:
+    """Résultat normalisé {'home', 'away', 'score', 'outcome'}"""
+    if home_score is None or away_score is None:
+        return None
+    if winner_code in (1, 2, 3):
+        outcome = {1: '1', 2: '2', 3: 'X'}[winner_code]
+    elif home_score > away_score:
+        outcome = '1'
+    elif home_score < away_score:
+        outcome = '2'
+    else:
+        outcome = 'X'
+    return {
+        'home': normalize_name(home),
+        'away': normalize_name(away),
+        'score': f"{home_score}-{away_score}",
+        'outcome': outcome
+    }
+
+
+def _swap_outcome(outcome: str) -> str:
+    return {'1': '2', '2': '1'}.get(outcome, outcome)
+
+
+def _swap_score(score: str) -> str:
+    home, away = score.split('-')
+    return f"{away}-{home}"
+
+# ════════════════════════════════════════════════════════════════════════════
+# 📥 RÉCUPÉRATION DES RÉSULTATS
+# ════════════════════════════════════════════════════════════════════════════
+
+class ResultsFetcher:
+    """Un appel par (sport, jour), mémorisé pendant le règlement"""
+
+    def __init__(self):
+        self.session: Optional[aiohttp.ClientSession] = None
+        self.requests_made = 0
+        self._days: Dict[Tuple[str, str], List[Dict]] = {}
+
+    async def __aenter__(self):
+        self.session = aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=30))
+        return self
+
+    async def __aexit__(self, *args):
+        if self.session:
+            await self.session.close()
+
+    async def fetch_day(self, sport: str, date: str) -> List[Dict]:
+        key = (sport, date)
+        if key not in self._days:
+            if sport == 'football' and API_FOOTBALL_KEY:
+                results = await self._fetch_api_football(date)
+            elif sport in SOFASCORE_SPORTS:
+                results = await self._fetch_sofascore(SOFASCORE_SPORTS[sport], date)
+            else:
+                results = []
+            self._days[key] = results
+        return self._days[key]
+
+    async def _get_json(self, url: str, params: Optional[Dict], headers: Dict, label: str,
+                        **options) -> Optional[Dict]:
+        """GET via le cache HTTP (même entrée que l'instantané des matchs pour /fixtures?date=)"""
+        # ttl=0: les scores évoluent, chaque passage revalide (304 si rien n'a changé)
+        response = await http_cache.get_json(self.session, url, params=params, headers=headers,
+                                             timeout=15, ttl=0, **options)
+        if response.sent:
+            self.requests_made += 1
+        if not response.ok:
+            logger.warning(f"⚠️ {label}: {response.status or response.source}")
+            return None
+        return response.data
+
+    async def _fetch_api_football(self, date: str) -> List[Dict]:
+        headers = {'x-apisports-key': API_FOOTBALL_KEY}
+        results = []
+        try:
+            data = await self._get_json(f"{API_FOOTBALL_URL}/fixtures", {'date': date}, headers,
+                                        f"API-Football résultats {date}",
+                                        quota=('api_football', 1.0), breaker='api_football')
+            if not data:
+                return results
+            for fixture in data.get('response', []):
+                if fixture.get('fixture', {}).get('status', {}).get('short') not in API_FOOTBALL_FINISHED:
+                    continue
+                teams = fixture.get('teams', {})
+                goals = fixture.get('goals', {})
+                result = _result(teams.get('home', {}).get('name', ''),
+                                 teams.get('away', {}).get('name', ''),
+                                 goals.get('home'), goals.get('away'))
+                if result:
+                    results.append(result)
+        except Exception as e:
+            logger.error(f"❌ Erreur résultats API-Football {date}: {e}")
+        return results
+
+    async def _fetch_sofascore(self, slug: str, date: str) -> List[Dict]:
+        headers = {
+            'User-Agent': USER_AGENTS[0],
+            'Accept': 'application/json',
+            'Origin': 'https://www.sofascore.com',
+            'Referer': 'https://www.sofascore.com/'
+        }
+        results = []
+        try:
+            data = await self._get_json(f"{SOFASCORE_URL}/sport/{slug}/scheduled-events/{date}", None,
+                                        headers, f"Sofascore résultats {slug} {date}", breaker='sofascore')
+            if not data:
+                return results
+            for event in data.get('events', []):
+                if event.get('status', {}).get('type') != 'finished':
+                    continue
+                result = _result(event.get('homeTeam', {}).get('name', ''),
+                                 event.get('awayTeam', {}).get('name', ''),
+                                 event.get('homeScore', {}).get('current'),
+                                 event.get('awayScore', {}).get('current'),
+                                 event.get('winnerCode'))
+                if result:
+                    results.append(result)
+        except Exception as e:
+            logger.error(f"❌ Erreur résultats Sofascore {slug} {date}: {e}")
+        return results
+
+# ════════════════════════════════════════════════════════════════════════════
+# 🏁 MOTEUR DE RÈGLEMENT
+# ════════════════════════════════════════════════════════════════════════════
+
+class SettlementEngine:
+    """Règle pronostics et votes en attente, en lot"""
+
+    def __init__(self):
+        self.last_run: Optional[str] = None
+        self.last_report: Dict = {}
+
+    @staticmethod
+    def _find_result(index: TeamPairIndex, team1: str, team2: str) -> Optional[Tuple[str, str]]:
+        """(outcome, score) du point de vue team1, ou None"""
+        found = index.find_scored(team1, team2)
+        if not found:
+            return None
+        result, swapped, _ = found
+        if swapped:
+            return _swap_outcome(result['outcome']), _swap_score(result['score'])
+        return result['outcome'], result['score']
+
+    @staticmethod
+    def _load_pending() -> Tuple[Dict, Dict, List[Dict], List[Tuple[str, Dict]]]:
+        """(historique, votes, pronostics en attente, votes en attente)"""
+        history = AdvancedDataManager._load_file('history', {'predictions': []})
+        votes = AdvancedDataManager._load_file('votes', {'matches': {}})
+        pending_preds = [
+            p for p in history.get('predictions', [])
+            if p.get('status') == 'pending'
+        ]
+        pending_votes = [
+            (match_id, entry) for match_id, entry in votes.get('matches', {}).items()
+            if entry.get('status', 'pending') == 'pending'
+        ]
+        return history, votes, pending_preds, pending_votes
+
+    async def run(self) -> Dict:
+        """Exécute un cycle de règlement complet"""
+        start = time.time()
+        today = datetime.now().date().isoformat()
+        expiry = (datetime.now() - timedelta(days=PENDING_EXPIRY_DAYS)).date().isoformat()
+
+        _, _, pending_preds, pending_votes = self._load_pending()
+
+        # === 1. JOURS À RÉCUPÉRER (un appel par sport et par jour) ===
+        days = set()
+        for item in pending_preds + [entry for _, entry in pending_votes]:
+            date = item.get('match_date')
+            if item.get('team1') and item.get('team2') and date and date <= today:
+                days.add((item.get('sport', 'football').lower(), date))
+
+        async with ResultsFetcher() as fetcher:
+            fetched = await asyncio.gather(*[fetcher.fetch_day(sport, date) for sport, date in days])
+            requests_made = fetcher.requests_made
+        results_by_day = dict(zip(days, fetched))
+
+        # Relecture après les requêtes: pronostics et votes ajoutés pendant l'attente conservés.
+        # La suite est synchrone: aucune autre écriture avant nos sauvegardes
+        history, votes, pending_preds, pending_votes = self._load_pending()
+        indexes = {
+            key: TeamPairIndex(results, lambda r: (r['home'], r['away']))
+            for key, results in results_by_day.items()
+        }
+
+        def lookup(item: Dict) -> Optional[Tuple[str, str]]:
+            key = (item.get('sport', 'football').lower(), item.get('match_date'))
+            if key not in indexes:
+                return None
+            return self._find_result(indexes[key], item.get('team1', ''), item.get('team2', ''))
+
+        def expired(item: Dict, created_key: str) -> bool:
+            date = item.get('match_date') or item.get(created_key, '')[:10]
+            return bool(date) and date < expiry
+
+        now_iso = datetime.now().isoformat()
+        report = {
+            'days_fetched': len(days),
+            'requests': requests_made,
+            'predictions_settled': 0,
+            'predictions_won': 0,
+            'exact_scores': 0,
+            'votes_settled': 0,
+            'voided': 0,
+            'points_awarded': 0,
+            'users_updated': 0,
+            'ratings_updated': 0
+        }
+
+        # === 2. RÉSOLUTION DES PRONOSTICS (vectorisée) ===
+        settled_preds, pred_results = [], []
+        for pred in pending_preds:
+            found = lookup(pred)
+            if found:
+                settled_preds.append(pred)
+                pred_results.append(found)
+            elif expired(pred, 'timestamp'):
+                pred.update({'status': 'void', 'settled_at': now_iso})
+                report['voided'] += 1
+
+        user_points: Dict[int, int] = {}
+        user_wins: Dict[int, int] = {}
+        streak_updates: Dict[int, List[bool]] = {}
+
+        if settled_preds:
+            picks = np.array([OUTCOME_CODES.get(p.get('pick'), -1) for p in settled_preds])
+            outcomes = np.array([OUTCOME_CODES[r[0]] for r in pred_results])
+            predicted_scores = np.array([p.get('exact_score') or '' for p in settled_preds], dtype=object)
+            actual_scores = np.array([r[1] for r in pred_results], dtype=object)
+
+            has_pick = picks >= 0
+            correct = has_pick & (picks == outcomes)
+            exact = (predicted_scores != '') & (predicted_scores == actual_scores)
+            points = correct * Limits.POINTS_CORRECT + exact * Limits.POINTS_EXACT
+
+            users = np.array([p['user_id'] for p in settled_preds])
+            unique_users, inverse = np.unique(users, return_inverse=True)
+            points_per_user = np.bincount(inverse, weights=points).astype(int)
+            wins_per_user = np.bincount(inverse, weights=correct).astype(int)
+
+            for uid, pts, wins in zip(unique_users.tolist(), points_per_user.tolist(), wins_per_user.tolist()):
+                user_points[uid] = user_points.get(uid, 0) + pts
+                user_wins[uid] = wins
+
+            # Séries: ordre chronologique par utilisateur
+            timestamps = np.array([p.get('timestamp', '') for p in settled_preds])
+            for i in np.lexsort((timestamps, inverse)):
+                if has_pick[i]:
+                    streak_updates.setdefault(int(users[i]), []).append(bool(correct[i]))
+
+            for i, pred in enumerate(settled_preds):
+                outcome, score = pred_results[i]
+                pred.update({
+                    'status': 'won' if correct[i] else ('lost' if has_pick[i] else 'void'),
+                    'result': score,
+                    'outcome': outcome,
+                    'exact_hit': bool(exact[i]),
+                    'points': int(points[i]),
+                    'settled_at': now_iso
+                })
+
+            report['predictions_settled'] = int(has_pick.sum())
+            report['predictions_won'] = int(correct.sum())
+            report['exact_scores'] = int(exact.sum())
+            report['voided'] += int((~has_pick).sum())
+
+        # === 3. RÉSOLUTION DES VOTES (vectorisée) ===
+        voter_ids, vote_codes, vote_outcomes = [], [], []
+        for match_id, entry in pending_votes:
+            found = lookup(entry)
+            if not found:
+                if expired(entry, 'created_at'):
+                    entry.update({'status': 'void', 'settled_at': now_iso})
+                    report['voided'] += 1
+                continue
+            outcome, score = found
+            entry.update({'status': 'settled', 'result': score, 'outcome': outcome, 'settled_at': now_iso})
+            report['votes_settled'] += 1
+            for vote in entry.get('votes', []):
+                voter_ids.append(vote['user_id'])
+                vote_codes.append(OUTCOME_CODES.get(vote.get('vote'), -1))
+                vote_outcomes.append(OUTCOME_CODES[outcome])
+
+        if voter_ids:
+            voters = np.array(voter_ids)
+            vote_correct = np.array(vote_codes) == np.array(vote_outcomes)
+            unique_voters, inverse = np.unique(voters, return_inverse=True)
+            vote_points = np.bincount(inverse, weights=vote_correct * Limits.POINTS_CORRECT).astype(int)
+            for uid, pts in zip(unique_voters.tolist(), vote_points.tolist()):
+                if pts:
+                    user_points[uid] = user_points.get(uid, 0) + pts
+
+        # === 4. PROFILS: UNE SEULE ÉCRITURE ===
+        touched = set(user_points) | set(streak_updates)
+        if touched:
+            stats = AdvancedDataManager._load_file('stats', {'users': {}})
+            users_data = stats.setdefault('users', {})
+            for uid in touched:
+                profile = users_data.setdefault(str(uid), asdict(UserProfile(user_id=uid)))
+                profile['total_points'] = profile.get('total_points', 0) + user_points.get(uid, 0)
+                profile['wins_count'] = profile.get('wins_count', 0) + user_wins.get(uid, 0)
+                streak = profile.get('current_streak', 0)
+                best = profile.get('best_streak', 0)
+                for won in streak_updates.get(uid, []):
+                    streak = streak + 1 if won else 0
+                    best = max(best, streak)
+                profile['current_streak'] = streak
+                profile['best_streak'] = best
+            AdvancedDataManager._save_file('stats', stats)
+            report['users_updated'] = len(touched)
+            report['points_awarded'] = sum(user_points.values())
+
+        if pending_preds:
+            AdvancedDataManager._save_file('history', history)
+        if pending_votes:
+            AdvancedDataManager._save_file('votes', votes)
+
+        # === 5. RATINGS ET MODÈLE ===
+        report['ratings_updated'] = self._update_ratings(results_by_day)
+        report['model_teams'] = self.refit_model()
+
+        report['elapsed_ms'] = round((time.time() - start) * 1000)
+        self.last_run = now_iso
+        self.last_report = report
+        logger.info(
+            f"🏁 Règlement: {report['predictions_settled']} pronostics "
+            f"({report['predictions_won']} gagnés), {report['votes_settled']} votes, "
+            f"{report['requests']} requêtes, {report['elapsed_ms']}ms"
+        )
+        return report
+
+    @staticmethod
+    def refit_model() -> int:
+        """
+        Réajuste les moyennes du modèle statistique sur les stats de saison
+        persistées (matchs terminés); retourne le nombre d'équipes utilisées
+        """
+        stats = [entry['stats'] for entry in team_stats_store.entries.values() if entry.get('stats')]
+        if len(stats) < MODEL_FIT_MIN_TEAMS:
+            return 0
+        statistical_model.fit(stats)
+        return len(stats)
+
+    @staticmethod
+    def _update_ratings(results_by_day: Dict[Tuple[str, str], List[Dict]]) -> int:
+        """Transmet chaque résultat terminé au moteur de ratings (une seule fois)"""
+        state = AdvancedDataManager._load_file('settlement', {'rated': {}})
+        rated = state.setdefault('rated', {})
+        updated = 0
+
+        for (sport, date), results in results_by_day.items():
+            if sport not in SPORTS_CONFIG:
+                continue
+            batch = []
+            for result in results:
+                key = f"{sport}:{date}:{result['home']}:{result['away']}"
+                if key in rated:
+                    continue
+                rated[key] = date
+                batch.append((result['home'], result['away'],
+                              {'1': 1.0, 'X': 0.5, '2': 0.0}[result['outcome']]))
+            if batch:
+                rating_engine.update_many(sport, batch, HOME_ADVANTAGE.get(sport, 0.0))
+                updated += len(batch)
+
+        if updated:
+            cutoff = (datetime.now() - timedelta(days=RATED_RETENTION_DAYS)).date().isoformat()
+            state['rated'] = {k: d for k, d in rated.items() if d >= cutoff}
+            AdvancedDataManager._save_file('settlement', state)
+        return updated
+
+
+# Instance globale
+settlement_engine = SettlementEngine()
+
+
+__all__ = [
+    'SettlementEngine',
+    'ResultsFetcher',
+    'settlement_engine'
+]
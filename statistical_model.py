@@ -0,0 +1,629 @@
+"""
+📐 MODÈLE STATISTIQUE HORS-LIGNE V1.0 - FALLBACK SANS IA
+═══════════════════════════════════════════════════════════════════════════════
+Remplace les probabilités aléatoires du mode algorithmique par un vrai modèle:
+- Football: Poisson bivarié avec correction Dixon–Coles (1X2, score exact,
+  Over/Under, BTTS, mi-temps, clean sheets)
+- Sports à deux issues: modèle logistique sur différence de rating
+- Paramètres ajustés sur les statistiques d'équipes API-Football
+- Tous les matchs du jour scorés en UNE passe vectorisée NumPy
+
+Benchmark de calibration: python statistical_model.py [--data matchs.json]
+═══════════════════════════════════════════════════════════════════════════════
+"""
+import logging
+import math
+import time
+from typing import Dict, List, Optional, Any, Iterable
+
+import numpy as np
+
+logger = logging.getLogger("footbot.statistical_model")
+
+# ════════════════════════════════════════════════════════════════════════════
+# ⚙️ CONFIGURATION
+# ════════════════════════════════════════════════════════════════════════════
+
+# Moyennes de référence (top-5 européens, saisons récentes)
+LEAGUE_PRIORS = {
+    'home_goals': 1.52,
+    'away_goals': 1.21,
+    'corners': 10.1,
+    'yellow_cards': 4.3,
+    'fouls': 23.5
+}
+
+MAX_GOALS = 10            # Grille de scores 0..9
+DIXON_COLES_RHO = -0.08   # Dépendance des scores faibles
+SHRINKAGE_MATCHES = 6.0   # Poids du prior (en matchs joués)
+HALFTIME_SHARE = 0.45     # Part des buts marqués en 1re mi-temps
+
+# Avantage du terrain en points de rating (échelle Elo, 400 = x10)
+HOME_ADVANTAGE = {
+    'football': 65, 'nba': 70, 'nfl': 48, 'nhl': 30, 'rugby': 60,
+    'volleyball': 25, 'other': 20
+}
+
+# Taux de nul des sports 1X2 hors football
+DRAW_RATES = {'boxing': 0.03, 'nhl': 0.22, 'rugby': 0.03}
+
+# Taux de base UFC (moyennes historiques)
+UFC_METHOD_RATES = {'ko_tko': 0.32, 'submission': 0.19, 'decision': 0.49}
+
+# Références NBA
+NBA_AVERAGE_TOTAL = 228.5
+NBA_ELO_PER_POINT = 28.0
+
+# Références tennis (best-of-3)
+TENNIS_BASE_GAMES = 23.0
+
+# Limite de confiance du projet
+MAX_CONFIDENCE = 70
+
+
+def _to_float(value: Any, default: Optional[float] = None) -> Optional[float]:
+    """Convertit les valeurs API-Football ('1.5', None, 3) en float"""
+    try:
+        if value is None or value == '':
+            return default
+        return float(value)
+    except (TypeError, ValueError):
+        return default
+
+
+def _pct(p: float) -> int:
+    """Probabilité [0,1] -> pourcentage entier"""
+    return int(round(float(p) * 100))
+
+# ════════════════════════════════════════════════════════════════════════════
+# 📐 MODÈLE
+# ════════════════════════════════════════════════════════════════════════════
+
+class StatisticalModel:
+    """Moteur de prédiction hors-ligne vectorisé"""
+
+    def __init__(self, rho: float = DIXON_COLES_RHO, max_goals: int = MAX_GOALS,
+                 shrinkage: float = SHRINKAGE_MATCHES):
+        self.rho = rho
+        self.max_goals = max_goals
+        self.shrinkage = shrinkage
+        self.league = dict(LEAGUE_PRIORS)
+
+        # Précalculs de la grille de scores
+        goals = np.arange(max_goals)
+        self._goals = goals
+        self._log_factorials = np.array([math.lgamma(k + 1) for k in goals])
+        self._totals = goals[:, None] + goals[None, :]
+        self._home_win_mask = goals[:, None] > goals[None, :]
+        self._draw_mask = goals[:, None] == goals[None, :]
+        self._away_win_mask = goals[:, None] < goals[None, :]
+
+    # === AJUSTEMENT DES PARAMÈTRES ===
+
+    def fit(self, team_stats: Iterable[Dict]) -> Dict[str, float]:
+        """
+        Ajuste les moyennes de ligue sur les stats d'équipes API-Football
+        (réponses /teams/statistics). Pondéré par le nombre de matchs joués.
+        """
+        home_goals, away_goals, yellow = [], [], []
+        home_weights, away_weights, card_weights = [], [], []
+
+        for stats in team_stats:
+            if not stats:
+                continue
+            played = stats.get('fixtures', {}).get('played', {})
+            goals_for = stats.get('goals', {}).get('for', {}).get('average', {})
+
+            played_home = _to_float(played.get('home'), 0) or 0
+            played_away = _to_float(played.get('away'), 0) or 0
+            avg_home = _to_float(goals_for.get('home'))
+            avg_away = _to_float(goals_for.get('away'))
+
+            if played_home > 0 and avg_home is not None:
+                home_goals.append(avg_home)
+                home_weights.append(played_home)
+            if played_away > 0 and avg_away is not None:
+                away_goals.append(avg_away)
+                away_weights.append(played_away)
+
+            cards = self._yellow_per_match(stats)
+            if cards is not None:
+                yellow.append(cards)
+                card_weights.append(played_home + played_away)
+
+        if home_goals:
+            self.league['home_goals'] = float(np.average(home_goals, weights=home_weights))
+        if away_goals:
+            self.league['away_goals'] = float(np.average(away_goals, weights=away_weights))
+        if yellow:
+            # Stats par équipe -> total du match
+            self.league['yellow_cards'] = float(np.average(yellow, weights=card_weights)) * 2
+
+        logger.info(
+            f"📐 Modèle ajusté: dom {self.league['home_goals']:.2f} / "
+            f"ext {self.league['away_goals']:.2f} buts, {self.league['yellow_cards']:.1f} jaunes"
+        )
+        return dict(self.league)
+
+    @staticmethod
+    def _yellow_per_match(stats: Dict) -> Optional[float]:
+        """Cartons jaunes par match d'une équipe"""
+        played = _to_float(stats.get('fixtures', {}).get('played', {}).get('total'), 0) or 0
+        yellow = stats.get('cards', {}).get('yellow', {})
+        if not played or not yellow:
+            return None
+        total = sum((_to_float(v.get('total'), 0) or 0) for v in yellow.values() if isinstance(v, dict))
+        return total / played if total else None
+
+    def _shrunk_ratio(self, value: Optional[float], played: float, reference: float) -> float:
+        """Force relative (attaque/défense) rétrécie vers 1.0"""
+        if value is None or reference <= 0:
+            return 1.0
+        ratio = value / reference
+        weight = played / (played + self.shrinkage)
+        return 1.0 + weight * (ratio - 1.0)
+
+    def football_features(self, team1_stats: Optional[Dict] = None,
+                          team2_stats: Optional[Dict] = None,
+                          rating_diff: float = 0.0) -> Dict[str, float]:
+        """
+        Calcule les buts attendus (lambda dom / ext) d'un match.
+        team1 = domicile, team2 = extérieur (ordre VIPRow / API-Football).
+        """
+        league_home = self.league['home_goals']
+        league_away = self.league['away_goals']
+
+        t1 = team1_stats or {}
+        t2 = team2_stats or {}
+
+        t1_played = t1.get('fixtures', {}).get('played', {})
+        t2_played = t2.get('fixtures', {}).get('played', {})
+        t1_goals = t1.get('goals', {})
+        t2_goals = t2.get('goals', {})
+
+        t1_home_played = _to_float(t1_played.get('home'), 0) or 0
+        t2_away_played = _to_float(t2_played.get('away'), 0) or 0
+
+        attack_home = self._shrunk_ratio(
+            _to_float(t1_goals.get('for', {}).get('average', {}).get('home')), t1_home_played, league_home)
+        defense_home = self._shrunk_ratio(
+            _to_float(t1_goals.get('against', {}).get('average', {}).get('home')), t1_home_played, league_away)
+        attack_away = self._shrunk_ratio(
+            _to_float(t2_goals.get('for', {}).get('average', {}).get('away')), t2_away_played, league_away)
+        defense_away = self._shrunk_ratio(
+            _to_float(t2_goals.get('against', {}).get('average', {}).get('away')), t2_away_played, league_home)
+
+        lam_home = league_home * attack_home * defense_away
+        lam_away = league_away * attack_away * defense_home
+
+        # Signal de rating externe (Elo): déplace la balance sans changer le total
+        if rating_diff:
+            shift = math.exp(rating_diff / 1000.0)
+            lam_home *= shift
+            lam_away /= shift
+
+        yellow1 = self._yellow_per_match(t1)
+        yellow2 = self._yellow_per_match(t2)
+        if yellow1 is not None and yellow2 is not None:
+            yellow = yellow1 + yellow2
+        else:
+            yellow = self.league['yellow_cards']
+
+        return {
+            'lambda_home': float(np.clip(lam_home, 0.15, 5.0)),
+            'lambda_away': float(np.clip(lam_away, 0.15, 5.0)),
+            'yellow_expected': float(yellow),
+            'has_stats': bool(team1_stats and team2_stats)
+        }
+
+    # === CALCULS VECTORISÉS ===
+
+    def _poisson_pmf(self, lam: np.ndarray) -> np.ndarray:
+        """PMF de Poisson (N, G) pour un vecteur de lambdas"""
+        lam = lam[:, None]
+        return np.exp(self._goals[None, :] * np.log(lam) - lam - self._log_factorials[None, :])
+
+    def score_matrix(self, lam_home: np.ndarray, lam_away: np.ndarray,
+                     rho: Optional[float] = None) -> np.ndarray:
+        """Matrice des scores (N, G, G) avec correction Dixon–Coles"""
+        rho = self.rho if rho is None else rho
+        matrix = self._poisson_pmf(lam_home)[:, :, None] * self._poisson_pmf(lam_away)[:, None, :]
+
+        if rho:
+            matrix[:, 0, 0] *= 1.0 - lam_home * lam_away * rho
+            matrix[:, 0, 1] *= 1.0 + lam_home * rho
+            matrix[:, 1, 0] *= 1.0 + lam_away * rho
+            matrix[:, 1, 1] *= 1.0 - rho
+
+        matrix = np.clip(matrix, 0.0, None)
+        return matrix / matrix.sum(axis=(1, 2), keepdims=True)
+
+    def football_markets(self, lam_home: np.ndarray, lam_away: np.ndarray) -> Dict[str, np.ndarray]:
+        """Tous les marchés football pour N matchs en une passe"""
+        lam_home = np.asarray(lam_home, dtype=float)
+        lam_away = np.asarray(lam_away, dtype=float)
+        matrix = self.score_matrix(lam_home, lam_away)
+
+        markets = {
+            'p_home': (matrix * self._home_win_mask).sum(axis=(1, 2)),
+            'p_draw': (matrix * self._draw_mask).sum(axis=(1, 2)),
+            'p_away': (matrix * self._away_win_mask).sum(axis=(1, 2)),
+            'btts': matrix[:, 1:, 1:].sum(axis=(1, 2)),
+            'clean_sheet_home': matrix[:, :, 0].sum(axis=1),
+            'clean_sheet_away': matrix[:, 0, :].sum(axis=1),
+            'expected_goals': lam_home + lam_away
+        }
+        for line in (0.5, 1.5, 2.5, 3.5, 4.5):
+            key = f"over_{str(line).replace('.', '_')}"
+            markets[key] = (matrix * (self._totals > line)).sum(axis=(1, 2))
+
+        # Top 3 des scores exacts
+        flat = matrix.reshape(len(lam_home), -1)
+        top = np.argsort(-flat, axis=1)[:, :3]
+        markets['top_scores'] = top
+        markets['top_scores_prob'] = np.take_along_axis(flat, top, axis=1)
+
+        # Mi-temps (Poisson indépendant sur la part 1re période)
+        ht = self.score_matrix(lam_home * HALFTIME_SHARE, lam_away * HALFTIME_SHARE, rho=0.0)
+        markets['ht_home'] = (ht * self._home_win_mask).sum(axis=(1, 2))
+        markets['ht_draw'] = (ht * self._draw_mask).sum(axis=(1, 2))
+        markets['ht_away'] = (ht * self._away_win_mask).sum(axis=(1, 2))
+        ht_flat = ht.reshape(len(lam_home), -1)
+        markets['ht_top_score'] = ht_flat.argmax(axis=1)
+
+        return markets
+
+    @staticmethod
+    def poisson_over(mean: np.ndarray, line: float) -> np.ndarray:
+        """P(X > line) pour X ~ Poisson(mean), vectorisé"""
+        mean = np.asarray(mean, dtype=float)
+        k = np.arange(int(math.floor(line)) + 1)
+        log_fact = np.array([math.lgamma(i + 1) for i in k])
+        cdf = np.exp(k[None, :] * np.log(mean[:, None]) - mean[:, None] - log_fact[None, :]).sum(axis=1)
+        return np.clip(1.0 - cdf, 0.0, 1.0)
+
+    @staticmethod
+    def logistic_win_probability(rating_diff: np.ndarray, home_advantage: np.ndarray) -> np.ndarray:
+        """Probabilité de victoire du participant 1 (échelle Elo)"""
+        diff = np.asarray(rating_diff, dtype=float) + np.asarray(home_advantage, dtype=float)
+        return 1.0 / (1.0 + np.power(10.0, -diff / 400.0))
+
+    @staticmethod
+    def tennis_set_probability(p_match: np.ndarray) -> np.ndarray:
+        """Inverse p_match = p²(3 - 2p) (best-of-3) par bissection vectorisée"""
+        p_match = np.asarray(p_match, dtype=float)
+        low = np.zeros_like(p_match)
+        high = np.ones_like(p_match)
+        for _ in range(30):
+            mid = (low + high) / 2
+            too_high = mid * mid * (3 - 2 * mid) > p_match
+            high = np.where(too_high, mid, high)
+            low = np.where(too_high, low, mid)
+        return (low + high) / 2
+
+    @staticmethod
+    def _confidence(max_prob: np.ndarray, outcomes: int, has_data: np.ndarray) -> np.ndarray:
+        """Confiance 25-70 selon l'écart à l'uniforme et la présence de données"""
+        uniform = 1.0 / outcomes
+        edge = np.clip((max_prob - uniform) / (1.0 - uniform), 0.0, 1.0)
+        conf = 35 + 45 * edge - np.where(has_data, 0, 8)
+        return np.clip(np.round(conf), 25, MAX_CONFIDENCE).astype(int)
+
+    # === API HAUT NIVEAU ===
+
+    def predict_matches(self, items: List[Dict]) -> List[Dict]:
+        """
+        Score tous les matchs en une passe vectorisée par famille de sport.
+
+        items: [{'sport': 'football', 'result_type': '1X2',
+                 'team1_stats': {...}, 'team2_stats': {...}, 'rating_diff': 0.0}]
+        Retourne, dans le même ordre, le bloc 'predictions' de chaque match.
+        """
+        results: List[Optional[Dict]] = [None] * len(items)
+
+        football_idx = [i for i, it in enumerate(items) if it.get('sport', '') in ('football', 'soccer')]
+        football_set = set(football_idx)
+        other_idx = [i for i in range(len(items)) if i not in football_set]
+
+        if football_idx:
+            for i, preds in zip(football_idx, self._predict_football([items[i] for i in football_idx])):
+                results[i] = preds
+        if other_idx:
+            for i, preds in zip(other_idx, self._predict_rated([items[i] for i in other_idx])):
+                results[i] = preds
+
+        return results
+
+    def _predict_football(self, items: List[Dict]) -> List[Dict]:
+        features = [
+            self.football_features(it.get('team1_stats'), it.get('team2_stats'), it.get('rating_diff', 0.0))
+            for it in items
+        ]
+        lam_home = np.array([f['lambda_home'] for f in features])
+        lam_away = np.array([f['lambda_away'] for f in features])
+        has_stats = np.array([f['has_stats'] or bool(it.get('rating_diff')) for f, it in zip(features, items)])
+        yellow = np.array([f['yellow_expected'] for f in features])
+
+        m = self.football_markets(lam_home, lam_away)
+        probs_1x2 = np.stack([m['p_home'], m['p_draw'], m['p_away']], axis=1)
+        conf_1x2 = self._confidence(probs_1x2.max(axis=1), 3, has_stats)
+        conf_goals = self._confidence(np.maximum(m['over_2_5'], 1 - m['over_2_5']), 2, has_stats)
+        conf_btts = self._confidence(np.maximum(m['btts'], 1 - m['btts']), 2, has_stats)
+
+        corners = np.full(len(items), self.league['corners'])
+        fouls = np.full(len(items), self.league['fouls'])
+        corners_over = {line: self.poisson_over(corners, line) for line in (8.5, 9.5, 10.5)}
+        yellow_over = {line: self.poisson_over(yellow, line) for line in (3.5, 4.5)}
+        red_prob = 1.0 - np.exp(-0.13 * yellow / self.league['yellow_cards'])
+        fouls_over = self.poisson_over(fouls, 22.5)
+
+        g = self.max_goals
+        outputs = []
+        for n in range(len(items)):
+            probs = {'1': _pct(m['p_home'][n]), 'X': _pct(m['p_draw'][n]), '2': _pct(m['p_away'][n])}
+            winner = max(probs, key=probs.get)
+            top_scores = [
+                {'score': f"{idx // g}-{idx % g}", 'probability': _pct(p)}
+                for idx, p in zip(m['top_scores'][n], m['top_scores_prob'][n])
+            ]
+            ht_probs = {'1': _pct(m['ht_home'][n]), 'X': _pct(m['ht_draw'][n]), '2': _pct(m['ht_away'][n])}
+            ht_idx = int(m['ht_top_score'][n])
+            btts = float(m['btts'][n])
+
+            outputs.append({
+                'winner': {
+                    'prediction': winner,
+                    'probabilities': probs,
+                    'confidence': int(conf_1x2[n]),
+                    'reasoning': (
+                        f"Modèle Poisson/Dixon–Coles: {lam_home[n]:.2f} vs {lam_away[n]:.2f} buts attendus."
+                    )
+                },
+                'exact_score': {
+                    'top_3': top_scores,
+                    'confidence': max(25, int(conf_1x2[n]) - 20)
+                },
+                'total_goals': {
+                    'expected': round(float(m['expected_goals'][n]), 1),
+                    'over_1_5': {'probability': _pct(m['over_1_5'][n])},
+                    'over_2_5': {'probability': _pct(m['over_2_5'][n])},
+                    'over_3_5': {'probability': _pct(m['over_3_5'][n])},
+                    'confidence': int(conf_goals[n])
+                },
+                'btts': {
+                    'prediction': 'Oui' if btts >= 0.5 else 'Non',
+                    'probability': _pct(btts if btts >= 0.5 else 1 - btts),
+                    'confidence': int(conf_btts[n])
+                },
+                'corners': {
+                    'total_expected': round(float(corners[n]), 1),
+                    'over_8_5': {'probability': _pct(corners_over[8.5][n])},
+                    'over_9_5': {'probability': _pct(corners_over[9.5][n])},
+                    'over_10_5': {'probability': _pct(corners_over[10.5][n])},
+                    'confidence': 30
+                },
+                'cards': {
+                    'yellow_cards': {
+                        'total_expected': round(float(yellow[n]), 1),
+                        'over_3_5': {'probability': _pct(yellow_over[3.5][n])},
+                        'over_4_5': {'probability': _pct(yellow_over[4.5][n])}
+                    },
+                    'red_cards': {'probability': _pct(red_prob[n])},
+                    'confidence': 35 if has_stats[n] else 28
+                },
+                'fouls': {
+                    'total_expected': round(float(fouls[n])),
+                    'over_22_5': {'probability': _pct(fouls_over[n])},
+                    'confidence': 28
+                },
+                'halftime': {
+                    'result': max(ht_probs, key=ht_probs.get),
+                    'score': f"{ht_idx // g}-{ht_idx % g}",
+                    'probabilities': ht_probs,
+                    'confidence': max(25, int(conf_1x2[n]) - 10)
+                },
+                'clean_sheet': {
+                    'team1': {'probability': _pct(m['clean_sheet_home'][n])},
+                    'team2': {'probability': _pct(m['clean_sheet_away'][n])},
+                    'confidence': int(conf_btts[n])
+                }
+            })
+        return outputs
+
+    def _predict_rated(self, items: List[Dict]) -> List[Dict]:
+        """Sports hors football: logistique sur différence de rating"""
+        sports = [it.get('sport', 'other') for it in items]
+        diffs = np.array([float(it.get('rating_diff', 0.0) or 0.0) for it in items])
+        advantages = np.array([HOME_ADVANTAGE.get(s, 0) for s in sports], dtype=float)
+        has_rating = np.array([bool(it.get('rating_diff')) for it in items])
+
+        p1 = self.logistic_win_probability(diffs, advantages)
+        conf = self._confidence(np.maximum(p1, 1 - p1), 2, has_rating)
+        p_set = self.tennis_set_probability(p1)
+
+        outputs = []
+        for n, it in enumerate(items):
+            sport = sports[n]
+            draw = DRAW_RATES.get(sport, 0.0) if it.get('result_type') == '1X2' else 0.0
+            if draw:
+                probs = {'1': _pct(p1[n] * (1 - draw)), 'X': _pct(draw), '2': _pct((1 - p1[n]) * (1 - draw))}
+            else:
+                probs = {'1': _pct(p1[n]), '2': _pct(1 - p1[n])}
+            winner = max(probs, key=probs.get)
+
+            preds = {
+                'winner': {
+                    'prediction': winner,
+                    'probabilities': probs,
+                    'confidence': int(conf[n]),
+                    'reasoning': (
+                        f"Modèle logistique: écart de rating {diffs[n]:+.0f}, "
+                        f"avantage terrain {advantages[n]:+.0f}."
+                    )
+                }
+            }
+
+            if sport in ('ufc', 'mma'):
+                preds['method'] = {
+                    key: {'probability': _pct(rate)} for key, rate in UFC_METHOD_RATES.items()
+                }
+                preds['method']['confidence'] = 30
+                preds['round'] = {
+                    'goes_distance': {'probability': _pct(UFC_METHOD_RATES['decision'])},
+                    'confidence': 30
+                }
+
+            elif sport in ('nba', 'basketball'):
+                spread = -(diffs[n] + advantages[n]) / NBA_ELO_PER_POINT
+                preds['total_points'] = {
+                    'line': NBA_AVERAGE_TOTAL,
+                    'over_probability': 50,
+                    'confidence': 30
+                }
+                preds['spread'] = {
+                    'line': round(spread * 2) / 2,
+                    'confidence': int(conf[n])
+                }
+
+            elif sport == 'tennis':
+                ps = float(p_set[n])
+                sets = {
+                    '2-0': ps * ps,
+                    '2-1': 2 * ps * ps * (1 - ps),
+                    '1-2': 2 * ps * (1 - ps) ** 2,
+                    '0-2': (1 - ps) ** 2
+                }
+                # Plus le match est serré, plus il y a de jeux
+                closeness = 1.0 - abs(2 * ps - 1)
+                expected_games = TENNIS_BASE_GAMES - 4.0 + 5.0 * closeness
+                preds['sets'] = {
+                    'prediction': max(sets, key=sets.get),
+                    'probabilities': {k: _pct(v) for k, v in sets.items()},
+                    'confidence': max(25, int(conf[n]) - 10)
+                }
+                preds['total_games'] = {
+                    'expected': round(expected_games, 1),
+                    'over_21_5': {'probability': _pct(self.poisson_over(np.array([expected_games]), 21.5)[0])},
+                    'confidence': 30
+                }
+
+            outputs.append(preds)
+        return outputs
+
+
+# Instance globale
+statistical_model = StatisticalModel()
+
+# ════════════════════════════════════════════════════════════════════════════
+# 🧪 BENCHMARK DE CALIBRATION
+# ════════════════════════════════════════════════════════════════════════════
+
+def _synthetic_team_stats(attack: float, defense: float, played: int, rng: np.random.Generator) -> Dict:
+    """Stats d'équipe bruitées au format API-Football"""
+    half = played // 2
+    home_for = rng.poisson(LEAGUE_PRIORS['home_goals'] * attack, half).mean() if half else 0
+    away_for = rng.poisson(LEAGUE_PRIORS['away_goals'] * attack, half).mean() if half else 0
+    home_against = rng.poisson(LEAGUE_PRIORS['away_goals'] * defense, half).mean() if half else 0
+    away_against = rng.poisson(LEAGUE_PRIORS['home_goals'] * defense, half).mean() if half else 0
+    return {
+        'fixtures': {'played': {'home': half, 'away': half, 'total': half * 2}},
+        'goals': {
+            'for': {'average': {'home': f"{home_for:.1f}", 'away': f"{away_for:.1f}"}},
+            'against': {'average': {'home': f"{home_against:.1f}", 'away': f"{away_against:.1f}"}}
+        }
+    }
+
+
+def run_calibration_benchmark(samples: Optional[List[Dict]] = None, n: int = 3000,
+                              seed: int = 7, bins: int = 10) -> Dict[str, Any]:
+    """
+    Mesure calibration (Brier, log-loss, fiabilité par tranche) et vitesse.
+
+    samples: matchs réglés [{'team1_stats', 'team2_stats', 'home_goals', 'away_goals'}].
+    Sans échantillon fourni, simule une saison à partir de forces cachées.
+    """
+    model = StatisticalModel()
+    rng = np.random.default_rng(seed)
+
+    if samples is None:
+        samples = []
+        for _ in range(n):
+            att1, def1, att2, def2 = rng.lognormal(0.0, 0.25, 4)
+            lam_h = LEAGUE_PRIORS['home_goals'] * att1 * def2
+            lam_a = LEAGUE_PRIORS['away_goals'] * att2 * def1
+            samples.append({
+                'sport': 'football',
+                'team1_stats': _synthetic_team_stats(att1, def1, 20, rng),
+                'team2_stats': _synthetic_team_stats(att2, def2, 20, rng),
+                'home_goals': int(rng.poisson(lam_h)),
+                'away_goals': int(rng.poisson(lam_a))
+            })
+
+    model.fit([s['team1_stats'] for s in samples] + [s['team2_stats'] for s in samples])
+
+    start = time.perf_counter()
+    features = [model.football_features(s.get('team1_stats'), s.get('team2_stats')) for s in samples]
+    markets = model.football_markets(
+        np.array([f['lambda_home'] for f in features]),
+        np.array([f['lambda_away'] for f in features])
+    )
+    elapsed_ms = (time.perf_counter() - start) * 1000
+
+    probs = np.stack([markets['p_home'], markets['p_draw'], markets['p_away']], axis=1)
+    home = np.array([s['home_goals'] for s in samples])
+    away = np.array([s['away_goals'] for s in samples])
+    outcome = np.where(home > away, 0, np.where(home == away, 1, 2))
+    onehot = np.eye(3)[outcome]
+
+    brier = float(np.mean(np.sum((probs - onehot) ** 2, axis=1)))
+    log_loss = float(-np.mean(np.log(np.clip(probs[np.arange(len(outcome)), outcome], 1e-12, 1))))
+    brier_uniform = float(np.mean(np.sum((np.full_like(probs, 1 / 3) - onehot) ** 2, axis=1)))
+
+    over = markets['over_2_5']
+    over_actual = (home + away) > 2.5
+    brier_over = float(np.mean((over - over_actual) ** 2))
+
+    # Fiabilité: probabilités prédites (toutes issues) vs fréquences observées
+    flat_p = probs.ravel()
+    flat_y = onehot.ravel()
+    edges = np.linspace(0, 1, bins + 1)
+    which = np.clip(np.digitize(flat_p, edges) - 1, 0, bins - 1)
+    reliability = []
+    ece = 0.0
+    for b in range(bins):
+        mask = which == b
+        if not mask.any():
+            continue
+        mean_p = float(flat_p[mask].mean())
+        freq = float(flat_y[mask].mean())
+        ece += mask.mean() * abs(mean_p - freq)
+        reliability.append({'bin': f"{edges[b]:.1f}-{edges[b + 1]:.1f}", 'predicted': round(mean_p, 3),
+                            'observed': round(freq, 3), 'count': int(mask.sum())})
+
+    return {
+        'matches': len(samples),
+        'batch_ms': round(elapsed_ms, 2),
+        'brier_1x2': round(brier, 4),
+        'brier_1x2_uniform': round(brier_uniform, 4),
+        'log_loss_1x2': round(log_loss, 4),
+        'brier_over_2_5': round(brier_over, 4),
+        'ece': round(float(ece), 4),
+        'reliability': reliability
+    }
+
+
+if __name__ == "__main__":
+    import json
+    import sys
+
+    print("=" * 50)
+    print("📐 BENCHMARK MODÈLE STATISTIQUE")
+    print("=" * 50)
+
+    data = None
+    if '--data' in sys.argv:
+        with open(sys.argv[sys.argv.index('--data') + 1], 'r', encoding='utf-8') as f:
+            data = json.load(f)
+
+    report = run_calibration_benchmark(samples=data)
+    print(json.dumps(report, indent=2, ensure_ascii=False))
@@ -0,0 +1,320 @@
+"""
+🏷️ RÉSOLUTION DES NOMS D'ÉQUIPES V1.0 - NORMALISATION, ALIAS, SCORE
+═══════════════════════════════════════════════════════════════════════════════
+Un seul moteur pour rapprocher les noms venant de VIPRow, Sofascore,
+API-Football, The Odds API et des résultats:
+- Repli des accents et de la casse, suffixes et préfixes retirés ("FC", "RC", "VfL"...)
+- Table d'alias ("PSG", "Man Utd", "Bayern München", "Wolves"...)
+- Profils précalculés (mots, trigrammes) mis en cache par nom
+- Score de similarité 0-1: un mot faible commun ("United", "City",
+  "Real") ne suffit plus, deux noms distincts se contredisent
+- Nom court contenu dans le long si le reste n'est qu'une ville ("Lakers")
+- Index inversé mots/trigrammes: meilleure correspondance sans tout parcourir,
+  égalité entre deux équipes = ambiguë ("Manchester")
+═══════════════════════════════════════════════════════════════════════════════
+"""
+import re
+import time
+import unicodedata
+from functools import lru_cache
+from typing import Callable, Dict, FrozenSet, List, Optional, Tuple
+
+# ════════════════════════════════════════════════════════════════════════════
+# ⚙️ CONFIGURATION
+# ════════════════════════════════════════════════════════════════════════════
+
+MATCH_THRESHOLD = 0.6          # Score minimal pour considérer deux noms identiques
+PROFILE_CACHE_SIZE = 8192
+
+# Suffixes et préfixes de club sans valeur discriminante ("Arsenal FC" == "Arsenal",
+# "RC Lens" == "Lens"); les nombres ("TSG 1899 Hoffenheim", "Schalke 04") aussi
+NAME_NOISE = {
+    'fc', 'cf', 'sc', 'afc', 'ac', 'as', 'ssc', 'club', 'the', 'cd', 'sv', 'bc',
+    'rc', 'rcd', 'ogc', 'vfl', 'vfb', 'tsg', 'tsv', 'fsv', 'ssv', 'bsc', 'cp', 'sd', 'ud',
+    'us', 'ss', 'sl', 'ca', 'krc', 'rsc', 'kv'
+}
+
+# Abréviations ramenées au mot complet ("Manchester Utd" == "Manchester United")
+TOKEN_SYNONYMS = {'utd': 'united'}
+
+# Mots fréquents qui, seuls en commun, ne prouvent rien
+WEAK_TOKENS = {
+    'united', 'city', 'real', 'sporting', 'athletic', 'olympique', 'racing', 'dynamo',
+    'de', 'del', 'la', 'le', 'and', 'town', 'county', 'rovers', 'wanderers', 'fk', 'sk'
+}
+WEAK_WEIGHT = 0.25
+
+# Villes accolées au nom par certains fournisseurs ("Atletico Madrid" / "Atletico",
+# "Los Angeles Lakers" / "Lakers"). Pas les villes qui sont elles-mêmes un club
+# ("Leeds") ni celles d'homonymes ("Arsenal Tula", "Liverpool Montevideo")
+CITY_TOKENS = {
+    'madrid', 'munich', 'lisbon', 'london', 'milan', 'milano', 'turin', 'istanbul', 'prague',
+    'praha', 'vienna', 'wien', 'bucharest', 'belgrade', 'kyiv', 'kiev', 'moscow', 'glasgow',
+    'athens', 'bilbao', 'eindhoven', 'amsterdam', 'rotterdam', 'brugge', 'zagreb', 'sofia',
+    'los', 'angeles', 'golden', 'state', 'san', 'antonio', 'oklahoma', 'boston', 'chicago',
+    'dallas', 'houston', 'denver', 'phoenix', 'toronto', 'brooklyn', 'philadelphia',
+    'sacramento', 'orlando', 'atlanta', 'detroit', 'memphis', 'milwaukee', 'minnesota',
+    'utah', 'washington', 'cleveland', 'miami', 'portland', 'indiana', 'charlotte'
+}
+
+# Alias -> nom canonique (formes normalisées)
+TEAM_ALIASES = {
+    'psg': 'paris saint germain',
+    'paris sg': 'paris saint germain',
+    'paris st germain': 'paris saint germain',
+    'om': 'marseille',
+    'olympique marseille': 'marseille',
+    'olympique de marseille': 'marseille',
+    'ol': 'lyon',
+    'olympique lyon': 'lyon',
+    'olympique lyonnais': 'lyon',
+    'man utd': 'manchester united',
+    'man united': 'manchester united',
+    'man city': 'manchester city',
+    'tottenham': 'tottenham hotspur',
+    'wolves': 'wolverhampton wanderers',
+    'wolverhampton': 'wolverhampton wanderers',
+    'newcastle': 'newcastle united',
+    'west ham': 'west ham united',
+    'brighton': 'brighton and hove albion',
+    'brighton hove albion': 'brighton and hove albion',
+    'nottingham': 'nottingham forest',
+    'nottm forest': 'nottingham forest',
+    'barca': 'barcelona',
+    'atleti': 'atletico madrid',
+    'atl madrid': 'atletico madrid',
+    'betis': 'real betis',
+    'athletic club': 'athletic bilbao',
+    'bayern': 'bayern munich',
+    'bayern munchen': 'bayern munich',
+    'fc bayern munchen': 'bayern munich',
+    'bvb': 'borussia dortmund',
+    'dortmund': 'borussia dortmund',
+    'gladbach': 'borussia monchengladbach',
+    'leverkusen': 'bayer leverkusen',
+    'leipzig': 'rb leipzig',
+    'rasenballsport leipzig': 'rb leipzig',
+    'inter': 'internazionale',
+    'inter milan': 'internazionale',
+    'inter milano': 'internazionale',
+    'internazionale milano': 'internazionale',
+    'juve': 'juventus',
+    'psv eindhoven': 'psv',
+    'sporting cp': 'sporting lisbon',
+    'sporting clube de portugal': 'sporting lisbon',
+    'benfica lisbon': 'benfica',
+    'sl benfica': 'benfica',
+    'fc porto': 'porto',
+    'sixers': 'philadelphia 76ers',
+    '76ers': 'philadelphia 76ers',
+    'blazers': 'portland trail blazers',
+    'trail blazers': 'portland trail blazers'
+}
+
+
+@lru_cache(maxsize=PROFILE_CACHE_SIZE)
+def normalize_name(name: str) -> str:
+    """Nom canonique: sans accents, minuscules, sans ponctuation ni suffixes"""
+    if not name:
+        return ""
+    folded = unicodedata.normalize('NFKD', name)
+    folded = ''.join(c for c in folded if not unicodedata.combining(c)).lower()
+    tokens = [TOKEN_SYNONYMS.get(t, t) for t in re.findall(r'[a-z0-9]+', folded)]
+    kept = [t for t in tokens if t not in NAME_NOISE and not t.isdigit()]
+    return ' '.join(kept or tokens)
+
+
+def fold_accents(text: str) -> str:
+    """Minuscules sans accents, ponctuation conservée (recherche de sous-chaînes)"""
+    folded = unicodedata.normalize('NFKD', text)
+    return ''.join(c for c in folded if not unicodedata.combining(c)).lower()
+
+
+# Alias indexés sous leur forme normalisée (une seule fois au chargement)
+_ALIASES = {normalize_name(alias): normalize_name(target) for alias, target in TEAM_ALIASES.items()}
+
+
+def canonical_name(name: str) -> str:
+    """Nom normalisé puis résolu par la table d'alias"""
+    key = normalize_name(name)
+    return _ALIASES.get(key, key)
+
+# ════════════════════════════════════════════════════════════════════════════
+# 🧮 PROFILS ET SCORE
+# ════════════════════════════════════════════════════════════════════════════
+
+class TeamProfile:
+    """Nom canonique + mots + trigrammes, calculés une fois par nom"""
+
+    __slots__ = ('key', 'tokens', 'weight', 'grams')
+
+    def __init__(self, key: str):
+        self.key = key
+        self.tokens: FrozenSet[str] = frozenset(key.split())
+        self.weight = _weight(self.tokens)
+        padded = f"  {key} "
+        self.grams: FrozenSet[str] = frozenset(padded[i:i + 3] for i in range(len(padded) - 2))
+
+
+def _weight(tokens) -> float:
+    return sum(WEAK_WEIGHT if token in WEAK_TOKENS else 1.0 for token in tokens)
+
+
+def _distinctive(tokens) -> float:
+    """Poids des mots qui désignent une autre équipe (ni faibles, ni ville)"""
+    return _weight(tokens - CITY_TOKENS)
+
+
+@lru_cache(maxsize=PROFILE_CACHE_SIZE)
+def team_profile(name: str) -> TeamProfile:
+    return TeamProfile(canonical_name(name))
+
+
+def profile_similarity(a: TeamProfile, b: TeamProfile) -> float:
+    """Similarité 0-1 entre deux profils"""
+    if not a.key or not b.key:
+        return 0.0
+    if a.key == b.key:
+        return 1.0
+    common = a.tokens & b.tokens
+    gram_score = 2 * len(a.grams & b.grams) / (len(a.grams) + len(b.grams))
+    only_a, only_b = a.tokens - b.tokens, b.tokens - a.tokens
+
+    # Nom court contenu dans le long, qui n'ajoute que des mots faibles ou une ville ("Leeds" /
+    # "Leeds United", "Lakers" / "Los Angeles Lakers"). Un mot distinctif en plus ("Arsenal Tula")
+    # est une autre équipe: formes courtes -> TEAM_ALIASES
+    if common and not (only_a and only_b) and _distinctive(common) >= 1.0 \
+            and _distinctive(only_a | only_b) < 1.0:
+        shorter, longer = sorted((a.weight, b.weight))
+        return 0.7 + 0.3 * shorter / longer
+
+    token_score = _weight(common) / _weight(a.tokens | b.tokens) if common else 0.0
+    score = 0.6 * token_score + 0.4 * gram_score
+    if common and ((only_a and only_b) or _distinctive(only_a | only_b) >= 1.0):
+        score *= 0.7        # "Manchester United" / "Manchester City", "Paris FC" / "Paris Saint Germain"
+    # Variantes d'orthographe sans mot commun ("Olympiacos" / "Olympiakos")
+    return max(score, 0.85 * gram_score if not common else 0.0)
+
+
+def similarity(a: str, b: str) -> float:
+    return profile_similarity(team_profile(a), team_profile(b))
+
+
+def same_team(a: str, b: str, threshold: float = MATCH_THRESHOLD) -> bool:
+    return similarity(a, b) >= threshold
+
+# ════════════════════════════════════════════════════════════════════════════
+# 🗂️ INDEX
+# ════════════════════════════════════════════════════════════════════════════
+
+class TeamIndex:
+    """Noms indexés par nom canonique, mot et trigramme -> meilleure correspondance"""
+
+    __slots__ = ('profiles', 'by_key', 'by_token', 'by_gram')
+
+    def __init__(self, names: Optional[List[str]] = None):
+        self.profiles: List[TeamProfile] = []
+        self.by_key: Dict[str, int] = {}
+        self.by_token: Dict[str, List[int]] = {}
+        self.by_gram: Dict[str, List[int]] = {}
+        for name in names or ():
+            self.add(name)
+
+    def add(self, name: str) -> int:
+        """Identifiant de l'entrée (un par nom canonique)"""
+        profile = team_profile(name)
+        entry = self.by_key.get(profile.key)
+        if entry is not None:
+            return entry
+        entry = self.by_key[profile.key] = len(self.profiles)
+        self.profiles.append(profile)
+        for token in profile.tokens:
+            self.by_token.setdefault(token, []).append(entry)
+        for gram in profile.grams:
+            self.by_gram.setdefault(gram, []).append(entry)
+        return entry
+
+    def candidates(self, name: str, threshold: float = MATCH_THRESHOLD) -> List[Tuple[float, int]]:
+        """(score, entrée) au-dessus du seuil, du meilleur au moins bon"""
+        profile = team_profile(name)
+        exact = self.by_key.get(profile.key)
+        if exact is not None:
+            return [(1.0, exact)]
+        entries = set()
+        for token in profile.tokens:
+            entries.update(self.by_token.get(token, ()))
+        if not entries:
+            # Aucun mot commun: entrées partageant au moins la moitié des trigrammes
+            counts: Dict[int, int] = {}
+            for gram in profile.grams:
+                for entry in self.by_gram.get(gram, ()):
+                    counts[entry] = counts.get(entry, 0) + 1
+            entries = {entry for entry, count in counts.items() if 2 * count >= len(profile.grams)}
+        scored = [(profile_similarity(profile, self.profiles[entry]), entry) for entry in entries]
+        return sorted((item for item in scored if item[0] >= threshold), reverse=True)
+
+    def best(self, name: str, threshold: float = MATCH_THRESHOLD) -> Optional[Tuple[str, float]]:
+        """(nom canonique, score) de la meilleure correspondance, None si ex æquo (ambigu)"""
+        found = self.candidates(name, threshold)
+        if not found or (len(found) > 1 and found[1][0] >= found[0][0]):
+            return None
+        score, entry = found[0]
+        return self.profiles[entry].key, score
+
+
+class TeamPairIndex:
+    """Éléments (domicile, extérieur) indexés par paire canonique et par équipe"""
+
+    __slots__ = ('items', 'sides', 'by_pair', 'teams', 'positions', 'built_at')
+
+    def __init__(self, items: List[Dict], names: Callable[[Dict], Tuple[str, str]]):
+        self.items = items
+        self.sides: List[Tuple[TeamProfile, TeamProfile]] = []
+        self.by_pair: Dict[Tuple[str, str], int] = {}
+        self.teams = TeamIndex()
+        self.positions: Dict[int, List[int]] = {}     # entrée d'équipe -> éléments
+        self.built_at = time.time()
+        for position, item in enumerate(items):
+            home, away = (team_profile(name or '') for name in names(item))
+            self.sides.append((home, away))
+            self.by_pair.setdefault((home.key, away.key), position)
+            for profile in (home, away):
+                if profile.key:
+                    self.positions.setdefault(self.teams.add(profile.key), []).append(position)
+
+    def find(self, team1: str, team2: str, threshold: float = MATCH_THRESHOLD) -> Optional[Dict]:
+        """Élément opposant les deux équipes (dans un sens ou dans l'autre), meilleur score"""
+        found = self.find_scored(team1, team2, threshold)
+        return found[0] if found else None
+
+    def find_scored(self, team1: str, team2: str,
+                    threshold: float = MATCH_THRESHOLD) -> Optional[Tuple[Dict, bool, float]]:
+        """(élément, inversé?, score): inversé si team1 joue à l'extérieur, None si ex æquo"""
+        p1, p2 = team_profile(team1), team_profile(team2)
+        position = self.by_pair.get((p1.key, p2.key))
+        if position is not None:
+            return self.items[position], False, 2.0
+        position = self.by_pair.get((p2.key, p1.key))
+        if position is not None:
+            return self.items[position], True, 2.0
+
+        best, best_position, tied = None, None, False
+        for score1, entry in self.teams.candidates(team1, threshold):
+            for position in self.positions[entry]:
+                home, away = self.sides[position]
+                swapped = home.key != self.teams.profiles[entry].key
+                other = home if swapped else away
+                score2 = profile_similarity(p2, other)
+                if score2 < threshold:
+                    continue
+                if best is None or score1 + score2 > best[2]:
+                    best, best_position, tied = (self.items[position], swapped, score1 + score2), position, False
+                elif score1 + score2 == best[2] and position != best_position:
+                    tied = True     # Deux rencontres aussi plausibles: ne pas choisir au hasard
+        return None if tied else best
+
+
+__all__ = [
+    'normalize_name', 'canonical_name', 'fold_accents', 'similarity', 'same_team',
+    'team_profile', 'TeamProfile', 'TeamIndex', 'TeamPairIndex', 'TEAM_ALIASES', 'MATCH_THRESHOLD'
+]
@@ -0,0 +1,231 @@
+"""
+📚 STATISTIQUES D'ÉQUIPES V1.0 - PAR ÉQUIPE, LIGUE ET SAISON
+═══════════════════════════════════════════════════════════════════════════════
+/teams/statistics était redemandé pour les deux équipes à chaque prédiction,
+avec season=2024 codé en dur. Les stats ne changent qu'après un match:
+- Clé (équipe, ligue, saison), saison détectée depuis le match API-Football
+- Entrée valable jusqu'à la fin du prochain match connu de l'équipe,
+  puis rafraîchie à la demande suivante (filet: âge maximal)
+- Persistée en JSON (sous-ensemble utile de la réponse)
+- Préchargement en lot des équipes des matchs suivis aux heures creuses,
+  seulement quand le quota est en retard sur le calendrier, et jamais
+  au-delà d'une part de cette avance
+═══════════════════════════════════════════════════════════════════════════════
+"""
+import asyncio
+import json
+import logging
+import os
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, List, Optional
+
+from circuit_breaker import circuit_breakers
+from quota_ledger import quota_ledger
+
+logger = logging.getLogger("footbot.team_stats_store")
+
+# ════════════════════════════════════════════════════════════════════════════
+# ⚙️ CONFIGURATION
+# ════════════════════════════════════════════════════════════════════════════
+
+STATS_FILE = Path("data/footbot/predictions/team_stats.json")
+
+MATCH_DURATION = 2.5 * 3600     # Coup d'envoi + durée: stats de l'équipe à jour côté API
+STATS_MAX_AGE = 7 * 86400       # Filet de sécurité (matchs non vus par l'instantané)
+SEASON_START_MONTH = 7          # Saison européenne: juillet -> juin
+
+# Heures creuses du préchargement (heure locale, "début-fin")
+PREFETCH_HOURS = os.environ.get("TEAM_STATS_PREFETCH_HOURS", "3-8")
+PREFETCH_MAX = int(os.environ.get("TEAM_STATS_PREFETCH_MAX", "20"))
+# Valeur du préchargement pour le registre: dépense seulement si la consommation suit le calendrier
+PREFETCH_VALUE = 0.0
+# Part des requêtes d'avance sur le calendrier que le préchargement peut consommer
+PREFETCH_SLACK_SHARE = 0.5
+
+# Parties de la réponse /teams/statistics conservées (le reste n'est pas lu)
+KEPT_KEYS = ('form', 'fixtures', 'goals', 'clean_sheet', 'failed_to_score', 'cards', 'penalty')
+
+# fetch(team_id, league_id, season) -> réponse /teams/statistics (None si échec)
+StatsFetcher = Callable[[int, int, int], Awaitable[Optional[Dict]]]
+
+
+def season_for_date(date: Optional[datetime] = None) -> int:
+    """Saison (année de début) contenant la date"""
+    date = date or datetime.now()
+    return date.year if date.month >= SEASON_START_MONTH else date.year - 1
+
+
+def detect_season(fixture: Dict) -> int:
+    """Saison d'un match API-Football: champ league.season, sinon date du match"""
+    season = fixture.get('league', {}).get('season')
+    if isinstance(season, int):
+        return season
+    try:
+        return season_for_date(datetime.fromisoformat(fixture.get('fixture', {}).get('date', '')))
+    except (TypeError, ValueError):
+        return season_for_date()
+
+
+def in_off_peak(hours: str = PREFETCH_HOURS, now: Optional[datetime] = None) -> bool:
+    """L'heure courante est-elle dans la plage "début-fin" (peut passer minuit) ?"""
+    try:
+        start, end = (int(h) % 24 for h in hours.split('-'))
+    except ValueError:
+        return False
+    hour = (now or datetime.now()).hour
+    return start <= hour < end if start <= end else hour >= start or hour < end
+
+
+class TeamStatsStore:
+    """Stats de saison par (équipe, ligue, saison), persistées"""
+
+    def __init__(self, path: Path = STATS_FILE):
+        self.path = path
+        self._lock = threading.Lock()
+        self._fetch_locks: Dict[str, asyncio.Lock] = {}
+        self.dirty = False
+        # clé -> {'stats', 'fetched_at', 'pending_kickoff'}
+        self.entries: Dict[str, Dict] = {}
+        self.stats = {'hits': 0, 'fetches': 0, 'after_match': 0, 'failed': 0, 'prefetched': 0}
+        self.load()
+
+    # === PERSISTANCE ===
+    def load(self):
+        try:
+            if self.path.exists():
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    self.entries = json.load(f).get('teams', {})
+                logger.info(f"📚 Stats d'équipes chargées: {len(self.entries)}")
+        except Exception as e:
+            logger.error(f"Erreur chargement stats d'équipes: {e}")
+            self.entries = {}
+
+    def save(self, force: bool = False):
+        if not (self.dirty or force):
+            return
+        with self._lock:
+            try:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                tmp_path = self.path.with_suffix('.tmp')
+                with open(tmp_path, 'w', encoding='utf-8') as f:
+                    json.dump({'version': 1, 'updated_at': time.time(), 'teams': self.entries}, f, ensure_ascii=False)
+                tmp_path.replace(self.path)
+                self.dirty = False
+            except Exception as e:
+                logger.error(f"Erreur sauvegarde stats d'équipes: {e}")
+
+    # === FRAÎCHEUR ===
+    @staticmethod
+    def key(team_id: int, league_id: int, season: int) -> str:
+        return f"{team_id}:{league_id}:{season}"
+
+    def note_fixture(self, team_id: int, league_id: int, season: int, kickoff: Optional[float]):
+        """Enregistre un match de l'équipe: l'entrée expirera à sa fin"""
+        entry = self.entries.get(self.key(team_id, league_id, season))
+        if not entry or not kickoff or kickoff + MATCH_DURATION <= entry['fetched_at']:
+            return
+        pending = entry.get('pending_kickoff')
+        if pending is None or kickoff < pending:
+            entry['pending_kickoff'] = kickoff
+            self.dirty = True
+
+    @staticmethod
+    def _fresh(entry: Optional[Dict], now: float) -> bool:
+        if not entry or now - entry['fetched_at'] > STATS_MAX_AGE:
+            return False
+        pending = entry.get('pending_kickoff')
+        return pending is None or now < pending + MATCH_DURATION
+
+    def is_fresh(self, team_id: int, league_id: int, season: int) -> bool:
+        return self._fresh(self.entries.get(self.key(team_id, league_id, season)), time.time())
+
+    # === LECTURE ===
+    async def get(self, fetch: StatsFetcher, team_id: int, league_id: int, season: int,
+                  kickoff: Optional[float] = None) -> Dict:
+        """Stats de l'équipe: entrée fraîche, sinon une requête (ancienne entrée si elle échoue)"""
+        key = self.key(team_id, league_id, season)
+        self.note_fixture(team_id, league_id, season, kickoff)
+        entry = self.entries.get(key)
+        if self._fresh(entry, time.time()):
+            self.stats['hits'] += 1
+            return entry['stats']
+
+        lock = self._fetch_locks.setdefault(key, asyncio.Lock())
+        async with lock:
+            entry = self.entries.get(key)
+            if self._fresh(entry, time.time()):
+                self.stats['hits'] += 1
+                return entry['stats']
+            if entry and entry.get('pending_kickoff'):
+                self.stats['after_match'] += 1
+            stats = await fetch(team_id, league_id, season)
+            if not stats:
+                self.stats['failed'] += 1
+                return entry['stats'] if entry else {}
+            now = time.time()
+            self.entries[key] = {
+                'stats': {k: stats[k] for k in KEPT_KEYS if k in stats},
+                'fetched_at': now,
+                'pending_kickoff': None
+            }
+            self.stats['fetches'] += 1
+            self.dirty = True
+            # Match en cours ou à venir: l'entrée neuve expirera à sa fin
+            self.note_fixture(team_id, league_id, season, kickoff)
+        self.save()
+        return self.entries[key]['stats']
+
+    # === PRÉCHARGEMENT ===
+    async def prefetch(self, fetch: StatsFetcher, fixtures: List[Dict], limit: int = PREFETCH_MAX) -> int:
+        """
+        Charge les stats des équipes des matchs donnés qui ne sont pas à jour.
+        Au plus une part des requêtes d'avance sur le calendrier: le quota
+        n'est jamais poussé en avance par une requête de fond.
+        """
+        now = time.time()
+        teams = []
+        for fixture in sorted(fixtures, key=lambda f: f.get('fixture', {}).get('timestamp') or 0):
+            kickoff = fixture.get('fixture', {}).get('timestamp') or 0
+            league_id = fixture.get('league', {}).get('id')
+            if kickoff <= now or not league_id:
+                continue
+            season = detect_season(fixture)
+            for side in ('home', 'away'):
+                team_id = fixture.get('teams', {}).get(side, {}).get('id')
+                if team_id:
+                    self.note_fixture(team_id, league_id, season, kickoff)
+                    teams.append((team_id, league_id, season, kickoff))
+
+        limit = min(limit, int(quota_ledger.slack('api_football') * PREFETCH_SLACK_SHARE))
+        done = 0
+        for team_id, league_id, season, kickoff in teams:
+            if self.is_fresh(team_id, league_id, season):
+                continue
+            if done >= limit or not circuit_breakers.get('api_football').available \
+                    or not quota_ledger.allow('api_football', PREFETCH_VALUE):
+                break
+            before = self.stats['fetches']
+            await self.get(fetch, team_id, league_id, season, kickoff)
+            done += self.stats['fetches'] - before
+        self.stats['prefetched'] += done
+        self.save()
+        return done
+
+    def get_stats(self) -> Dict:
+        now = time.time()
+        return {
+            **self.stats,
+            'teams': len(self.entries),
+            'fresh': sum(1 for entry in self.entries.values() if self._fresh(entry, now))
+        }
+
+
+# Instance globale
+team_stats_store = TeamStatsStore()
+
+
+__all__ = ['TeamStatsStore', 'team_stats_store', 'detect_season', 'season_for_date', 'in_off_peak',
+           'PREFETCH_VALUE']
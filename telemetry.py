@@ -0,0 +1,288 @@
+"""
+📡 TÉLÉMÉTRIE GROQ V1.0 - TOKENS, LATENCE, COÛT
+═══════════════════════════════════════════════════════════════════════════════
+Agrégats en mémoire (thread-safe) partagés par tout le processus:
+- Par modèle GROQ_MODELS: requêtes, tokens prompt/complétion, latence HTTP,
+  429, erreurs, timeouts, échecs de parsing JSON, réparations et relances
+  ciblées, coût estimé
+- Par type de prédiction (DATA-DRIVEN / AI / ALGORITHMIC): volume, latence
+  de bout en bout, taux de fallback
+- Attente en file avant analyse, hits de cache
+- Requêtes couvertes (hedging): déclenchements, victoires, budget, latence
+  effective (à comparer au p99 du modèle principal)
+- Taille des prompts système par sport (version, empreinte, tokens estimés)
+Persistance JSON périodique; exposé sur /metrics par le launcher.
+═══════════════════════════════════════════════════════════════════════════════
+"""
+import json
+import logging
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from pathlib import Path
+from typing import Deque, Dict, Optional
+
+logger = logging.getLogger("footbot.telemetry")
+
+# ════════════════════════════════════════════════════════════════════════════
+# ⚙️ CONFIGURATION
+# ════════════════════════════════════════════════════════════════════════════
+
+TELEMETRY_FILE = Path("data/footbot/predictions/telemetry.json")
+
+PERSIST_INTERVAL = 60     # Sauvegarde au plus toutes les 60s
+SAMPLE_SIZE = 500         # Échantillons de latence conservés par série
+HEDGE_WINDOW = 200        # Fenêtre glissante (appels) du budget de couverture
+HEDGE_MIN_CALLS = 20      # Appels observés avant toute couverture
+
+# Tarifs Groq en $ par million de tokens (entrée, sortie)
+MODEL_PRICING = {
+    "llama-3.3-70b-versatile": (0.59, 0.79),
+    "llama3-70b-8192": (0.59, 0.79),
+    "gemma2-9b-it": (0.20, 0.20),
+    "llama-3.1-8b-instant": (0.05, 0.08),
+    "llama3-8b-8192": (0.05, 0.08)
+}
+
+HEDGE_COUNTERS = ('calls', 'fired', 'wins', 'budget_denied')
+
+MODEL_COUNTERS = (
+    'requests', 'ok', 'rate_limited', 'http_errors', 'timeouts',
+    'parse_failures', 'json_salvaged', 'json_followups',
+    'prompt_tokens', 'completion_tokens'
+)
+
+
+def _percentiles(samples) -> Dict[str, float]:
+    if not samples:
+        return {'p50': 0.0, 'p90': 0.0, 'p95': 0.0, 'p99': 0.0}
+    ordered = sorted(samples)
+    last = len(ordered) - 1
+    return {
+        f"p{q}": round(ordered[min(last, int(q / 100 * len(ordered)))], 1)
+        for q in (50, 90, 95, 99)
+    }
+
+# ════════════════════════════════════════════════════════════════════════════
+# 📡 TÉLÉMÉTRIE
+# ════════════════════════════════════════════════════════════════════════════
+
+class Telemetry:
+    """Compteurs et échantillons de latence, protégés par un verrou"""
+
+    def __init__(self, path: Path = TELEMETRY_FILE):
+        self.path = path
+        self._lock = threading.Lock()
+        self.models: Dict[str, Dict[str, int]] = {}
+        self.types: Dict[str, Dict[str, int]] = {}
+        self.cache: Dict[str, int] = {}
+        self._model_latency: Dict[str, Deque[float]] = {}
+        self._type_latency: Dict[str, Deque[float]] = {}
+        self._queue_wait: Deque[float] = deque(maxlen=SAMPLE_SIZE)
+        self.hedging: Dict[str, int] = {name: 0 for name in HEDGE_COUNTERS}
+        self._hedge_window: Deque[bool] = deque(maxlen=HEDGE_WINDOW)
+        self._hedged_latency: Deque[float] = deque(maxlen=SAMPLE_SIZE)
+        self.prompts: Dict[str, Dict] = {}
+        self.started_at = datetime.now().isoformat()
+        self._dirty = False
+        self._last_persist = time.time()
+        self._load()
+
+    def _model(self, model: str) -> Dict[str, int]:
+        if model not in self.models:
+            self.models[model] = {name: 0 for name in MODEL_COUNTERS}
+            self._model_latency[model] = deque(maxlen=SAMPLE_SIZE)
+        return self.models[model]
+
+    def _type(self, prediction_type: str) -> Dict[str, int]:
+        if prediction_type not in self.types:
+            self.types[prediction_type] = {'count': 0, 'fallback': 0}
+            self._type_latency[prediction_type] = deque(maxlen=SAMPLE_SIZE)
+        return self.types[prediction_type]
+
+    # === ENREGISTREMENT ===
+    def record_groq_call(self, model: str, status: str, latency_ms: float,
+                         prompt_tokens: int = 0, completion_tokens: int = 0):
+        """status: ok | rate_limited | http_error | timeout"""
+        with self._lock:
+            counters = self._model(model)
+            counters['requests'] += 1
+            counters['prompt_tokens'] += prompt_tokens
+            counters['completion_tokens'] += completion_tokens
+            if status == 'ok':
+                counters['ok'] += 1
+                self._model_latency[model].append(latency_ms)
+            elif status == 'rate_limited':
+                counters['rate_limited'] += 1
+            elif status == 'timeout':
+                counters['timeouts'] += 1
+            else:
+                counters['http_errors'] += 1
+            self._dirty = True
+        self.maybe_persist()
+
+    def record_parse_failure(self, model: str):
+        with self._lock:
+            self._model(model)['parse_failures'] += 1
+            self._dirty = True
+
+    def record_json_repair(self, model: str, kind: str):
+        """kind: salvaged (JSON tronqué/réparé) | followup (relance des champs manquants)"""
+        with self._lock:
+            self._model(model)['json_salvaged' if kind == 'salvaged' else 'json_followups'] += 1
+            self._dirty = True
+
+    def record_prediction(self, prediction_type: str, latency_ms: float, fallback: bool = False):
+        with self._lock:
+            counters = self._type(prediction_type)
+            counters['count'] += 1
+            counters['fallback'] += int(fallback)
+            self._type_latency[prediction_type].append(latency_ms)
+            self._dirty = True
+        self.maybe_persist()
+
+    def record_cache_hit(self, kind: str):
+        with self._lock:
+            self.cache[kind] = self.cache.get(kind, 0) + 1
+            self._dirty = True
+
+    def record_queue_wait(self, wait_ms: float):
+        with self._lock:
+            self._queue_wait.append(wait_ms)
+
+    def hedge_allowed(self, budget_ratio: float) -> bool:
+        """Une requête de couverture de plus resterait-elle dans le budget ?"""
+        with self._lock:
+            calls = len(self._hedge_window)
+            fired = sum(self._hedge_window)
+            # Part mesurée sur les appels réellement vus (fenêtre pas encore pleine après un redémarrage)
+            allowed = calls >= HEDGE_MIN_CALLS and fired + 1 <= budget_ratio * (calls + 1)
+            if not allowed:
+                self.hedging['budget_denied'] += 1
+            return allowed
+
+    def record_hedge(self, fired: bool, won: bool, latency_ms: float):
+        """Un appel en mode couverture (latence effective, du départ au gagnant)"""
+        with self._lock:
+            self.hedging['calls'] += 1
+            self.hedging['fired'] += int(fired)
+            self.hedging['wins'] += int(won)
+            self._hedge_window.append(fired)
+            self._hedged_latency.append(latency_ms)
+            self._dirty = True
+
+    def set_prompt_sizes(self, report: Dict[str, Dict]):
+        """Tailles des prompts système (registre, calculé au chargement)"""
+        with self._lock:
+            self.prompts = dict(report)
+
+    def groq_requests(self) -> int:
+        """Requêtes Groq envoyées depuis le démarrage (tous modèles)"""
+        with self._lock:
+            return sum(counters['requests'] for counters in self.models.values())
+
+    def model_latency_percentile(self, model: str, q: float) -> Optional[float]:
+        """Percentile de latence HTTP d'un modèle (None si pas assez d'échantillons)"""
+        with self._lock:
+            samples = list(self._model_latency.get(model, ()))
+        if len(samples) < 10:
+            return None
+        samples.sort()
+        return samples[min(len(samples) - 1, int(q / 100 * len(samples)))]
+
+    # === LECTURE ===
+    def snapshot(self) -> Dict:
+        with self._lock:
+            models = {}
+            for model, counters in self.models.items():
+                price_in, price_out = MODEL_PRICING.get(model, (0.0, 0.0))
+                ok = max(counters['ok'], 1)
+                models[model] = {
+                    **counters,
+                    'latency_ms': _percentiles(self._model_latency.get(model, ())),
+                    'tokens_per_call': round((counters['prompt_tokens'] + counters['completion_tokens']) / ok),
+                    'estimated_cost_usd': round(
+                        (counters['prompt_tokens'] * price_in + counters['completion_tokens'] * price_out) / 1e6, 4
+                    )
+                }
+
+            types = {
+                ptype: {
+                    **counters,
+                    'latency_ms': _percentiles(self._type_latency.get(ptype, ()))
+                }
+                for ptype, counters in self.types.items()
+            }
+            total = sum(c['count'] for c in self.types.values())
+            fallbacks = sum(c['fallback'] for c in self.types.values())
+
+            return {
+                'started_at': self.started_at,
+                'models': models,
+                'prediction_types': types,
+                'fallback_rate': round(fallbacks / total, 3) if total else 0.0,
+                'cache_hits': dict(self.cache),
+                'queue_wait_ms': _percentiles(self._queue_wait),
+                'hedging': {
+                    **self.hedging,
+                    'latency_ms': _percentiles(self._hedged_latency)
+                },
+                'prompts': dict(self.prompts),
+                'total_cost_usd': round(sum(m['estimated_cost_usd'] for m in models.values()), 4)
+            }
+
+    # === PERSISTANCE ===
+    def _load(self):
+        try:
+            if self.path.exists():
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                for model, counters in data.get('models', {}).items():
+                    target = self._model(model)
+                    target.update({k: counters.get(k, 0) for k in MODEL_COUNTERS})
+                    self._model_latency[model].extend(counters.get('latency_samples', []))
+                for ptype, counters in data.get('prediction_types', {}).items():
+                    target = self._type(ptype)
+                    target.update({k: counters.get(k, 0) for k in ('count', 'fallback')})
+                    self._type_latency[ptype].extend(counters.get('latency_samples', []))
+                self.cache = data.get('cache_hits', {})
+                hedging = data.get('hedging', {})
+                self.hedging.update({k: hedging.get(k, 0) for k in HEDGE_COUNTERS})
+                self.started_at = data.get('started_at', self.started_at)
+        except Exception as e:
+            logger.error(f"Erreur chargement télémétrie: {e}")
+
+    def maybe_persist(self, force: bool = False):
+        now = time.time()
+        if not force and (not self._dirty or now - self._last_persist < PERSIST_INTERVAL):
+            return
+        with self._lock:
+            self._last_persist = now
+            data = {
+                'started_at': self.started_at,
+                'models': {
+                    model: {**counters, 'latency_samples': list(self._model_latency[model])}
+                    for model, counters in self.models.items()
+                },
+                'prediction_types': {
+                    ptype: {**counters, 'latency_samples': list(self._type_latency[ptype])}
+                    for ptype, counters in self.types.items()
+                },
+                'cache_hits': dict(self.cache),
+                'hedging': dict(self.hedging)
+            }
+            self._dirty = False
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.path, 'w', encoding='utf-8') as f:
+                json.dump(data, f)
+        except Exception as e:
+            logger.error(f"Erreur sauvegarde télémétrie: {e}")
+
+
+# Instance globale
+telemetry = Telemetry()
+
+
+__all__ = ['Telemetry', 'telemetry', 'MODEL_PRICING']
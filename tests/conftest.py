@@ -0,0 +1,18 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+# Modules à la racine du dépôt (pas de paquet installable)
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+
+@pytest.fixture
+def prediction_files(tmp_path, monkeypatch):
+    """Fichiers JSON des prédictions redirigés vers un dossier temporaire"""
+    import prediction_module
+
+    files = {key: tmp_path / path.name for key, path in prediction_module.FILES.items()}
+    monkeypatch.setattr(prediction_module, 'FILES', files)
+    monkeypatch.setattr(prediction_module.AdvancedDataManager, '_cache', {})
+    return files
@@ -0,0 +1,14 @@
+from fixture_identity import fixture_key
+
+MATCH = {'sport': 'FOOTBALL', 'start_time': '21:00', 'scraped_at': '2026-10-18T18:00:00'}
+
+
+def test_alias_names_share_a_fixture_key():
+    short = dict(MATCH, team1='PSG', team2='Man Utd')
+    full = dict(MATCH, team1='Paris Saint-Germain', team2='Manchester United FC')
+    assert fixture_key(short) == fixture_key(full)
+
+
+def test_overnight_kickoff_keyed_on_next_day():
+    match = dict(MATCH, team1='Lens', team2='Nice', scraped_at='2026-10-18T23:10:00', start_time='00:30')
+    assert fixture_key(match).endswith('|2026-10-19')
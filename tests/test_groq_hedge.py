@@ -0,0 +1,43 @@
+import asyncio
+
+import pytest
+
+import prediction_module
+from prediction_module import UltraPredictor
+
+
+@pytest.fixture
+def predictor(monkeypatch):
+    monkeypatch.setattr(prediction_module.Limits, 'HEDGE_MIN_DELAY', 0.01)
+    monkeypatch.setattr(prediction_module.telemetry, 'model_latency_percentile', lambda *args: 10)
+    monkeypatch.setattr(prediction_module.telemetry, 'hedge_allowed', lambda budget: True)
+    monkeypatch.setattr(prediction_module.telemetry, 'record_hedge', lambda *args: None)
+    return UltraPredictor()
+
+
+def hedge(predictor, results):
+    """results: modèle -> résultat de _post_groq (ou exception), rendu après un court délai"""
+    async def post(model, quality, messages, extended, timeout):
+        await asyncio.sleep(0.05)
+        if isinstance(results[model], Exception):
+            raise results[model]
+        return results[model]
+
+    predictor._post_groq = post
+    return asyncio.run(predictor._post_groq_hedged(('primary', 70), ('backup', 60), [], True))
+
+
+def test_backup_answer_kept_when_primary_fails(predictor):
+    answer = (200, 'texte tronqué', '')
+    assert hedge(predictor, {'primary': asyncio.TimeoutError(), 'backup': answer}) == ('backup', answer)
+
+
+def test_truncated_answer_preferred_over_error_status(predictor):
+    answer = (200, 'texte tronqué', '')
+    found = hedge(predictor, {'primary': (429, None, 'rate limit'), 'backup': answer})
+    assert found == ('backup', answer)
+
+
+def test_raises_only_when_both_fail(predictor):
+    with pytest.raises(asyncio.TimeoutError):
+        hedge(predictor, {'primary': asyncio.TimeoutError(), 'backup': asyncio.TimeoutError()})
@@ -0,0 +1,45 @@
+import asyncio
+
+import aiohttp
+from aiohttp import web
+
+import http_cache as http_cache_module
+from circuit_breaker import CircuitBreakers
+from deadline import Deadline
+from http_cache import HttpCache
+
+
+async def fetch_slow(timeout, deadline=None):
+    async def slow(request):
+        await asyncio.sleep(2)
+        return web.json_response({})
+
+    app = web.Application()
+    app.router.add_get('/slow', slow)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, '127.0.0.1', 0)
+    await site.start()
+    port = runner.addresses[0][1]
+    try:
+        async with aiohttp.ClientSession() as session:
+            return await HttpCache().get_json(session, f"http://127.0.0.1:{port}/slow", timeout=timeout,
+                                              breaker='slow', deadline=deadline)
+    finally:
+        await runner.cleanup()
+
+
+def test_deadline_clipped_timeout_is_not_a_source_failure(monkeypatch):
+    breakers = CircuitBreakers()
+    monkeypatch.setattr(http_cache_module, 'circuit_breakers', breakers)
+    result = asyncio.run(fetch_slow(10, Deadline(0.3)))
+    assert result.source == 'error'
+    assert breakers.get('slow').failures == 0
+
+
+def test_timeout_at_the_source_cap_is_a_failure(monkeypatch):
+    breakers = CircuitBreakers()
+    monkeypatch.setattr(http_cache_module, 'circuit_breakers', breakers)
+    result = asyncio.run(fetch_slow(0.3, Deadline(30)))
+    assert result.source == 'error'
+    assert breakers.get('slow').failures == 1
@@ -0,0 +1,40 @@
+import asyncio
+
+import prediction_module
+from prediction_module import AdvancedDataManager, UltraPredictor
+
+MATCH = {
+    'id': 'm1', 'sport': 'FOOTBALL', 'title': 'Arsenal vs Chelsea', 'team1': 'Arsenal', 'team2': 'Chelsea',
+    'start_time': '20:00', 'league': 'Premier League'
+}
+
+
+def analyze(match, user_id):
+    predictor = UltraPredictor()
+    predictor.api_key = None
+    return asyncio.run(predictor.analyze_match(match, user_id))
+
+
+def test_prewarmed_fixture_tapped_by_user_is_recorded(prediction_files, monkeypatch):
+    monkeypatch.setattr(prediction_module, 'DATA_COLLECTOR_AVAILABLE', False)
+    analyze(MATCH, None)
+    assert AdvancedDataManager.get_user_predictions(42) == []
+
+    analyze(MATCH, 42)
+    history = AdvancedDataManager.get_user_predictions(42)
+    assert [p['match_id'] for p in history] == ['m1']
+    assert AdvancedDataManager.get_user_profile(42).predictions_count == 1
+
+
+def test_repeat_tap_records_the_fixture_once(prediction_files, monkeypatch):
+    monkeypatch.setattr(prediction_module, 'DATA_COLLECTOR_AVAILABLE', False)
+    analyze(MATCH, 42)
+    analyze(dict(MATCH, id='m1-renamed', title='Arsenal FC vs Chelsea'), 42)
+    assert len(AdvancedDataManager.get_user_predictions(42)) == 1
+    assert AdvancedDataManager.get_user_profile(42).predictions_count == 1
+
+
+def test_overnight_match_dated_by_kickoff(prediction_files):
+    match = dict(MATCH, scraped_at='2026-10-18T23:10:00', start_time='00:30')
+    assert AdvancedDataManager.add_prediction_to_history(7, match, {})
+    assert AdvancedDataManager.get_user_predictions(7)[0]['match_date'] == '2026-10-19'
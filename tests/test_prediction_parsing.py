@@ -0,0 +1,33 @@
+import asyncio
+import json
+
+from llm_json import missing_fields, normalize_prediction
+from prediction_module import PROMPTS, UltraPredictor, required_outcomes
+
+NHL_ANSWER = json.dumps({
+    "predictions": {
+        "winner": {"prediction": "1", "probabilities": {"1": 58, "2": 42}}
+    },
+    "summary": {"main_pick": "Victoire Dom"}
+})
+
+
+def test_required_outcomes_follow_the_prompt():
+    assert required_outcomes('nhl', PROMPTS.for_sport('nhl')) == ('1', '2')
+    assert required_outcomes('rugby', PROMPTS.for_sport('rugby')) == ('1', '2')
+    assert required_outcomes('football', PROMPTS.for_sport('football')) == ('1', 'X', '2')
+    assert required_outcomes('nhl', PROMPTS.get('data_driven')) == ('1', 'X', '2')
+    assert required_outcomes('nba', PROMPTS.get('data_driven')) == ('1', '2')
+
+
+def test_nhl_answer_without_draw_is_complete():
+    outcomes = required_outcomes('nhl', PROMPTS.for_sport('nhl'))
+    prediction = asyncio.run(UltraPredictor()._parse_prediction(NHL_ANSWER, [], outcomes))
+    assert prediction is not None
+    assert prediction['predictions']['winner']['probabilities'] == {'1': 58, '2': 42}
+
+
+def test_confidence_is_optional():
+    payload = normalize_prediction(json.loads(NHL_ANSWER), ('1', '2'))
+    assert missing_fields(payload, ('1', '2')) == []
+    assert missing_fields(payload, ('1', 'X', '2')) == ['predictions.winner.probabilities']
@@ -0,0 +1,16 @@
+from quota_ledger import QuotaLedger
+
+
+def test_groq_model_header_does_not_reset_global_count(tmp_path):
+    ledger = QuotaLedger(tmp_path / 'quota_ledger.json')
+    ledger.charge('groq', 10)
+    # Un modèle presque épuisé ne dit rien des autres modèles ni du budget global
+    ledger.observe('groq', {'x-ratelimit-remaining-requests': '3'}, model='llama-3.3-70b-versatile')
+    assert ledger.remaining('groq') == ledger.limit('groq') - 10
+    assert ledger.forecast('groq')['models'] == {'llama-3.3-70b-versatile': 3}
+
+
+def test_provider_header_recalibrates_usage(tmp_path):
+    ledger = QuotaLedger(tmp_path / 'quota_ledger.json')
+    ledger.observe('api_football', {'x-ratelimit-requests-remaining': '60'})
+    assert ledger.remaining('api_football') == 60
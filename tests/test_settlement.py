@@ -0,0 +1,60 @@
+import asyncio
+
+from aiohttp import web
+
+import http_cache as http_cache_module
+import settlement
+from circuit_breaker import CircuitBreakers
+from http_cache import HttpCache
+from quota_ledger import QuotaLedger
+
+FIXTURES = {'response': [{
+    'fixture': {'status': {'short': 'FT'}},
+    'teams': {'home': {'name': 'RC Lens'}, 'away': {'name': 'OGC Nice'}},
+    'goals': {'home': 2, 'away': 1}
+}]}
+
+
+async def fetch_results(monkeypatch, calls):
+    async def fixtures(request):
+        calls.append(request.query.get('date'))
+        return web.json_response(FIXTURES)
+
+    app = web.Application()
+    app.router.add_get('/fixtures', fixtures)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, '127.0.0.1', 0)
+    await site.start()
+    monkeypatch.setattr(settlement, 'API_FOOTBALL_URL', f"http://127.0.0.1:{runner.addresses[0][1]}")
+    try:
+        async with settlement.ResultsFetcher() as fetcher:
+            return await fetcher.fetch_day('football', '2026-10-18'), fetcher.requests_made
+    finally:
+        await runner.cleanup()
+
+
+def setup_env(monkeypatch, tmp_path):
+    ledger = QuotaLedger(tmp_path / 'quota_ledger.json')
+    monkeypatch.setattr(settlement, 'API_FOOTBALL_KEY', 'key')
+    monkeypatch.setattr(settlement, 'http_cache', HttpCache())
+    monkeypatch.setattr(http_cache_module, 'quota_ledger', ledger)
+    monkeypatch.setattr(http_cache_module, 'circuit_breakers', CircuitBreakers())
+    return ledger
+
+
+def test_api_football_results_go_through_quota_ledger(monkeypatch, tmp_path):
+    ledger = setup_env(monkeypatch, tmp_path)
+    calls = []
+    results, requests_made = asyncio.run(fetch_results(monkeypatch, calls))
+    assert calls == ['2026-10-18'] and requests_made == 1
+    assert results == [{'home': 'lens', 'away': 'nice', 'score': '2-1', 'outcome': '1'}]
+    assert ledger.remaining('api_football') == ledger.limit('api_football') - 1
+
+
+def test_exhausted_quota_sends_nothing(monkeypatch, tmp_path):
+    ledger = setup_env(monkeypatch, tmp_path)
+    ledger.charge('api_football', ledger.limit('api_football'))
+    calls = []
+    results, requests_made = asyncio.run(fetch_results(monkeypatch, calls))
+    assert calls == [] and requests_made == 0 and results == []
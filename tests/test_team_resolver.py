@@ -0,0 +1,45 @@
+import pytest
+
+from team_resolver import TeamIndex, TeamPairIndex, same_team
+
+
+@pytest.mark.parametrize('a, b', [
+    ('Paris FC', 'Paris Saint Germain'),
+    ('Arsenal', 'Arsenal Tula'),
+    ('Liverpool', 'Liverpool Montevideo'),
+    ('Manchester United', 'Manchester City'),
+])
+def test_distinct_teams(a, b):
+    assert not same_team(a, b)
+    assert not same_team(b, a)
+
+
+@pytest.mark.parametrize('a, b', [
+    ('Leeds', 'Leeds United'),
+    ('Arsenal FC', 'Arsenal'),
+    ('Bayern', 'Bayern Munich'),
+    ('PSG', 'Paris Saint-Germain'),
+    ('Atlético Madrid', 'Atletico Madrid'),
+    ('Olympiacos', 'Olympiakos'),
+    ('RC Lens', 'Lens'),
+    ('VfL Wolfsburg', 'Wolfsburg'),
+    ('OGC Nice', 'Nice'),
+    ('TSG 1899 Hoffenheim', 'Hoffenheim'),
+    ('Atletico Madrid', 'Atletico'),
+    ('Sporting CP', 'Sporting'),
+    ('Los Angeles Lakers', 'Lakers'),
+    ('Manchester Utd', 'Man Utd'),
+])
+def test_same_team_variants(a, b):
+    assert same_team(a, b)
+    assert same_team(b, a)
+
+
+def test_tie_is_ambiguous():
+    assert TeamIndex(['Manchester City', 'Manchester United']).best('Manchester') is None
+    index = TeamPairIndex(
+        [{'home': 'Manchester City', 'away': 'Leeds'}, {'home': 'Manchester United', 'away': 'Leeds'}],
+        lambda item: (item['home'], item['away'])
+    )
+    assert index.find('Manchester', 'Leeds') is None
+    assert index.find('Manchester City', 'Leeds')['home'] == 'Manchester City'
@@ -0,0 +1,62 @@
+import asyncio
+import time
+from datetime import datetime
+
+import pytest
+
+import quota_ledger as ledger_module
+import team_stats_store as store_module
+from quota_ledger import QuotaLedger
+from team_stats_store import TeamStatsStore
+
+
+class EightAM(datetime):
+    @classmethod
+    def now(cls, tz=None):
+        return datetime.now(tz).replace(hour=8, minute=0, second=0, microsecond=0)
+
+
+@pytest.fixture
+def ledger(tmp_path, monkeypatch):
+    monkeypatch.setattr(ledger_module, 'datetime', EightAM)
+    ledger = QuotaLedger(tmp_path / 'quota_ledger.json')
+    monkeypatch.setattr(store_module, 'quota_ledger', ledger)
+    return ledger
+
+
+def fixtures(count):
+    kickoff = int(time.time()) + 6 * 3600
+    return [{
+        'fixture': {'id': n, 'timestamp': kickoff + n},
+        'league': {'id': 39, 'season': 2026},
+        'teams': {'home': {'id': 1000 + 2 * n}, 'away': {'id': 1001 + 2 * n}}
+    } for n in range(count)]
+
+
+def run_prefetch(tmp_path, count):
+    calls = []
+
+    async def fetch(team_id, league_id, season):
+        calls.append(team_id)
+        store_module.quota_ledger.charge('api_football')
+        return {'form': 'WWD'}
+
+    store = TeamStatsStore(tmp_path / 'team_stats.json')
+    done = asyncio.run(store.prefetch(fetch, fixtures(count)))
+    return done, calls
+
+
+def test_prefetch_refused_when_consumption_is_ahead_of_pace(tmp_path, ledger):
+    # 08:00: un tiers de la journée écoulé, 33 requêtes au rythme du calendrier
+    ledger.charge('api_football', 40)
+    assert ledger.slack('api_football') == 0
+    done, calls = run_prefetch(tmp_path, 5)
+    assert done == 0 and calls == []
+
+
+def test_prefetch_spends_only_a_share_of_the_slack(tmp_path, ledger):
+    ledger.charge('api_football', 20)
+    assert ledger.slack('api_football') == 13
+    done, calls = run_prefetch(tmp_path, 10)
+    assert done == len(calls) == 6
+    assert ledger.required_value('api_football') == 0
@@ -0,0 +1,18 @@
+from telemetry import HEDGE_MIN_CALLS, Telemetry
+
+
+def test_no_hedging_before_minimum_samples(tmp_path):
+    telemetry = Telemetry(tmp_path / 'telemetry.json')
+    for _ in range(HEDGE_MIN_CALLS - 1):
+        telemetry.record_hedge(False, False, 100)
+    assert not telemetry.hedge_allowed(0.1)
+
+
+def test_hedge_budget_is_a_share_of_observed_calls(tmp_path):
+    telemetry = Telemetry(tmp_path / 'telemetry.json')
+    for n in range(40):
+        telemetry.record_hedge(n < 3, False, 100)
+    # 10% de 41 appels: 4 couvertures, la 5e dépasserait
+    assert telemetry.hedge_allowed(0.1)
+    telemetry.record_hedge(True, False, 100)
+    assert not telemetry.hedge_allowed(0.1)